@@ -8,9 +8,11 @@ It provides methods for registering UI components, commands, and accessing core
 from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING
 from PySide6.QtWidgets import QWidget
 from PySide6.QtGui import QIcon
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtCore import QObject
 from lg import logger
 
+from core.event_bus import EventBus, EventDelivery
+
 if TYPE_CHECKING:
     from core.main_app_window import MainAppWindow
 
@@ -27,18 +29,39 @@ class PluginAPI(QObject):
     - Access core services
     """
 
-    # Signals for event system
-    event_emitted = Signal(str, dict)  # event_name, event_data
-
     def __init__(self, main_window: 'MainAppWindow'):
         super().__init__()
         self._main_window = main_window
         self._commands: Dict[str, Callable] = {}
         self._services: Dict[str, Any] = {}
-        self._event_subscribers: Dict[str, List[Callable]] = {}
+        self._event_bus = EventBus(self)
+        self._activation_handler: Optional[Callable[[str], Any]] = None
 
         logger.info("PluginAPI initialized")
 
+    # Lazy plugin activation
+    def set_activation_handler(self, handler: Optional[Callable[[str], Any]]) -> None:
+        """
+        Set the callback that loads plugins for activation events.
+
+        Args:
+            handler: Callable taking an activation event, usually PluginManager.activate
+        """
+        self._activation_handler = handler
+
+    def activate(self, event: str) -> None:
+        """
+        Fire an activation event so deferred plugins waiting for it are loaded.
+
+        Args:
+            event: Activation event, e.g. "onPanel:search" or "onFileType:.po"
+        """
+        if self._activation_handler is not None:
+            try:
+                self._activation_handler(event)
+            except Exception as e:
+                logger.error(f"Failed to handle activation event {event}: {e}")
+
     # Sidebar management
     def add_sidebar_panel(self, panel_id: str, widget: QWidget, icon: QIcon, title: str) -> None:
         """
@@ -205,6 +228,9 @@ class PluginAPI(QObject):
             Result of the command execution
         """
         try:
+            if command_id not in self._commands:
+                # The command may belong to a plugin that is not activated yet
+                self.activate(f"onCommand:{command_id}")
             if command_id not in self._commands:
                 logger.error(f"Command not found: {command_id}")
                 return None
@@ -240,23 +266,25 @@ class PluginAPI(QObject):
             return False
 
     # Event system
-    def subscribe_event(self, event_name: str, callback: Callable) -> None:
+    @property
+    def event_emitted(self):
+        """Qt signal (event_name, event_data) emitted for every dispatched event."""
+        return self._event_bus.event_emitted
+
+    def subscribe_event(self, event_name: str, callback: Callable,
+                        delivery: EventDelivery = EventDelivery.DIRECT) -> None:
         """
         Subscribe to an event.
 
+        Bound methods are referenced weakly and are dropped automatically
+        when their object is deleted.
+
         Args:
             event_name: Name of the event to subscribe to
             callback: Function to call when event is emitted
+            delivery: Call the callback directly, queued on the UI thread or on a worker thread
         """
-        try:
-            if event_name not in self._event_subscribers:
-                self._event_subscribers[event_name] = []
-
-            self._event_subscribers[event_name].append(callback)
-            logger.info(f"Subscribed to event: {event_name}")
-        except Exception as e:
-            logger.error(f"Failed to subscribe to event {event_name}: {e}")
-            raise
+        self._event_bus.subscribe(event_name, callback, delivery)
 
     def emit_event(self, event_name: str, **event_data) -> None:
         """
@@ -266,21 +294,7 @@ class PluginAPI(QObject):
             event_name: Name of the event to emit
             **event_data: Data to pass to event subscribers
         """
-        try:
-            logger.info(f"Emitting event: {event_name}")
-
-            # Emit via signal for Qt integration
-            self.event_emitted.emit(event_name, event_data)
-
-            # Call direct subscribers
-            if event_name in self._event_subscribers:
-                for callback in self._event_subscribers[event_name]:
-                    try:
-                        callback(**event_data)
-                    except Exception as e:
-                        logger.error(f"Error in event subscriber for {event_name}: {e}")
-        except Exception as e:
-            logger.error(f"Failed to emit event {event_name}: {e}")
+        self._event_bus.emit(event_name, event_data)
 
     def unsubscribe_event(self, event_name: str, callback: Callable) -> bool:
         """
@@ -293,18 +307,26 @@ class PluginAPI(QObject):
         Returns:
             True if callback was removed successfully
         """
-        try:
-            if event_name in self._event_subscribers:
-                if callback in self._event_subscribers[event_name]:
-                    self._event_subscribers[event_name].remove(callback)
-                    logger.info(f"Unsubscribed from event: {event_name}")
-                    return True
+        if self._event_bus.unsubscribe(event_name, callback):
+            return True
+        logger.warning(f"Callback not found for event: {event_name}")
+        return False
 
-            logger.warning(f"Callback not found for event: {event_name}")
-            return False
-        except Exception as e:
-            logger.error(f"Failed to unsubscribe from event {event_name}: {e}")
-            return False
+    def set_event_coalescing(self, event_name: str, interval_ms: Optional[int], debounce: bool = False) -> None:
+        """
+        Coalesce bursts of a high-frequency event into one dispatch of the latest data.
+
+        Args:
+            event_name: Name of the event
+            interval_ms: Coalescing window in milliseconds, None to turn coalescing off
+            debounce: Dispatch only after the event has been quiet for the interval
+        """
+        self._event_bus.set_coalescing(event_name, interval_ms, debounce)
+
+    def shutdown_events(self) -> None:
+        """Deliver coalesced events still waiting and stop the event worker threads."""
+        self._event_bus.flush()
+        self._event_bus.shutdown()
 
     # Service system
     def register_service(self, service_name: str, service: Any) -> None:
@@ -388,7 +410,11 @@ class PluginAPI(QObject):
 
     def get_event_subscribers(self) -> Dict[str, int]:
         """Get count of subscribers for each event."""
-        return {event: len(callbacks) for event, callbacks in self._event_subscribers.items()}
+        return self._event_bus.get_subscriber_counts()
+
+    def get_event_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Get dispatch statistics (counts and latency) for each emitted event."""
+        return self._event_bus.get_metrics()
 
     def get_icon_manager(self):
         """
@@ -0,0 +1,90 @@
+"""
+Deferred initialisation queue for the POEditor application.
+
+Work that is not needed for the first frame (hidden panels, background
+subsystems) is queued here and run one task per event loop iteration once
+the main window has painted, so the UI stays responsive while it runs.
+"""
+
+from collections import deque
+from typing import Callable, Deque, Optional, Tuple
+
+from PySide6.QtCore import QObject, QTimer
+from lg import logger
+
+from core.startup_profiler import StartupProfiler
+
+
+class DeferredInitQueue(QObject):
+    """
+    FIFO of named initialisation tasks run after startup.
+
+    Tasks queued before start() wait; tasks queued after start() are
+    scheduled immediately. A task can also be run early with run_now(),
+    e.g. when the user opens a panel before its deferred creation ran.
+    """
+
+    def __init__(self, profiler: Optional[StartupProfiler] = None, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._tasks: Deque[Tuple[str, Callable[[], None]]] = deque()
+        self._profiler = profiler
+        self._started = False
+        self._scheduled = False
+
+    def add(self, name: str, task: Callable[[], None]) -> None:
+        """
+        Queue a deferred initialisation task.
+
+        Args:
+            name: Task name used in logs and the startup report
+            task: Callable run on the UI thread
+        """
+        self._tasks.append((name, task))
+        self._schedule()
+
+    def start(self) -> None:
+        """Start draining the queue from the event loop."""
+        self._started = True
+        self._schedule()
+
+    def run_now(self, name: str) -> bool:
+        """
+        Run a queued task immediately instead of waiting for its turn.
+
+        Args:
+            name: Name of the queued task
+
+        Returns:
+            True if a task with that name was queued and has now run
+        """
+        for index, (task_name, task) in enumerate(self._tasks):
+            if task_name == name:
+                del self._tasks[index]
+                self._run(task_name, task)
+                return True
+        return False
+
+    def pending(self) -> int:
+        """Number of tasks still queued."""
+        return len(self._tasks)
+
+    def _schedule(self) -> None:
+        if self._started and self._tasks and not self._scheduled:
+            self._scheduled = True
+            QTimer.singleShot(0, self._run_next)
+
+    def _run_next(self) -> None:
+        self._scheduled = False
+        if self._tasks:
+            self._run(*self._tasks.popleft())
+        self._schedule()
+
+    def _run(self, name: str, task: Callable[[], None]) -> None:
+        try:
+            if self._profiler is not None:
+                with self._profiler.phase(f"deferred:{name}"):
+                    task()
+            else:
+                task()
+        except Exception as e:
+            logger.error(f"Deferred initialisation task {name} failed: {e}")
@@ -50,7 +50,7 @@ class DirectoryModel:
         self._files = []
         self._loaded = False
 
-        logger.debug(f"DirectoryModel created for {path}, include_hidden={include_hidden}")
+        logger.debug("DirectoryModel created for %s, include_hidden=%s", path, include_hidden)
 
     def load(self) -> List[FileInfo]:
         """Load directory contents synchronously."""
@@ -137,4 +137,4 @@ class DirectoryModel:
         """Force reload of directory contents."""
         self._loaded = False
         self._files = []
-        logger.debug(f"DirectoryModel refreshed for {self.path}")
+        logger.debug("DirectoryModel refreshed for %s", self.path)
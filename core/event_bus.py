@@ -0,0 +1,270 @@
+"""
+Event bus for the POEditor plugin API.
+
+Subscribers are indexed per event so subscribing and unsubscribing are
+constant time. Bound-method callbacks are held weakly and drop out when
+their object is deleted. Noisy events (selection, cursor moves) can be
+coalesced or debounced, subscribers can ask for queued or worker-thread
+delivery, and dispatch time is tracked per event.
+
+The bus is driven from the UI thread: emit() and the coalescing timers run
+there, and only WORKER subscribers are called on other threads.
+"""
+
+import inspect
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from functools import partial
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from PySide6.QtCore import QObject, QTimer, Signal, SIGNAL
+from lg import logger
+
+
+class EventDelivery(Enum):
+    """How a subscriber is called."""
+    DIRECT = "direct"  # Synchronously inside emit()
+    QUEUED = "queued"  # On the UI thread at the next event loop iteration
+    WORKER = "worker"  # On a background worker thread
+
+
+@dataclass
+class EventMetrics:
+    """Dispatch statistics for one event."""
+    emitted: int = 0
+    dispatched: int = 0
+    coalesced: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def average_ms(self) -> float:
+        return self.total_ms / self.dispatched if self.dispatched else 0.0
+
+
+class _Subscription:
+    """A subscriber callback and how to deliver to it."""
+
+    __slots__ = ('callback_ref', 'delivery')
+
+    def __init__(self, callback_ref: Callable[[], Optional[Callable]], delivery: EventDelivery):
+        self.callback_ref = callback_ref
+        self.delivery = delivery
+
+
+def _callback_key(callback: Callable) -> Hashable:
+    # Bound methods are new objects on every attribute access, so they are
+    # identified by their instance and function.
+    if inspect.ismethod(callback):
+        return id(callback.__self__), id(callback.__func__)
+    return id(callback)
+
+
+def _strong_ref(callback: Callable) -> Callable[[], Callable]:
+    # Same call shape as a weak reference for callbacks the bus keeps alive
+    return lambda: callback
+
+
+class EventBus(QObject):
+    """
+    Indexed publish/subscribe bus.
+
+    Subscribers are called in subscription order. Bound methods are
+    referenced weakly; plain functions and lambdas are kept alive by the bus
+    until unsubscribed.
+    """
+
+    WORKER_THREADS = 2
+
+    # Mirrors every dispatched event for Qt consumers; only emitted when connected
+    event_emitted = Signal(str, dict)  # event_name, event_data
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._subscribers: Dict[str, Dict[Hashable, _Subscription]] = {}
+        self._coalescing: Dict[str, QTimer] = {}
+        self._debounced: Dict[str, bool] = {}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._metrics: Dict[str, EventMetrics] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def subscribe(self, event_name: str, callback: Callable,
+                  delivery: EventDelivery = EventDelivery.DIRECT) -> None:
+        """
+        Subscribe to an event.
+
+        Subscribing the same callback again only updates its delivery mode.
+
+        Args:
+            event_name: Name of the event
+            callback: Called with the event data as keyword arguments
+            delivery: How the callback is called
+        """
+        key = _callback_key(callback)
+        if inspect.ismethod(callback):
+            callback_ref = weakref.WeakMethod(callback, partial(self._drop_dead, event_name, key))
+        else:
+            callback_ref = _strong_ref(callback)
+        self._subscribers.setdefault(event_name, {})[key] = _Subscription(callback_ref, delivery)
+        logger.debug("Subscribed to event: %s", event_name)
+
+    def unsubscribe(self, event_name: str, callback: Callable) -> bool:
+        """
+        Unsubscribe from an event.
+
+        Args:
+            event_name: Name of the event
+            callback: Callback to remove
+
+        Returns:
+            True if the callback was subscribed
+        """
+        subscribers = self._subscribers.get(event_name)
+        if subscribers is None or subscribers.pop(_callback_key(callback), None) is None:
+            return False
+        if not subscribers:
+            del self._subscribers[event_name]
+        logger.debug("Unsubscribed from event: %s", event_name)
+        return True
+
+    def set_coalescing(self, event_name: str, interval_ms: Optional[int], debounce: bool = False) -> None:
+        """
+        Coalesce bursts of an event into a single dispatch of the latest data.
+
+        With debounce=False the event is dispatched at most once per interval;
+        with debounce=True it is dispatched once the event has been quiet for
+        the interval.
+
+        Args:
+            event_name: Name of the event
+            interval_ms: Coalescing window in milliseconds, None to dispatch every emit
+            debounce: Restart the window on every emit
+        """
+        timer = self._coalescing.pop(event_name, None)
+        if timer is not None:
+            timer.stop()
+            timer.deleteLater()
+            self._flush(event_name)
+        if interval_ms is None:
+            self._debounced.pop(event_name, None)
+            return
+
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(interval_ms)
+        timer.timeout.connect(partial(self._flush, event_name))
+        self._coalescing[event_name] = timer
+        self._debounced[event_name] = debounce
+
+    def emit(self, event_name: str, event_data: Dict[str, Any]) -> None:
+        """
+        Emit an event.
+
+        Args:
+            event_name: Name of the event
+            event_data: Keyword arguments passed to subscribers
+        """
+        metrics = self._metrics.get(event_name)
+        if metrics is None:
+            metrics = self._metrics[event_name] = EventMetrics()
+        metrics.emitted += 1
+
+        timer = self._coalescing.get(event_name)
+        if timer is None:
+            self._dispatch(event_name, event_data, metrics)
+            return
+
+        if event_name in self._pending:
+            metrics.coalesced += 1
+        self._pending[event_name] = event_data
+        if self._debounced[event_name] or not timer.isActive():
+            timer.start()
+
+    def flush(self) -> None:
+        """Dispatch all coalesced events that are still waiting."""
+        for event_name in list(self._pending):
+            self._coalescing[event_name].stop()
+            self._flush(event_name)
+
+    def subscriber_count(self, event_name: str) -> int:
+        """Number of subscribers for an event."""
+        return len(self._subscribers.get(event_name, ()))
+
+    def get_subscriber_counts(self) -> Dict[str, int]:
+        """Subscriber count for each event."""
+        return {event_name: len(subscribers) for event_name, subscribers in self._subscribers.items()}
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Dispatch statistics for each emitted event."""
+        return {
+            event_name: {
+                'emitted': metrics.emitted,
+                'dispatched': metrics.dispatched,
+                'coalesced': metrics.coalesced,
+                'average_ms': round(metrics.average_ms, 3),
+                'max_ms': round(metrics.max_ms, 3)
+            }
+            for event_name, metrics in self._metrics.items()
+        }
+
+    def shutdown(self) -> None:
+        """Stop coalescing timers and the worker threads."""
+        for timer in self._coalescing.values():
+            timer.stop()
+        self._pending.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _flush(self, event_name: str) -> None:
+        event_data = self._pending.pop(event_name, None)
+        if event_data is not None:
+            self._dispatch(event_name, event_data, self._metrics[event_name])
+
+    def _dispatch(self, event_name: str, event_data: Dict[str, Any], metrics: EventMetrics) -> None:
+        start = time.perf_counter()
+
+        if self.receivers(SIGNAL("event_emitted(QString,QVariantMap)")) > 0:
+            self.event_emitted.emit(event_name, event_data)
+
+        subscribers = self._subscribers.get(event_name)
+        if subscribers:
+            # Copy: callbacks may subscribe or unsubscribe while we iterate
+            for subscription in list(subscribers.values()):
+                callback = subscription.callback_ref()
+                if callback is None:
+                    continue
+                if subscription.delivery is EventDelivery.DIRECT:
+                    self._call(event_name, callback, event_data)
+                elif subscription.delivery is EventDelivery.QUEUED:
+                    QTimer.singleShot(0, self, partial(self._call, event_name, callback, event_data))
+                else:
+                    self._worker_pool().submit(self._call, event_name, callback, event_data)
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        metrics.dispatched += 1
+        metrics.total_ms += elapsed_ms
+        if elapsed_ms > metrics.max_ms:
+            metrics.max_ms = elapsed_ms
+
+    @staticmethod
+    def _call(event_name: str, callback: Callable, event_data: Dict[str, Any]) -> None:
+        try:
+            callback(**event_data)
+        except Exception as e:
+            logger.error(f"Error in event subscriber for {event_name}: {e}")
+
+    def _worker_pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.WORKER_THREADS, thread_name_prefix="event-bus")
+        return self._executor
+
+    def _drop_dead(self, event_name: str, key: Hashable, _ref: weakref.ref) -> None:
+        subscribers = self._subscribers.get(event_name)
+        if subscribers is not None:
+            subscribers.pop(key, None)
+            if not subscribers:
+                del self._subscribers[event_name]
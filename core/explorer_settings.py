@@ -3,31 +3,41 @@ Explorer Settings
 
 Manages user preferences for the SimpleExplorer widget.
 Handles settings persistence and provides defaults.
+
+Settings are stored as one state store row per top-level key; the legacy
+JSON settings file is imported once.
 """
 
-import json
-import os
 from pathlib import Path
 from typing import Dict, Any, Optional
 
 from lg import logger
+from services.state_store import StateStore, diff_rows, get_state_store
+
+DEFAULT_SETTINGS_FILE = Path.home() / ".pyside_poeditor_plugin" / "explorer_settings.json"
+SETTINGS_NAMESPACE = "explorer_settings"
 
 
 class ExplorerSettings:
     """Manages explorer settings with persistence."""
 
-    def __init__(self, settings_file: Optional[str] = None):
+    def __init__(self, settings_file: Optional[str] = None, state_store: Optional[StateStore] = None):
         """Initialize settings manager.
 
         Args:
-            settings_file: Path to settings file. If None, uses default location.
+            settings_file: Legacy JSON settings file to migrate. If None, uses default location.
+            state_store: State store to persist into (defaults to the shared store)
         """
-        if settings_file is None:
-            settings_dir = Path.home() / ".pyside_poeditor_plugin"
-            settings_dir.mkdir(exist_ok=True)
-            settings_file = str(settings_dir / "explorer_settings.json")
+        if settings_file is None or Path(settings_file) == DEFAULT_SETTINGS_FILE:
+            settings_file = str(DEFAULT_SETTINGS_FILE)
+            self._namespace = SETTINGS_NAMESPACE
+        else:
+            # Separate settings files keep separate settings
+            self._namespace = f"{SETTINGS_NAMESPACE}:{Path(settings_file).resolve()}"
 
         self.settings_file = settings_file
+        self._store = state_store or get_state_store()
+        self._saved: Dict[str, str] = {}  # top-level key -> last saved JSON text
         self._settings = self._load_defaults()
         self.load()
 
@@ -51,28 +61,33 @@ class ExplorerSettings:
         }
 
     def load(self):
-        """Load settings from file."""
+        """Load settings from the state store."""
         try:
-            if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r') as f:
-                    loaded_settings = json.load(f)
-                    # Merge with defaults to ensure all keys exist
-                    self._settings.update(loaded_settings)
-                    logger.info(f"Settings loaded from {self.settings_file}")
+            self._store.migrate_json(
+                self._namespace, self.settings_file,
+                lambda data: self._store.put_many(self._namespace, data.items()))
+            loaded_settings = dict(self._store.items(self._namespace))
+            if loaded_settings:
+                # Merge with defaults to ensure all keys exist
+                self._settings.update(loaded_settings)
+                diff_rows(self._saved, loaded_settings)
+                logger.info(f"Settings loaded for {self.settings_file}")
             else:
-                logger.info("No settings file found, using defaults")
+                logger.info("No saved settings found, using defaults")
         except Exception as e:
             logger.error(f"Error loading settings: {e}")
             # Keep defaults on error
 
     def save(self):
-        """Save current settings to file."""
+        """Save current settings, writing only the keys that changed."""
         try:
-            os.makedirs(os.path.dirname(self.settings_file), exist_ok=True)
-            with open(self.settings_file, 'w') as f:
-                json.dump(self._settings, f, indent=2)
-            logger.info(f"Settings saved to {self.settings_file}")
+            changed, removed = diff_rows(self._saved, self._settings)
+            with self._store.transaction():
+                self._store.delete(self._namespace, *removed)
+                self._store.put_many(self._namespace, changed)
+            logger.info(f"Saved {len(changed)} changed settings for {self.settings_file}")
         except Exception as e:
+            self._saved.clear()
             logger.error(f"Error saving settings: {e}")
 
     def get(self, key: str, default: Any = None) -> Any:
@@ -31,7 +31,8 @@ class FileFilter:
         self.include_hidden = include_hidden
         self.is_glob = '*' in self.pattern or '?' in self.pattern or '[' in self.pattern
 
-        logger.debug(f"FileFilter created: pattern='{self.pattern}', include_hidden={self.include_hidden}, is_glob={self.is_glob}")
+        logger.debug("FileFilter created: pattern='%s', include_hidden=%s, is_glob=%s",
+                     self.pattern, self.include_hidden, self.is_glob)
 
     def matches(self, filename: str, is_directory: bool = False) -> bool:
         """
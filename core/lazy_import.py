@@ -0,0 +1,44 @@
+"""
+Lazy import helpers for the POEditor application.
+
+Packages expose their public names through a PEP 562 module __getattr__
+so that importing the package does not import every submodule. The
+submodule is imported the first time one of its names is accessed and the
+value is then cached in the package namespace.
+"""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build module __getattr__ and __dir__ functions for lazily exported names.
+
+    Usage in a package __init__.py:
+        __getattr__, __dir__ = lazy_exports(__name__, {
+            'NavigationService': '.navigation_service',
+        })
+
+    Args:
+        package: Name of the package, normally __name__
+        exports: Mapping of exported name to the (relative) module defining it
+
+    Returns:
+        Tuple of (__getattr__, __dir__) to assign in the package namespace
+    """
+    namespace = sys.modules[package].__dict__
+
+    def __getattr__(name: str) -> Any:
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
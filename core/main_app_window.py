@@ -5,16 +5,20 @@ This is the main window that hosts the entire application UI using a plugin-base
 architecture similar to VS Code. It manages the sidebar, tab area, and plugin loading.
 """
 
-from typing import Optional
+import os
+import zlib
+from functools import partial
+from typing import Any, Dict, Optional
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
     QApplication, QDockWidget, QTextEdit
 )
-from PySide6.QtCore import Qt, QSettings
-from PySide6.QtGui import QAction, QKeySequence
+from PySide6.QtCore import Qt, QSettings, QTimer
+from PySide6.QtGui import QAction, QKeySequence, QTextCursor
 from lg import logger
 from services.theme_manager import ThemeManager
 from widgets.sidebar_dock_widget import SidebarDockWidget
+from widgets.large_file_viewer import LARGE_FILE_THRESHOLD, LargeFileViewer
 
 # Custom editor classes with file_path attribute
 class FileAwareTextEdit(QTextEdit):
@@ -33,6 +37,45 @@ class FileAwareTextEdit(QTextEdit):
         """Set the file path."""
         self._file_path = path
 
+    def get_virtual_state(self) -> Optional[Dict[str, Any]]:
+        """
+        Serialise the editor so its tab can be virtualised.
+
+        Returns:
+            Compressed content, cursor and scroll state, or None while the
+            document has unsaved edits (Qt's undo history cannot be serialised)
+        """
+        if self.document().isModified():
+            return None
+        cursor = self.textCursor()
+        return {
+            'file_path': self._file_path,
+            'content': zlib.compress(self.toPlainText().encode('utf-8')),
+            'cursor': (cursor.anchor(), cursor.position()),
+            'scroll': (self.horizontalScrollBar().value(), self.verticalScrollBar().value())
+        }
+
+    def restore_virtual_state(self, state: Dict[str, Any]) -> None:
+        """
+        Rebuild the editor from get_virtual_state() output.
+
+        Args:
+            state: Serialised editor state
+        """
+        self._file_path = state['file_path']
+        self.setPlainText(zlib.decompress(state['content']).decode('utf-8'))
+        anchor, position = state['cursor']
+        cursor = self.textCursor()
+        cursor.setPosition(anchor)
+        cursor.setPosition(position, QTextCursor.MoveMode.KeepAnchor)
+        self.setTextCursor(cursor)
+        # Scroll ranges are only known once the editor is laid out in its tab
+        QTimer.singleShot(0, self, partial(self._restore_scroll, *state['scroll']))
+
+    def _restore_scroll(self, horizontal: int, vertical: int) -> None:
+        self.horizontalScrollBar().setValue(horizontal)
+        self.verticalScrollBar().setValue(vertical)
+
 from core.api import PluginAPI
 from core.plugin_manager import PluginManager
 from core.sidebar_manager import SidebarManager
@@ -44,7 +87,9 @@ from models.core_activities import (
 )
 # Theme system imports
 from services.theme_manager import theme_manager
-from services.icon_manager import icon_manager
+from services.stylesheet_diff import batched_repolish
+from core.startup_profiler import startup_profiler
+from core.deferred_init_queue import DeferredInitQueue
 # Dockable activity bar imports
 from widgets.activity_bar import ActivityBar
 from widgets.activity_bar_dock_widget import ActivityBarDockWidget
@@ -86,16 +131,32 @@ class MainAppWindow(QMainWindow):
         # Settings
         self.settings = QSettings('POEditor', 'PluginEditor')
 
+        # Work not needed for the first frame runs after the window has painted
+        self.deferred_init = DeferredInitQueue(startup_profiler, self)
+
         # Initialize the application
-        self.setup_ui()
-        self.setup_theme_system()  # Initialize theme system
-        self.setup_plugin_system()
-        self.setup_sidebar_buttons()  # Add sidebar buttons
-        self.load_plugins()
-        self.restore_settings()
+        with startup_profiler.phase("setup_ui"):
+            self.setup_ui()
+        with startup_profiler.phase("theme"):
+            self.setup_theme_system()  # Initialize theme system
+        with startup_profiler.phase("plugin_system"):
+            self.setup_plugin_system()
+        with startup_profiler.phase("sidebar"):
+            self.setup_sidebar_buttons()  # Add sidebar buttons
+        with startup_profiler.phase("plugins"):
+            self.load_plugins()
+        with startup_profiler.phase("restore_settings"):
+            self.restore_settings()
+
+        startup_profiler.watch_first_paint(self, self._on_first_paint)
 
         logger.info("MainAppWindow initialized")
 
+    def _on_first_paint(self) -> None:
+        """Start deferred initialisation once the first frame is on screen."""
+        self.deferred_init.add("startup_report", startup_profiler.write_report)
+        self.deferred_init.start()
+
     def setup_ui(self) -> None:
         """Setup the main window UI."""
         try:
@@ -643,14 +704,22 @@ class MainAppWindow(QMainWindow):
             # Update the main window styling
             self.apply_styles()
 
-            # Force style refresh on QDockWidgets for better style application
-            for dock in self.findChildren(QDockWidget):
-                dock.setStyle(QApplication.style())
-                # Temporarily toggle visibility to force style refresh
-                was_visible = dock.isVisible()
-                if was_visible:
-                    dock.hide()
-                    dock.show()
+            # Force style refresh on QDockWidgets for better style application.
+            # In incremental mode only docks matched by changed selectors are
+            # re-polished, in one batch instead of a hide/show per dock.
+            stylesheet_diff = theme_manager.last_stylesheet_diff
+            if stylesheet_diff is not None:
+                docks = stylesheet_diff.affected_widgets(self.findChildren(QDockWidget))
+                repolished = batched_repolish(docks)
+                logger.debug(f"Re-polished {repolished} dock widgets affected by theme change")
+            else:
+                for dock in self.findChildren(QDockWidget):
+                    dock.setStyle(QApplication.style())
+                    # Temporarily toggle visibility to force style refresh
+                    was_visible = dock.isVisible()
+                    if was_visible:
+                        dock.hide()
+                        dock.show()
 
             # Update status bar with theme information temporarily
             self.statusBar().showMessage(f"Theme changed to: {theme_name}", 3000)
@@ -667,10 +736,31 @@ class MainAppWindow(QMainWindow):
             # Create plugin manager
             self.plugin_manager = PluginManager("plugins", self.plugin_api)
 
+            # Publish file system changes on the plugin event bus
+            from services.file_watcher_service import get_file_watcher_service
+            file_watcher = get_file_watcher_service()
+            file_watcher.set_api(self.plugin_api)
+            self.plugin_api.register_service("file_watcher", file_watcher)
+            if self.tab_manager:
+                # Open tabs follow their files when renamed or moved
+                file_watcher.changes_ready.connect(self.tab_manager.apply_file_system_changes)
+
             # Discover plugins
             discovered = self.plugin_manager.discover_plugins()
             logger.info(f"Discovered {len(discovered)} plugins: {discovered}")
 
+            # Load deferred plugins when their panel is shown or command is run.
+            # Panel activation goes through the deferred queue so showing a panel
+            # (including the initial one) never blocks on a plugin import.
+            self.plugin_api.set_activation_handler(self.plugin_manager.activate)
+            if self.sidebar_manager:
+                self.sidebar_manager.panel_changed.connect(
+                    lambda panel_id: self.deferred_init.add(
+                        f"activate:{panel_id}",
+                        lambda: self.plugin_api.activate(f"onPanel:{panel_id}")
+                    )
+                )
+
             # Setup activities after plugin API is available
             if self.sidebar_manager and not self.activity_manager:
                 self.setup_activity_manager()
@@ -823,6 +913,13 @@ class MainAppWindow(QMainWindow):
                     if sizes:
                         self.main_splitter.setSizes(sizes)
 
+            # Background tabs beyond the memory budget are virtualised
+            if self.tab_manager:
+                self.tab_manager.set_virtualization(
+                    self.settings.value('tabVirtualization', True, type=bool),
+                    self.settings.value('tabMemoryBudgetMB', 64, type=int) * 1024 * 1024
+                )
+
             # Restore sidebar visibility
             if self.sidebar_manager:
                 sidebar_visible = self.settings.value('sidebarVisible', True, type=bool)
@@ -905,14 +1002,9 @@ class MainAppWindow(QMainWindow):
         """Setup the sidebar activity buttons."""
         try:
             # Import the panel classes
-            from panels.explorer_panel import ExplorerPanel
             from panels.explorer_panel_with_column_menu import ExplorerPanelWithColumnMenu
-            from panels.search_panel import SearchPanel
-            from panels.preferences_panel import PreferencesPanel
-            from panels.extensions_panel import ExtensionsPanel
-            from panels.account_panel import AccountPanel
 
-            # Create panel instances
+            # Create the initially visible panel; the others are created after first paint
             explorer_panel = ExplorerPanelWithColumnMenu()  # Use our enhanced panel with column menu
             # Set the API for enhanced features if available
             if self.plugin_api:
@@ -923,23 +1015,17 @@ class MainAppWindow(QMainWindow):
             explorer_panel.file_opened.connect(self.on_file_opened_from_explorer)
             explorer_panel.location_changed.connect(self.on_explorer_location_changed)
 
-            search_panel = SearchPanel()
-            preferences_panel = PreferencesPanel()
-            extensions_panel = ExtensionsPanel()
-            account_panel = AccountPanel()
-
-            # Get icons from icon manager
-            icons = icon_manager.get_default_sidebar_icons()
-
             # Add panels to sidebar manager (only panel_id and widget)
             if self.sidebar_manager:
                 # Use direct method access with try/except
                 try:
                     self.sidebar_manager.add_panel("explorer", explorer_panel)
-                    self.sidebar_manager.add_panel("search", search_panel)
-                    self.sidebar_manager.add_panel("preferences", preferences_panel)
-                    self.sidebar_manager.add_panel("extensions", extensions_panel)
-                    self.sidebar_manager.add_panel("account", account_panel)
+                    for panel_id, factory in self._deferred_panel_factories().items():
+                        self.sidebar_manager.add_panel_factory(panel_id, factory)
+                        self.deferred_init.add(
+                            f"panel:{panel_id}",
+                            lambda panel_id=panel_id: self.sidebar_manager.ensure_panel(panel_id)
+                        )
                 except AttributeError as e:
                     logger.warning(f"sidebar_manager.add_panel method not available: {e}")
 
@@ -976,6 +1062,31 @@ class MainAppWindow(QMainWindow):
             logger.error(f"Failed to add sidebar buttons: {e}")
             raise
 
+    def _deferred_panel_factories(self) -> dict:
+        """Get factories for sidebar panels that are hidden at startup."""
+        def create_search_panel():
+            from panels.search_panel import SearchPanel
+            return SearchPanel()
+
+        def create_preferences_panel():
+            from panels.preferences_panel import PreferencesPanel
+            return PreferencesPanel()
+
+        def create_extensions_panel():
+            from panels.extensions_panel import ExtensionsPanel
+            return ExtensionsPanel()
+
+        def create_account_panel():
+            from panels.account_panel import AccountPanel
+            return AccountPanel()
+
+        return {
+            "search": create_search_panel,
+            "preferences": create_preferences_panel,
+            "extensions": create_extensions_panel,
+            "account": create_account_panel,
+        }
+
     # Menu action handlers
     def on_new_file(self) -> None:
         """Handle new file action."""
@@ -1084,6 +1195,12 @@ class MainAppWindow(QMainWindow):
             # Unload all plugins
             if self.plugin_manager:
                 self.plugin_manager.unload_all_plugins()
+            if self.plugin_api:
+                self.plugin_api.shutdown_events()
+
+            # Write out settings still held by the write-behind stores
+            from services.settings_store import flush_all_settings
+            flush_all_settings()
 
             event.accept()
             logger.info("Application closed")
@@ -1097,6 +1214,10 @@ class MainAppWindow(QMainWindow):
         try:
             logger.info(f"Opening file from Explorer: {file_path}")
 
+            if self.plugin_api:
+                from pathlib import Path
+                self.plugin_api.activate(f"onFileType:{Path(file_path).suffix.lower()}")
+
             # Check if file is already open in a tab
             if self.tab_manager:
                 # Use direct method access with try/except
@@ -1165,7 +1286,7 @@ class MainAppWindow(QMainWindow):
             if file_extension in ['.po', '.pot']:
                 # PO/POT files - create translation editor
                 return self.create_translation_editor(file_path)
-            elif file_extension in ['.txt', '.md', '.py', '.js', '.json', '.xml']:
+            elif file_extension in ['.txt', '.md', '.py', '.js', '.json', '.xml', '.log']:
                 # Text files - create text editor
                 return self.create_text_editor(file_path)
             else:
@@ -1205,6 +1326,10 @@ class MainAppWindow(QMainWindow):
     def create_text_editor(self, file_path: str) -> Optional[QWidget]:
         """Create a text editor for general text files."""
         try:
+            # Large files open read-only in a viewer that only loads visible lines
+            if os.path.getsize(file_path) >= LARGE_FILE_THRESHOLD:
+                return LargeFileViewer(file_path)
+
             # Use our custom FileAwareTextEdit
             editor = FileAwareTextEdit()
 
@@ -1289,8 +1414,8 @@ class MainAppWindow(QMainWindow):
             # Update application styling
             self.apply_styles()
 
-            # Propagate change to all components
-            self._propagate_theme_changes(theme_name)
+            # Components are already updated by _on_theme_changed, which is
+            # connected to the same signal; propagating again would restyle twice
 
         except Exception as e:
             logger.error(f"Failed to handle global theme change: {e}")
@@ -4,18 +4,25 @@ Plugin Manager for the POEditor application.
 Handles loading, initializing, and managing plugins in a modular way.
 """
 
+import gc
+import os
 import sys
 import json
+import time
 import importlib
 import importlib.util
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, Optional, List, TYPE_CHECKING, Union
-from types import ModuleType
+from types import CodeType, ModuleType
 from lg import logger
 
 if TYPE_CHECKING:
     from core.api import PluginAPI
 
+MANIFEST_VERSION = 1
+
 
 class PluginInfo:
     """Information about a plugin."""
@@ -27,6 +34,9 @@ class PluginInfo:
         self.loaded = False
         self.module: Optional[ModuleType] = None
         self.error: Optional[str] = None
+        self.deferred = False
+        self.import_time_ms: Optional[float] = None
+        self.register_time_ms: Optional[float] = None
 
     @property
     def version(self) -> str:
@@ -48,6 +58,16 @@ class PluginInfo:
     def dependencies(self) -> List[str]:
         return self.metadata.get('dependencies', [])
 
+    @property
+    def activation_events(self) -> List[str]:
+        return self.metadata.get('activation_events', [])
+
+    @property
+    def is_lazy(self) -> bool:
+        """True if the plugin is only imported once one of its activation events fires."""
+        events = self.activation_events
+        return bool(events) and '*' not in events
+
 
 class PluginManager:
     """
@@ -59,13 +79,22 @@ class PluginManager:
     - Controlled plugin loading and unloading
     - Error handling and plugin isolation
     - Dependency resolution
+    - Cached plugin manifest and lazy activation
+
+    Plugins may declare "activation_events" in plugin.json, e.g.
+    "onPanel:explorer", "onCommand:explorer.refresh" or "onFileType:.po".
+    Such plugins are not imported at startup but when one of their events
+    is passed to activate(). Plugins without activation events, or with
+    "*", are loaded eagerly as before.
     """
 
-    def __init__(self, plugin_dir: str, api: 'PluginAPI'):
+    def __init__(self, plugin_dir: str, api: 'PluginAPI', manifest_path: Optional[Path] = None):
         self.plugin_dir = Path(plugin_dir)
         self.api = api
         self._plugins: Dict[str, PluginInfo] = {}
         self._loaded_plugins: Dict[str, Any] = {}
+        self._activation_index: Dict[str, List[str]] = {}
+        self._manifest_path = manifest_path or Path.home() / ".poeditor_plugin" / "plugin_manifest.json"
 
         logger.info(f"PluginManager initialized with directory: {plugin_dir}")
 
@@ -73,6 +102,10 @@ class PluginManager:
         """
         Discover all available plugins in the plugin directory.
 
+        Uses the cached plugin manifest when no plugin directory, plugin.json
+        or plugin.py changed since it was written, so discovery only stats
+        files and reads one manifest.
+
         Returns:
             List of plugin names found
         """
@@ -83,22 +116,110 @@ class PluginManager:
                 logger.warning(f"Plugin directory does not exist: {self.plugin_dir}")
                 return plugins_found
 
-            # Scan for plugin directories
-            for item in self.plugin_dir.iterdir():
-                if item.is_dir() and not item.name.startswith('.'):
-                    plugin_info = self._analyze_plugin(item)
+            signature = self._directory_signature()
+            cached_plugins = self._read_manifest(signature)
+
+            if cached_plugins is not None:
+                for plugin_name, entry in cached_plugins.items():
+                    self._plugins[plugin_name] = PluginInfo(plugin_name, entry['path'], entry['metadata'])
+                    plugins_found.append(plugin_name)
+                logger.info(f"Discovered {len(plugins_found)} plugins from manifest cache")
+            else:
+                # Scan for plugin directories
+                for plugin_name in signature:
+                    plugin_info = self._analyze_plugin(self.plugin_dir / plugin_name)
                     if plugin_info:
                         self._plugins[plugin_info.name] = plugin_info
                         plugins_found.append(plugin_info.name)
                         logger.info(f"Discovered plugin: {plugin_info.name}")
 
-            logger.info(f"Discovered {len(plugins_found)} plugins")
+                self._write_manifest(signature, plugins_found)
+                logger.info(f"Discovered {len(plugins_found)} plugins")
+
+            self._index_activation_events()
             return plugins_found
 
         except Exception as e:
             logger.error(f"Failed to discover plugins: {e}")
             return []
 
+    def _directory_signature(self) -> Dict[str, List[int]]:
+        """
+        Build the manifest cache key from plugin directory and file mtimes.
+
+        Returns:
+            Mapping of plugin directory name to [dir, plugin.json, plugin.py, __init__.py] mtimes
+        """
+        signature = {}
+        with os.scandir(self.plugin_dir) as entries:
+            for entry in entries:
+                if entry.is_dir() and not entry.name.startswith('.'):
+                    mtimes = [entry.stat().st_mtime_ns]
+                    for file_name in ('plugin.json', 'plugin.py', '__init__.py'):
+                        try:
+                            mtimes.append(os.stat(os.path.join(entry.path, file_name)).st_mtime_ns)
+                        except OSError:
+                            mtimes.append(0)
+                    signature[entry.name] = mtimes
+        return dict(sorted(signature.items()))
+
+    def _read_manifest(self, signature: Dict[str, List[int]]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Read the cached plugin manifest if it matches the current directory state.
+
+        Args:
+            signature: Current directory signature
+
+        Returns:
+            Cached plugin entries or None if the cache is missing or stale
+        """
+        try:
+            with open(self._manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if (manifest.get('version') != MANIFEST_VERSION
+                or manifest.get('plugin_dir') != str(self.plugin_dir.resolve())
+                or manifest.get('signature') != signature):
+            logger.debug("Plugin manifest cache is stale")
+            return None
+        return manifest.get('plugins', {})
+
+    def _write_manifest(self, signature: Dict[str, List[int]], plugin_names: List[str]) -> None:
+        """
+        Write the plugin manifest cache.
+
+        Args:
+            signature: Directory signature the manifest is valid for
+            plugin_names: Plugins found by the scan
+        """
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'plugin_dir': str(self.plugin_dir.resolve()),
+            'signature': signature,
+            'plugins': {
+                name: {'path': self._plugins[name].path, 'metadata': self._plugins[name].metadata}
+                for name in plugin_names
+            }
+        }
+        try:
+            self._manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self._manifest_path.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f)
+            temp_path.replace(self._manifest_path)
+        except OSError as e:
+            logger.warning(f"Failed to write plugin manifest cache: {e}")
+
+    def _index_activation_events(self) -> None:
+        """Map each activation event to the lazy plugins it activates."""
+        self._activation_index = {}
+        for name, info in self._plugins.items():
+            if info.is_lazy:
+                for event in info.activation_events:
+                    self._activation_index.setdefault(event, []).append(name)
+
     def _analyze_plugin(self, plugin_path: Path) -> Optional[PluginInfo]:
         """
         Analyze a plugin directory to extract metadata and validate structure.
@@ -204,27 +325,13 @@ class PluginManager:
                 return False
 
             # Load the plugin module
+            start_time = time.perf_counter()
             plugin_module = self._import_plugin_module(plugin_info)
+            plugin_info.import_time_ms = (time.perf_counter() - start_time) * 1000
             if not plugin_module:
                 return False
 
-            # Call the register function - direct attribute access instead of hasattr
-            try:
-                plugin_module.register(self.api)
-                plugin_info.loaded = True
-                plugin_info.module = plugin_module
-                self._loaded_plugins[plugin_name] = plugin_module
-
-                logger.info(f"Successfully loaded plugin: {plugin_name}")
-                return True
-
-            except AttributeError:
-                logger.error(f"Plugin {plugin_name} missing register() function")
-                return False
-            except Exception as e:
-                logger.error(f"Failed to register plugin {plugin_name}: {e}")
-                plugin_info.error = str(e)
-                return False
+            return self._register_plugin(plugin_info, plugin_module)
 
         except Exception as e:
             logger.error(f"Failed to load plugin {plugin_name}: {e}")
@@ -232,6 +339,40 @@ class PluginManager:
                 self._plugins[plugin_name].error = str(e)
             return False
 
+    def _register_plugin(self, plugin_info: PluginInfo, plugin_module: ModuleType) -> bool:
+        """
+        Call a plugin's register() function. Must run on the UI thread.
+
+        Args:
+            plugin_info: Information about the plugin
+            plugin_module: The imported plugin module
+
+        Returns:
+            True if the plugin registered successfully
+        """
+        plugin_name = plugin_info.name
+        start_time = time.perf_counter()
+
+        # Call the register function - direct attribute access instead of hasattr
+        try:
+            plugin_module.register(self.api)
+            plugin_info.loaded = True
+            plugin_info.module = plugin_module
+            self._loaded_plugins[plugin_name] = plugin_module
+
+            logger.info(f"Successfully loaded plugin: {plugin_name}")
+            return True
+
+        except AttributeError:
+            logger.error(f"Plugin {plugin_name} missing register() function")
+            return False
+        except Exception as e:
+            logger.error(f"Failed to register plugin {plugin_name}: {e}")
+            plugin_info.error = str(e)
+            return False
+        finally:
+            plugin_info.register_time_ms = (time.perf_counter() - start_time) * 1000
+
     def _import_plugin_module(self, plugin_info: PluginInfo):
         """
         Import a plugin module safely.
@@ -250,19 +391,7 @@ class PluginManager:
             sys.path.insert(0, str(plugin_path.parent))
 
             try:
-                # Import the plugin module
-                spec = importlib.util.spec_from_file_location(
-                    f"plugins.{plugin_info.name}.plugin",
-                    plugin_file
-                )
-
-                if spec and spec.loader:
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    return module
-                else:
-                    logger.error(f"Failed to create module spec for {plugin_info.name}")
-                    return None
+                return self._exec_plugin_module(plugin_info.name, plugin_file)
 
             finally:
                 # Remove from sys.path
@@ -273,6 +402,84 @@ class PluginManager:
             logger.error(f"Failed to import plugin module {plugin_info.name}: {e}")
             return None
 
+    def _exec_plugin_module(self, plugin_name: str, plugin_file: Path,
+                            code: Optional[CodeType] = None) -> Optional[ModuleType]:
+        """
+        Create and execute a plugin module without touching sys.path.
+
+        Args:
+            plugin_name: Name of the plugin
+            plugin_file: Path to the plugin's plugin.py
+            code: Code object from _compile_plugin_module, compiled here if None
+
+        Returns:
+            Executed module or None if no spec could be created
+        """
+        spec = self._plugin_module_spec(plugin_name, plugin_file)
+
+        if spec and spec.loader:
+            module = importlib.util.module_from_spec(spec)
+            if code is None:
+                spec.loader.exec_module(module)
+            else:
+                exec(code, module.__dict__)
+            return module
+
+        logger.error(f"Failed to create module spec for {plugin_name}")
+        return None
+
+    @staticmethod
+    def _plugin_module_spec(plugin_name: str, plugin_file: Path):
+        return importlib.util.spec_from_file_location(f"plugins.{plugin_name}.plugin", plugin_file)
+
+    def _compile_plugin_module(self, plugin_info: PluginInfo) -> Optional[CodeType]:
+        """
+        Read and compile a plugin module on a worker thread.
+
+        Only the source (or its cached bytecode) is read and compiled here;
+        the module body may create Qt objects, so it runs on the UI thread.
+
+        Args:
+            plugin_info: Information about the plugin to compile
+
+        Returns:
+            Code object or None if failed
+        """
+        start_time = time.perf_counter()
+        try:
+            spec = self._plugin_module_spec(plugin_info.name, Path(plugin_info.path) / 'plugin.py')
+            if not spec or not spec.loader:
+                logger.error(f"Failed to create module spec for {plugin_info.name}")
+                return None
+            return spec.loader.get_code(spec.name)
+        except Exception as e:
+            logger.error(f"Failed to compile plugin module {plugin_info.name}: {e}")
+            plugin_info.error = str(e)
+            return None
+        finally:
+            plugin_info.import_time_ms = (time.perf_counter() - start_time) * 1000
+
+    def _exec_compiled_plugin(self, plugin_info: PluginInfo, code: CodeType) -> Optional[ModuleType]:
+        """
+        Execute a compiled plugin module on the UI thread.
+
+        Args:
+            plugin_info: Information about the plugin
+            code: Code object from _compile_plugin_module
+
+        Returns:
+            Executed module or None if failed
+        """
+        start_time = time.perf_counter()
+        try:
+            return self._exec_plugin_module(plugin_info.name, Path(plugin_info.path) / 'plugin.py', code)
+        except Exception as e:
+            logger.error(f"Failed to import plugin module {plugin_info.name}: {e}")
+            plugin_info.error = str(e)
+            return None
+        finally:
+            plugin_info.import_time_ms = (plugin_info.import_time_ms or 0) + (time.perf_counter() - start_time) * 1000
+
     def unload_plugin(self, plugin_name: str) -> bool:
         """
         Unload a specific plugin.
@@ -358,48 +565,148 @@ class PluginManager:
         """
         results = {}
 
-        # First, load plugins without dependencies
-        plugins_to_load = list(self._plugins.keys())
-        loaded_plugins = set()
-
-        # Simple dependency resolution (could be improved)
-        max_iterations = len(plugins_to_load) + 1
-        iteration = 0
-
-        while plugins_to_load and iteration < max_iterations:
-            iteration += 1
-            plugins_loaded_this_iteration = []
+        # Lazy plugins wait for their activation events unless an eager plugin needs them
+        eager_plugins = self._eagerly_required_plugins()
+        for plugin_name, plugin_info in self._plugins.items():
+            if plugin_name not in eager_plugins and not plugin_info.loaded:
+                plugin_info.deferred = True
+                results[plugin_name] = True
+                logger.info(f"Deferred plugin {plugin_name} until: {plugin_info.activation_events}")
+
+        plugins_to_load = [name for name in self._plugins
+                           if name in eager_plugins and not self._plugins[name].loaded]
+        loaded_count = sum(1 for info in self._plugins.values() if info.loaded)
+
+        # Topological order (Kahn): a plugin becomes ready once all its dependencies registered
+        pending_dependencies: Dict[str, int] = {}
+        dependents: Dict[str, List[str]] = {name: [] for name in plugins_to_load}
+        ready: deque = deque()
+        for plugin_name in plugins_to_load:
+            unmet = 0
+            for dependency in self._plugins[plugin_name].dependencies:
+                if dependency in dependents:
+                    dependents[dependency].append(plugin_name)
+                    unmet += 1
+                elif dependency not in self._plugins or not self._plugins[dependency].loaded:
+                    logger.error(f"Plugin {plugin_name} requires {dependency} which is not available")
+                    unmet = -1
+                    break
+            if unmet == 0:
+                ready.append(plugin_name)
+            elif unmet > 0:
+                pending_dependencies[plugin_name] = unmet
+            else:
+                results[plugin_name] = False
+
+        # Plugin sources are read and compiled concurrently; module bodies and
+        # register() run on this thread, in dependency order. Compiling
+        # allocates enough to trigger a garbage collection on a worker, so
+        # unreachable Qt objects are collected here first, on this thread.
+        gc.collect()
+        plugin_dir = str(self.plugin_dir.resolve())
+        sys.path.insert(0, plugin_dir)
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(8, len(plugins_to_load), os.cpu_count() or 1)),
+                                    thread_name_prefix="plugin-compile") as executor:
+                compiled: Dict[str, Future] = {
+                    name: executor.submit(self._compile_plugin_module, self._plugins[name])
+                    for name in plugins_to_load if name not in results
+                }
+
+                while ready:
+                    plugin_name = ready.popleft()
+                    plugin_info = self._plugins[plugin_name]
+                    code = compiled[plugin_name].result()
+                    plugin_module = self._exec_compiled_plugin(plugin_info, code) if code is not None else None
+                    success = plugin_module is not None and self._register_plugin(plugin_info, plugin_module)
+                    results[plugin_name] = success
+                    if not success:
+                        continue
+
+                    loaded_count += 1
+                    for dependent in dependents[plugin_name]:
+                        pending_dependencies[dependent] -= 1
+                        if pending_dependencies[dependent] == 0:
+                            ready.append(dependent)
+        finally:
+            if plugin_dir in sys.path:
+                sys.path.remove(plugin_dir)
+
+        # Mark remaining plugins as failed due to unmet or circular dependencies
+        for plugin_name in plugins_to_load:
+            if plugin_name not in results:
+                results[plugin_name] = False
+                logger.error(f"Plugin {plugin_name} not loaded due to unmet dependencies")
+
+        timed = [info for info in self._plugins.values() if info.loaded and info.import_time_ms is not None]
+        slowest = sorted(timed, key=lambda info: info.import_time_ms + (info.register_time_ms or 0), reverse=True)
+        logger.info("Plugin load times: " + ", ".join(
+            f"{info.name} {info.import_time_ms:.1f}+{info.register_time_ms or 0:.1f}ms" for info in slowest
+        ))
+        logger.info(f"Loaded {loaded_count}/{len(self._plugins)} plugins")
+        return results
 
-            for plugin_name in plugins_to_load:
-                plugin_info = self._plugins[plugin_name]
+    def _eagerly_required_plugins(self) -> set:
+        """Get non-lazy plugins plus everything they depend on."""
+        required = set()
+        pending = [name for name, info in self._plugins.items() if not info.is_lazy]
+        while pending:
+            plugin_name = pending.pop()
+            if plugin_name in required or plugin_name not in self._plugins:
+                continue
+            required.add(plugin_name)
+            pending.extend(self._plugins[plugin_name].dependencies)
+        return required
+
+    def activate(self, event: str) -> List[str]:
+        """
+        Load the deferred plugins registered for an activation event.
 
-                # Check if all dependencies are loaded
-                dependencies_met = all(
-                    dep in loaded_plugins for dep in plugin_info.dependencies
-                )
+        Args:
+            event: Activation event, e.g. "onPanel:search" or "onCommand:search.find"
 
-                if dependencies_met:
-                    success = self.load_plugin(plugin_name)
-                    results[plugin_name] = success
-                    if success:
-                        loaded_plugins.add(plugin_name)
-                        plugins_loaded_this_iteration.append(plugin_name)
+        Returns:
+            Names of plugins loaded by this event
+        """
+        activated = []
+        for plugin_name in self._activation_index.get(event, []):
+            if not self._plugins[plugin_name].loaded and self._load_with_dependencies(plugin_name, set()):
+                activated.append(plugin_name)
+        if activated:
+            logger.info(f"Activation event {event} loaded plugins: {activated}")
+        return activated
+
+    def _load_with_dependencies(self, plugin_name: str, visiting: set) -> bool:
+        """
+        Load a plugin after loading its (possibly deferred) dependencies.
 
-            # Remove loaded plugins from the list
-            for plugin_name in plugins_loaded_this_iteration:
-                plugins_to_load.remove(plugin_name)
+        Args:
+            plugin_name: Plugin to load
+            visiting: Plugins on the current dependency path, for cycle detection
 
-            # If no plugins were loaded this iteration, break to avoid infinite loop
-            if not plugins_loaded_this_iteration:
-                break
+        Returns:
+            True if the plugin is loaded
+        """
+        plugin_info = self._plugins.get(plugin_name)
+        if plugin_info is None:
+            logger.error(f"Plugin not found: {plugin_name}")
+            return False
+        if plugin_info.loaded:
+            return True
+        if plugin_name in visiting:
+            logger.error(f"Circular plugin dependency involving {plugin_name}")
+            return False
 
-        # Mark remaining plugins as failed due to unmet dependencies
-        for plugin_name in plugins_to_load:
-            results[plugin_name] = False
-            logger.error(f"Plugin {plugin_name} not loaded due to unmet dependencies")
+        visiting.add(plugin_name)
+        for dependency in plugin_info.dependencies:
+            if not self._load_with_dependencies(dependency, visiting):
+                return False
+        visiting.discard(plugin_name)
 
-        logger.info(f"Loaded {len(loaded_plugins)}/{len(self._plugins)} plugins")
-        return results
+        if self.load_plugin(plugin_name):
+            plugin_info.deferred = False
+            return True
+        return False
 
     def unload_all_plugins(self) -> Dict[str, bool]:
         """
@@ -470,6 +777,10 @@ class PluginManager:
                 'description': info.description,
                 'author': info.author,
                 'dependencies': info.dependencies,
+                'activation_events': info.activation_events,
+                'deferred': info.deferred and not info.loaded,
+                'import_time_ms': info.import_time_ms,
+                'register_time_ms': info.register_time_ms,
                 'error': info.error
             }
 
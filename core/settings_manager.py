@@ -1,18 +1,21 @@
 """
 Settings Manager for POEditor Plugin
 Handles application settings persistence and retrieval.
+Settings are rows in the shared state store; the old settings.json is migrated once.
 """
 
-import json
 from pathlib import Path
 
+from services.state_store import diff_rows, get_state_store
+
 class SettingsManager:
-    def __init__(self):
+    NAMESPACE = "app_settings"
+
+    def __init__(self, state_store=None):
         self.config_dir = Path.home() / ".poeditor_plugin"
         self.config_file = self.config_dir / "settings.json"
-
-        # Ensure config directory exists
-        self.config_dir.mkdir(exist_ok=True)
+        self._store = state_store or get_state_store()
+        self._saved = {}
 
         self.default_settings = {
             "api_token": "",
@@ -24,11 +27,14 @@ class SettingsManager:
         self.load_settings()
 
     def load_settings(self):
-        """Load settings from file"""
+        """Load settings from the state store"""
         try:
-            if self.config_file.exists():
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    self.settings = json.load(f)
+            self._store.migrate_json(
+                "settings_manager", self.config_file,
+                lambda data: self._store.put_many(self.NAMESPACE, data.items()))
+            self.settings = dict(self._store.items(self.NAMESPACE))
+            if self.settings:
+                diff_rows(self._saved, self.settings)
             else:
                 self.settings = self.default_settings.copy()
                 self.save_settings()
@@ -37,11 +43,14 @@ class SettingsManager:
             self.settings = self.default_settings.copy()
 
     def save_settings(self):
-        """Save settings to file"""
+        """Save changed settings to the state store"""
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=4)
+            changed, removed = diff_rows(self._saved, self.settings)
+            with self._store.transaction():
+                self._store.delete(self.NAMESPACE, *removed)
+                self._store.put_many(self.NAMESPACE, changed)
         except Exception as e:
+            self._saved.clear()
             print(f"Error saving settings: {e}")
 
     def get_setting(self, key, default=None):
@@ -5,7 +5,7 @@ This module manages the sidebar panel container. The activity bar is now externa
 and dockable, so this manager focuses solely on panel management and switching.
 """
 
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QStackedWidget, QSizePolicy
 )
@@ -25,6 +25,7 @@ class SidebarManager(QWidget):
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
         self._panels: Dict[str, QWidget] = {}
+        self._panel_factories: Dict[str, Callable[[], QWidget]] = {}
         self._active_panel: Optional[str] = None
         self._visible = True  # CRITICAL: Always start visible
 
@@ -86,6 +87,37 @@ class SidebarManager(QWidget):
             logger.error(f"Failed to add panel {panel_id}: {e}")
             raise
 
+    def add_panel_factory(self, panel_id: str, factory: Callable[[], QWidget]) -> None:
+        """
+        Register a panel that is created on first use.
+
+        Args:
+            panel_id: Unique identifier for the panel
+            factory: Callable that creates the panel widget
+        """
+        if panel_id in self._panels or panel_id in self._panel_factories:
+            logger.warning(f"Panel already exists: {panel_id}")
+            return
+        self._panel_factories[panel_id] = factory
+
+    def ensure_panel(self, panel_id: str) -> bool:
+        """
+        Create a factory-registered panel if it has not been created yet.
+
+        Args:
+            panel_id: Identifier of the panel
+
+        Returns:
+            True if the panel exists afterwards
+        """
+        if panel_id in self._panels:
+            return True
+        factory = self._panel_factories.pop(panel_id, None)
+        if factory is None:
+            return False
+        self.add_panel(panel_id, factory())
+        return panel_id in self._panels
+
     def remove_panel(self, panel_id: str) -> bool:
         """
         Remove a panel from the sidebar.
@@ -114,7 +146,7 @@ class SidebarManager(QWidget):
         Set the active panel in the sidebar.
         """
         try:
-            if panel_id not in self._panels:
+            if not self.ensure_panel(panel_id):
                 logger.warning(f"Panel not found: {panel_id}")
                 return
             widget = self._panels[panel_id]
@@ -0,0 +1,171 @@
+"""
+Startup profiler for the POEditor application.
+
+Records wall time per startup phase (imports, theme, plugins, settings,
+first paint, deferred work) and writes a JSON report so startup regressions
+can be tracked between runs.
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TYPE_CHECKING
+
+from PySide6.QtCore import QEvent, QObject
+from lg import logger
+
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QWidget
+
+
+class StartupProfiler:
+    """
+    Tracks startup phases relative to the process start time passed to
+    set_origin(), taken by main.py before its first import, or else to the
+    profiler's creation.
+
+    Phases are recorded in the order they finish. The first paint is
+    recorded by watching the main window for its first paint event. Once the
+    report is written, later phases are no longer recorded.
+    """
+
+    def __init__(self, origin: Optional[float] = None):
+        """
+        Initialize the profiler.
+
+        Args:
+            origin: time.perf_counter() value startup is measured from;
+                defaults to now
+        """
+        self._origin = time.perf_counter() if origin is None else origin
+        self._phases: List[Dict[str, Any]] = []
+        self._first_paint_ms: Optional[float] = None
+        self._paint_watcher: Optional['FirstPaintWatcher'] = None
+        self._report_path = Path.home() / ".poeditor_plugin" / "startup_report.json"
+        self._finished = False
+
+    def set_origin(self, origin: float) -> None:
+        """
+        Measure startup from an earlier time.
+
+        The time between origin and the profiler's creation, spent importing
+        the profiler itself (PySide6.QtCore, lg and its log rotation), is
+        recorded as the "bootstrap" phase.
+
+        Args:
+            origin: time.perf_counter() value taken at the top of main.py
+        """
+        shift_ms = (self._origin - origin) * 1000
+        self._origin = origin
+        for phase in self._phases:
+            phase['finished_at_ms'] = round(phase['finished_at_ms'] + shift_ms, 2)
+        self._phases.insert(0, {'name': 'bootstrap', 'duration_ms': round(shift_ms, 2),
+                                'finished_at_ms': round(shift_ms, 2)})
+
+    def elapsed_ms(self) -> float:
+        """Milliseconds since the startup origin."""
+        return (time.perf_counter() - self._origin) * 1000
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time a startup phase.
+
+        Args:
+            name: Phase name shown in the report
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def record(self, name: str, duration_ms: float) -> None:
+        """
+        Record a phase that was timed elsewhere.
+
+        Args:
+            name: Phase name shown in the report
+            duration_ms: Duration of the phase in milliseconds
+        """
+        if self._finished:
+            return
+        self._phases.append({
+            'name': name,
+            'duration_ms': round(duration_ms, 2),
+            'finished_at_ms': round(self.elapsed_ms(), 2)
+        })
+        logger.debug("Startup phase %s: %.1f ms", name, duration_ms)
+
+    def watch_first_paint(self, window: 'QWidget', on_first_paint=None) -> None:
+        """
+        Record time-to-first-frame when the window first paints.
+
+        Args:
+            window: Main window to watch
+            on_first_paint: Optional callback run after the first paint
+        """
+        self._paint_watcher = FirstPaintWatcher(self, window, on_first_paint)
+
+    def _mark_first_paint(self) -> None:
+        if self._first_paint_ms is None:
+            self._first_paint_ms = self.elapsed_ms()
+            logger.info(f"Time to first frame: {self._first_paint_ms:.0f} ms")
+
+    @property
+    def first_paint_ms(self) -> Optional[float]:
+        """Milliseconds from the startup origin to the first paint, if it happened."""
+        return self._first_paint_ms
+
+    def get_report(self) -> Dict[str, Any]:
+        """Get the startup report as a dictionary."""
+        return {
+            'first_paint_ms': round(self._first_paint_ms, 2) if self._first_paint_ms is not None else None,
+            'phases': list(self._phases)
+        }
+
+    def write_report(self, path: Optional[Path] = None) -> Optional[Path]:
+        """
+        Write the startup report as JSON and log a summary.
+
+        Args:
+            path: Report file, defaults to ~/.poeditor_plugin/startup_report.json
+
+        Returns:
+            Path of the written report or None if it could not be written
+        """
+        report_path = path or self._report_path
+        self._finished = True
+        summary = ", ".join(f"{phase['name']} {phase['duration_ms']:.0f}ms" for phase in self._phases)
+        logger.info(f"Startup phases: {summary}")
+        try:
+            report_path.parent.mkdir(parents=True, exist_ok=True)
+            report_path.write_text(json.dumps(self.get_report(), indent=2), encoding='utf-8')
+            return report_path
+        except OSError as e:
+            logger.warning(f"Failed to write startup report: {e}")
+            return None
+
+
+class FirstPaintWatcher(QObject):
+    """Event filter that reports the first paint of a window and removes itself."""
+
+    def __init__(self, profiler: StartupProfiler, window: 'QWidget', on_first_paint=None):
+        super().__init__(window)
+        self._profiler = profiler
+        self._window = window
+        self._on_first_paint = on_first_paint
+        window.installEventFilter(self)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.Type.Paint:
+            self._window.removeEventFilter(self)
+            self._profiler._mark_first_paint()
+            if self._on_first_paint is not None:
+                self._on_first_paint()
+        return False
+
+
+# Global startup profiler, created as early as possible in main.py
+startup_profiler = StartupProfiler()
@@ -5,7 +5,9 @@ This module manages document tabs in the main editor area.
 It handles tab creation, switching, closing, and state management.
 """
 
-from typing import Optional
+import os
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
 from PySide6.QtWidgets import QTabWidget, QWidget, QTabBar
 from PySide6.QtGui import QIcon
 from PySide6.QtCore import Signal
@@ -13,6 +15,7 @@ from lg import logger
 
 # Import theme system
 from services.theme_manager import theme_manager
+from services.stylesheet_diff import set_scoped_stylesheet
 from themes.typography import get_typography_manager, get_font, FontRole
 
 
@@ -45,6 +48,30 @@ class CustomTabBar(QTabBar):
             logger.error(f"Failed to apply typography to CustomTabBar: {e}")
 
 
+def _path_key(file_path: str) -> str:
+    """Normalise a file path for the path index."""
+    return os.path.normcase(os.path.abspath(file_path))
+
+
+class VirtualTabPlaceholder(QWidget):
+    """
+    Lightweight stand-in for a virtualised tab.
+
+    Holds the serialised state of the destroyed editor and the class needed
+    to rebuild it when the tab is activated again.
+    """
+
+    def __init__(self, widget_class: type, state: Dict[str, Any], parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.widget_class = widget_class
+        self.state = state
+
+    @property
+    def file_path(self) -> Optional[str]:
+        """File path of the virtualised editor."""
+        return self.state.get('file_path')
+
+
 class TabManager(QTabWidget):
     """
     Manages document tabs in the main editor area.
@@ -54,8 +81,19 @@ class TabManager(QTabWidget):
     - Modified state tracking (shows * in title)
     - Tab close handling with confirmation
     - Context menu support
+    - Path index for finding the tab of an open file
+    - Optional virtualisation of background tabs beyond a memory budget
+
+    Virtualisation works with widgets that implement get_virtual_state() and
+    restore_virtual_state(state). Background tabs are serialised into a
+    VirtualTabPlaceholder, least recently used first, until the resident
+    editors fit the memory budget, and are rebuilt when activated. A widget
+    can return None from get_virtual_state() to stay resident, e.g. while it
+    has unsaved edits whose undo history would be lost.
     """
 
+    DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024  # bytes of resident editor content
+
     # Signals
     tab_changed = Signal(int)  # tab index
     tab_close_requested = Signal(int)  # tab index
@@ -64,6 +102,11 @@ class TabManager(QTabWidget):
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
         self._modified_tabs = set()  # Track which tabs are modified
+        self._path_index: Dict[str, QWidget] = {}  # normalised path -> tab widget
+        self._widget_paths: Dict[QWidget, str] = {}  # tab widget -> normalised path
+        self._recent_widgets: OrderedDict = OrderedDict()  # widget -> None, least recently active first
+        self._virtualization_enabled = False
+        self._memory_budget = self.DEFAULT_MEMORY_BUDGET
 
         # Initialize typography and theme managers
         self.typography_manager = get_typography_manager()
@@ -126,8 +169,11 @@ class TabManager(QTabWidget):
             else:
                 index = super().addTab(widget, title)
 
+            self._index_widget_path(widget)
+
             # Set the new tab as current
             self.setCurrentIndex(index)
+            self._enforce_memory_budget()
 
             logger.info(f"Added tab: {title} at index {index}")
             return index
@@ -170,6 +216,7 @@ class TabManager(QTabWidget):
 
             # Remove from modified tabs set
             self._modified_tabs.discard(index)
+            self._unindex_widget(widget)
 
             # Remove the tab
             self.removeTab(index)
@@ -251,20 +298,208 @@ class TabManager(QTabWidget):
             Index of the tab, or -1 if not found
         """
         try:
-            for i in range(self.count()):
-                widget = self.widget(i)
-                # Check if widget has a file_path attribute
-                try:
-                    if widget.file_path == file_path:  # type: ignore
-                        return i
-                except (AttributeError, TypeError):
-                    # Widget doesn't have file_path attribute, skip
-                    continue
-            return -1
+            key = _path_key(file_path)
+            widget = self._path_index.get(key)
+            if widget is None:
+                return -1
+            index = self.indexOf(widget)
+            if index < 0:
+                # Tab was removed without going through close_tab
+                self._unindex_widget(widget)
+            return index
         except Exception as e:
             logger.error(f"Failed to find tab by path {file_path}: {e}")
             return -1
 
+    def update_tab_path(self, widget: QWidget, new_path: str) -> None:
+        """
+        Re-index a tab whose file was renamed or saved under a new path.
+
+        Args:
+            widget: The tab widget
+            new_path: The file's new path
+        """
+        self._unindex_widget(widget)
+        try:
+            widget.file_path = new_path  # type: ignore
+        except (AttributeError, TypeError):
+            # Widget does not expose a settable file_path, index it anyway
+            pass
+        key = _path_key(new_path)
+        self._path_index[key] = widget
+        self._widget_paths[widget] = key
+
+    def rename_path(self, old_path: str, new_path: str) -> None:
+        """
+        Follow a file rename for the tab showing it, if any.
+
+        Args:
+            old_path: The file's previous path
+            new_path: The file's new path
+        """
+        widget = self._path_index.get(_path_key(old_path))
+        if widget is not None:
+            self.update_tab_path(widget, new_path)
+            index = self.indexOf(widget)
+            if index >= 0:
+                title = os.path.basename(new_path)
+                self.setTabText(index, title + ' *' if index in self._modified_tabs else title)
+
+    def rename_directory(self, old_directory: str, new_directory: str) -> None:
+        """
+        Follow a directory rename for the tabs showing files below it.
+
+        Args:
+            old_directory: The directory's previous path
+            new_directory: The directory's new path
+        """
+        prefix = os.path.join(_path_key(old_directory), '')
+        old_directory = os.path.abspath(old_directory)
+        for key, widget in list(self._path_index.items()):
+            if key.startswith(prefix):
+                # Keep the case of the file's own path where normcase folds it
+                file_path = os.path.abspath(getattr(widget, 'file_path', None) or key)
+                self.update_tab_path(widget, new_directory + file_path[len(old_directory):])
+
+    def apply_file_system_changes(self, changes: List[Any]) -> None:
+        """
+        Follow renames reported by the file watcher.
+
+        Args:
+            changes: DirectoryChanges batches of one FileWatcherService flush
+        """
+        for change in changes:
+            for old_path, new_path in change.moved:
+                # A move between directories is in both batches; the second
+                # finds nothing left under the old path
+                if old_path in change.directories:
+                    self.rename_directory(old_path, new_path)
+                else:
+                    self.rename_path(old_path, new_path)
+
+    def _index_widget_path(self, widget: QWidget) -> None:
+        try:
+            file_path = widget.file_path  # type: ignore
+        except (AttributeError, TypeError):
+            return
+        if file_path:
+            key = _path_key(file_path)
+            self._path_index[key] = widget
+            self._widget_paths[widget] = key
+
+    def _unindex_widget(self, widget: QWidget) -> None:
+        self._recent_widgets.pop(widget, None)
+        key = self._widget_paths.pop(widget, None)
+        if key is not None and self._path_index.get(key) is widget:
+            del self._path_index[key]
+
+    # Tab virtualisation
+    def set_virtualization(self, enabled: bool, memory_budget: Optional[int] = None) -> None:
+        """
+        Enable or disable virtualisation of background tabs.
+
+        Args:
+            enabled: Serialise background tabs that exceed the memory budget
+            memory_budget: Resident editor content budget in bytes
+        """
+        self._virtualization_enabled = enabled
+        if memory_budget is not None:
+            self._memory_budget = memory_budget
+        logger.info(f"Tab virtualisation {'enabled' if enabled else 'disabled'} "
+                    f"(budget {self._memory_budget // (1024 * 1024)} MB)")
+        self._enforce_memory_budget()
+
+    def is_tab_virtual(self, index: int) -> bool:
+        """Check whether the tab at index is currently virtualised."""
+        return isinstance(self.widget(index), VirtualTabPlaceholder)
+
+    def get_resident_memory(self) -> int:
+        """Estimated bytes of editor content held by non-virtualised tabs."""
+        return sum(self._estimate_widget_memory(self.widget(i)) for i in range(self.count()))
+
+    @staticmethod
+    def _estimate_widget_memory(widget: Optional[QWidget]) -> int:
+        if widget is None or isinstance(widget, VirtualTabPlaceholder):
+            return 0
+        try:
+            # QTextDocument stores UTF-16 text plus layout; 4 bytes per character
+            return widget.document().characterCount() * 4  # type: ignore
+        except (AttributeError, TypeError):
+            return 0
+
+    def _enforce_memory_budget(self) -> None:
+        if not self._virtualization_enabled:
+            return
+        current = self.currentWidget()
+        resident = self.get_resident_memory()
+        for widget in list(self._recent_widgets):
+            if resident <= self._memory_budget:
+                break
+            if widget is current:
+                continue
+            index = self.indexOf(widget)
+            if index < 0 or index in self._modified_tabs:
+                continue
+            size = self._estimate_widget_memory(widget)
+            if self._virtualize_tab(index):
+                resident -= size
+
+        # Tabs never activated since they were added are virtualised last
+        for index in range(self.count()):
+            if resident <= self._memory_budget:
+                break
+            widget = self.widget(index)
+            if widget is current or widget in self._recent_widgets or index in self._modified_tabs:
+                continue
+            size = self._estimate_widget_memory(widget)
+            if size and self._virtualize_tab(index):
+                resident -= size
+
+    def _virtualize_tab(self, index: int) -> bool:
+        widget = self.widget(index)
+        try:
+            state = widget.get_virtual_state()  # type: ignore
+        except (AttributeError, TypeError):
+            return False
+        if state is None:
+            return False
+
+        placeholder = VirtualTabPlaceholder(type(widget), state)
+        self._replace_tab_widget(index, widget, placeholder)
+        widget.deleteLater()
+        logger.debug("Virtualised tab %s", self.tabText(index))
+        return True
+
+    def _materialize_tab(self, index: int) -> QWidget:
+        placeholder = self.widget(index)
+        widget = placeholder.widget_class()
+        widget.restore_virtual_state(placeholder.state)
+        self._replace_tab_widget(index, placeholder, widget)
+        placeholder.deleteLater()
+        logger.debug("Restored virtualised tab %s", self.tabText(index))
+        return widget
+
+    def _replace_tab_widget(self, index: int, old_widget: QWidget, new_widget: QWidget) -> None:
+        """Swap the widget of a tab in place, keeping its title, icon and tooltip."""
+        title = self.tabText(index)
+        icon = self.tabIcon(index)
+        tooltip = self.tabToolTip(index)
+        was_current = self.currentIndex() == index
+
+        # The swap must not look like a tab switch to listeners
+        self.blockSignals(True)
+        try:
+            self.removeTab(index)
+            self.insertTab(index, new_widget, icon, title)
+            self.setTabToolTip(index, tooltip)
+            if was_current:
+                self.setCurrentIndex(index)
+        finally:
+            self.blockSignals(False)
+
+        self._unindex_widget(old_widget)
+        self._index_widget_path(new_widget)
+
     def set_tab_modified(self, index: int, modified: bool) -> None:
         """
         Set the modified state of a tab.
@@ -356,7 +591,11 @@ class TabManager(QTabWidget):
         try:
             if index >= 0:
                 widget = self.widget(index)
+                if isinstance(widget, VirtualTabPlaceholder):
+                    widget = self._materialize_tab(index)
                 if widget:
+                    self._recent_widgets.pop(widget, None)
+                    self._recent_widgets[widget] = None
                     # Direct attribute access with try/except
                     try:
                         widget.on_activated()  # type: ignore
@@ -366,6 +605,7 @@ class TabManager(QTabWidget):
 
                 self.tab_changed.emit(index)
                 logger.info(f"Tab changed to index: {index}")
+                self._enforce_memory_budget()
 
         except Exception as e:
             logger.error(f"Error handling tab change: {e}")
@@ -556,12 +796,12 @@ class TabManager(QTabWidget):
 
             # Apply the complete stylesheet
             complete_stylesheet = "\n".join(stylesheet_parts)
-            self.setStyleSheet(complete_stylesheet)
+            set_scoped_stylesheet(self, complete_stylesheet)
 
             # Also apply to custom tab bar
             tab_bar = self.tabBar()
             if tab_bar:
-                tab_bar.setStyleSheet(complete_stylesheet)
+                set_scoped_stylesheet(tab_bar, complete_stylesheet)
 
             logger.info("Theme styling applied successfully to TabManager")
 
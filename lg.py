@@ -1,12 +1,170 @@
 import os
+import sys
+import atexit
+import gzip
+import queue
+import shutil
 import logging
+import threading
 import logging.config
 import configparser
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Dict, List, Optional
 
 # Calculate project root - lg.py is at project root level
 project_root = Path(__file__).parent
 default_log_config = os.path.join(project_root, 'logging_config.ini')
+
+# Background writer started by setup_logging_from_config when async logging is on
+_listener: Optional[QueueListener] = None
+
+
+class CompressedRotatingFileHandler(RotatingFileHandler):
+    """
+    Rotating file handler that gzips rotated files.
+
+    With rollover_on_start a non-empty log from the previous run is rotated
+    away when the handler opens, so every run starts with a fresh file like
+    the old mode='w' handler while keeping earlier runs as .gz backups.
+
+    Rotation only renames the file; it is gzipped on a background thread,
+    so opening the handler during startup does not compress a full log on
+    the main thread.
+    """
+
+    COMPRESS_LEVEL = 6
+
+    def __init__(self, filename: str, mode: str = 'a', maxBytes: int = 0, backupCount: int = 0,
+                 encoding: Optional[str] = None, delay: bool = False, rollover_on_start: bool = True):
+        super().__init__(filename, mode, maxBytes, backupCount, encoding, delay)
+        self.namer = self._compressed_name
+        self.rotator = self._rotate
+        self._compressor: Optional[threading.Thread] = None
+        if (rollover_on_start and backupCount > 0 and os.path.exists(self.baseFilename)
+                and os.path.getsize(self.baseFilename) > 0):
+            self.doRollover()
+
+    @staticmethod
+    def _compressed_name(name: str) -> str:
+        return name + '.gz'
+
+    def doRollover(self) -> None:
+        # Backups are renamed during rollover, so the last one must be complete
+        self._wait_for_compression()
+        super().doRollover()
+
+    def close(self) -> None:
+        self._wait_for_compression()
+        super().close()
+
+    def _wait_for_compression(self) -> None:
+        if self._compressor is not None:
+            self._compressor.join()
+            self._compressor = None
+
+    def _rotate(self, source: str, dest: str) -> None:
+        pending = dest + '.pending'
+        os.replace(source, pending)
+        self._compressor = threading.Thread(target=self._compress, args=(pending, dest),
+                                            name="log-compress", daemon=True)
+        self._compressor.start()
+
+    @classmethod
+    def _compress(cls, source: str, dest: str) -> None:
+        try:
+            with open(source, 'rb') as source_file, \
+                    gzip.open(dest, 'wb', compresslevel=cls.COMPRESS_LEVEL) as dest_file:
+                shutil.copyfileobj(source_file, dest_file)
+            os.remove(source)
+        except OSError as e:
+            # logging itself may be what failed; report like logging.Handler.handleError
+            print(f"Failed to compress rotated log {source}: {e}", file=sys.stderr)
+
+
+class ModuleLevelFilter(logging.Filter):
+    """
+    Per-module level overrides.
+
+    The application logs through one shared logger, so overrides are keyed by
+    the calling module name (record.module, e.g. 'css_manager').
+    """
+
+    def __init__(self, module_levels: Dict[str, int]):
+        super().__init__()
+        self.module_levels = module_levels
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= self.module_levels.get(record.module, logging.NOTSET)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves formatting to the listener thread.
+
+    The stock QueueHandler formats every record in the calling thread so it
+    can be pickled; records here never leave the process, so the message,
+    arguments and traceback are formatted by the background writer instead.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _read_module_levels(config: configparser.ConfigParser) -> Dict[str, int]:
+    if not config.has_section('module_levels'):
+        return {}
+    module_levels = {}
+    for module, level_name in config.items('module_levels'):
+        # getLevelName returns "Level X" rather than raising for unknown names
+        level = logging.getLevelName(level_name.strip().upper())
+        if isinstance(level, int):
+            module_levels[module] = level
+        else:
+            logging.getLogger(__name__).warning(
+                f"Ignoring unknown log level {level_name!r} for module {module!r} in [module_levels]")
+    return module_levels
+
+
+def _start_async_logging(module_levels: Dict[str, int]) -> None:
+    """Move configured handlers behind a queue drained by a background thread."""
+    global _listener
+
+    configured_loggers: List[logging.Logger] = [logging.getLogger()]
+    configured_loggers.extend(
+        item for item in logging.Logger.manager.loggerDict.values()
+        if isinstance(item, logging.Logger) and item.handlers
+    )
+
+    handlers: List[logging.Handler] = []
+    for configured_logger in configured_loggers:
+        for handler in configured_logger.handlers:
+            if handler not in handlers:
+                handlers.append(handler)
+    if not handlers:
+        return
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    if module_levels:
+        queue_handler.addFilter(ModuleLevelFilter(module_levels))
+    for configured_logger in configured_loggers:
+        if configured_logger.handlers:
+            configured_logger.handlers = [queue_handler]
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the background writer."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def setup_logging_from_config(path: str = default_log_config) -> logging.Logger:
     # Always construct full path relative to project root
     if not os.path.isabs(path):
@@ -26,7 +184,15 @@ def setup_logging_from_config(path: str = default_log_config) -> logging.Logger:
     enabled: bool = config.getboolean('log_control', 'enabled', fallback=True)
     if enabled:
         logging.getLogger("urllib3.connectionpool").setLevel(logging.WARNING)
+        stop_logging()
         logging.config.fileConfig(str(config_path))
+        if config.getboolean('log_control', 'async', fallback=True):
+            _start_async_logging(_read_module_levels(config))
+        else:
+            module_levels = _read_module_levels(config)
+            if module_levels:
+                for handler in logging.getLogger().handlers:
+                    handler.addFilter(ModuleLevelFilter(module_levels))
     else:
         logging.disable(logging.CRITICAL)
 
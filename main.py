@@ -6,26 +6,35 @@ This script initializes the PySide6 application and creates the main window
 with the plugin-based architecture.
 """
 
+import time
+_process_start = time.perf_counter()  # before any other import, for time-to-first-frame
+
 import sys
-from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import Qt
-from lg import logger
+from core.startup_profiler import startup_profiler
+startup_profiler.set_origin(_process_start)
+
+with startup_profiler.phase("imports"):
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import Qt
+    from lg import logger
 
-from core.main_app_window import MainAppWindow
+    from core.main_app_window import MainAppWindow
 
 
 def main():
     """Main application entry point."""
     try:
         # Create QApplication
-        app = QApplication(sys.argv)
-        app.setApplicationName("POEditor")
-        app.setApplicationVersion("2.0.0")
-        app.setOrganizationName("POEditor")
-        app.setOrganizationDomain("poeditor.com")
+        with startup_profiler.phase("qapplication"):
+            app = QApplication(sys.argv)
+            app.setApplicationName("POEditor")
+            app.setApplicationVersion("2.0.0")
+            app.setOrganizationName("POEditor")
+            app.setOrganizationDomain("poeditor.com")
 
         # Import resources after QApplication is created
-        import resources_rc
+        with startup_profiler.phase("resources"):
+            import resources_rc
 
         # Enable high DPI scaling
         app.setAttribute(Qt.ApplicationAttribute.AA_EnableHighDpiScaling, True)
@@ -34,8 +43,10 @@ def main():
         logger.info("Starting POEditor application")
 
         # Create main window
-        window = MainAppWindow()
-        window.show()
+        with startup_profiler.phase("main_window"):
+            window = MainAppWindow()
+        with startup_profiler.phase("show"):
+            window.show()
 
         logger.info("Application started successfully")
 
@@ -210,6 +210,14 @@ class ExplorerPanel(QWidget):
         except Exception as e:
             logger.error(f"Failed to navigate to {path}: {e}")
 
+    def on_file_system_changed(self, changes: list) -> None:
+        """Reload the directory if the file watcher reports changes in it."""
+        for change in changes:
+            if change.directory == self.current_path or (
+                    change.overflow and self.current_path.startswith(os.path.join(change.directory, ""))):
+                self.load_directory()
+                return
+
     # Public API methods for commands
     def refresh(self) -> None:
         """Refresh the current directory."""
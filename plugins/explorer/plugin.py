@@ -44,6 +44,10 @@ def register(api: 'PluginAPI') -> None:
         api.register_command('explorer.show_hidden', panel.toggle_hidden_files)
         api.register_command('explorer.set_filter', panel.set_filter_pattern)
 
+        # Reload when the shown directory changes on disk
+        from services.file_watcher_service import FILE_SYSTEM_CHANGED_EVENT
+        api.subscribe_event(FILE_SYSTEM_CHANGED_EVENT, panel.on_file_system_changed)
+
         logger.info(f"{__plugin_name__} plugin registered successfully")
 
     except Exception as e:
@@ -24,39 +24,43 @@ Usage:
     dialog.show()
 """
 
-from .common.workspace_types import (
-    FindReplaceScope, ReplacementCaseMatch, PagingMode, EmptyMode,
-    FindReplaceRequest, FindReplaceResult, MatchInstance, MatchPair
-)
-
-from .common.data_models import (
-    PreferenceSearchRequest, PreferenceSearchResult, PageInfo,
-    ReplacementRecord, DatabasePORecord, TranslationRecord,
-    PluginPreferenceTab, NavRecord
-)
-
-from .common.database import DatabaseManager, DatabaseMigration
-
-from .common.base_components import (
-    PreferenceSection, PreferencePage, FormLayoutHelper,
-    PagedTableWidget, SearchableListWidget, EditableTableWidget,
-    ValidationHelpers, PagingControlsWidget, SettingsGroupWidget
-)
-
-from .common.search_integration import (
-    PreferenceFlagLineEdit, PreferenceSearchBar, SearchResultHighlighter,
-    SearchNavigationWidget, PreferenceSearchService
-)
-
-from .common.import_export import (
-    BaseFormatHandler, JsonHandler, CsvHandler, PlistHandler, YamlHandler,
-    ImportExportService, ImportExportWidget
-)
-
-from .main_dialog import (
-    PreferencesDialog, PreferencePageRegistry, 
-    preference_page_registry, create_preferences_dialog
-)
+from core.lazy_import import lazy_exports
+
+_EXPORT_MODULES = {
+    '.common.workspace_types': (
+        'FindReplaceScope', 'ReplacementCaseMatch', 'PagingMode', 'EmptyMode',
+        'FindReplaceRequest', 'FindReplaceResult', 'MatchInstance', 'MatchPair'
+    ),
+    '.common.data_models': (
+        'PreferenceSearchRequest', 'PreferenceSearchResult', 'PageInfo',
+        'ReplacementRecord', 'DatabasePORecord', 'TranslationRecord',
+        'PluginPreferenceTab', 'NavRecord'
+    ),
+    '.common.database': ('DatabaseManager', 'DatabaseMigration'),
+    '.common.base_components': (
+        'PreferenceSection', 'PreferencePage', 'FormLayoutHelper',
+        'PagedTableWidget', 'SearchableListWidget', 'EditableTableWidget',
+        'ValidationHelpers', 'PagingControlsWidget', 'SettingsGroupWidget'
+    ),
+    '.common.search_integration': (
+        'PreferenceFlagLineEdit', 'PreferenceSearchBar', 'SearchResultHighlighter',
+        'SearchNavigationWidget', 'PreferenceSearchService'
+    ),
+    '.common.import_export': (
+        'BaseFormatHandler', 'JsonHandler', 'CsvHandler', 'PlistHandler', 'YamlHandler',
+        'ImportExportService', 'ImportExportWidget'
+    ),
+    '.main_dialog': (
+        'PreferencesDialog', 'PreferencePageRegistry',
+        'preference_page_registry', 'create_preferences_dialog'
+    ),
+}
+
+# The dialog and its widgets are only needed once preferences are opened, so
+# submodules are imported on first attribute access.
+__getattr__, __dir__ = lazy_exports(__name__, {
+    name: module for module, names in _EXPORT_MODULES.items() for name in names
+})
 
 from lg import logger
 
@@ -120,6 +124,10 @@ def get_phase1_status():
 
 def validate_phase1_installation():
     """Validate Phase 1 installation and dependencies."""
+    from .common.database import DatabaseManager
+    from .common.import_export import ImportExportService
+    from .main_dialog import create_preferences_dialog
+
     issues = []
     
     try:
@@ -9,9 +9,31 @@ This module will provide translation history management including:
 - Import/export of translation history data
 - Integration with external translation services
 
+Available now:
+- Translation memory suggestions (fuzzy msgid lookup with n-gram index)
+
 Future implementation in Phase 3.
 """
 
-# Placeholder for Phase 3 implementation
-__version__ = "0.0.0"
-__status__ = "Not implemented - Phase 3"
+from core.lazy_import import lazy_exports
+
+_EXPORT_MODULES = {
+    '.translation_memory_service': (
+        'TranslationMemoryService', 'TranslationMemoryMatch',
+        'bounded_levenshtein', 'extract_ngrams', 'normalize_text'
+    ),
+}
+
+# The trigram index is only needed once suggestions are requested
+__getattr__, __dir__ = lazy_exports(__name__, {
+    name: module for module, names in _EXPORT_MODULES.items() for name in names
+})
+
+# Phase 3 in progress: only the translation memory service is implemented
+__version__ = "0.1.0"
+__status__ = "Partial - translation memory service available"
+
+__all__ = [
+    'TranslationMemoryService', 'TranslationMemoryMatch',
+    'bounded_levenshtein', 'extract_ngrams', 'normalize_text'
+]
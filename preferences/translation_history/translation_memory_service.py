@@ -0,0 +1,515 @@
+"""
+Translation memory suggestion service.
+
+This module provides fuzzy "similar msgid" lookup over the translation
+history stored in ``preferences.db``. A character n-gram inverted index is
+kept in memory and persisted to a sidecar SQLite file next to the
+preferences database, so it does not have to be rebuilt on every start.
+
+Lookups run in two stages:
+
+1. Candidate generation - the query n-grams are sorted rarest first and a
+   prefix filter selects entries that can still reach the requested minimum
+   score. At most POSTINGS_BUDGET ids are read from those lists, so grams of
+   common words are skipped once the budget is spent. Shared n-gram counts
+   are then completed, by binary search in the long posting lists, for the
+   CANDIDATE_POOL entries sharing the most rare n-grams only.
+2. Verification - the best candidates by Dice coefficient are re-scored with
+   a bounded Levenshtein distance, which gives the final confidence.
+"""
+
+import heapq
+import sqlite3
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass
+from math import ceil
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from lg import logger
+from ..common.database import DatabaseManager
+
+
+@dataclass
+class TranslationMemoryMatch:
+    """A single translation memory suggestion."""
+    entry_id: int
+    msgid: str
+    msgctxt: str
+    msgstr: str
+    confidence: float
+
+
+def normalize_text(text: str) -> str:
+    """Normalise text for n-gram indexing (case and whitespace folding)."""
+    return " ".join(text.lower().split())
+
+
+def extract_ngrams(text: str, size: int = 3) -> List[str]:
+    """Return the distinct character n-grams of already normalised text."""
+    padded = f" {text} "
+    if len(padded) <= size:
+        return [padded]
+    return list(dict.fromkeys(padded[i:i + size] for i in range(len(padded) - size + 1)))
+
+
+def bounded_levenshtein(source: str, target: str, max_distance: int) -> int:
+    """
+    Compute the Levenshtein distance between two strings, giving up early.
+
+    Only the diagonal band of width ``2 * max_distance + 1`` is evaluated.
+    When the distance is certain to exceed ``max_distance`` the function
+    returns ``max_distance + 1`` instead of the exact value.
+    """
+    if source == target:
+        return 0
+    len_source, len_target = len(source), len(target)
+    if abs(len_source - len_target) > max_distance:
+        return max_distance + 1
+    if len_source > len_target:
+        source, target = target, source
+        len_source, len_target = len_target, len_source
+    if len_source == 0:
+        return len_target
+
+    over_limit = max_distance + 1
+    previous = list(range(len_target + 1))
+    for i in range(1, len_source + 1):
+        start = max(1, i - max_distance)
+        end = min(len_target, i + max_distance)
+        current = [over_limit] * (len_target + 1)
+        if start == 1:
+            current[0] = i
+        source_char = source[i - 1]
+        row_min = current[0] if start == 1 else over_limit
+        for j in range(start, end + 1):
+            cost = 0 if source_char == target[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return over_limit
+        previous = current
+    return min(previous[len_target], over_limit)
+
+
+class TranslationMemoryService:
+    """Fuzzy msgid lookup over translation history using an n-gram index."""
+
+    NGRAM_SIZE = 3
+    INDEX_VERSION = 1
+    CANDIDATE_LIMIT = 64
+    CANDIDATE_POOL = 256  # entries whose shared n-gram counts are completed
+    POSTINGS_BUDGET = 32000  # posting ids read per lookup for candidate generation
+    TM_SOURCE = "tm"
+
+    def __init__(self, db_manager: DatabaseManager, index_path: Optional[str] = None):
+        """Initialize the service for the given preferences database."""
+        self.db_manager = db_manager
+        self.index_path = index_path or self._get_default_index_path()
+        self._postings: Dict[str, array] = {}
+        self._gram_counts: Dict[int, int] = {}
+        # Replaced or removed entries, whose ids may still be listed under
+        # n-grams of their old text: id -> current normalised text, or None
+        self._replaced: Dict[int, Optional[str]] = {}
+        self._max_entry_id = 0
+        self._last_modified = ""
+        logger.info(f"TranslationMemoryService initialized with index: {self.index_path}")
+
+    def _get_default_index_path(self) -> Optional[str]:
+        """Place the index next to the preferences database file."""
+        if self.db_manager.db_path == ":memory:":
+            return None
+        return str(Path(self.db_manager.db_path).with_suffix(".tmindex"))
+
+    @property
+    def entry_count(self) -> int:
+        """Number of entries currently indexed."""
+        return len(self._gram_counts)
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+
+    def add_entry(self, entry_id: int, msgid: str):
+        """
+        Add or replace a single entry in the index.
+
+        A replaced entry stays listed under the n-grams of its old text
+        until purge_replaced(); lookups recount its shared n-grams from the
+        new text meanwhile. Re-adding an entry with unchanged text, as
+        sync_index() does for rows of the last second seen, is a no-op.
+        """
+        text = normalize_text(msgid)
+        grams = extract_ngrams(text, self.NGRAM_SIZE)
+        if (entry_id not in self._replaced and self._gram_counts.get(entry_id) == len(grams)
+                and all(self._lists_entry(gram, entry_id) for gram in grams)):
+            return
+        replacing = entry_id in self._gram_counts or entry_id in self._replaced
+        if replacing:
+            self._replaced[entry_id] = text
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings is None:
+                self._postings[gram] = array("I", (entry_id,))
+            elif entry_id > postings[-1]:
+                postings.append(entry_id)
+            else:
+                position = bisect_left(postings, entry_id)
+                if not (replacing and postings[position] == entry_id):
+                    postings.insert(position, entry_id)
+        self._gram_counts[entry_id] = len(grams)
+        if entry_id > self._max_entry_id:
+            self._max_entry_id = entry_id
+
+    def _lists_entry(self, gram: str, entry_id: int) -> bool:
+        postings = self._postings.get(gram)
+        if not postings:
+            return False
+        position = bisect_left(postings, entry_id)
+        return position < len(postings) and postings[position] == entry_id
+
+    def remove_entry(self, entry_id: int):
+        """
+        Remove an entry from the index.
+
+        Its posting list ids are skipped during lookup and dropped by
+        purge_replaced().
+        """
+        if self._gram_counts.pop(entry_id, None) is not None:
+            self._replaced[entry_id] = None
+
+    def purge_replaced(self):
+        """Drop the ids of replaced and removed entries from stale posting lists."""
+        if not self._replaced:
+            return
+        current = {
+            entry_id: frozenset(extract_ngrams(text, self.NGRAM_SIZE)) if text is not None else frozenset()
+            for entry_id, text in self._replaced.items()
+        }
+        for gram, postings in list(self._postings.items()):
+            if current.keys().isdisjoint(postings):
+                continue
+            kept = array("I", (entry_id for entry_id in postings
+                               if entry_id not in current or gram in current[entry_id]))
+            if kept:
+                self._postings[gram] = kept
+            else:
+                del self._postings[gram]
+        logger.debug(f"Purged {len(current)} replaced entries from the translation memory index")
+        self._replaced = {}
+
+    def build_index(self) -> int:
+        """Rebuild the whole index from ``translation_entries``."""
+        self._postings = {}
+        self._gram_counts = {}
+        self._replaced = {}
+        self._max_entry_id = 0
+        self._last_modified = ""
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.execute("SELECT id, msgid, modified_date FROM translation_entries ORDER BY id")
+            for row in cursor:
+                self.add_entry(row["id"], row["msgid"])
+                self._last_modified = max(self._last_modified, row["modified_date"] or "")
+        logger.info(f"Translation memory index built with {self.entry_count} entries")
+        return self.entry_count
+
+    def sync_index(self) -> int:
+        """
+        Bring the index up to date with the database.
+
+        Entries added since the last sync are indexed incrementally, and so
+        are rewritten entries, recognised by a ``modified_date`` not older
+        than the newest one seen before; writers editing a msgid must bump
+        it. If entries were deleted the index is rebuilt from scratch.
+        """
+        with self.db_manager.get_connection() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) AS count FROM translation_entries WHERE id <= ?",
+                (self._max_entry_id,)
+            ).fetchone()
+            if row["count"] != self.entry_count:
+                return self.build_index()
+            # Timestamps have one second resolution, so rows from the last
+            # seen second are indexed again
+            cursor = conn.execute(
+                "SELECT id, msgid, modified_date FROM translation_entries "
+                "WHERE id > ? OR modified_date >= ? ORDER BY id",
+                (self._max_entry_id, self._last_modified)
+            )
+            synced = 0
+            for entry in cursor:
+                self.add_entry(entry["id"], entry["msgid"])
+                self._last_modified = max(self._last_modified, entry["modified_date"] or "")
+                synced += 1
+        if synced:
+            logger.debug(f"Translation memory index synced, {synced} new or modified entries")
+        return self.entry_count
+
+    def save_index(self) -> bool:
+        """Persist the index to the sidecar file."""
+        if self.index_path is None:
+            return False
+        self.purge_replaced()
+        conn = sqlite3.connect(self.index_path)
+        try:
+            self._create_index_schema(conn)
+            conn.execute("DELETE FROM tm_postings")
+            conn.execute("DELETE FROM tm_entries")
+            conn.executemany(
+                "INSERT INTO tm_postings (gram, entry_ids) VALUES (?, ?)",
+                ((gram, postings.tobytes()) for gram, postings in self._postings.items())
+            )
+            conn.executemany(
+                "INSERT INTO tm_entries (entry_id, gram_count) VALUES (?, ?)",
+                self._gram_counts.items()
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO tm_metadata (key, value) VALUES (?, ?)",
+                (("index_version", str(self.INDEX_VERSION)),
+                 ("ngram_size", str(self.NGRAM_SIZE)),
+                 ("max_entry_id", str(self._max_entry_id)),
+                 ("last_modified", self._last_modified))
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        logger.info(f"Translation memory index saved to {self.index_path}")
+        return True
+
+    def load_index(self) -> bool:
+        """Load a previously saved index, returning False if unusable."""
+        if self.index_path is None or not Path(self.index_path).exists():
+            return False
+        conn = sqlite3.connect(self.index_path)
+        try:
+            self._create_index_schema(conn)
+            metadata = dict(conn.execute("SELECT key, value FROM tm_metadata"))
+            if (metadata.get("index_version") != str(self.INDEX_VERSION) or
+                    metadata.get("ngram_size") != str(self.NGRAM_SIZE)):
+                logger.info("Translation memory index format changed, ignoring saved index")
+                return False
+            postings: Dict[str, array] = {}
+            for gram, blob in conn.execute("SELECT gram, entry_ids FROM tm_postings"):
+                ids = array("I")
+                ids.frombytes(blob)
+                postings[gram] = ids
+            self._postings = postings
+            self._gram_counts = dict(conn.execute("SELECT entry_id, gram_count FROM tm_entries"))
+            self._replaced = {}
+            self._max_entry_id = int(metadata.get("max_entry_id", "0"))
+            self._last_modified = metadata.get("last_modified", "")
+        finally:
+            conn.close()
+        logger.info(f"Translation memory index loaded with {self.entry_count} entries")
+        return True
+
+    def open(self) -> int:
+        """Load the saved index if present, sync it with the database and save."""
+        self.load_index()
+        count = self.sync_index()
+        self.save_index()
+        return count
+
+    def _create_index_schema(self, conn: sqlite3.Connection):
+        """Create the sidecar index tables."""
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tm_postings (
+                gram TEXT PRIMARY KEY,
+                entry_ids BLOB NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tm_entries (
+                entry_id INTEGER PRIMARY KEY,
+                gram_count INTEGER NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tm_metadata (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """)
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def find_similar(self, msgid: str, limit: int = 5,
+                     min_confidence: float = 0.6) -> List[TranslationMemoryMatch]:
+        """
+        Return up to ``limit`` entries whose msgid is similar to ``msgid``.
+
+        Confidence is ``1 - distance / max(len)`` on the normalised texts,
+        so 1.0 means identical after case and whitespace folding.
+        """
+        query = normalize_text(msgid)
+        if not query or not self._gram_counts:
+            return []
+        candidates = self._collect_candidates(query, min_confidence)
+        if not candidates:
+            return []
+        return self._verify_candidates(query, candidates, limit, min_confidence)
+
+    def _collect_candidates(self, query: str, min_confidence: float) -> List[int]:
+        """Select the most promising entry ids by shared n-gram count."""
+        grams = extract_ngrams(query, self.NGRAM_SIZE)
+        query_size = len(grams)
+        postings_list = sorted(
+            (self._postings[gram] for gram in grams if gram in self._postings),
+            key=len
+        )
+        if not postings_list:
+            return []
+
+        # Dice >= s and shared <= |C| imply shared >= s * |Q| / (2 - s)
+        min_shared = max(1, ceil(min_confidence * query_size / (2 - min_confidence)))
+        prefix_length = len(postings_list) - min_shared + 1
+        if prefix_length <= 0:
+            return []
+
+        # Count the rarest prefix lists within the budget. Lists of common
+        # n-grams would dominate the cost while adding few candidates; if
+        # even the rarest list is over budget only its newest ids are read.
+        shared: Counter = Counter()
+        budget = self.POSTINGS_BUDGET
+        read = 0
+        for postings in postings_list[:prefix_length]:
+            if len(postings) > budget:
+                if read == 0:
+                    shared.update(postings[-budget:])
+                    read = 1
+                break
+            shared.update(postings)
+            budget -= len(postings)
+            read += 1
+
+        # Complete the counts of the best pool from the remaining lists,
+        # probing long lists by binary search instead of reading them
+        pool = sorted(entry_id for entry_id, _ in shared.most_common(self.CANDIDATE_POOL))
+        pool_ids = set(pool)
+        for postings in postings_list[read:]:
+            size = len(postings)
+            if size > 8 * len(pool):
+                position = 0
+                for entry_id in pool:
+                    position = bisect_left(postings, entry_id, position)
+                    if position == size:
+                        break
+                    if postings[position] == entry_id:
+                        shared[entry_id] += 1
+            else:
+                shared.update(pool_ids.intersection(postings))
+
+        gram_counts = self._gram_counts
+        replaced = self._replaced
+        query_grams = set(grams)
+        scored: List[Tuple[float, int]] = []
+        for entry_id in pool:
+            gram_count = gram_counts.get(entry_id)
+            if gram_count is None:
+                continue
+            count = shared[entry_id]
+            if entry_id in replaced:
+                # Postings may still list the id under its old text
+                count = len(query_grams.intersection(extract_ngrams(replaced[entry_id], self.NGRAM_SIZE)))
+            if count < min_shared:
+                continue
+            scored.append((2.0 * count / (query_size + gram_count), entry_id))
+        return [entry_id for _, entry_id in heapq.nlargest(self.CANDIDATE_LIMIT, scored)]
+
+    def _verify_candidates(self, query: str, candidates: List[int], limit: int,
+                           min_confidence: float) -> List[TranslationMemoryMatch]:
+        """Score candidates with a bounded edit distance and keep the best."""
+        placeholders = ",".join("?" * len(candidates))
+        with self.db_manager.get_connection() as conn:
+            rows = conn.execute(
+                f"SELECT id, msgid, msgctxt, current_msgstr FROM translation_entries "
+                f"WHERE id IN ({placeholders})",
+                candidates
+            ).fetchall()
+
+        matches: List[TranslationMemoryMatch] = []
+        for row in rows:
+            candidate = normalize_text(row["msgid"])
+            longest = max(len(query), len(candidate))
+            max_distance = int(longest * (1.0 - min_confidence))
+            distance = bounded_levenshtein(query, candidate, max_distance)
+            if distance > max_distance:
+                continue
+            matches.append(TranslationMemoryMatch(
+                entry_id=row["id"],
+                msgid=row["msgid"],
+                msgctxt=row["msgctxt"] or "",
+                msgstr=row["current_msgstr"] or "",
+                confidence=round(1.0 - distance / longest, 4)
+            ))
+        matches.sort(key=lambda match: match.confidence, reverse=True)
+        return matches[:limit]
+
+    # ------------------------------------------------------------------
+    # Translation history integration
+    # ------------------------------------------------------------------
+
+    def record_suggestion(self, entry_id: int, match: TranslationMemoryMatch) -> int:
+        """
+        Store a TM suggestion as a new translation version.
+
+        The match confidence is written to ``confidence_score`` so the
+        history panel can tell machine suggestions from manual edits.
+        """
+        with self.db_manager.get_connection() as conn:
+            row = conn.execute(
+                "SELECT COALESCE(MAX(version_number), 0) AS latest "
+                "FROM translation_versions WHERE entry_id = ?",
+                (entry_id,)
+            ).fetchone()
+            cursor = conn.execute(
+                "INSERT INTO translation_versions "
+                "(entry_id, msgstr, source, version_number, confidence_score) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (entry_id, match.msgstr, self.TM_SOURCE, row["latest"] + 1, match.confidence)
+            )
+            conn.commit()
+            return cursor.lastrowid
+
+    def score_unscored_versions(self) -> int:
+        """
+        Fill missing ``confidence_score`` values for TM-sourced versions.
+
+        The score is the similarity between the entry's msgid and the best
+        other entry whose current translation equals the stored msgstr.
+        """
+        with self.db_manager.get_connection() as conn:
+            rows = conn.execute(
+                "SELECT v.id, v.msgstr, e.id AS entry_id, e.msgid "
+                "FROM translation_versions v "
+                "JOIN translation_entries e ON e.id = v.entry_id "
+                "WHERE v.source = ? AND v.confidence_score IS NULL",
+                (self.TM_SOURCE,)
+            ).fetchall()
+
+        scores: List[Tuple[float, int]] = []
+        for row in rows:
+            matches = self.find_similar(row["msgid"], limit=self.CANDIDATE_LIMIT, min_confidence=0.0)
+            best = next(
+                (match for match in matches
+                 if match.entry_id != row["entry_id"] and match.msgstr == row["msgstr"]),
+                None
+            )
+            if best is not None:
+                scores.append((best.confidence, row["id"]))
+
+        if scores:
+            with self.db_manager.get_connection() as conn:
+                conn.executemany(
+                    "UPDATE translation_versions SET confidence_score = ? WHERE id = ?",
+                    scores
+                )
+                conn.commit()
+        logger.info(f"Filled confidence scores for {len(scores)} translation versions")
+        return len(scores)
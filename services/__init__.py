@@ -5,10 +5,18 @@ This package contains the business logic services for the application,
 providing separation between UI components and core functionality.
 """
 
-from .navigation_service import NavigationService
-from .location_manager import LocationManager, QuickLocation, LocationBookmark
-from .navigation_history_service import NavigationHistoryService
-from .path_completion_service import PathCompletionService
+from core.lazy_import import lazy_exports
+
+# Submodules are imported on first attribute access so that importing one
+# service does not pay for all of them.
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'NavigationService': '.navigation_service',
+    'LocationManager': '.location_manager',
+    'QuickLocation': '.location_manager',
+    'LocationBookmark': '.location_manager',
+    'NavigationHistoryService': '.navigation_history_service',
+    'PathCompletionService': '.path_completion_service',
+})
 
 __all__ = [
     'NavigationService',
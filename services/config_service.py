@@ -3,13 +3,16 @@ Configuration Service for the POEditor application.
 
 This service manages application and plugin settings using QSettings.
 It provides a centralized way to store and retrieve configuration data
-with plugin-specific namespaces.
+with plugin-specific namespaces. Writes go through a write-behind store
+that batches them into occasional flushes instead of syncing every change.
 """
 
 from typing import Any, Dict, List, Optional, Union, Callable
-from PySide6.QtCore import QSettings, QObject, Signal
+from PySide6.QtCore import QObject, Signal
 from lg import logger
 
+from services.settings_store import get_settings_store
+
 
 class ConfigurationService(QObject):
     """
@@ -29,7 +32,7 @@ class ConfigurationService(QObject):
 
     def __init__(self, organization: str = "POEditor", application: str = "PluginEditor"):
         super().__init__()
-        self._settings = QSettings(organization, application)
+        self._store = get_settings_store(organization, application)
         self._defaults: Dict[str, Dict[str, Any]] = {}
         self._watchers: Dict[str, List[Callable]] = {}
 
@@ -52,10 +55,9 @@ class ConfigurationService(QObject):
         """
         try:
             full_key = self._get_key(namespace, key)
-            old_value = self._settings.value(full_key)
+            old_value = self._store.value(full_key)
 
-            self._settings.setValue(full_key, value)
-            self._settings.sync()
+            self._store.set_value(full_key, value)
 
             # Emit change signal if value actually changed
             if old_value != value:
@@ -97,12 +99,7 @@ class ConfigurationService(QObject):
                 default = self._defaults[namespace][key]
 
             # Get value with type conversion
-            if value_type:
-                value = self._settings.value(full_key, default, type=value_type)
-            else:
-                value = self._settings.value(full_key, default)
-
-            return value
+            return self._store.value(full_key, default, value_type)
 
         except Exception as e:
             logger.error(f"Failed to get config {namespace}.{key}: {e}")
@@ -121,7 +118,7 @@ class ConfigurationService(QObject):
         """
         try:
             full_key = self._get_key(namespace, key)
-            return self._settings.contains(full_key)
+            return self._store.contains(full_key)
         except Exception as e:
             logger.error(f"Failed to check config {namespace}.{key}: {e}")
             return False
@@ -140,10 +137,9 @@ class ConfigurationService(QObject):
         try:
             full_key = self._get_key(namespace, key)
 
-            if self._settings.contains(full_key):
-                old_value = self._settings.value(full_key)
-                self._settings.remove(full_key)
-                self._settings.sync()
+            if self._store.contains(full_key):
+                old_value = self._store.value(full_key)
+                self._store.remove(full_key)
 
                 self.setting_changed.emit(namespace, key, None)
 
@@ -177,12 +173,10 @@ class ConfigurationService(QObject):
         """
         try:
             if namespace:
-                self._settings.beginGroup(namespace)
-                keys = self._settings.allKeys()
-                self._settings.endGroup()
+                keys = self._store.keys(namespace)
             else:
                 # Get all top-level keys
-                keys = [key for key in self._settings.allKeys() if '/' not in key]
+                keys = self._store.child_keys()
 
             return keys
 
@@ -239,17 +233,8 @@ class ConfigurationService(QObject):
             namespace: Configuration namespace to clear
         """
         try:
-            if namespace:
-                self._settings.beginGroup(namespace)
-                self._settings.clear()
-                self._settings.endGroup()
-            else:
-                # Clear all top-level keys
-                keys = [key for key in self._settings.allKeys() if '/' not in key]
-                for key in keys:
-                    self._settings.remove(key)
-
-            self._settings.sync()
+            # An empty namespace clears only the top-level keys
+            self._store.remove_group(namespace)
             self.namespace_cleared.emit(namespace)
 
             logger.info(f"Cleared namespace {namespace}")
@@ -414,10 +399,10 @@ class ConfigurationService(QObject):
             raise
 
     def sync(self) -> None:
-        """Force synchronization of settings to storage."""
+        """Force synchronization of pending settings to storage."""
         try:
-            self._settings.sync()
-            logger.info("Configuration synchronized to storage")
+            if self._store.flush():
+                logger.info("Configuration synchronized to storage")
         except Exception as e:
             logger.error(f"Failed to sync configuration: {e}")
 
@@ -429,7 +414,7 @@ class ConfigurationService(QObject):
             List of namespace names
         """
         try:
-            all_keys = self._settings.allKeys()
+            all_keys = self._store.keys()
             namespaces = set()
 
             for key in all_keys:
@@ -450,11 +435,14 @@ class ConfigurationService(QObject):
         Returns:
             Dictionary with storage information
         """
+        settings = self._store.settings
         return {
-            "organization": self._settings.organizationName(),
-            "application": self._settings.applicationName(),
-            "format": self._settings.format(),
-            "filename": self._settings.fileName(),
+            "organization": settings.organizationName(),
+            "application": settings.applicationName(),
+            "format": settings.format(),
+            "filename": settings.fileName(),
             "namespaces": self.get_all_namespaces(),
-            "total_keys": len(self._settings.allKeys())
+            "total_keys": len(self._store.keys()),
+            "pending_writes": self._store.has_pending_writes(),
+            "flush_count": self._store.flush_count
         }
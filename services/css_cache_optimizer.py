@@ -3,16 +3,22 @@ CSS Cache Optimization Enhancement
 
 This module provides advanced caching optimizations for the CSS preprocessing system,
 including memory-efficient storage, cache persistence, and intelligent invalidation.
+
+Entries are kept in an OrderedDict in recency order, so lookups, insertions and
+evictions are all O(1). Values are serialized once on insertion (str, bytes or
+JSON-compatible data only - nothing is pickled) and the size of the serialized
+bytes is used for memory accounting. Persistent entries live in a single SQLite
+file under the application data directory.
 """
 
 import json
-import pickle
-import hashlib
-import weakref
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional, Set
-from dataclasses import dataclass, asdict
-from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Tuple
+from dataclasses import dataclass
 
 from lg import logger
 
@@ -21,35 +27,68 @@ from lg import logger
 class CacheEntry:
     """Enhanced cache entry with metadata"""
     data: Any
-    created_at: datetime
-    last_accessed: datetime
+    created_at: float
+    last_accessed: float
     access_count: int
     size_bytes: int
 
     def touch(self):
         """Update last accessed time and increment access count"""
-        self.last_accessed = datetime.now()
+        self.last_accessed = time.time()
         self.access_count += 1
 
 
+def serialize_cache_value(data: Any) -> Tuple[str, bytes]:
+    """
+    Serialize a cache value without pickle.
+
+    Returns:
+        Tuple of (kind, payload) where kind is 'str', 'bytes' or 'json'
+
+    Raises:
+        TypeError: If the value is not str, bytes or JSON-serializable
+    """
+    if isinstance(data, str):
+        return 'str', data.encode('utf-8')
+    if isinstance(data, bytes):
+        return 'bytes', data
+    return 'json', json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def deserialize_cache_value(kind: str, payload: bytes) -> Any:
+    """Restore a value serialized by serialize_cache_value"""
+    if kind == 'str':
+        return payload.decode('utf-8')
+    if kind == 'bytes':
+        return bytes(payload)
+    if kind == 'json':
+        return json.loads(payload.decode('utf-8'))
+    raise ValueError(f"Unknown cache value kind: {kind}")
+
+
 class AdvancedCSSCache:
     """
     Advanced caching system for CSS preprocessing with:
     - Memory-efficient storage
-    - LRU eviction
-    - Persistent cache to disk
-    - Intelligent invalidation
+    - O(1) LRU eviction
+    - Persistent cache to a single SQLite file
+    - Intelligent invalidation with background TTL sweeps
     - Cache analytics
     """
 
+    DEFAULT_CACHE_DIR = Path.home() / ".poeditor_plugin"
+    CACHE_FILE_NAME = "css_cache.db"
+
     def __init__(self, max_memory_mb: int = 50, max_entries: int = 1000,
-                 cache_dir: Optional[str] = None):
+                 cache_dir: Optional[str] = None, disk_ttl_hours: int = 24):
         self.max_memory_bytes = max_memory_mb * 1024 * 1024
         self.max_entries = max_entries
-        self.cache_dir = Path(cache_dir) if cache_dir else Path.cwd() / ".css_cache"
+        self.disk_ttl_seconds = disk_ttl_hours * 3600
+        self.cache_dir = Path(cache_dir) if cache_dir else self.DEFAULT_CACHE_DIR
+        self.cache_file = self.cache_dir / self.CACHE_FILE_NAME
 
-        # In-memory cache
-        self.entries: Dict[str, CacheEntry] = {}
+        # In-memory cache, least recently used first
+        self.entries: "OrderedDict[tuple, CacheEntry]" = OrderedDict()
         self.current_memory_usage = 0
 
         # Analytics
@@ -57,198 +96,205 @@ class AdvancedCSSCache:
         self.misses = 0
         self.evictions = 0
 
-        # Weak references to track object usage
-        self.weak_refs: Set[weakref.ref] = set()
+        # Guards entries and the database connection against the sweep thread
+        self._lock = threading.RLock()
+        self._sweep_thread: Optional[threading.Thread] = None
 
-        # Ensure cache directory exists
-        self.cache_dir.mkdir(exist_ok=True)
+        # Ensure cache directory exists and open the persistent store
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._connection = self._open_connection()
 
         logger.info(f"Advanced CSS cache initialized - Max Memory: {max_memory_mb}MB, Max Entries: {max_entries}")
 
-    def _calculate_size(self, data: Any) -> int:
-        """Calculate approximate size of data in bytes"""
-        if isinstance(data, str):
-            return len(data.encode('utf-8'))
-        elif isinstance(data, dict):
-            return len(str(data).encode('utf-8'))
-        else:
-            try:
-                return len(pickle.dumps(data))
-            except:
-                return len(str(data).encode('utf-8'))
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open the cache database, creating the schema if needed"""
+        connection = sqlite3.connect(str(self.cache_file), check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                cache_key TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        connection.execute("CREATE INDEX IF NOT EXISTS idx_cache_created ON cache_entries(created_at)")
+        connection.commit()
+        return connection
 
     def _generate_cache_key(self, key_components: tuple) -> str:
-        """Generate consistent cache key from components"""
-        key_str = "|".join(str(c) for c in key_components)
-        return hashlib.md5(key_str.encode()).hexdigest()
-
-    def _evict_lru(self):
-        """Evict least recently used entries"""
-        if not self.entries:
-            return
-
-        # Sort by last accessed time (oldest first)
-        sorted_entries = sorted(
-            self.entries.items(),
-            key=lambda x: x[1].last_accessed
-        )
-
-        # Evict oldest entries until under memory limit
-        while (self.current_memory_usage > self.max_memory_bytes * 0.8 or
-               len(self.entries) > self.max_entries * 0.8):
-            if not sorted_entries:
-                break
-
-            key, entry = sorted_entries.pop(0)
+        """Generate the persistent cache key from components"""
+        return json.dumps(key_components, separators=(',', ':'), ensure_ascii=False, default=str)
+
+    def _evict_lru(self, incoming_size: int = 0):
+        """Evict least recently used entries until the incoming entry fits"""
+        while self.entries and (
+                self.current_memory_usage + incoming_size > self.max_memory_bytes or
+                len(self.entries) >= self.max_entries):
+            key, entry = self.entries.popitem(last=False)
             self.current_memory_usage -= entry.size_bytes
-            del self.entries[key]
             self.evictions += 1
 
-            logger.debug(f"Evicted cache entry: {key[:12]}... (Size: {entry.size_bytes} bytes)")
+            logger.debug(f"Evicted cache entry: {str(key)[:24]}... (Size: {entry.size_bytes} bytes)")
 
     def put(self, key_components: tuple, data: Any, persist: bool = True) -> str:
-        """Store data in cache with optional persistence"""
-        cache_key = self._generate_cache_key(key_components)
-        data_size = self._calculate_size(data)
-
-        # Check if we need to evict first
-        if (self.current_memory_usage + data_size > self.max_memory_bytes or
-            len(self.entries) >= self.max_entries):
-            self._evict_lru()
-
-        # Create cache entry
-        entry = CacheEntry(
-            data=data,
-            created_at=datetime.now(),
-            last_accessed=datetime.now(),
-            access_count=1,
-            size_bytes=data_size
-        )
-
-        # Store in memory
-        self.entries[cache_key] = entry
-        self.current_memory_usage += data_size
-
-        # Persist to disk if requested
-        if persist:
-            self._persist_entry(cache_key, entry)
-
-        logger.debug(f"Cached entry: {cache_key[:12]}... (Size: {data_size} bytes)")
+        """
+        Store data in cache with optional persistence
+
+        Raises:
+            TypeError: If data is not str, bytes or JSON-serializable
+        """
+        kind, payload = serialize_cache_value(data)
+        data_size = len(payload)
+        now = time.time()
+
+        with self._lock:
+            previous = self.entries.pop(key_components, None)
+            if previous is not None:
+                self.current_memory_usage -= previous.size_bytes
+
+            self._evict_lru(data_size)
+
+            self.entries[key_components] = CacheEntry(
+                data=data,
+                created_at=now,
+                last_accessed=now,
+                access_count=1,
+                size_bytes=data_size
+            )
+            self.current_memory_usage += data_size
+
+            cache_key = self._generate_cache_key(key_components)
+            if persist:
+                self._persist_entry(cache_key, kind, payload, now)
+
+        logger.debug(f"Cached entry: {cache_key[:24]}... (Size: {data_size} bytes)")
         return cache_key
 
     def get(self, key_components: tuple, load_from_disk: bool = True) -> Optional[Any]:
         """Retrieve data from cache with optional disk loading"""
-        cache_key = self._generate_cache_key(key_components)
-
-        # Check memory cache first
-        if cache_key in self.entries:
-            entry = self.entries[cache_key]
-            entry.touch()
-            self.hits += 1
-            logger.debug(f"Cache hit (memory): {cache_key[:12]}...")
-            return entry.data
-
-        # Check disk cache if enabled
-        if load_from_disk:
-            disk_data = self._load_from_disk(cache_key)
-            if disk_data is not None:
-                # Load back into memory cache
-                self.put(key_components, disk_data, persist=False)
+        with self._lock:
+            entry = self.entries.get(key_components)
+            if entry is not None:
+                self.entries.move_to_end(key_components)
+                entry.touch()
                 self.hits += 1
-                logger.debug(f"Cache hit (disk): {cache_key[:12]}...")
-                return disk_data
-
-        # Cache miss
-        self.misses += 1
-        logger.debug(f"Cache miss: {cache_key[:12]}...")
+                return entry.data
+
+            # Check disk cache if enabled
+            if load_from_disk:
+                disk_data = self._load_from_disk(self._generate_cache_key(key_components))
+                if disk_data is not None:
+                    # Load back into memory cache
+                    self.put(key_components, disk_data, persist=False)
+                    self.hits += 1
+                    logger.debug(f"Cache hit (disk): {str(key_components)[:24]}...")
+                    return disk_data
+
+            # Cache miss
+            self.misses += 1
+        logger.debug(f"Cache miss: {str(key_components)[:24]}...")
         return None
 
-    def _persist_entry(self, cache_key: str, entry: CacheEntry):
-        """Persist cache entry to disk"""
+    def _persist_entry(self, cache_key: str, kind: str, payload: bytes, created_at: float):
+        """Persist a serialized cache entry to the cache database"""
         try:
-            cache_file = self.cache_dir / f"{cache_key}.cache"
-
-            # Prepare data for serialization
-            entry_data = {
-                'data': entry.data,
-                'metadata': {
-                    'created_at': entry.created_at.isoformat(),
-                    'last_accessed': entry.last_accessed.isoformat(),
-                    'access_count': entry.access_count,
-                    'size_bytes': entry.size_bytes
-                }
-            }
-
-            with open(cache_file, 'wb') as f:
-                pickle.dump(entry_data, f)
-
-        except Exception as e:
-            logger.warning(f"Failed to persist cache entry {cache_key[:12]}...: {e}")
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache_entries (cache_key, kind, payload, size_bytes, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (cache_key, kind, payload, len(payload), created_at)
+            )
+            self._connection.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to persist cache entry {cache_key[:24]}...: {e}")
 
     def _load_from_disk(self, cache_key: str) -> Optional[Any]:
-        """Load cache entry from disk"""
+        """Load cache entry from the cache database, skipping entries past the disk TTL"""
         try:
-            cache_file = self.cache_dir / f"{cache_key}.cache"
-
-            if not cache_file.exists():
-                return None
-
-            # Check if file is too old (older than 24 hours)
-            file_age = datetime.now() - datetime.fromtimestamp(cache_file.stat().st_mtime)
-            if file_age > timedelta(hours=24):
-                cache_file.unlink()  # Delete old cache file
-                return None
-
-            with open(cache_file, 'rb') as f:
-                entry_data = pickle.load(f)
-                return entry_data['data']
-
-        except Exception as e:
-            logger.warning(f"Failed to load cache entry {cache_key[:12]}... from disk: {e}")
+            row = self._connection.execute(
+                "SELECT kind, payload FROM cache_entries WHERE cache_key = ? AND created_at >= ?",
+                (cache_key, time.time() - self.disk_ttl_seconds)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to load cache entry {cache_key[:24]}... from disk: {e}")
+            return None
+        if row is None:
             return None
+        return deserialize_cache_value(row[0], row[1])
 
     def clear(self, clear_disk: bool = True):
         """Clear all cache entries"""
-        self.entries.clear()
-        self.current_memory_usage = 0
-
-        if clear_disk:
-            try:
-                for cache_file in self.cache_dir.glob("*.cache"):
-                    cache_file.unlink()
-                logger.info("Cleared disk cache")
-            except Exception as e:
-                logger.warning(f"Failed to clear disk cache: {e}")
+        with self._lock:
+            self.entries.clear()
+            self.current_memory_usage = 0
+
+            if clear_disk:
+                try:
+                    self._connection.execute("DELETE FROM cache_entries")
+                    self._connection.commit()
+                    logger.info("Cleared disk cache")
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to clear disk cache: {e}")
 
         logger.info("Cleared memory cache")
 
-    def cleanup_expired(self, max_age_hours: int = 48):
-        """Clean up expired cache entries"""
-        cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
-        expired_keys = []
-
-        # Find expired memory entries
-        for key, entry in self.entries.items():
-            if entry.last_accessed < cutoff_time:
-                expired_keys.append(key)
-
-        # Remove expired memory entries
-        for key in expired_keys:
-            entry = self.entries[key]
-            self.current_memory_usage -= entry.size_bytes
-            del self.entries[key]
-
-        # Clean up expired disk cache files
+    def cleanup_expired(self, max_age_hours: int = 48, wait: bool = False):
+        """
+        Clean up expired cache entries
+
+        Memory entries are swept from the LRU end, which only touches expired
+        entries. The disk sweep runs on a background thread with its own
+        connection so it never blocks the UI thread; pass wait=True to block
+        until it has finished.
+        """
+        cutoff_time = time.time() - max_age_hours * 3600
+        expired_count = 0
+
+        with self._lock:
+            while self.entries:
+                key, entry = next(iter(self.entries.items()))
+                if entry.last_accessed >= cutoff_time:
+                    break
+                del self.entries[key]
+                self.current_memory_usage -= entry.size_bytes
+                expired_count += 1
+
+        if expired_count:
+            logger.info(f"Cleaned up {expired_count} expired cache entries")
+
+        if self._sweep_thread is not None and self._sweep_thread.is_alive():
+            logger.debug("Disk cache sweep already running")
+        else:
+            self._sweep_thread = threading.Thread(
+                target=self._sweep_disk, args=(cutoff_time,),
+                name="css-cache-sweep", daemon=True
+            )
+            self._sweep_thread.start()
+
+        if wait:
+            self._sweep_thread.join()
+
+    def _sweep_disk(self, cutoff_time: float):
+        """Delete expired rows from the cache database (runs on the sweep thread)"""
+        connection = sqlite3.connect(str(self.cache_file), timeout=30)
         try:
-            for cache_file in self.cache_dir.glob("*.cache"):
-                file_age = datetime.now() - datetime.fromtimestamp(cache_file.stat().st_mtime)
-                if file_age > timedelta(hours=max_age_hours):
-                    cache_file.unlink()
-        except Exception as e:
+            cursor = connection.execute("DELETE FROM cache_entries WHERE created_at < ?", (cutoff_time,))
+            connection.commit()
+            if cursor.rowcount:
+                logger.info(f"Removed {cursor.rowcount} expired entries from disk cache")
+        except sqlite3.Error as e:
             logger.warning(f"Failed to cleanup expired disk cache: {e}")
+        finally:
+            connection.close()
 
-        if expired_keys:
-            logger.info(f"Cleaned up {len(expired_keys)} expired cache entries")
+    def close(self):
+        """Wait for a running sweep and close the cache database"""
+        if self._sweep_thread is not None:
+            self._sweep_thread.join()
+        with self._lock:
+            self._connection.close()
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get cache performance statistics"""
@@ -296,8 +342,7 @@ class CacheOptimizedMixin:
 
         self.advanced_cache = AdvancedCSSCache(
             max_memory_mb=25,  # 25MB memory limit
-            max_entries=500,   # 500 entry limit
-            cache_dir=".css_cache"
+            max_entries=500    # 500 entry limit
         )
 
         logger.info("Advanced CSS caching enabled")
@@ -355,8 +400,7 @@ def optimize_css_preprocessor_cache():
         # Replace simple cache with advanced cache
         self.advanced_cache = AdvancedCSSCache(
             max_memory_mb=25,
-            max_entries=500,
-            cache_dir=".css_cache"
+            max_entries=500
         )
         logger.info("Enhanced CSSPreprocessor with advanced caching")
 
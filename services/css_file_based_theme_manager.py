@@ -5,13 +5,17 @@ Manages theme loading, switching, and application.
 Now supports both file-based CSS and resource-based CSS with fallback.
 """
 
+import hashlib
 import os
+import time
+from pathlib import Path
 from typing import Optional, Dict
 from PySide6.QtCore import QFile, QIODevice, QObject, Signal, QSettings
 from PySide6.QtWidgets import QApplication
 from .css_manager import CSSManager
 from .css_preprocessor import CSSPreprocessor
 from .icon_preprocessor import IconPreprocessor
+from .stylesheet_diff import StylesheetDiff, apply_stylesheet_overlays, object_name_overlays, set_scoped_stylesheet
 from lg import logger
 
 # Simple Theme class for compatibility
@@ -32,6 +36,10 @@ class CSSFileBasedThemeManager(QObject):
 
     _instance = None
 
+    # Bump when processing changes so stale cached stylesheets are ignored
+    STYLESHEET_CACHE_VERSION = 1
+    STYLESHEET_CACHE_LIMIT = 16
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(CSSFileBasedThemeManager, cls).__new__(cls)
@@ -55,9 +63,22 @@ class CSSFileBasedThemeManager(QObject):
         self._css_cache = {}
         self._cache_loaded = False
 
+        # Processed stylesheets keyed by content hash, persisted across restarts
+        self._processed_css_cache: Dict[str, str] = {}
+        self._stylesheet_cache_dir = Path.home() / ".poeditor_plugin" / "stylesheet_cache"
+
         # Initialize settings for theme persistence
         self.settings = QSettings('POEditor', 'ThemeManager')
 
+        # Incremental switching diffs old and new stylesheets; the last diff is
+        # kept so UI components can limit their own refresh work
+        self.theme_switch_mode = str(self.settings.value('theme_switch_mode', 'incremental'))
+        self.last_stylesheet_diff: Optional[StylesheetDiff] = None
+        # Stylesheet set on the application, and the theme it currently shows
+        # once changes scoped to named widgets are applied as overlays
+        self._application_css: Optional[str] = None
+        self._effective_css: Optional[str] = None
+
         # Initialize CSS Manager for file-based CSS loading
         logger.debug("About to initialize CSS Manager...")
         try:
@@ -175,61 +196,26 @@ class CSSFileBasedThemeManager(QObject):
             logger.info(f"BEFORE - Background: {window_color.name()}, Text: {text_color.name()}")
 
             # Reset palette to system defaults to ensure CSS has full control
-            app.setPalette(QPalette())
-            logger.info("Reset palette to system defaults to let CSS control all styling")
+            # (in incremental mode only when something changed the palette)
+            if self.theme_switch_mode != 'incremental' or app.palette() != QPalette():
+                app.setPalette(QPalette())
+                logger.info("Reset palette to system defaults to let CSS control all styling")
 
             # Apply stylesheet directly - let CSS control all colors
             logger.info(f"Applying theme CSS directly without palette manipulation")
 
-            # Process CSS variables using preprocessor if available
-            processed_css = css_content
-            if self.css_preprocessor:
-                try:
-                    # Load variables.css file if it exists
-                    variables_css = ""
-                    if self.css_manager and "variables" in self.css_manager.css_cache:
-                        variables_css = self.css_manager.css_cache["variables"]
-                        logger.debug("Found variables.css file, including in processing")
-
-                    # Combine variables CSS with theme CSS
-                    combined_css = variables_css + "\n" + css_content
-
-                    # Extract variables from the combined CSS content
-                    variables = self.css_preprocessor.extract_variables(combined_css)
-                    logger.debug(f"Extracted {len(variables)} CSS variables")
-
-                    # Generate icon CSS with theme variables if IconPreprocessor available
-                    icon_css = ""
-                    if self.icon_preprocessor:
-                        try:
-                            icon_css = self.icon_preprocessor.generate_icon_css(generate_variables=True)
-                            logger.debug(f"Generated icon CSS ({len(icon_css)} chars)")
-                        except Exception as e:
-                            logger.warning(f"Failed to generate icon CSS: {e}")
-
-                    # Combine all CSS: variables + theme + icons
-                    final_combined_css = variables_css + "\n" + icon_css + "\n" + css_content
-
-                    # Process CSS to replace var() references with actual values
-                    processed_css = self.css_preprocessor.process_css(final_combined_css, variables)
-                    logger.info(f"CSS preprocessing completed successfully")
-                    logger.debug(f"Processed CSS preview (first 200 chars): {processed_css[:200]}")
-
-                    # Debug: Write processed CSS to a file for inspection
-                    try:
-                        debug_file = f"debug_processed_{self.current_theme.lower() if self.current_theme else 'unknown'}_theme.css"
-                        with open(debug_file, 'w', encoding='utf-8') as f:
-                            f.write(processed_css)
-                        logger.info(f"Debug: Processed CSS written to {debug_file}")
-                    except Exception as debug_e:
-                        logger.warning(f"Failed to write debug CSS file: {debug_e}")
-                except Exception as e:
-                    logger.error(f"CSS preprocessing failed: {e}")
-                    processed_css = css_content  # Fallback to original CSS
-            else:
-                logger.warning("CSS preprocessor not available, using CSS as-is")
+            # Process CSS variables, reusing the on-disk stylesheet cache when inputs are unchanged
+            start_time = time.perf_counter()
+            processed_css = self._get_processed_css(css_content)
+            logger.info(f"Theme stylesheet ready in {(time.perf_counter() - start_time) * 1000:.2f} ms")
 
-            app.setStyleSheet(processed_css)
+            if self.theme_switch_mode == 'incremental':
+                self._apply_incremental(app, processed_css)
+            else:
+                self.last_stylesheet_diff = None
+                apply_stylesheet_overlays({})
+                app.setStyleSheet(processed_css)
+                self._application_css = self._effective_css = processed_css
 
             # Log for debugging that CSS has been applied
             logger.info(f"CSS has been applied for theme: {self.current_theme}")
@@ -239,6 +225,191 @@ class CSSFileBasedThemeManager(QObject):
         except Exception as e:
             logger.error(f"Failed to apply theme CSS: {e}")
 
+    def _apply_incremental(self, app: QApplication, processed_css: str):
+        """
+        Apply only what changed since the current theme stylesheet.
+
+        Changes confined to rules for named widgets go into overlays on those
+        widgets, so Qt only re-polishes their subtrees; anything else replaces
+        the application stylesheet, which also drops the overlays.
+        """
+        ours = app.styleSheet() == self._application_css
+        current_css = self._effective_css if ours else app.styleSheet()
+        self.last_stylesheet_diff = StylesheetDiff.between(current_css, processed_css)
+        if self.last_stylesheet_diff.is_empty:
+            logger.info("Theme stylesheet unchanged, skipping re-application")
+            return
+
+        overlays = object_name_overlays(self._application_css, processed_css) if ours else None
+        if overlays is not None:
+            updated = apply_stylesheet_overlays(overlays)
+            if updated is not None:
+                self._effective_css = processed_css
+                logger.info(f"Theme changes scoped to {sorted(overlays)}, updated {updated} widget stylesheets")
+                return
+
+        apply_stylesheet_overlays({})
+        self._set_application_stylesheet(app, processed_css)
+        self._application_css = self._effective_css = processed_css
+
+    def _set_application_stylesheet(self, app: QApplication, processed_css: str):
+        """
+        Apply the application stylesheet with painting suspended.
+
+        Qt re-polishes every widget when the application stylesheet changes;
+        disabling updates on top-level windows turns the resulting repaints
+        into a single one per window.
+        """
+        frozen = [window for window in app.topLevelWidgets()
+                  if window.isVisible() and window.updatesEnabled()]
+        for window in frozen:
+            window.setUpdatesEnabled(False)
+        app.setStyleSheet(processed_css)
+        for window in frozen:
+            window.setUpdatesEnabled(True)
+
+    def set_theme_switch_mode(self, mode: str):
+        """
+        Select how theme switches are applied.
+
+        Args:
+            mode: 'incremental' diffs stylesheets and skips unchanged work,
+                  'full' always re-applies everything
+        """
+        if mode not in ('incremental', 'full'):
+            raise ValueError(f"Unknown theme switch mode: {mode}")
+        self.theme_switch_mode = mode
+        self.settings.setValue('theme_switch_mode', mode)
+        logger.info(f"Theme switch mode set to: {mode}")
+
+    def _get_processed_css(self, css_content: str) -> str:
+        """
+        Return the final stylesheet for the given theme CSS.
+
+        The processed stylesheet is content-addressed: the cache key is a hash of
+        variables.css, the theme CSS and the icon sources. A hit is served from
+        memory or with a single file read, skipping variable extraction, icon CSS
+        generation and preprocessing entirely.
+
+        When debug_dump_processed_css is enabled the result is dumped however
+        it was obtained, so enabling it on a warm cache still writes a file.
+        """
+        processed_css = self._resolve_processed_css(css_content)
+        if self.settings.value('debug_dump_processed_css', False, type=bool):
+            self._write_debug_css(processed_css)
+        return processed_css
+
+    def _resolve_processed_css(self, css_content: str) -> str:
+        """Look up the processed stylesheet in memory or on disk, building it on a miss."""
+        if not self.css_preprocessor:
+            logger.warning("CSS preprocessor not available, using CSS as-is")
+            return css_content
+
+        variables_css = ""
+        if self.css_manager and "variables" in self.css_manager.css_cache:
+            variables_css = self.css_manager.css_cache["variables"]
+            logger.debug("Found variables.css file, including in processing")
+
+        cache_key = self._stylesheet_cache_key(variables_css, css_content)
+        cached_css = self._processed_css_cache.get(cache_key)
+        if cached_css is not None:
+            logger.debug(f"Processed stylesheet served from memory: {cache_key[:12]}")
+            return cached_css
+
+        cache_file = self._stylesheet_cache_dir / f"{cache_key}.qss"
+        try:
+            processed_css = cache_file.read_text(encoding='utf-8')
+        except OSError:
+            # Missing, or pruned by another instance; rebuild it
+            pass
+        else:
+            self._processed_css_cache[cache_key] = processed_css
+            logger.info(f"Processed stylesheet loaded from cache: {cache_file.name}")
+            return processed_css
+
+        try:
+            # Combine variables CSS with theme CSS
+            combined_css = variables_css + "\n" + css_content
+
+            # Extract variables from the combined CSS content
+            variables = self.css_preprocessor.extract_variables(combined_css)
+            logger.debug(f"Extracted {len(variables)} CSS variables")
+
+            # Generate icon CSS with theme variables if IconPreprocessor available
+            icon_css = ""
+            if self.icon_preprocessor:
+                try:
+                    icon_css = self.icon_preprocessor.generate_icon_css(generate_variables=True)
+                    logger.debug(f"Generated icon CSS ({len(icon_css)} chars)")
+                except Exception as e:
+                    logger.warning(f"Failed to generate icon CSS: {e}")
+
+            # Combine all CSS: variables + theme + icons
+            final_combined_css = variables_css + "\n" + icon_css + "\n" + css_content
+
+            # Process CSS to replace var() references with actual values
+            processed_css = self.css_preprocessor.process_css(final_combined_css, variables, combined_css)
+            logger.info(f"CSS preprocessing completed successfully")
+            logger.debug(f"Processed CSS preview (first 200 chars): {processed_css[:200]}")
+        except Exception as e:
+            logger.error(f"CSS preprocessing failed: {e}")
+            return css_content  # Fallback to original CSS
+
+        self._processed_css_cache[cache_key] = processed_css
+        self._write_stylesheet_cache(cache_file, processed_css)
+        return processed_css
+
+    def _stylesheet_cache_key(self, variables_css: str, css_content: str) -> str:
+        """Build the content hash identifying a processed stylesheet."""
+        digest = hashlib.sha256()
+        digest.update(f"format:{self.STYLESHEET_CACHE_VERSION}\0".encode('utf-8'))
+        digest.update(variables_css.encode('utf-8'))
+        digest.update(b"\0")
+        digest.update(css_content.encode('utf-8'))
+        digest.update(b"\0")
+        if self.icon_preprocessor:
+            digest.update(self.icon_preprocessor.get_source_fingerprint().encode('utf-8'))
+        return digest.hexdigest()
+
+    def _write_stylesheet_cache(self, cache_file: Path, processed_css: str):
+        """Atomically store a processed stylesheet and prune old cache entries."""
+        try:
+            self._stylesheet_cache_dir.mkdir(parents=True, exist_ok=True)
+            temp_file = cache_file.with_suffix(".tmp")
+            temp_file.write_text(processed_css, encoding='utf-8')
+            os.replace(temp_file, cache_file)
+            logger.debug(f"Processed stylesheet cached: {cache_file.name}")
+
+            cached_files = sorted(self._stylesheet_cache_dir.glob("*.qss"),
+                                  key=lambda path: path.stat().st_mtime, reverse=True)
+            for stale_file in cached_files[self.STYLESHEET_CACHE_LIMIT:]:
+                stale_file.unlink()
+        except OSError as e:
+            logger.warning(f"Failed to write stylesheet cache: {e}")
+
+    def _write_debug_css(self, processed_css: str):
+        """Write processed CSS to a file for inspection (opt-in via settings)."""
+        try:
+            debug_file = f"debug_processed_{self.current_theme.lower() if self.current_theme else 'unknown'}_theme.css"
+            with open(debug_file, 'w', encoding='utf-8') as f:
+                f.write(processed_css)
+            logger.info(f"Debug: Processed CSS written to {debug_file}")
+        except Exception as debug_e:
+            logger.warning(f"Failed to write debug CSS file: {debug_e}")
+
+    def set_debug_css_dump(self, enabled: bool):
+        """Enable or disable writing debug_processed_*_theme.css files."""
+        self.settings.setValue('debug_dump_processed_css', enabled)
+        logger.info(f"Processed CSS debug dump {'enabled' if enabled else 'disabled'}")
+
+    def clear_stylesheet_cache(self):
+        """Drop all processed stylesheets from memory and disk."""
+        self._processed_css_cache.clear()
+        if self._stylesheet_cache_dir.exists():
+            for cache_file in self._stylesheet_cache_dir.glob("*.qss"):
+                cache_file.unlink()
+        logger.info("Cleared processed stylesheet cache")
+
     def reload_current_theme(self) -> bool:
         """Reload the current theme from disk (file-based CSS only)."""
         if not self.use_file_css or not self.css_manager:
@@ -372,7 +543,7 @@ class CSSFileBasedThemeManager(QObject):
 
                         # Process ActivityBar CSS with variables
                         processed_css = self.css_preprocessor.process_css(activity_css, variables)
-                        widget.setStyleSheet(processed_css)
+                        set_scoped_stylesheet(widget, processed_css)
                         logger.info(f"Applied processed activity bar theme to widget: {widget.objectName()}")
                         logger.debug(f"ActivityBar CSS processed with {len(variables)} variables")
                     else:
@@ -406,7 +577,7 @@ class CSSFileBasedThemeManager(QObject):
                             variables.update(self.css_preprocessor.extract_variables(theme_css))
 
                     processed_css = self.css_preprocessor.process_css(content, variables)
-                    widget.setStyleSheet(processed_css)
+                    set_scoped_stylesheet(widget, processed_css)
                     logger.info(f"Applied processed activity bar theme from resource to widget: {widget.objectName()}")
                     logger.debug(f"ActivityBar CSS processed with {len(variables)} variables from resource")
                 else:
@@ -41,7 +41,8 @@ class CSSManager:
                 self.css_cache[filename] = content
                 self.current_css_file = str(file_path)  # Keep full path for debugging
             logger.info(f"Loaded CSS file: {self.current_css_file} ({len(content)} chars)")
-            logger.debug(f"=== DEBUG: Loaded CSS content for {filename} ===\n{content}\n=== END CSS content, length: {len(content)} ===")
+            logger.debug("=== DEBUG: Loaded CSS content for %s ===\n%s\n=== END CSS content, length: %d ===",
+                         filename, content, len(content))
         except Exception as e:
             logger.error(f"Failed to load CSS file {file_path}: {e}")
 
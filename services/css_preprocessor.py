@@ -1,12 +1,52 @@
 import re
 import os
 import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set, Tuple
 import logging
 
 from lg import logger
 
+
+class CompiledCSS:
+    """CSS compiled into literal segments and variable slots
+
+    Rendering only fills the slots from a resolved variable table and joins
+    the segments, so no regular expressions run on re-render.
+    """
+
+    __slots__ = ('segments', 'slots')
+
+    def __init__(self, segments: List[str], slots: List[Tuple[int, str, Optional[str]]]):
+        self.segments = segments
+        self.slots = slots
+
+    def render(self, resolved: Dict[str, str], missing: Set[str]) -> str:
+        """Render the template with resolved variable values
+
+        Args:
+            resolved: Flattened variable table from CSSPreprocessor.resolve_variables
+            missing: Set collecting names of variables without value or fallback
+
+        Returns:
+            CSS with all variable slots filled
+        """
+        if not self.slots:
+            return self.segments[0]
+        parts = self.segments.copy()
+        for index, name, fallback in self.slots:
+            value = resolved.get(name)
+            if value is None:
+                if fallback is None:
+                    missing.add(name)
+                    value = 'initial'
+                else:
+                    value = fallback
+            parts[index] = value
+        return ''.join(parts)
+
+
 class CSSPreprocessor:
     """CSS Preprocessor for handling CSS variables in PySide6
 
@@ -15,11 +55,22 @@ class CSSPreprocessor:
     with their actual values.
     """
 
+    # Entries kept by the LRU caches below; a theme switch needs a handful
+    TEMPLATE_CACHE_SIZE = 32
+    RESOLVED_TABLE_CACHE_SIZE = 8
+
     def __init__(self, themes_dir: str = "themes"):
         self.themes_dir = Path(themes_dir)
 
         # Cache for processed CSS to improve performance
-        self.cache: Dict[str, Any] = {}
+        self.cache: Dict[Any, Any] = {}
+
+        # Compiled stylesheet templates keyed by CSS content, least recently used first
+        self._compiled_templates: "OrderedDict[Tuple[str, bool], CompiledCSS]" = OrderedDict()
+
+        # Flattened variable tables keyed by the CSS the variables were
+        # extracted from, least recently used first
+        self._resolved_tables: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
 
         # Regular expressions for finding variables
         self.var_declaration_pattern = re.compile(r'--([\w-]+)\s*:\s*([^;]+);')
@@ -81,89 +132,139 @@ class CSSPreprocessor:
 
         return variables
 
-    def process_css(self, css_content: str, variables: Dict[str, str]) -> str:
-        """Process CSS content by replacing variable references with actual values
+    def resolve_variables(self, variables: Dict[str, str], source: Optional[str] = None) -> Dict[str, str]:
+        """Flatten a variable map so that no value references another variable
+
+        Variables are resolved once in dependency (topological) order, so each
+        value is substituted exactly one time. Reference cycles are detected and
+        every variable taking part in a cycle resolves to 'initial'.
 
         Args:
-            css_content: CSS content as string
-            variables: Dictionary of variable names and values
+            variables: Dictionary of variable names and raw values
+            source: CSS the variables were extracted from; when given, the
+                    resolved table is cached under it
 
         Returns:
-            Processed CSS with variables replaced
+            Dictionary of variable names and fully resolved values
         """
-        # Cache key based on content hash and variables
-        cache_key = f"process:{hash(css_content)}-{hash(str(variables))}"
+        if source is not None:
+            resolved = self._resolved_tables.get(source)
+            if resolved is not None:
+                self._resolved_tables.move_to_end(source)
+                return resolved
+
+        # Dependency graph: variable -> variables referenced by its value
+        dependencies: Dict[str, List[str]] = {}
+        dependents: Dict[str, List[str]] = {}
+        for name, value in variables.items():
+            if 'var(--' not in value:
+                dependencies[name] = []
+                continue
+            refs = [ref for ref, _ in self.var_usage_pattern.findall(value) if ref in variables]
+            dependencies[name] = refs
+            for ref in refs:
+                dependents.setdefault(ref, []).append(name)
+
+        # Kahn's algorithm gives the order in which values can be resolved
+        pending = {name: len(refs) for name, refs in dependencies.items()}
+        ready = [name for name, count in pending.items() if count == 0]
+        order: List[str] = []
+        while ready:
+            name = ready.pop()
+            order.append(name)
+            for dependent in dependents.get(name, ()):
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    ready.append(dependent)
+
+        resolved = {}
+        missing: Set[str] = set()
+        for name in order:
+            value = variables[name]
+            if 'var(--' in value:
+                value = self.compile_css(value).render(resolved, missing)
+            resolved[name] = value
+
+        if len(order) < len(variables):
+            cyclic = sorted(name for name in variables if name not in resolved)
+            logger.warning(f"Circular CSS variable references: {', '.join('--' + name for name in cyclic)}")
+            for name in cyclic:
+                resolved[name] = 'initial'
+        if missing:
+            logger.warning(f"Undefined CSS variables referenced by variables: "
+                           f"{', '.join('--' + name for name in sorted(missing))}")
+
+        if source is not None:
+            self._resolved_tables[source] = resolved
+            if len(self._resolved_tables) > self.RESOLVED_TABLE_CACHE_SIZE:
+                self._resolved_tables.popitem(last=False)
+        return resolved
+
+    def compile_css(self, css_content: str, strip_declarations: bool = False) -> 'CompiledCSS':
+        """Compile CSS content into a template of literal segments and variable slots
+
+        Compiled templates are cached by content, so re-rendering the same
+        stylesheet under another theme skips all regex work.
 
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        Args:
+            css_content: CSS content as string
+            strip_declarations: Remove :root blocks and variable declarations first
 
-        # Function to replace variables in a match
-        def replace_var(match):
-            var_name = match.group(1)
+        Returns:
+            CompiledCSS template
+        """
+        template_key = (css_content, strip_declarations)
+        template = self._compiled_templates.get(template_key)
+        if template is not None:
+            self._compiled_templates.move_to_end(template_key)
+            return template
+
+        source = self._remove_css_variable_declarations(css_content) if strip_declarations else css_content
+        segments: List[str] = []
+        slots: List[Tuple[int, str, Optional[str]]] = []
+        position = 0
+        for match in self.var_usage_pattern.finditer(source):
+            segments.append(source[position:match.start()])
             fallback = match.group(2)
+            slots.append((len(segments), match.group(1), fallback.strip() if fallback else None))
+            segments.append('')
+            position = match.end()
+        segments.append(source[position:])
+
+        template = CompiledCSS(segments, slots)
+        self._compiled_templates[template_key] = template
+        if len(self._compiled_templates) > self.TEMPLATE_CACHE_SIZE:
+            self._compiled_templates.popitem(last=False)
+        return template
+
+    def process_css(self, css_content: str, variables: Dict[str, str],
+                    variables_source: Optional[str] = None) -> str:
+        """Process CSS content by replacing variable references with actual values
 
-            if var_name in variables:
-                value = variables[var_name]
-
-                # Check if value contains variable references
-                if 'var(--' in value:
-                    # Recursively resolve nested variables
-                    value = self._resolve_nested_variables(value, variables)
-
-                return value
-            elif fallback:
-                return fallback.strip()
-            else:
-                # Variable not found and no fallback
-                logger.warning(f"Variable '--{var_name}' not found and no fallback provided")
-                return 'initial'
-
-        # Replace all variable references
-        processed_css = self.var_usage_pattern.sub(replace_var, css_content)
-
-        # Remove :root blocks and variable declarations for QSS compatibility
-        processed_css = self._remove_css_variable_declarations(processed_css)
-
-        # Cache the result
-        self.cache[cache_key] = processed_css
-
-        return processed_css
-
-    def _resolve_nested_variables(self, value: str, variables: Dict[str, str], depth: int = 0) -> str:
-        """Recursively resolve nested variable references
+        Rendering a cached template is a join of its segments, so results are
+        not cached themselves.
 
         Args:
-            value: CSS value potentially containing variable references
+            css_content: CSS content as string
             variables: Dictionary of variable names and values
-            depth: Recursion depth to prevent infinite loops
+            variables_source: CSS the variables were extracted from, if any,
+                              used as the key of the resolved variable table
 
         Returns:
-            Value with all variable references resolved
+            Processed CSS with variables replaced
         """
-        # Prevent infinite recursion
-        if depth > 10:
-            logger.warning(f"Max recursion depth reached when resolving variables: {value}")
-            return value
-
-        # Replace all variable references in this value
-        def replace_nested_var(match):
-            nested_var_name = match.group(1)
-            nested_fallback = match.group(2)
-
-            if nested_var_name in variables:
-                nested_value = variables[nested_var_name]
-
-                # Check for nested variables in the replacement
-                if 'var(--' in nested_value:
-                    return self._resolve_nested_variables(nested_value, variables, depth + 1)
-                return nested_value
-            elif nested_fallback:
-                return nested_fallback.strip()
-            else:
-                logger.warning(f"Nested variable '--{nested_var_name}' not found and no fallback provided")
-                return 'initial'
-
-        return self.var_usage_pattern.sub(replace_nested_var, value)
+        resolved = self.resolve_variables(variables, variables_source)
+
+        # Remove :root blocks and variable declarations for QSS compatibility,
+        # then fill the remaining variable references from the resolved table
+        template = self.compile_css(css_content, strip_declarations=True)
+        missing: Set[str] = set()
+        processed_css = template.render(resolved, missing)
+        if missing:
+            logger.warning(f"Variables not found and no fallback provided: "
+                           f"{', '.join('--' + name for name in sorted(missing))}")
+
+        return processed_css
 
     def process_css_file(self, file_path: str, variables: Dict[str, str]) -> str:
         """Process a CSS file by replacing variable references with actual values
@@ -224,6 +325,8 @@ class CSSPreprocessor:
     def clear_cache(self):
         """Clear the preprocessor cache"""
         self.cache = {}
+        self._compiled_templates.clear()
+        self._resolved_tables.clear()
         logger.debug("Cleared CSS preprocessor cache")
 
     def generate_final_css(self, theme_name: str) -> str:
@@ -0,0 +1,734 @@
+"""
+Workspace-wide file system watcher.
+
+One service watches whole directory trees and reports what changed in them,
+so the explorer, the path index and the folder sizes can update themselves
+instead of being refreshed by hand.
+
+On Linux the service reads inotify events from a QSocketNotifier on the
+event loop; elsewhere it falls back to QFileSystemWatcher and diffs the
+listing of each changed directory, which reports created and deleted
+entries but not modified files. Watches are added recursively and limited
+to MAX_WATCHES directories. Trees are listed on a background thread, both
+the initial one and directories created or moved in later; with inotify
+that thread adds each watch before listing the directory, so entries
+created meanwhile are not missed.
+
+Raw events are coalesced per directory: a file created and deleted within
+the window disappears, a deleted and re-created file is reported modified,
+and IN_MOVED_FROM/IN_MOVED_TO pairs become (old, new) moves. A rename over
+an existing file, as in an editor's atomic save, reports no deletion, so
+the entry names of each watched directory are kept to report it modified.
+Batches are flushed once events have been quiet for DEBOUNCE_MS, or after
+MAX_LATENCY_MS during a continuous burst, through changes_ready and the
+FILE_SYSTEM_CHANGED_EVENT of the plugin event bus.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple
+
+from PySide6.QtCore import QCoreApplication, QFileSystemWatcher, QObject, QSocketNotifier, QTimer, Signal
+
+from services.path_index import IGNORED_DIRECTORIES
+from lg import logger
+
+if TYPE_CHECKING:
+    from core.api import PluginAPI
+
+FILE_SYSTEM_CHANGED_EVENT = "file_system.changed"
+
+# inotify event flags (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_EXCL_UNLINK = 0x04000000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR | IN_DONT_FOLLOW | IN_EXCL_UNLINK)
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+# A raw event: watch id, mask, move cookie, entry name
+RawEvent = Tuple[int, int, int, str]
+
+
+@dataclass
+class DirectoryChanges:
+    """Coalesced changes to the entries of one directory."""
+
+    directory: str
+    created: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    moved: List[Tuple[str, str]] = field(default_factory=list)  # (old path, new path)
+    directories: Set[str] = field(default_factory=set)  # paths above that are directories
+    overflow: bool = False  # events were lost; anything below directory may have changed
+
+    def changed_paths(self) -> List[str]:
+        """All paths touched by the batch, both sides of moves included."""
+        paths = self.created + self.deleted + self.modified
+        for old_path, new_path in self.moved:
+            paths.extend((old_path, new_path))
+        return paths
+
+
+class _PendingChanges:
+    """Changes of one directory collected until the next flush."""
+
+    def __init__(self):
+        # dicts keep the event order and act as ordered sets
+        self.created: Dict[str, None] = {}
+        self.deleted: Dict[str, None] = {}
+        self.modified: Dict[str, None] = {}
+        self.moved: List[Tuple[str, str]] = []
+        self.directories: Set[str] = set()
+
+    def add_created(self, path: str, is_dir: bool) -> None:
+        if is_dir:
+            self.directories.add(path)
+        if path in self.deleted and not is_dir:
+            # Replaced, e.g. by an editor's atomic save
+            del self.deleted[path]
+            self.modified[path] = None
+        else:
+            self.created[path] = None
+
+    def add_deleted(self, path: str, is_dir: bool) -> None:
+        self.modified.pop(path, None)
+        if path in self.created:
+            # Created and deleted within one batch
+            del self.created[path]
+            self.directories.discard(path)
+            return
+        if is_dir:
+            self.directories.add(path)
+        self.deleted[path] = None
+
+    def add_modified(self, path: str) -> None:
+        if path not in self.created:
+            self.modified[path] = None
+
+    def to_changes(self, directory: str) -> DirectoryChanges:
+        paths = set(self.created).union(self.deleted, *self.moved)
+        return DirectoryChanges(directory, list(self.created), list(self.deleted), list(self.modified),
+                                list(self.moved), self.directories & paths)
+
+
+def _is_under(path: str, root: str) -> bool:
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
+
+class _InotifyBackend:
+    """Linux inotify read from the event loop through a socket notifier."""
+
+    def __init__(self, on_events: Callable[[List[RawEvent]], None], parent: QObject):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch_call = libc.inotify_add_watch
+        self._add_watch_call.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch_call = libc.inotify_rm_watch
+        self._rm_watch_call.argtypes = [ctypes.c_int, ctypes.c_int]
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._on_events = on_events
+        self._notifier = QSocketNotifier(self._fd, QSocketNotifier.Type.Read, parent)
+        self._notifier.activated.connect(self._read)
+
+    def add_watch(self, path: str) -> int:
+        wd = self._add_watch_call(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), path)
+        return wd
+
+    def remove_watch(self, wd: int) -> None:
+        self._rm_watch_call(self._fd, wd)
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            self._notifier.setEnabled(False)
+            os.close(self._fd)
+            self._fd = -1
+
+    def _read(self, *args) -> None:
+        events: List[RawEvent] = []
+        while self._fd >= 0:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                events.append((wd, mask, cookie, name))
+        if events:
+            self._on_events(events)
+
+
+class _QtBackend:
+    """QFileSystemWatcher fallback reporting created and deleted entries."""
+
+    def __init__(self, on_events: Callable[[List[RawEvent]], None], parent: QObject):
+        self._on_events = on_events
+        self._watcher = QFileSystemWatcher(parent)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._ids: Dict[str, int] = {}
+        self._paths: Dict[int, str] = {}
+        self._listings: Dict[int, Dict[str, bool]] = {}  # id -> name -> is directory
+        self._next_id = 0
+
+    def add_watch(self, path: str) -> int:
+        if path in self._ids:
+            return self._ids[path]
+        if not self._watcher.addPath(path):
+            raise OSError(f"Cannot watch {path}")
+        self._next_id += 1
+        self._ids[path] = self._next_id
+        self._paths[self._next_id] = path
+        self._listings[self._next_id] = self._list(path)
+        return self._next_id
+
+    def remove_watch(self, wd: int) -> None:
+        path = self._paths.pop(wd, None)
+        if path is not None:
+            self._watcher.removePath(path)
+            del self._ids[path]
+        self._listings.pop(wd, None)
+
+    def close(self) -> None:
+        if self._ids:
+            self._watcher.removePaths(list(self._ids))
+        self._ids.clear()
+        self._paths.clear()
+        self._listings.clear()
+
+    @staticmethod
+    def _list(path: str) -> Dict[str, bool]:
+        listing = {}
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        listing[entry.name] = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return listing
+
+    def _on_directory_changed(self, path: str) -> None:
+        wd = self._ids.get(path)
+        if wd is None:
+            return
+        if not os.path.isdir(path):
+            self.remove_watch(wd)
+            self._on_events([(wd, IN_DELETE_SELF, 0, ""), (wd, IN_IGNORED, 0, "")])
+            return
+        old, new = self._listings[wd], self._list(path)
+        self._listings[wd] = new
+        events = [(wd, IN_DELETE | (IN_ISDIR if is_dir else 0), 0, name)
+                  for name, is_dir in old.items() if name not in new]
+        events.extend((wd, IN_CREATE | (IN_ISDIR if is_dir else 0), 0, name)
+                      for name, is_dir in new.items() if name not in old)
+        if events:
+            self._on_events(events)
+
+
+@dataclass
+class _TreeScan:
+    """A directory tree queued for or being listed by the scanner."""
+
+    root: str
+    limit: int  # maximum number of directories
+    report_created: bool  # the tree is new and its entries are reported as created
+    cancelled: bool = False
+    limit_reached: bool = False
+
+
+class _WatchTreeScanner:
+    """Daemon thread listing the directories of trees to watch, one tree at a time."""
+
+    CHUNK_SIZE = 512
+
+    def __init__(self, add_watch: Optional[Callable[[str], int]],
+                 on_found: Callable[[_TreeScan, list], None], on_finished: Callable[[_TreeScan], None]):
+        """
+        Initialize the scanner.
+
+        Args:
+            add_watch: Thread-safe callable watching a directory, called
+                before the directory is listed; None to only list
+            on_found: Called with a scan and [(directory, watch id or None,
+                [(name, is_dir)])] chunks
+            on_finished: Called with a scan once it is done or cancelled
+        """
+        self._add_watch = add_watch
+        self._on_found = on_found
+        self._on_finished = on_finished
+        self._condition = threading.Condition()
+        self._queue: List[_TreeScan] = []
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="watch-tree-scanner", daemon=True)
+        self._thread.start()
+
+    def scan(self, tree_scan: _TreeScan) -> None:
+        with self._condition:
+            self._queue.append(tree_scan)
+            self._condition.notify()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                tree_scan = self._queue.pop(0)
+            if not tree_scan.cancelled:
+                try:
+                    self._list_tree(tree_scan)
+                except Exception as e:
+                    logger.error(f"Failed to list {tree_scan.root} for watching: {e}")
+            self._on_finished(tree_scan)
+
+    def _list_tree(self, tree_scan: _TreeScan) -> None:
+        found = 0
+        chunk = []
+        pending = [tree_scan.root]
+        while pending and not tree_scan.cancelled:
+            if found >= tree_scan.limit:
+                tree_scan.limit_reached = True
+                break
+            directory = pending.pop()
+            wd = None
+            if self._add_watch is not None:
+                try:
+                    wd = self._add_watch(directory)
+                except OSError as e:
+                    if e.errno == errno.ENOSPC:  # the system's inotify watch limit
+                        tree_scan.limit_reached = True
+                        break
+                    continue
+            listing = []
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            is_dir = entry.is_dir(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        listing.append((entry.name, is_dir))
+                        if is_dir and entry.name not in IGNORED_DIRECTORIES:
+                            pending.append(entry.path)
+            except OSError:
+                pass
+            found += 1
+            chunk.append((directory, wd, listing))
+            if len(chunk) >= self.CHUNK_SIZE:
+                self._on_found(tree_scan, chunk)
+                chunk = []
+        if chunk:
+            # Also once cancelled, so watches already added are released
+            self._on_found(tree_scan, chunk)
+
+
+class FileWatcherService(QObject):
+    """
+    Recursive file system watcher publishing coalesced per-directory changes.
+
+    Signals:
+        changes_ready(list): DirectoryChanges batches of one flush
+        watch_ready(str): The initial watches of a root are in place
+        watch_limit_reached(int): MAX_WATCHES was reached; further
+            directories are not watched
+    """
+
+    DEBOUNCE_MS = 200
+    MAX_LATENCY_MS = 1000
+    MAX_WATCHES = 8192
+
+    changes_ready = Signal(list)
+    watch_ready = Signal(str)
+    watch_limit_reached = Signal(int)
+    _directories_found = Signal(object, list)  # scanner thread -> main thread: _TreeScan, chunk
+    _scan_finished = Signal(object)  # scanner thread -> main thread: _TreeScan
+
+    def __init__(self, api: Optional['PluginAPI'] = None, parent: Optional[QObject] = None):
+        """
+        Initialize the watcher service.
+
+        Args:
+            api: Plugin API whose event bus receives the change batches
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self._api = api
+        self._backend = None
+        self._roots: Set[str] = set()
+        self._scanner: Optional[_WatchTreeScanner] = None
+        self._scans: Dict[str, _TreeScan] = {}  # tree root -> scan listing it
+        self._wd_paths: Dict[int, str] = {}
+        self._path_wds: Dict[str, int] = {}
+        self._entries: Dict[str, Set[str]] = {}  # watched directory -> entry names
+        self._early_events: Dict[int, List[RawEvent]] = {}  # events of watches a scanner has not reported yet
+        self._limit_reported = False
+
+        self._pending: Dict[str, _PendingChanges] = {}
+        self._move_sources: Dict[int, Tuple[str, str, bool]] = {}  # cookie -> (directory, path, is_dir)
+        self._overflow = False
+        self._first_pending = 0.0
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self.flush)
+        self._directories_found.connect(self._on_directories_found)
+        self._scan_finished.connect(self._on_scan_finished)
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.close)
+
+    @property
+    def watch_count(self) -> int:
+        """Number of watched directories."""
+        return len(self._path_wds)
+
+    def set_api(self, api: 'PluginAPI') -> None:
+        """Publish change batches on a plugin API's event bus."""
+        self._api = api
+
+    def watch(self, root: str) -> None:
+        """
+        Watch a directory tree. Its directories are listed in the background;
+        watch_ready is emitted once they are watched.
+
+        Args:
+            root: Directory path
+        """
+        root = os.path.abspath(root)
+        if any(_is_under(root, watched) for watched in self._roots) or not os.path.isdir(root):
+            return
+        self._roots.add(root)
+        self._start_scan(root, report_created=False)
+        logger.info(f"Watching {root}")
+
+    def unwatch(self, root: str) -> None:
+        """
+        Stop watching a directory tree.
+
+        Args:
+            root: Directory path passed to watch()
+        """
+        root = os.path.abspath(root)
+        if root not in self._roots:
+            return
+        self._roots.discard(root)
+        self._cancel_scan(root)
+        self._remove_watches(root)
+
+    def is_watched(self, path: str) -> bool:
+        """True if a directory is watched."""
+        return os.path.abspath(path) in self._path_wds
+
+    def flush(self) -> None:
+        """Publish the pending changes now."""
+        self._flush_timer.stop()
+        for cookie in list(self._move_sources):
+            # Moved out of the watched trees
+            directory, path, is_dir = self._move_sources.pop(cookie)
+            self._changes(directory).add_deleted(path, is_dir)
+            if is_dir:
+                self._cancel_scans_under(path)
+                self._remove_watches(path)
+
+        changes = [pending.to_changes(directory) for directory, pending in sorted(self._pending.items())]
+        changes = [change for change in changes if change.changed_paths()]
+        if self._overflow:
+            changes = [DirectoryChanges(root, overflow=True) for root in sorted(self._roots)]
+        self._pending.clear()
+        self._overflow = False
+        if not changes:
+            return
+
+        self.changes_ready.emit(changes)
+        if self._api is not None:
+            self._api.emit_event(FILE_SYSTEM_CHANGED_EVENT, changes=changes)
+
+    def close(self) -> None:
+        """Stop watching everything."""
+        for root in list(self._scans):
+            self._cancel_scan(root)
+        if self._scanner is not None:
+            self._scanner.close()
+            self._scanner = None
+        self._roots.clear()
+        self._wd_paths.clear()
+        self._path_wds.clear()
+        self._entries.clear()
+        self._early_events.clear()
+        self._flush_timer.stop()
+        if self._backend is not None:
+            self._backend.close()
+            self._backend = None
+
+    # Watch management
+
+    def _get_backend(self):
+        if self._backend is None:
+            if sys.platform.startswith("linux"):
+                try:
+                    self._backend = _InotifyBackend(self._on_events, self)
+                except (OSError, AttributeError) as e:
+                    logger.warning(f"inotify unavailable, falling back to QFileSystemWatcher: {e}")
+            if self._backend is None:
+                self._backend = _QtBackend(self._on_events, self)
+        return self._backend
+
+    def _add_watch(self, path: str, wd: Optional[int] = None) -> bool:
+        """Register the watch of a directory, adding it unless a scanner already did."""
+        if path in self._path_wds:
+            return True
+        if len(self._path_wds) >= self.MAX_WATCHES:
+            self._report_limit()
+            return False
+        if wd is None:
+            try:
+                wd = self._get_backend().add_watch(path)
+            except OSError as e:
+                if e.errno == errno.ENOSPC:  # the system's inotify watch limit
+                    self._report_limit()
+                else:
+                    logger.debug(f"Cannot watch {path}: {e}")
+                return False
+        old_path = self._wd_paths.get(wd)
+        if old_path is not None:
+            self._path_wds.pop(old_path, None)
+        self._wd_paths[wd] = path
+        self._path_wds[path] = wd
+        return True
+
+    def _report_limit(self) -> None:
+        if not self._limit_reported:
+            self._limit_reported = True
+            logger.warning(f"File watcher limit reached at {len(self._path_wds)} directories")
+            self.watch_limit_reached.emit(len(self._path_wds))
+
+    def _remove_watches(self, directory: str) -> None:
+        for path in [path for path in self._path_wds if _is_under(path, directory)]:
+            wd = self._path_wds.pop(path)
+            self._wd_paths.pop(wd, None)
+            self._entries.pop(path, None)
+            if self._backend is not None:
+                self._backend.remove_watch(wd)
+
+    def _rename_watches(self, old_directory: str, new_directory: str) -> None:
+        for path in [path for path in self._path_wds if _is_under(path, old_directory)]:
+            new_path = new_directory + path[len(old_directory):]
+            wd = self._path_wds.pop(path)
+            self._path_wds[new_path] = wd
+            self._wd_paths[wd] = new_path
+            if path in self._entries:
+                self._entries[new_path] = self._entries.pop(path)
+
+    def _watch_new_tree(self, directory: str) -> None:
+        # Entries created before the watches were added are reported as created
+        self._cancel_scan(directory)
+        self._start_scan(directory, report_created=True)
+
+    def _start_scan(self, root: str, report_created: bool) -> None:
+        if self._scanner is None:
+            backend = self._get_backend()
+            # QFileSystemWatcher must be used from its own thread
+            add_watch = backend.add_watch if isinstance(backend, _InotifyBackend) else None
+            self._scanner = _WatchTreeScanner(add_watch, self._directories_found.emit, self._scan_finished.emit)
+        tree_scan = _TreeScan(root, self.MAX_WATCHES - len(self._path_wds), report_created)
+        self._scans[root] = tree_scan
+        self._scanner.scan(tree_scan)
+
+    def _cancel_scan(self, root: str) -> None:
+        tree_scan = self._scans.pop(root, None)
+        if tree_scan is not None:
+            tree_scan.cancelled = True
+
+    def _cancel_scans_under(self, directory: str) -> List[_TreeScan]:
+        stopped = [self._scans[root] for root in list(self._scans) if _is_under(root, directory)]
+        for tree_scan in stopped:
+            self._cancel_scan(tree_scan.root)
+        return stopped
+
+    def _on_directories_found(self, tree_scan: _TreeScan,
+                              found: List[Tuple[str, Optional[int], List[Tuple[str, bool]]]]) -> None:
+        if self._backend is None:
+            return
+        current = self._scans.get(tree_scan.root) is tree_scan
+        early_events: List[RawEvent] = []
+        for directory, wd, listing in found:
+            if not current or not self._add_watch(directory, wd):
+                if wd is not None and wd not in self._wd_paths:
+                    self._backend.remove_watch(wd)
+                continue
+            self._entries[directory] = {name for name, _is_dir in listing}
+            if tree_scan.report_created:
+                changes = self._changes(directory)
+                for name, is_dir in listing:
+                    changes.add_created(os.path.join(directory, name), is_dir)
+            early_events.extend(self._early_events.pop(self._path_wds[directory], ()))
+        if early_events:
+            self._on_events(early_events)
+        elif current and tree_scan.report_created:
+            self._schedule_flush()
+
+    def _on_scan_finished(self, tree_scan: _TreeScan) -> None:
+        if tree_scan.limit_reached:
+            self._report_limit()
+        if self._scans.get(tree_scan.root) is tree_scan:
+            del self._scans[tree_scan.root]
+            if not tree_scan.report_created:
+                logger.info(f"Watching {self.watch_count} directories")
+                self.watch_ready.emit(tree_scan.root)
+        if not self._scans:
+            self._early_events.clear()
+
+    # Event coalescing
+
+    def _changes(self, directory: str) -> _PendingChanges:
+        pending = self._pending.get(directory)
+        if pending is None:
+            pending = self._pending[directory] = _PendingChanges()
+        return pending
+
+    def _on_events(self, events: List[RawEvent]) -> None:
+        for wd, mask, cookie, name in events:
+            if mask & IN_Q_OVERFLOW:
+                self._overflow = True
+                continue
+            directory = self._wd_paths.get(wd)
+            if directory is None:
+                if self._scans:
+                    # Possibly a watch the scanner added but has not reported yet
+                    self._early_events.setdefault(wd, []).append((wd, mask, cookie, name))
+                continue
+            if mask & IN_IGNORED:
+                # The directory was deleted or unwatched
+                del self._wd_paths[wd]
+                if self._path_wds.get(directory) == wd:
+                    del self._path_wds[directory]
+                    self._entries.pop(directory, None)
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                # Reported by the parent directory
+                continue
+
+            path = os.path.join(directory, name)
+            is_dir = bool(mask & IN_ISDIR)
+            entries = self._entries.setdefault(directory, set())
+            if mask & IN_CREATE:
+                entries.add(name)
+                self._changes(directory).add_created(path, is_dir)
+                if is_dir and name not in IGNORED_DIRECTORIES:
+                    self._watch_new_tree(path)
+            elif mask & IN_DELETE:
+                entries.discard(name)
+                self._changes(directory).add_deleted(path, is_dir)
+                if is_dir:
+                    self._cancel_scans_under(path)
+            elif mask & (IN_CLOSE_WRITE | IN_MODIFY):
+                self._changes(directory).add_modified(path)
+            elif mask & IN_MOVED_FROM:
+                entries.discard(name)
+                self._move_sources[cookie] = (directory, path, is_dir)
+            elif mask & IN_MOVED_TO:
+                replaced = name in entries
+                entries.add(name)
+                self._on_moved_to(directory, path, is_dir, self._move_sources.pop(cookie, None), replaced)
+        self._schedule_flush()
+
+    def _on_moved_to(self, directory: str, path: str, is_dir: bool,
+                     source: Optional[Tuple[str, str, bool]], replaced: bool) -> None:
+        new_changes = self._changes(directory)
+        if source is None:
+            # Moved in from outside the watched trees
+            if replaced and not is_dir:
+                new_changes.add_modified(path)
+                return
+            new_changes.add_created(path, is_dir)
+            if is_dir and os.path.basename(path) not in IGNORED_DIRECTORIES:
+                self._watch_new_tree(path)
+            return
+
+        old_directory, old_path, _ = source
+        if is_dir:
+            self._rename_watches(old_path, path)
+            for tree_scan in self._cancel_scans_under(old_path):
+                # List the rest of the tree under its new name
+                self._start_scan(path + tree_scan.root[len(old_path):], tree_scan.report_created)
+            if os.path.basename(path) in IGNORED_DIRECTORIES:
+                self._cancel_scans_under(path)
+                self._remove_watches(path)
+        old_changes = self._changes(old_directory)
+        if old_path in old_changes.created:
+            # Created and renamed within one batch; over an existing file,
+            # e.g. by an editor's atomic save, the file was modified
+            del old_changes.created[old_path]
+            if replaced and not is_dir:
+                new_changes.add_modified(path)
+            else:
+                new_changes.add_created(path, is_dir)
+            return
+        # A move between directories is reported in both batches
+        move = (old_path, path)
+        for changes in (old_changes,) if new_changes is old_changes else (old_changes, new_changes):
+            changes.moved.append(move)
+            if is_dir:
+                changes.directories.update(move)
+
+    def _schedule_flush(self) -> None:
+        now = time.monotonic()
+        if not self._flush_timer.isActive():
+            self._first_pending = now
+        if (now - self._first_pending) * 1000 >= self.MAX_LATENCY_MS:
+            self._flush_timer.start(0)
+        else:
+            self._flush_timer.start(self.DEBOUNCE_MS)
+
+
+_file_watcher_service: Optional[FileWatcherService] = None
+
+
+def get_file_watcher_service() -> FileWatcherService:
+    """
+    Get the application-wide file watcher service.
+
+    Returns:
+        Shared FileWatcherService instance
+    """
+    global _file_watcher_service
+    if _file_watcher_service is None:
+        _file_watcher_service = FileWatcherService()
+    return _file_watcher_service
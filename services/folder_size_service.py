@@ -0,0 +1,411 @@
+"""
+Recursive folder sizes for the explorer.
+
+Sizes are computed on a background thread. A walk lists one tree level at a
+time with os.scandir on a small thread pool; like ``du -x`` it neither
+follows symlinks nor crosses into other file systems.
+
+For every directory the service records the bytes and number of its own
+files and the names of its subdirectories, keyed by the directory's device,
+inode and mtime, in a state store of its own (folder_sizes.db). A first walk
+of a large tree writes a row per directory; in the application state store
+those writes would hold its lock against navigation and settings saves, so
+they go to a separate database and are committed SAVE_BATCH rows at a time. A
+directory whose key is unchanged is not listed again, so recomputing a large
+tree after a restart costs one stat per directory. Recursive totals are
+summed from the records and kept in memory; invalidate() re-lists only the
+changed directory and re-sums its ancestors.
+
+Adding, removing or renaming an entry changes a directory's mtime, but
+rewriting a file in place does not. Such changes reach the service through
+invalidate(), called by file watchers and after file operations.
+"""
+
+import os
+import stat
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from PySide6.QtCore import QFileSystemWatcher, QLocale, QObject, QStandardPaths, Signal
+
+from services.state_store import StateStore
+from lg import logger
+
+NAMESPACE = "folder_sizes"
+FOLDER_SIZE_DATABASE_NAME = "folder_sizes.db"
+SAVE_BATCH = 1000  # records per write transaction
+SCAN_WORKERS = 8
+SCAN_BATCH = 64  # directories handed to the pool at once; bounds the wait at exit
+EMIT_INTERVAL = 0.1  # seconds between result batches while requests are queued
+
+# Pseudo file systems whose "sizes" mean nothing
+EXCLUDED_PATHS = frozenset({"/proc", "/sys", "/dev"})
+
+
+@dataclass(frozen=True)
+class FolderSize:
+    """Recursive size of a directory."""
+
+    size: int
+    file_count: int
+    folder_count: int
+
+
+def format_size(size: int) -> str:
+    """Format a byte count the way QFileSystemModel formats file sizes."""
+    return QLocale.system().formattedDataSize(size)
+
+
+def scan_directory(path: str, record: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    List a directory's own files and subdirectories. Runs on a pool thread.
+
+    Args:
+        path: Directory path
+        record: Previous record of the directory, returned as is if the
+            directory's device, inode and mtime are unchanged
+
+    Returns:
+        Record dict, or None if the path is no longer a directory
+    """
+    try:
+        st = os.stat(path, follow_symlinks=False)
+    except OSError:
+        return None
+    if not stat.S_ISDIR(st.st_mode):
+        return None
+    key = [st.st_dev, st.st_ino, st.st_mtime_ns]
+    if record is not None and record["key"] == key:
+        return record
+
+    size = files = 0
+    dirs = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    entry_stat = entry.stat(follow_symlinks=False)
+                    if stat.S_ISDIR(entry_stat.st_mode):
+                        # Stay on the directory's file system
+                        if entry_stat.st_dev == st.st_dev:
+                            dirs.append(entry.name)
+                    else:
+                        size += entry_stat.st_size
+                        files += 1
+                except OSError:
+                    continue
+    except OSError as e:
+        logger.debug(f"Cannot list {path}: {e}")
+    return {"key": key, "size": size, "files": files, "dirs": dirs}
+
+
+class _FolderSizeWalker:
+    """Daemon thread owning the directory records and recursive totals."""
+
+    def __init__(self, store: StateStore, on_results):
+        self._store = store
+        self._on_results = on_results
+        self._condition = threading.Condition()
+        self._requests: List[str] = []  # newest last, served first
+        self._invalidated: List[str] = []
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._totals: Dict[str, FolderSize] = {}
+        self._pool = ThreadPoolExecutor(SCAN_WORKERS, thread_name_prefix="folder-size-scan")
+        self._thread = threading.Thread(target=self._run, name="folder-size", daemon=True)
+        self._thread.start()
+
+    def request(self, path: str) -> None:
+        with self._condition:
+            if path in self._requests:
+                self._requests.remove(path)
+            self._requests.append(path)
+            self._condition.notify()
+
+    def invalidate(self, paths: List[str]) -> None:
+        with self._condition:
+            self._invalidated.extend(paths)
+            self._condition.notify()
+
+    def cancel_requests(self) -> List[str]:
+        with self._condition:
+            cancelled, self._requests = self._requests, []
+        return cancelled
+
+    def _run(self) -> None:
+        try:
+            self._records = dict(self._store.items(NAMESPACE))
+        except Exception as e:
+            logger.error(f"Failed to load folder size records: {e}")
+
+        results: Dict[str, Optional[FolderSize]] = {}
+        last_emit = time.monotonic()
+        while True:
+            with self._condition:
+                while not self._requests and not self._invalidated:
+                    self._condition.wait()
+                invalidated, self._invalidated = self._invalidated, []
+                path = self._requests.pop() if self._requests else None
+
+            for changed_path in invalidated:
+                self._invalidate(changed_path)
+            if path is not None:
+                try:
+                    results[path] = self._compute(path)
+                except Exception as e:
+                    logger.error(f"Failed to compute folder size of {path}: {e}")
+                    results[path] = None
+
+            with self._condition:
+                idle = not self._requests and not self._invalidated
+            if results and (idle or time.monotonic() - last_emit > EMIT_INTERVAL):
+                self._on_results(results)
+                results = {}
+                last_emit = time.monotonic()
+
+    def _invalidate(self, path: str) -> None:
+        # A changed file makes its directory stale
+        directory = path if path in self._records else os.path.dirname(path)
+        record = self._records.get(directory)
+        if record is not None:
+            self._records[directory] = dict(record, key=None)
+        while True:
+            self._totals.pop(directory, None)
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
+
+    def _compute(self, root: str) -> Optional[FolderSize]:
+        total = self._totals.get(root)
+        if total is not None:
+            return total
+
+        # A directory with a total has an up-to-date subtree, so the walk
+        # only descends into directories without one
+        scanned: List[str] = []
+        changed: Dict[str, Dict[str, Any]] = {}
+        removed: List[str] = []
+        frontier = [root]
+        while frontier:
+            next_frontier = []
+            for start in range(0, len(frontier), SCAN_BATCH):
+                batch = frontier[start:start + SCAN_BATCH]
+                old_records = [self._records.get(path) for path in batch]
+                for path, old, record in zip(batch, old_records,
+                                             self._pool.map(scan_directory, batch, old_records)):
+                    if record is None:
+                        self._drop(path, removed)
+                        continue
+                    if record is not old:
+                        self._records[path] = changed[path] = record
+                        if old is not None:
+                            for name in set(old["dirs"]).difference(record["dirs"]):
+                                self._drop(os.path.join(path, name), removed)
+                    scanned.append(path)
+                    next_frontier.extend(child for child in (os.path.join(path, name) for name in record["dirs"])
+                                         if child not in self._totals)
+            frontier = next_frontier
+
+        # Children were scanned after their parents
+        for path in reversed(scanned):
+            record = self._records[path]
+            size, file_count, folder_count = record["size"], record["files"], 0
+            for name in record["dirs"]:
+                child = self._totals.get(os.path.join(path, name))
+                if child is not None:
+                    size += child.size
+                    file_count += child.file_count
+                    folder_count += child.folder_count + 1
+            self._totals[path] = FolderSize(size, file_count, folder_count)
+
+        self._save(changed, removed)
+        return self._totals.get(root)
+
+    def _save(self, changed: Dict[str, Dict[str, Any]], removed: List[str]) -> None:
+        # Small transactions: a reader of the store never waits long, and an
+        # interrupted save only loses records that are recomputed anyway
+        changed_items = list(changed.items())
+        try:
+            for start in range(0, len(removed), SAVE_BATCH):
+                self._store.delete(NAMESPACE, *removed[start:start + SAVE_BATCH])
+            for start in range(0, len(changed_items), SAVE_BATCH):
+                self._store.put_many(NAMESPACE, changed_items[start:start + SAVE_BATCH])
+        except Exception as e:
+            logger.error(f"Failed to save folder size records: {e}")
+
+    def _drop(self, path: str, removed: List[str]) -> None:
+        stack = [path]
+        while stack:
+            path = stack.pop()
+            self._totals.pop(path, None)
+            record = self._records.pop(path, None)
+            if record is not None:
+                removed.append(path)
+                stack.extend(os.path.join(path, name) for name in record["dirs"])
+
+
+class FolderSizeService(QObject):
+    """
+    Recursive folder sizes computed in the background and cached.
+
+    Signals:
+        sizes_updated(object): Dict of path to FolderSize, or to None where
+            the size could not be computed
+    """
+
+    MAX_CACHED_SIZES = 4096
+    MAX_WATCHED_DIRECTORIES = 64
+
+    sizes_updated = Signal(object)
+    _walk_done = Signal(object)  # walker thread -> main thread
+
+    def __init__(self, state_store: Optional[StateStore] = None, parent: Optional[QObject] = None):
+        """
+        Initialize the folder size service.
+
+        Args:
+            state_store: Store for the directory records; defaults to the
+                folder size database in the app data directory
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self._store = state_store
+        self._walker: Optional[_FolderSizeWalker] = None
+        self._sizes: "OrderedDict[str, FolderSize]" = OrderedDict()
+        self._pending = set()
+        self._watched: "OrderedDict[str, None]" = OrderedDict()
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(lambda path: self.invalidate([path]))
+        self._walk_done.connect(self._on_walk_done)
+
+    def get_size(self, path: str) -> Optional[FolderSize]:
+        """
+        Get a directory's recursive size, computing it if it is not known.
+
+        A size that is being recomputed after a change is returned until the
+        new one arrives through sizes_updated.
+
+        Args:
+            path: Absolute directory path
+
+        Returns:
+            FolderSize, or None while it is being computed
+        """
+        folder_size = self._sizes.get(path)
+        if folder_size is None:
+            self.request(path)
+        return folder_size
+
+    def request(self, path: str) -> None:
+        """
+        Compute a directory's size in the background; the most recent
+        request is served first.
+
+        Args:
+            path: Absolute directory path
+        """
+        if path in self._pending or path in EXCLUDED_PATHS:
+            return
+        self._pending.add(path)
+        self._get_walker().request(path)
+
+    def cancel_requests(self) -> None:
+        """Drop requests that have not started, e.g. after leaving a directory."""
+        if self._walker is not None:
+            self._pending.difference_update(self._walker.cancel_requests())
+
+    def invalidate(self, paths: Iterable[str]) -> None:
+        """
+        Recompute sizes affected by changed files or directories.
+
+        Cached sizes of the paths' ancestors are recomputed and reported
+        through sizes_updated.
+
+        Args:
+            paths: Paths that were created, modified, deleted or renamed
+        """
+        paths = [os.path.abspath(path) for path in paths]
+        if not paths:
+            return
+        walker = self._get_walker()
+        walker.invalidate(paths)
+        stale = set()
+        for path in paths:
+            while path not in stale:
+                if path in self._sizes:
+                    stale.add(path)
+                parent = os.path.dirname(path)
+                if parent == path:
+                    break
+                path = parent
+        # Requested again even if pending: a walk already running may have
+        # started before the change
+        for path in stale:
+            self._pending.add(path)
+            walker.request(path)
+
+    def _get_walker(self) -> _FolderSizeWalker:
+        if self._walker is None:
+            self._walker = _FolderSizeWalker(self._store or get_folder_size_store(), self._walk_done.emit)
+        return self._walker
+
+    def _on_walk_done(self, results: Dict[str, Optional[FolderSize]]) -> None:
+        for path, folder_size in results.items():
+            self._pending.discard(path)
+            if folder_size is None:
+                self._sizes.pop(path, None)
+                continue
+            self._sizes[path] = folder_size
+            self._sizes.move_to_end(path)
+            self._watch(path)
+        while len(self._sizes) > self.MAX_CACHED_SIZES:
+            self._sizes.popitem(last=False)
+        self.sizes_updated.emit(results)
+
+    def _watch(self, path: str) -> None:
+        if path in self._watched:
+            self._watched.move_to_end(path)
+            return
+        if self._watcher.addPath(path):
+            self._watched[path] = None
+        while len(self._watched) > self.MAX_WATCHED_DIRECTORIES:
+            self._watcher.removePath(self._watched.popitem(last=False)[0])
+
+
+_folder_size_store: Optional[StateStore] = None
+
+
+def get_folder_size_store() -> StateStore:
+    """
+    Get the store of directory records in the app data directory.
+
+    Returns:
+        Shared StateStore instance, separate from the application state store
+    """
+    global _folder_size_store
+    if _folder_size_store is None:
+        app_data_dir = Path(QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation))
+        app_data_dir.mkdir(parents=True, exist_ok=True)
+        _folder_size_store = StateStore(app_data_dir / FOLDER_SIZE_DATABASE_NAME)
+    return _folder_size_store
+
+
+_folder_size_service: Optional[FolderSizeService] = None
+
+
+def get_folder_size_service() -> FolderSizeService:
+    """
+    Get the application-wide folder size service.
+
+    Returns:
+        Shared FolderSizeService instance
+    """
+    global _folder_size_service
+    if _folder_size_service is None:
+        _folder_size_service = FolderSizeService()
+    return _folder_size_service
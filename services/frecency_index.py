@@ -0,0 +1,227 @@
+"""
+Frecency index for visited locations.
+
+A location's frecency is the sum over its visits of 2 ** (-age / half_life),
+so frequent and recent visits both count and old visits fade out. Scaling
+every score by the same factor 2 ** (now / half_life) gives a rank that does
+not change as time passes:
+
+    rank = log2(sum(2 ** (visit_time / half_life)))
+
+The order of locations therefore only changes when one of them is visited.
+The index keeps a dict from path to entry plus a list ordered by rank; a
+visit updates the rank in O(1) and re-positions the entry by binary search,
+and the top k locations are a slice of the ordered list.
+"""
+
+import math
+import time
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+HALF_LIFE_SECONDS = 7 * 24 * 3600  # a visit counts half as much after a week
+
+
+def add_visit(rank: Optional[float], visit_time: float, half_life: float = HALF_LIFE_SECONDS) -> float:
+    """
+    Fold one visit into a rank.
+
+    Args:
+        rank: Current rank, or None for a location without visits
+        visit_time: Visit time in seconds since the epoch
+        half_life: Decay half-life in seconds
+
+    Returns:
+        New rank
+    """
+    visit_rank = visit_time / half_life
+    if rank is None:
+        return visit_rank
+    high, low = max(rank, visit_rank), min(rank, visit_rank)
+    # log2(2 ** high + 2 ** low) without overflowing
+    return high + math.log2(1.0 + 2.0 ** (low - high))
+
+
+@dataclass
+class FrecencyEntry:
+    """A visited location and its frecency rank."""
+
+    path: str
+    rank: float
+    visit_count: int
+    last_visited: float
+    display_name: str
+
+    def score(self, now: Optional[float] = None, half_life: float = HALF_LIFE_SECONDS) -> float:
+        """Decayed score at a point in time; one visit made at that time scores 1."""
+        now = time.time() if now is None else now
+        return 2.0 ** (self.rank - now / half_life)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary representation."""
+        return {
+            'path': self.path,
+            'rank': self.rank,
+            'visit_count': self.visit_count,
+            'last_visited': self.last_visited,
+            'display_name': self.display_name
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FrecencyEntry':
+        """Create FrecencyEntry from dictionary."""
+        return cls(
+            path=data['path'],
+            rank=data['rank'],
+            visit_count=data.get('visit_count', 1),
+            last_visited=data['last_visited'],
+            display_name=data.get('display_name') or data['path']
+        )
+
+
+class FrecencyIndex:
+    """Visited locations ordered by frecency."""
+
+    def __init__(self, half_life: float = HALF_LIFE_SECONDS):
+        """
+        Initialize an empty index.
+
+        Args:
+            half_life: Decay half-life in seconds
+        """
+        self.half_life = half_life
+        self._entries: Dict[str, FrecencyEntry] = {}
+        self._order: List[Tuple[float, str]] = []  # (-rank, path), best first
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._entries
+
+    def __iter__(self) -> Iterator[FrecencyEntry]:
+        """Iterate entries from the highest rank down."""
+        for _, path in self._order:
+            yield self._entries[path]
+
+    def get(self, path: str) -> Optional[FrecencyEntry]:
+        """Get the entry for a path."""
+        return self._entries.get(path)
+
+    def load(self, entries: List[FrecencyEntry]) -> None:
+        """
+        Replace the contents with stored entries.
+
+        Args:
+            entries: Entries to index
+        """
+        self._entries = {entry.path: entry for entry in entries}
+        self._order = sorted((-entry.rank, entry.path) for entry in self._entries.values())
+
+    def visit(self, path: str, display_name: str, visit_time: Optional[float] = None) -> FrecencyEntry:
+        """
+        Record a visit.
+
+        Args:
+            path: Visited path
+            display_name: Display name used if the path is new
+            visit_time: Visit time in seconds since the epoch; defaults to now
+
+        Returns:
+            Updated entry
+        """
+        visit_time = time.time() if visit_time is None else visit_time
+        entry = self._entries.get(path)
+        if entry is None:
+            entry = FrecencyEntry(path, add_visit(None, visit_time, self.half_life), 1, visit_time, display_name)
+            self._entries[path] = entry
+        else:
+            self._unlink(entry)
+            entry.rank = add_visit(entry.rank, visit_time, self.half_life)
+            entry.visit_count += 1
+            entry.last_visited = max(entry.last_visited, visit_time)
+        insort(self._order, (-entry.rank, path))
+        return entry
+
+    def remove(self, path: str) -> bool:
+        """
+        Remove a path.
+
+        Returns:
+            True if the path was indexed
+        """
+        entry = self._entries.pop(path, None)
+        if entry is None:
+            return False
+        self._unlink(entry)
+        return True
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self._order.clear()
+
+    def top(self, limit: int) -> List[FrecencyEntry]:
+        """
+        Get the highest ranked entries.
+
+        Args:
+            limit: Maximum number of entries
+
+        Returns:
+            Entries, best first
+        """
+        return [self._entries[path] for _, path in self._order[:limit]]
+
+    def match(self, query: str, limit: int) -> List[FrecencyEntry]:
+        """
+        Get the highest ranked entries whose path contains a query.
+
+        Args:
+            query: Case-insensitive substring
+            limit: Maximum number of entries
+
+        Returns:
+            Matching entries, best first
+        """
+        query = query.lower()
+        matches = []
+        for _, path in self._order:
+            if query in path.lower():
+                matches.append(self._entries[path])
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    def trim(self, max_entries: int) -> List[str]:
+        """
+        Drop the lowest ranked entries beyond a size limit.
+
+        Returns:
+            Removed paths
+        """
+        removed = [path for _, path in self._order[max_entries:]]
+        del self._order[max_entries:]
+        for path in removed:
+            del self._entries[path]
+        return removed
+
+    def prune(self, min_score: float, now: Optional[float] = None) -> List[str]:
+        """
+        Drop entries whose score has decayed below a threshold.
+
+        Args:
+            min_score: Lowest score to keep
+            now: Current time in seconds since the epoch
+
+        Returns:
+            Removed paths
+        """
+        now = time.time() if now is None else now
+        min_rank = math.log2(min_score) + now / self.half_life
+        return self.trim(bisect_left(self._order, (-min_rank, "")))
+
+    def _unlink(self, entry: FrecencyEntry) -> None:
+        position = bisect_left(self._order, (-entry.rank, entry.path))
+        del self._order[position]
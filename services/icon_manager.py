@@ -5,10 +5,13 @@ Handles dynamic icon generation with different states (active, hover, inactive)
 for the sidebar and other components.
 """
 
-from typing import Dict, Tuple, Optional
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Optional
 from pathlib import Path
-from PySide6.QtGui import QIcon, QPixmap, QPainter, QFont, QColor
-from PySide6.QtCore import Qt, QSize
+from PySide6.QtGui import QIcon, QPixmap, QPainter, QFont, QColor, QImage, QGuiApplication
+from PySide6.QtCore import Qt, QSize, QFile, QIODevice, QRect, QRectF, QByteArray
 from PySide6.QtSvg import QSvgRenderer
 from lg import logger
 
@@ -25,10 +28,26 @@ class IconManager:
     state handling (active, hover, inactive).
     """
 
-    def __init__(self):
-        self._icon_cache: Dict[str, QIcon] = {}
+    ATLAS_VERSION = 1
+    ATLAS_WIDTH = 512
+    ATLAS_ICON_NAMES = ('explorer', 'search', 'preferences', 'extensions', 'account')
+    ATLAS_STATES = ('active', 'inactive')
+    ATLAS_SIZES = (16, 24, 32)
+    RUNTIME_CACHE_LIMIT = 256
+
+    def __init__(self, atlas_dir: Optional[Path] = None):
+        # Runtime-generated icons, least recently used first
+        self._icon_cache: "OrderedDict[Tuple, QIcon]" = OrderedDict()
         self._default_size = 32
 
+        # Prebuilt SVG icon atlas, loaded lazily once a QGuiApplication exists
+        self._atlas_dir = atlas_dir or Path.home() / ".poeditor_plugin" / "icon_atlas"
+        self._atlas_pixmap: Optional[QPixmap] = None
+        self._atlas_index: Dict[str, List[int]] = {}
+        self._atlas_dpr = 1.0
+        self._atlas_loaded_from_disk = False
+        self._atlas_attempted = False
+
         # Sidebar icon colors (fixed dark theme)
         self._sidebar_colors = {
             'active': '#ffffff',
@@ -54,9 +73,10 @@ class IconManager:
         if size is None:
             size = self._default_size
 
-        cache_key = f"emoji_{emoji}_{size}_{color}"
-        if cache_key in self._icon_cache:
-            return self._icon_cache[cache_key]
+        cache_key = ('emoji', emoji, size, color)
+        cached = self._get_cached_icon(cache_key)
+        if cached is not None:
+            return cached
 
         # Create pixmap
         pixmap = QPixmap(size, size)
@@ -89,9 +109,7 @@ class IconManager:
         )
         painter.end()
 
-        icon = QIcon(pixmap)
-        self._icon_cache[cache_key] = icon
-        return icon
+        return self._cache_icon(cache_key, QIcon(pixmap))
 
     def create_sidebar_icon_states(self, emoji: str, size: Optional[int] = None) -> Dict[str, QIcon]:
         """
@@ -131,9 +149,10 @@ class IconManager:
         if size is None:
             size = self._default_size
 
-        cache_key = f"text_{text}_{size}_{color}_{background_color}"
-        if cache_key in self._icon_cache:
-            return self._icon_cache[cache_key]
+        cache_key = ('text', text, size, color, background_color)
+        cached = self._get_cached_icon(cache_key)
+        if cached is not None:
+            return cached
 
         # Create pixmap
         pixmap = QPixmap(size, size)
@@ -159,9 +178,7 @@ class IconManager:
         )
         painter.end()
 
-        icon = QIcon(pixmap)
-        self._icon_cache[cache_key] = icon
-        return icon
+        return self._cache_icon(cache_key, QIcon(pixmap))
 
     def create_colored_rect_icon(self, color: str, size: Optional[int] = None,
                                 border_color: Optional[str] = None) -> QIcon:
@@ -179,9 +196,10 @@ class IconManager:
         if size is None:
             size = self._default_size
 
-        cache_key = f"rect_{color}_{size}_{border_color or 'none'}"
-        if cache_key in self._icon_cache:
-            return self._icon_cache[cache_key]
+        cache_key = ('rect', color, size, border_color or 'none')
+        cached = self._get_cached_icon(cache_key)
+        if cached is not None:
+            return cached
 
         # Create pixmap
         pixmap = QPixmap(size, size)
@@ -199,9 +217,7 @@ class IconManager:
 
         painter.end()
 
-        icon = QIcon(pixmap)
-        self._icon_cache[cache_key] = icon
-        return icon
+        return self._cache_icon(cache_key, QIcon(pixmap))
 
     def _create_fallback_icon(self, size: int, color: str) -> QIcon:
         """
@@ -228,15 +244,24 @@ class IconManager:
             QIcon object
         """
         try:
-            # Determine icon path based on state
-            state_suffix = "_active" if active else "_inactive"
-            resource_path = f":icons/{icon_name}{state_suffix}.svg"
-
-            cache_key = f"svg_{icon_name}_{state_suffix}_{size}"
-            if cache_key in self._icon_cache:
-                return self._icon_cache[cache_key]
+            state = "active" if active else "inactive"
+            self._ensure_atlas()
+            dpr = self._atlas_dpr
+
+            cache_key = ('svg', icon_name, state, size, dpr)
+            cached = self._get_cached_icon(cache_key)
+            if cached is not None:
+                return cached
+
+            # Prebuilt sizes are cut straight out of the atlas
+            rect = self._atlas_index.get(self._atlas_key(icon_name, state, size, dpr))
+            if rect is not None and self._atlas_pixmap is not None:
+                pixmap = self._atlas_pixmap.copy(QRect(*rect))
+                pixmap.setDevicePixelRatio(dpr)
+                return self._cache_icon(cache_key, QIcon(pixmap))
 
             # Create SVG renderer
+            resource_path = f":icons/{icon_name}_{state}.svg"
             renderer = QSvgRenderer(resource_path)
             if not renderer.isValid():
                 logger.warning(f"Invalid SVG resource: {resource_path}")
@@ -248,17 +273,17 @@ class IconManager:
                 color = self._sidebar_colors['active'] if active else self._sidebar_colors['inactive']
                 return self.create_emoji_icon(emoji, size, color)
 
-            # Render to pixmap
-            pixmap = QPixmap(QSize(size, size))
+            # Render to pixmap at device resolution
+            pixel_size = round(size * dpr)
+            pixmap = QPixmap(QSize(pixel_size, pixel_size))
             pixmap.fill(Qt.GlobalColor.transparent)
 
             painter = QPainter(pixmap)
             renderer.render(painter)
             painter.end()
 
-            icon = QIcon(pixmap)
-            self._icon_cache[cache_key] = icon
-            return icon
+            pixmap.setDevicePixelRatio(dpr)
+            return self._cache_icon(cache_key, QIcon(pixmap))
 
         except Exception as e:
             logger.error(f"Failed to create SVG icon for {icon_name}: {e}")
@@ -343,13 +368,174 @@ class IconManager:
 
         return icons
 
+    def _get_cached_icon(self, cache_key: Tuple) -> Optional[QIcon]:
+        """Look up a runtime-generated icon and mark it as recently used."""
+        icon = self._icon_cache.get(cache_key)
+        if icon is not None:
+            self._icon_cache.move_to_end(cache_key)
+        return icon
+
+    def _cache_icon(self, cache_key: Tuple, icon: QIcon) -> QIcon:
+        """Store a runtime-generated icon, evicting the least recently used ones."""
+        self._icon_cache[cache_key] = icon
+        self._icon_cache.move_to_end(cache_key)
+        while len(self._icon_cache) > self.RUNTIME_CACHE_LIMIT:
+            self._icon_cache.popitem(last=False)
+        return icon
+
+    @staticmethod
+    def _atlas_key(icon_name: str, state: str, size: int, dpr: float) -> str:
+        """Build the atlas index key for an icon variant."""
+        return f"{icon_name}:{state}:{size}@{dpr:g}"
+
+    @staticmethod
+    def _read_svg_resource(icon_name: str, state: str) -> Optional[bytes]:
+        """Read the raw SVG bytes for an icon from the compiled resources."""
+        resource = QFile(f":icons/{icon_name}_{state}.svg")
+        if not resource.open(QIODevice.OpenModeFlag.ReadOnly):
+            return None
+        data = bytes(resource.readAll().data())
+        resource.close()
+        return data
+
+    def _ensure_atlas(self) -> None:
+        """Load or build the icon atlas on first use."""
+        if not self._atlas_attempted and QGuiApplication.instance() is not None:
+            self.load_icon_atlas()
+
+    def load_icon_atlas(self, rebuild: bool = False) -> bool:
+        """
+        Load the prebuilt icon atlas, rebuilding it when the SVG sources changed.
+
+        Every (icon, state, size) combination in ATLAS_ICON_NAMES, ATLAS_STATES
+        and ATLAS_SIZES is rasterised once at the primary screen's device pixel
+        ratio into a single PNG with a JSON index next to it. The atlas is keyed
+        by a hash of the SVG contents, so edited icons invalidate it.
+
+        Args:
+            rebuild: Rebuild the atlas even if a valid one exists on disk
+
+        Returns:
+            True if an atlas is available after the call
+        """
+        self._atlas_attempted = True
+        screen = QGuiApplication.primaryScreen()
+        dpr = screen.devicePixelRatio() if screen is not None else 1.0
+
+        sources = {}
+        for icon_name in self.ATLAS_ICON_NAMES:
+            for state in self.ATLAS_STATES:
+                data = self._read_svg_resource(icon_name, state)
+                if data is not None:
+                    sources[(icon_name, state)] = data
+        if not sources:
+            logger.warning("No SVG icon resources found, icon atlas disabled")
+            return False
+
+        digest = hashlib.sha256(f"v{self.ATLAS_VERSION}:{self.ATLAS_SIZES}".encode('utf-8'))
+        for (icon_name, state), data in sorted(sources.items()):
+            digest.update(f"{icon_name}:{state}:".encode('utf-8'))
+            digest.update(hashlib.sha256(data).digest())
+        source_hash = digest.hexdigest()
+
+        image_path = self._atlas_dir / "icon_atlas.png"
+        index_path = self._atlas_dir / "icon_atlas.json"
+        if not rebuild and self._load_atlas_files(image_path, index_path, source_hash, dpr):
+            return True
+
+        self._build_atlas(sources, source_hash, dpr, image_path, index_path)
+        return self._atlas_pixmap is not None
+
+    def _load_atlas_files(self, image_path: Path, index_path: Path,
+                          source_hash: str, dpr: float) -> bool:
+        """Load a previously saved atlas if it matches the current sources."""
+        try:
+            index = json.loads(index_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return False
+        if index.get('source_hash') != source_hash or index.get('dpr') != dpr:
+            logger.info("Icon atlas is stale, rebuilding")
+            return False
+
+        pixmap = QPixmap(str(image_path))
+        if pixmap.isNull():
+            return False
+
+        self._atlas_pixmap = pixmap
+        self._atlas_index = index.get('icons', {})
+        self._atlas_dpr = dpr
+        self._atlas_loaded_from_disk = True
+        logger.info(f"Loaded icon atlas with {len(self._atlas_index)} icons from {image_path}")
+        return True
+
+    def _build_atlas(self, sources: Dict[Tuple[str, str], bytes], source_hash: str,
+                     dpr: float, image_path: Path, index_path: Path) -> None:
+        """Rasterise all atlas icons into one image and save it with its index."""
+        # Shelf packing, largest icons first so rows stay dense
+        placements = []
+        x = y = shelf_height = 0
+        for size in sorted(self.ATLAS_SIZES, reverse=True):
+            pixel_size = round(size * dpr)
+            for icon_name, state in sorted(sources):
+                if x + pixel_size > self.ATLAS_WIDTH:
+                    x, y, shelf_height = 0, y + shelf_height, 0
+                placements.append((icon_name, state, size, [x, y, pixel_size, pixel_size]))
+                x += pixel_size
+                shelf_height = max(shelf_height, pixel_size)
+
+        image = QImage(self.ATLAS_WIDTH, y + shelf_height, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(image)
+        index = {}
+        for icon_name, state, size, rect in placements:
+            renderer = QSvgRenderer(QByteArray(sources[(icon_name, state)]))
+            if not renderer.isValid():
+                logger.warning(f"Skipping invalid SVG in icon atlas: {icon_name}_{state}")
+                continue
+            renderer.render(painter, QRectF(*rect))
+            index[self._atlas_key(icon_name, state, size, dpr)] = rect
+        painter.end()
+
+        self._atlas_pixmap = QPixmap.fromImage(image)
+        self._atlas_index = index
+        self._atlas_dpr = dpr
+        self._atlas_loaded_from_disk = False
+
+        try:
+            self._atlas_dir.mkdir(parents=True, exist_ok=True)
+            temp_image = image_path.with_suffix('.png.tmp')
+            if not image.save(str(temp_image), 'PNG'):
+                raise OSError(f"could not write {temp_image}")
+            temp_image.replace(image_path)
+            temp_index = index_path.with_suffix('.json.tmp')
+            temp_index.write_text(json.dumps({
+                'version': self.ATLAS_VERSION,
+                'source_hash': source_hash,
+                'dpr': dpr,
+                'icons': index
+            }), encoding='utf-8')
+            temp_index.replace(index_path)
+            logger.info(f"Built icon atlas with {len(index)} icons at {image_path}")
+        except OSError as e:
+            logger.warning(f"Failed to save icon atlas, using it in memory only: {e}")
+
+    def get_atlas_info(self) -> Dict[str, object]:
+        """Get information about the loaded icon atlas."""
+        return {
+            'loaded': self._atlas_pixmap is not None,
+            'from_disk': self._atlas_loaded_from_disk,
+            'icons': len(self._atlas_index),
+            'dpr': self._atlas_dpr,
+            'directory': str(self._atlas_dir)
+        }
+
     def clear_cache(self) -> None:
         """Clear the icon cache."""
         self._icon_cache.clear()
         logger.info("Icon cache cleared")
 
     def get_cache_size(self) -> int:
-        """Get the number of cached icons."""
+        """Get the number of cached runtime-generated icons."""
         return len(self._icon_cache)
 
     def set_default_size(self, size: int) -> None:
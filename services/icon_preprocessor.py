@@ -6,13 +6,19 @@ SVG data that automatically adapts to the current theme colors.
 """
 
 import base64
+import hashlib
 import re
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from xml.etree import ElementTree as ET
 from lg import logger
 
 
+# Placeholder substituted for every fill attribute value in an SVG template
+_FILL_SLOT = "__icon_fill_slot__"
+_FILL_PATTERN = re.compile(r'fill="[^"]*"')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
 class IconPreprocessor:
     """
     Processes SVG icons for theme integration.
@@ -22,6 +28,10 @@ class IconPreprocessor:
     - Dynamic color replacement based on theme variables
     - CSS class generation for theme-aware icons
     - Icon optimization and validation
+
+    Each SVG is parsed and minified once into a template whose fill values are
+    slots; colour variants are rendered by slot substitution and memoised by
+    (svg hash, colour).
     """
 
     def __init__(self, icons_dir: str = "icons"):
@@ -34,6 +44,9 @@ class IconPreprocessor:
         self.icons_dir = Path(icons_dir)
         self.processed_icons: Dict[str, Dict[str, str]] = {}
         self.color_mappings: Dict[str, str] = {}
+        self._templates: Dict[str, List[str]] = {}
+        self._encoded_variants: Dict[Tuple[str, str], str] = {}
+        self._generated_css: Dict[Tuple[bool, str], str] = {}
 
         # Initialize with default color mappings
         self._setup_default_color_mappings()
@@ -75,40 +88,87 @@ class IconPreprocessor:
                 logger.error(f"SVG file not found: {svg_path}")
                 return None
 
-            # Read and parse SVG
+            # Read SVG and compile its template
             svg_content = svg_path.read_text(encoding='utf-8')
+            svg_hash = self._compile_template(svg_content)
+            return self._store_icon_variants(svg_path.stem, svg_hash)
+
+        except Exception as e:
+            logger.error(f"Failed to process SVG file {svg_path}: {e}")
+            return None
 
-            # Extract icon name from filename
-            icon_name = svg_path.stem
+    def _store_icon_variants(self, icon_name: str, svg_hash: str) -> Dict[str, str]:
+        """
+        Render the variants of a compiled icon and store them.
 
-            # Generate variants for different states
-            variants = {}
+        Args:
+            icon_name: Icon name taken from the file name
+            svg_hash: Hash of the SVG template to render
 
-            # Determine state from filename
-            if icon_name.endswith('_active'):
-                base_name = icon_name[:-7]  # Remove '_active'
-                variants['active'] = self._create_icon_variant(svg_content, 'activity-active')
-            elif icon_name.endswith('_inactive'):
-                base_name = icon_name[:-9]  # Remove '_inactive'
-                variants['inactive'] = self._create_icon_variant(svg_content, 'activity-inactive')
-            else:
-                base_name = icon_name
-                # Generate multiple variants for this icon
-                variants['primary'] = self._create_icon_variant(svg_content, 'icon-primary')
-                variants['secondary'] = self._create_icon_variant(svg_content, 'icon-secondary')
-                variants['muted'] = self._create_icon_variant(svg_content, 'icon-muted')
+        Returns:
+            Dictionary with icon variants
+        """
+        # Generate variants for different states
+        variants = {}
+
+        # Determine state from filename
+        if icon_name.endswith('_active'):
+            base_name = icon_name[:-7]  # Remove '_active'
+            variants['active'] = self._render_variant(svg_hash, 'activity-active')
+        elif icon_name.endswith('_inactive'):
+            base_name = icon_name[:-9]  # Remove '_inactive'
+            variants['inactive'] = self._render_variant(svg_hash, 'activity-inactive')
+        else:
+            base_name = icon_name
+            # Generate multiple variants for this icon
+            variants['primary'] = self._render_variant(svg_hash, 'icon-primary')
+            variants['secondary'] = self._render_variant(svg_hash, 'icon-secondary')
+            variants['muted'] = self._render_variant(svg_hash, 'icon-muted')
+
+        # Store processed icon
+        if base_name not in self.processed_icons:
+            self.processed_icons[base_name] = {}
+        self.processed_icons[base_name].update(variants)
+        self._generated_css.clear()
+
+        logger.debug(f"Processed SVG icon: {icon_name} -> {base_name} ({len(variants)} variants)")
+        return variants
+
+    def _compile_template(self, svg_content: str) -> str:
+        """
+        Parse and minify an SVG once into a template with fill slots.
 
-            # Store processed icon
-            if base_name not in self.processed_icons:
-                self.processed_icons[base_name] = {}
-            self.processed_icons[base_name].update(variants)
+        Args:
+            svg_content: Original SVG content
 
-            logger.debug(f"Processed SVG icon: {icon_name} -> {base_name} ({len(variants)} variants)")
-            return variants
+        Returns:
+            Hash of the SVG content, used as the template key
+        """
+        svg_hash = hashlib.sha1(svg_content.encode('utf-8')).hexdigest()
+        if svg_hash not in self._templates:
+            slotted = _FILL_PATTERN.sub(f'fill="{_FILL_SLOT}"', svg_content)
+            self._templates[svg_hash] = self._minify_svg(slotted).split(_FILL_SLOT)
+        return svg_hash
 
-        except Exception as e:
-            logger.error(f"Failed to process SVG file {svg_path}: {e}")
-            return None
+    def _render_variant(self, svg_hash: str, color_key: str) -> str:
+        """
+        Render a compiled SVG template with the specified color mapping.
+
+        Args:
+            svg_hash: Hash of the compiled SVG template
+            color_key: Key for color mapping
+
+        Returns:
+            Base64 encoded SVG with theme variable colors
+        """
+        css_color = self.color_mappings.get(color_key, 'var(--fg-main)')
+        memo_key = (svg_hash, css_color)
+        encoded = self._encoded_variants.get(memo_key)
+        if encoded is None:
+            modified_svg = _WHITESPACE_PATTERN.sub(' ', css_color).join(self._templates[svg_hash])
+            encoded = base64.b64encode(modified_svg.encode('utf-8')).decode('ascii')
+            self._encoded_variants[memo_key] = encoded
+        return encoded
 
     def _create_icon_variant(self, svg_content: str, color_key: str) -> str:
         """
@@ -122,24 +182,7 @@ class IconPreprocessor:
             Base64 encoded SVG with theme variable colors
         """
         try:
-            # Replace fill colors with CSS variables
-            css_color = self.color_mappings.get(color_key, 'var(--fg-main)')
-
-            # Replace fill attributes in SVG
-            # This handles both fill="#ffffff" and fill="#858585" patterns
-            modified_svg = re.sub(
-                r'fill="[^"]*"',
-                f'fill="{css_color}"',
-                svg_content
-            )
-
-            # Ensure SVG is properly formatted and minified
-            modified_svg = self._minify_svg(modified_svg)
-
-            # Base64 encode for CSS embedding
-            encoded = base64.b64encode(modified_svg.encode('utf-8')).decode('ascii')
-
-            return encoded
+            return self._render_variant(self._compile_template(svg_content), color_key)
 
         except Exception as e:
             logger.error(f"Failed to create icon variant with color {color_key}: {e}")
@@ -155,6 +198,9 @@ class IconPreprocessor:
         Returns:
             Minified SVG content
         """
+        # Imported here: only minification needs an XML parser
+        from xml.etree import ElementTree as ET
+
         try:
             # Parse and re-serialize to clean up formatting
             root = ET.fromstring(svg_content)
@@ -192,13 +238,48 @@ class IconPreprocessor:
 
         # Process all SVG files
         for svg_file in self.icons_dir.glob("*.svg"):
-            result = self.process_svg_file(svg_file)
-            if result:
+            svg_hash = self._read_and_compile(svg_file)
+            if svg_hash is not None:
+                self._store_icon_variants(svg_file.stem, svg_hash)
                 processed_count += 1
 
         logger.info(f"Processed {processed_count} SVG icons into {len(self.processed_icons)} icon sets")
         return self.processed_icons
 
+    def _read_and_compile(self, svg_path: Path) -> Optional[str]:
+        """
+        Read an SVG file and compile its template.
+
+        Args:
+            svg_path: Path to the SVG file
+
+        Returns:
+            Template hash or None if the file could not be processed
+        """
+        try:
+            return self._compile_template(svg_path.read_text(encoding='utf-8'))
+        except Exception as e:
+            logger.error(f"Failed to process SVG file {svg_path}: {e}")
+            return None
+
+    def get_source_fingerprint(self) -> str:
+        """
+        Get a fingerprint of the icon sources used for CSS generation.
+
+        Built from SVG file names, sizes and modification times plus the color
+        mappings, so it changes whenever generated icon CSS would change without
+        reading any icon file.
+
+        Returns:
+            Fingerprint string suitable for hashing into cache keys
+        """
+        parts = [f"{key}={value}" for key, value in sorted(self.color_mappings.items())]
+        if self.icons_dir.exists():
+            for svg_file in sorted(self.icons_dir.glob("*.svg")):
+                stat = svg_file.stat()
+                parts.append(f"{svg_file.name}:{stat.st_size}:{stat.st_mtime_ns}")
+        return "\n".join(parts)
+
     def generate_icon_css(self, generate_variables: bool = False, class_prefix: str = "icon-") -> str:
         """
         Generate CSS for all icons in the directory.
@@ -215,10 +296,13 @@ class IconPreprocessor:
             logger.debug("Processing icons before CSS generation...")
             self.process_all_icons()
 
-        if generate_variables:
-            return self._generate_icon_variables()
-        else:
-            return self._generate_icon_classes(class_prefix)
+        cache_key = (generate_variables, "" if generate_variables else class_prefix)
+        if cache_key not in self._generated_css:
+            if generate_variables:
+                self._generated_css[cache_key] = self._generate_icon_variables()
+            else:
+                self._generated_css[cache_key] = self._generate_icon_classes(class_prefix)
+        return self._generated_css[cache_key]
 
     def _generate_icon_variables(self) -> str:
         """
@@ -13,6 +13,8 @@ from datetime import datetime
 from PySide6.QtCore import QObject, Signal, QStandardPaths
 from lg import logger
 
+from services.state_store import StateStore, get_state_store
+
 
 class QuickLocation:
     """Data class representing a quick access location."""
@@ -109,14 +111,23 @@ class LocationManager(QObject):
     BOOKMARKS_FILE_NAME = "bookmarks.json"
     QUICK_LOCATIONS_FILE_NAME = "quick_locations.json"
 
-    def __init__(self, parent=None):
+    # State store namespaces
+    BOOKMARKS_NAMESPACE = "bookmarks"
+    CATEGORIES_NAMESPACE = "bookmark_categories"
+    QUICK_LOCATIONS_NAMESPACE = "quick_locations"
+
+    STANDARD_LOCATION_NAMES = {"Home", "Root", "Documents", "Downloads", "Desktop", "Applications", "Project Root"}
+
+    def __init__(self, parent=None, state_store: Optional[StateStore] = None):
         """
         Initialize the LocationManager.
 
         Args:
             parent: Parent QObject
+            state_store: State store to persist into (defaults to the shared store)
         """
         super().__init__(parent)
+        self._store = state_store or get_state_store()
 
         # Storage for locations and bookmarks
         self._quick_locations: List[QuickLocation] = []
@@ -132,6 +143,7 @@ class LocationManager(QObject):
         self._quick_locations_file_path = self._storage_dir / self.QUICK_LOCATIONS_FILE_NAME
 
         # Initialize locations and load data
+        self._migrate_json_files()
         self._initialize_quick_locations()
         self._load_bookmarks()
         self._load_custom_quick_locations()
@@ -208,7 +220,7 @@ class LocationManager(QObject):
             self._bookmark_categories.append(category)
 
         # Save and emit signals
-        self._save_bookmarks()
+        self._save_bookmark(bookmark)
         self.bookmarks_changed.emit()
 
         logger.info(f"Added bookmark: {name} -> {path}")
@@ -227,7 +239,7 @@ class LocationManager(QObject):
         for i, bookmark in enumerate(self._bookmarks):
             if bookmark.id == bookmark_id:
                 removed_bookmark = self._bookmarks.pop(i)
-                self._save_bookmarks()
+                self._delete_bookmark(removed_bookmark)
                 self.bookmarks_changed.emit()
                 logger.info(f"Removed bookmark: {removed_bookmark.name}")
                 return True
@@ -268,7 +280,7 @@ class LocationManager(QObject):
                     if category not in self._bookmark_categories:
                         self._bookmark_categories.append(category)
 
-                self._save_bookmarks()
+                self._save_bookmark(bookmark)
                 self.bookmarks_changed.emit()
                 logger.info(f"Updated bookmark: {bookmark.name}")
                 return True
@@ -321,7 +333,7 @@ class LocationManager(QObject):
         self._quick_locations.append(location)
 
         # Save and emit signals
-        self._save_quick_locations()
+        self._save_quick_location(location)
         self.quick_locations_changed.emit()
 
         logger.info(f"Added quick location: {name} -> {path}")
@@ -341,7 +353,7 @@ class LocationManager(QObject):
         for i, location in enumerate(self._quick_locations):
             if location.path == resolved_path:
                 removed_location = self._quick_locations.pop(i)
-                self._save_quick_locations()
+                self._store.delete(self.QUICK_LOCATIONS_NAMESPACE, removed_location.path)
                 self.quick_locations_changed.emit()
                 logger.info(f"Removed quick location: {removed_location.name}")
                 return True
@@ -511,39 +523,72 @@ class LocationManager(QObject):
         storage_dir.mkdir(parents=True, exist_ok=True)
         return storage_dir
 
+    def _migrate_json_files(self):
+        """Import the bookmark and quick location JSON files of older versions once."""
+        def import_bookmarks(data):
+            self._store.put_many(self.BOOKMARKS_NAMESPACE,
+                                 [(bm_data['id'], bm_data) for bm_data in data.get('bookmarks', [])])
+            if 'categories' in data:
+                self._store.replace(self.CATEGORIES_NAMESPACE,
+                                    [(category, True) for category in data['categories']])
+
+        def import_quick_locations(data):
+            self._store.put_many(self.QUICK_LOCATIONS_NAMESPACE,
+                                 [(loc_data['path'], loc_data) for loc_data in data.get('custom_locations', [])])
+
+        try:
+            self._store.migrate_json("locations.bookmarks", self._bookmarks_file_path, import_bookmarks)
+            self._store.migrate_json("locations.quick_locations", self._quick_locations_file_path,
+                                     import_quick_locations)
+        except Exception as e:
+            logger.error(f"Failed to migrate location files: {str(e)}")
+
     def _load_bookmarks(self):
         """Load bookmarks from persistent storage."""
         try:
-            if self._bookmarks_file_path.exists():
-                with open(self._bookmarks_file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-
-                # Load bookmarks
-                bookmark_data = data.get('bookmarks', [])
-                self._bookmarks = [
-                    LocationBookmark.from_dict(bm_data)
-                    for bm_data in bookmark_data
-                ]
+            self._bookmarks = [
+                LocationBookmark.from_dict(bm_data)
+                for _, bm_data in self._store.items(self.BOOKMARKS_NAMESPACE)
+            ]
 
-                # Load categories
-                self._bookmark_categories = data.get('categories', self._bookmark_categories)
+            # Load categories
+            categories = [category for category, _ in self._store.items(self.CATEGORIES_NAMESPACE)]
+            if categories:
+                self._bookmark_categories = categories
 
-                logger.info(f"Loaded {len(self._bookmarks)} bookmarks")
+            logger.info(f"Loaded {len(self._bookmarks)} bookmarks")
 
         except Exception as e:
             logger.error(f"Failed to load bookmarks: {str(e)}")
 
-    def _save_bookmarks(self):
-        """Save bookmarks to persistent storage."""
+    def _save_bookmark(self, bookmark: LocationBookmark):
+        """Save one bookmark and the category list."""
         try:
-            data = {
-                'bookmarks': [bm.to_dict() for bm in self._bookmarks],
-                'categories': self._bookmark_categories,
-                'saved_at': datetime.now().isoformat()
-            }
+            with self._store.transaction():
+                self._store.put(self.BOOKMARKS_NAMESPACE, bookmark.id, bookmark.to_dict())
+                self._save_categories()
+        except Exception as e:
+            logger.error(f"Failed to save bookmark: {str(e)}")
 
-            with open(self._bookmarks_file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+    def _delete_bookmark(self, bookmark: LocationBookmark):
+        """Delete one bookmark from persistent storage."""
+        try:
+            self._store.delete(self.BOOKMARKS_NAMESPACE, bookmark.id)
+        except Exception as e:
+            logger.error(f"Failed to delete bookmark: {str(e)}")
+
+    def _save_categories(self):
+        """Save the category list; unchanged categories are not rewritten."""
+        self._store.replace(self.CATEGORIES_NAMESPACE,
+                            [(category, True) for category in self._bookmark_categories])
+
+    def _save_bookmarks(self):
+        """Save all bookmarks to persistent storage, writing only changed rows."""
+        try:
+            with self._store.transaction():
+                self._store.replace(self.BOOKMARKS_NAMESPACE,
+                                    [(bm.id, bm.to_dict()) for bm in self._bookmarks])
+                self._save_categories()
 
         except Exception as e:
             logger.error(f"Failed to save bookmarks: {str(e)}")
@@ -551,41 +596,37 @@ class LocationManager(QObject):
     def _load_custom_quick_locations(self):
         """Load custom quick locations from persistent storage."""
         try:
-            if self._quick_locations_file_path.exists():
-                with open(self._quick_locations_file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-
-                # Load custom locations and append to standard ones
-                custom_locations = [
-                    QuickLocation.from_dict(loc_data)
-                    for loc_data in data.get('custom_locations', [])
-                ]
+            # Load custom locations and append to standard ones
+            custom_locations = [
+                QuickLocation.from_dict(loc_data)
+                for _, loc_data in self._store.items(self.QUICK_LOCATIONS_NAMESPACE)
+            ]
 
-                self._quick_locations.extend(custom_locations)
+            self._quick_locations.extend(custom_locations)
 
-                logger.info(f"Loaded {len(custom_locations)} custom quick locations")
+            logger.info(f"Loaded {len(custom_locations)} custom quick locations")
 
         except Exception as e:
             logger.error(f"Failed to load custom quick locations: {str(e)}")
 
+    def _save_quick_location(self, location: QuickLocation):
+        """Save one custom quick location."""
+        if location.name in self.STANDARD_LOCATION_NAMES:
+            return
+        try:
+            self._store.put(self.QUICK_LOCATIONS_NAMESPACE, location.path, location.to_dict())
+        except Exception as e:
+            logger.error(f"Failed to save custom quick location: {str(e)}")
+
     def _save_quick_locations(self):
-        """Save custom quick locations to persistent storage."""
+        """Save all custom quick locations to persistent storage, writing only changed rows."""
         try:
-            # Separate standard and custom locations
-            # (This is a simplified approach - in practice, you might want to track this differently)
-            standard_names = {"Home", "Root", "Documents", "Downloads", "Desktop", "Applications", "Project Root"}
             custom_locations = [
                 loc for loc in self._quick_locations
-                if loc.name not in standard_names
+                if loc.name not in self.STANDARD_LOCATION_NAMES
             ]
-
-            data = {
-                'custom_locations': [loc.to_dict() for loc in custom_locations],
-                'saved_at': datetime.now().isoformat()
-            }
-
-            with open(self._quick_locations_file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self._store.replace(self.QUICK_LOCATIONS_NAMESPACE,
+                                [(loc.path, loc.to_dict()) for loc in custom_locations])
 
         except Exception as e:
             logger.error(f"Failed to save custom quick locations: {str(e)}")
@@ -2,10 +2,10 @@
 NavigationHistoryService - Navigation history tracking and management.
 
 This service manages the navigation history, providing back/forward
-functionality and tracking recent locations with timestamps.
+functionality and ranking visited locations by frecency.
 """
 
-import json
+import math
 import time
 from collections import deque
 from pathlib import Path
@@ -14,6 +14,9 @@ from datetime import datetime, timedelta
 from PySide6.QtCore import QObject, Signal, QStandardPaths
 from lg import logger
 
+from services.frecency_index import FrecencyEntry, FrecencyIndex, add_visit
+from services.state_store import StateStore, diff_rows, get_state_store
+
 
 class NavigationHistoryService(QObject):
     """
@@ -33,18 +36,27 @@ class NavigationHistoryService(QObject):
 
     # Configuration constants
     MAX_HISTORY_SIZE = 100
-    MAX_RECENT_LOCATIONS = 20
+    MAX_RECENT_LOCATIONS = 20  # default number of locations returned
+    MAX_TRACKED_LOCATIONS = 20000  # visited locations kept for ranking
+    MIN_FRECENCY_SCORE = 0.05  # about one visit a month ago
     HISTORY_FILE_NAME = "navigation_history.json"
     RECENT_LOCATIONS_FILE_NAME = "recent_locations.json"
 
-    def __init__(self, parent=None):
+    # State store namespaces
+    HISTORY_NAMESPACE = "navigation_history"
+    RECENT_LOCATIONS_NAMESPACE = "recent_locations"
+
+    def __init__(self, parent=None, state_store: Optional[StateStore] = None):
         """
         Initialize the NavigationHistoryService.
 
         Args:
             parent: Parent QObject
+            state_store: State store to persist into (defaults to the shared store)
         """
         super().__init__(parent)
+        self._store = state_store or get_state_store()
+        self._saved_history: Dict[str, str] = {}  # history row -> last saved JSON text
 
         # History deques for back/forward navigation
         self._back_history: Deque[str] = deque(maxlen=self.MAX_HISTORY_SIZE)
@@ -53,8 +65,8 @@ class NavigationHistoryService(QObject):
         # Current position tracking
         self._current_path: Optional[str] = None
 
-        # Recent locations with metadata
-        self._recent_locations: List[Dict[str, Any]] = []
+        # Visited locations ranked by frecency
+        self._frecency = FrecencyIndex()
 
         # Storage paths
         self._storage_dir = self._get_storage_directory()
@@ -62,6 +74,7 @@ class NavigationHistoryService(QObject):
         self._recent_file_path = self._storage_dir / self.RECENT_LOCATIONS_FILE_NAME
 
         # Load persistent data
+        self._migrate_json_files()
         self._load_history()
         self._load_recent_locations()
 
@@ -87,11 +100,10 @@ class NavigationHistoryService(QObject):
         # Update current path
         self._current_path = path
 
-        # Update recent locations
-        self._update_recent_location(path)
-
-        # Save to persistent storage
-        self._save_history()
+        # Update recent locations and history rows in one transaction
+        with self._store.transaction():
+            self._update_recent_location(path)
+            self._save_history()
 
         # Emit signals
         self.history_changed.emit()
@@ -194,7 +206,7 @@ class NavigationHistoryService(QObject):
 
     def get_recent_locations(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
-        Get recent locations with metadata.
+        Get visited locations ranked by frecency, with metadata.
 
         Args:
             limit: Maximum number of entries to return
@@ -205,7 +217,20 @@ class NavigationHistoryService(QObject):
         if limit is None:
             limit = self.MAX_RECENT_LOCATIONS
 
-        return self._recent_locations[:limit]
+        return self._location_dicts(self._frecency.top(limit))
+
+    def match_recent_locations(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get the best ranked visited locations whose path contains a query.
+
+        Args:
+            query: Case-insensitive substring of the path
+            limit: Maximum number of entries to return
+
+        Returns:
+            List of recent location dictionaries with metadata
+        """
+        return self._location_dicts(self._frecency.match(query, limit))
 
     def clear_history(self):
         """Clear all navigation history."""
@@ -221,10 +246,13 @@ class NavigationHistoryService(QObject):
 
     def clear_recent_locations(self):
         """Clear all recent locations."""
-        self._recent_locations.clear()
+        self._frecency.clear()
 
         # Save cleared state
-        self._save_recent_locations()
+        try:
+            self._store.clear(self.RECENT_LOCATIONS_NAMESPACE)
+        except Exception as e:
+            logger.error(f"Failed to clear recent locations: {str(e)}")
         self.recent_locations_changed.emit()
 
         logger.info("Recent locations cleared")
@@ -236,13 +264,13 @@ class NavigationHistoryService(QObject):
         Args:
             path: Path to remove
         """
-        self._recent_locations = [
-            loc for loc in self._recent_locations
-            if loc.get('path') != path
-        ]
+        self._frecency.remove(path)
 
         # Save updated state
-        self._save_recent_locations()
+        try:
+            self._store.delete(self.RECENT_LOCATIONS_NAMESPACE, path)
+        except Exception as e:
+            logger.error(f"Failed to remove recent location: {str(e)}")
         self.recent_locations_changed.emit()
 
         logger.debug(f"Removed from recent locations: {path}")
@@ -257,50 +285,39 @@ class NavigationHistoryService(QObject):
         return {
             'back_history_count': len(self._back_history),
             'forward_history_count': len(self._forward_history),
-            'recent_locations_count': len(self._recent_locations),
+            'recent_locations_count': len(self._frecency),
             'current_path': self._current_path,
-            'total_visits': sum(loc.get('visit_count', 1) for loc in self._recent_locations)
+            'total_visits': sum(entry.visit_count for entry in self._frecency)
         }
 
+    def _location_dicts(self, entries: List[FrecencyEntry]) -> List[Dict[str, Any]]:
+        """Convert frecency entries to recent location dictionaries."""
+        now = time.time()
+        return [{
+            'path': entry.path,
+            'last_visited': datetime.fromtimestamp(entry.last_visited).isoformat(),
+            'visit_count': entry.visit_count,
+            'display_name': entry.display_name,
+            'score': entry.score(now, self._frecency.half_life)
+        } for entry in entries]
+
     def _update_recent_location(self, path: str):
         """
-        Update the recent locations list with the given path.
+        Record a visit to the given path in the frecency index.
 
         Args:
             path: Path to update in recent locations
         """
-        current_time = datetime.now().isoformat()
-
-        # Check if path already exists in recent locations
-        existing_location = None
-        for i, location in enumerate(self._recent_locations):
-            if location.get('path') == path:
-                existing_location = location
-                self._recent_locations.pop(i)
-                break
-
-        # Create or update location entry
-        if existing_location:
-            existing_location['last_visited'] = current_time
-            existing_location['visit_count'] = existing_location.get('visit_count', 1) + 1
-            location_entry = existing_location
-        else:
-            location_entry = {
-                'path': path,
-                'last_visited': current_time,
-                'visit_count': 1,
-                'display_name': self._get_display_name(path)
-            }
-
-        # Add to beginning of list
-        self._recent_locations.insert(0, location_entry)
-
-        # Trim to maximum size
-        if len(self._recent_locations) > self.MAX_RECENT_LOCATIONS:
-            self._recent_locations = self._recent_locations[:self.MAX_RECENT_LOCATIONS]
+        entry = self._frecency.visit(path, self._get_display_name(path))
+        evicted = self._frecency.trim(self.MAX_TRACKED_LOCATIONS)
 
-        # Save updated state
-        self._save_recent_locations()
+        # Save updated state: one row for the visited path
+        try:
+            with self._store.transaction():
+                self._store.put(self.RECENT_LOCATIONS_NAMESPACE, path, entry.to_dict())
+                self._store.delete(self.RECENT_LOCATIONS_NAMESPACE, *evicted)
+        except Exception as e:
+            logger.error(f"Failed to save recent location: {str(e)}")
         self.recent_locations_changed.emit()
 
     def _get_display_name(self, path: str) -> str:
@@ -338,16 +355,44 @@ class NavigationHistoryService(QObject):
         storage_dir.mkdir(parents=True, exist_ok=True)
         return storage_dir
 
+    def _migrate_json_files(self):
+        """Import the history and recent location JSON files of older versions once."""
+        def import_history(data):
+            self._store.put_many(self.HISTORY_NAMESPACE, [
+                ('back_history', data.get('back_history', [])),
+                ('forward_history', data.get('forward_history', [])),
+                ('current_path', data.get('current_path')),
+            ])
+
+        def import_recent_locations(data):
+            self._store.put_many(self.RECENT_LOCATIONS_NAMESPACE, [
+                (location['path'], location) for location in data.get('recent_locations', [])
+                if location.get('path')
+            ])
+
+        try:
+            self._store.migrate_json("navigation.history", self._history_file_path, import_history)
+            self._store.migrate_json("navigation.recent_locations", self._recent_file_path,
+                                     import_recent_locations)
+        except Exception as e:
+            logger.error(f"Failed to migrate navigation files: {str(e)}")
+
+    def _history_rows(self) -> Dict[str, Any]:
+        """Current history state as state store rows."""
+        return {
+            'back_history': list(self._back_history),
+            'forward_history': list(self._forward_history),
+            'current_path': self._current_path,
+        }
+
     def _load_history(self):
         """Load navigation history from persistent storage."""
         try:
-            if self._history_file_path.exists():
-                with open(self._history_file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-
+            data = dict(self._store.items(self.HISTORY_NAMESPACE))
+            if data:
                 # Load history lists
-                back_history = data.get('back_history', [])
-                forward_history = data.get('forward_history', [])
+                back_history = data.get('back_history') or []
+                forward_history = data.get('forward_history') or []
 
                 # Populate deques
                 self._back_history.extend(back_history)
@@ -358,56 +403,73 @@ class NavigationHistoryService(QObject):
 
                 logger.info(f"Loaded navigation history: {len(back_history)} back, {len(forward_history)} forward")
 
+            diff_rows(self._saved_history, self._history_rows())
+
         except Exception as e:
             logger.error(f"Failed to load navigation history: {str(e)}")
 
     def _save_history(self):
-        """Save navigation history to persistent storage."""
+        """Save navigation history to persistent storage, writing only changed rows."""
         try:
-            data = {
-                'back_history': list(self._back_history),
-                'forward_history': list(self._forward_history),
-                'current_path': self._current_path,
-                'saved_at': datetime.now().isoformat()
-            }
-
-            with open(self._history_file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            changed, _ = diff_rows(self._saved_history, self._history_rows())
+            self._store.put_many(self.HISTORY_NAMESPACE, changed)
 
         except Exception as e:
+            self._saved_history.clear()
             logger.error(f"Failed to save navigation history: {str(e)}")
 
     def _load_recent_locations(self):
         """Load recent locations from persistent storage."""
         try:
-            if self._recent_file_path.exists():
-                with open(self._recent_file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+            entries = []
+            converted = []
+            for _, location in self._store.items(self.RECENT_LOCATIONS_NAMESPACE):
+                if 'rank' in location:
+                    entries.append(FrecencyEntry.from_dict(location))
+                elif location.get('path'):
+                    entry = self._entry_from_legacy(location)
+                    entries.append(entry)
+                    converted.append((entry.path, entry.to_dict()))
+            self._frecency.load(entries)
+
+            # Drop locations whose score has decayed away
+            expired = self._frecency.prune(self.MIN_FRECENCY_SCORE)
+            expired += self._frecency.trim(self.MAX_TRACKED_LOCATIONS)
+            if converted or expired:
+                expired_paths = set(expired)
+                with self._store.transaction():
+                    self._store.put_many(self.RECENT_LOCATIONS_NAMESPACE,
+                                         [row for row in converted if row[0] not in expired_paths])
+                    self._store.delete(self.RECENT_LOCATIONS_NAMESPACE, *expired)
+
+            logger.info(f"Loaded {len(self._frecency)} recent locations")
 
-                self._recent_locations = data.get('recent_locations', [])
+        except Exception as e:
+            logger.error(f"Failed to load recent locations: {str(e)}")
 
-                # Clean up old entries (older than 30 days)
-                cutoff_date = datetime.now() - timedelta(days=30)
-                self._recent_locations = [
-                    loc for loc in self._recent_locations
-                    if loc.get('last_visited') and self._parse_timestamp(loc.get('last_visited', '')) > cutoff_date
-                ]
+    def _entry_from_legacy(self, location: Dict[str, Any]) -> FrecencyEntry:
+        """
+        Convert a recent location saved by older versions.
 
-                logger.info(f"Loaded {len(self._recent_locations)} recent locations")
+        The visits are assumed to have been made at the last visit time.
 
-        except Exception as e:
-            logger.error(f"Failed to load recent locations: {str(e)}")
+        Args:
+            location: Dictionary with an ISO 'last_visited' and a 'visit_count'
+
+        Returns:
+            Equivalent frecency entry
+        """
+        last_visited = self._parse_timestamp(location.get('last_visited', '')).timestamp()
+        visit_count = max(1, int(location.get('visit_count', 1)))
+        rank = add_visit(None, last_visited, self._frecency.half_life) + math.log2(visit_count)
+        return FrecencyEntry(location['path'], rank, visit_count, last_visited,
+                             location.get('display_name') or self._get_display_name(location['path']))
 
     def _save_recent_locations(self):
-        """Save recent locations to persistent storage."""
+        """Save recent locations to persistent storage, writing only changed rows."""
         try:
-            data = {
-                'recent_locations': self._recent_locations,
-                'saved_at': datetime.now().isoformat()
-            }
-
-            with open(self._recent_file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self._store.replace(self.RECENT_LOCATIONS_NAMESPACE,
+                                [(entry.path, entry.to_dict()) for entry in self._frecency])
 
         except Exception as e:
             logger.error(f"Failed to save recent locations: {str(e)}")
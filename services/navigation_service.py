@@ -4,13 +4,21 @@ NavigationService - Core navigation orchestration service.
 This service provides the main navigation functionality for the Explorer,
 coordinating between different navigation components and managing the
 overall navigation state.
+
+Target paths are checked through the shared PathProbe, so a slow or hung
+mount never blocks the event loop: navigate_to waits briefly for the probe
+and otherwise finishes the navigation in the background, reporting through
+the usual signals. A newer navigation supersedes a pending one.
 """
 
+import os
 from pathlib import Path
-from typing import Optional, List, Dict, Any, TYPE_CHECKING
+from typing import Optional, List, Dict, Any, Tuple, TYPE_CHECKING
 from PySide6.QtCore import QObject, Signal, QThread, QTimer
 from lg import logger
 
+from services.path_probe import PathProbe, PathStatus, get_path_probe
+
 if TYPE_CHECKING:
     from .navigation_history_service import NavigationHistoryService
     from .location_manager import LocationManager
@@ -39,12 +47,16 @@ class NavigationService(QObject):
     current_path_changed = Signal(str)
     navigation_state_changed = Signal(dict)
 
-    def __init__(self, parent=None):
+    # Milliseconds navigate_to waits for a path probe before finishing asynchronously
+    NAVIGATION_WAIT_MS = 150
+
+    def __init__(self, parent=None, path_probe: Optional[PathProbe] = None):
         """
         Initialize the NavigationService.
 
         Args:
             parent: Parent QObject
+            path_probe: Path probe to check targets with (defaults to the shared probe)
         """
         super().__init__(parent)
 
@@ -62,6 +74,11 @@ class NavigationService(QObject):
         self._navigation_queue: List[str] = []
         self._last_navigation_time: float = 0.0
 
+        # Navigation waiting for a path probe: (request id, requested path, add to history)
+        self._probe = path_probe or get_path_probe()
+        self._probe.probe_finished.connect(self._on_probe_finished)
+        self._pending_navigation: Optional[Tuple[int, str, bool]] = None
+
         logger.info("NavigationService initialized")
 
     def set_dependencies(self, history_service: 'NavigationHistoryService', location_manager: 'LocationManager'):
@@ -90,27 +107,97 @@ class NavigationService(QObject):
         """
         Navigate to the specified path.
 
+        If the path cannot be checked within NAVIGATION_WAIT_MS, the
+        navigation continues in the background and completes or fails
+        through the navigation signals.
+
         Args:
             path: Target path for navigation
             add_to_history: Whether to add this navigation to history
 
         Returns:
-            bool: True if navigation started successfully, False otherwise
+            bool: True if navigation succeeded or is still in progress, False otherwise
         """
         if not path:
             logger.warning("Navigation attempted with empty path")
             return False
 
+        target_path = self._absolute_path(path)
+        if not target_path:
+            error_msg = f"Could not resolve path: {path}"
+            logger.error(error_msg)
+            self.navigation_failed.emit(path, error_msg)
+            return False
+
+        # Supersede any navigation still waiting for its probe
+        self.cancel_navigation()
+
+        status = self._probe.check(target_path, self.NAVIGATION_WAIT_MS / 1000)
+        if status is None:
+            request_id = self._probe.request(target_path)
+            self._pending_navigation = (request_id, path, add_to_history)
+            self._is_navigating = True
+            self._update_navigation_state()
+            logger.info(f"Navigation to {target_path} continues in the background")
+            return True
+
+        return self._finish_navigation(path, status, add_to_history)
+
+    def cancel_navigation(self) -> bool:
+        """
+        Cancel a navigation that is waiting for its path check.
+
+        Returns:
+            bool: True if a navigation was cancelled
+        """
+        if self._pending_navigation is None:
+            return False
+
+        request_id, path, _ = self._pending_navigation
+        self._pending_navigation = None
+        self._probe.cancel(request_id)
+        self._is_navigating = False
+        logger.debug(f"Cancelled navigation to: {path}")
+        return True
+
+    def _on_probe_finished(self, request_id: int, status: PathStatus):
+        """Finish the pending navigation once its path check completes."""
+        if self._pending_navigation is None or self._pending_navigation[0] != request_id:
+            return
+
+        _, path, add_to_history = self._pending_navigation
+        self._pending_navigation = None
+        self._finish_navigation(path, status, add_to_history)
+        self._update_navigation_state()
+
+    def _finish_navigation(self, path: str, status: PathStatus, add_to_history: bool) -> bool:
+        """
+        Complete a navigation once the target path has been checked.
+
+        Args:
+            path: Path as requested
+            status: Probe result for the target path
+            add_to_history: Whether to add this navigation to history
+
+        Returns:
+            bool: True if navigation succeeded, False otherwise
+        """
+        self._is_navigating = False
+
+        if status.timed_out:
+            error_msg = f"{status.error}: {path}"
+            logger.error(error_msg)
+            self.navigation_failed.emit(path, error_msg)
+            return False
+
         # Validate path if validation is enabled
-        if self._validation_enabled:
-            if not self._validate_path(path):
-                error_msg = f"Invalid path: {path}"
-                logger.error(error_msg)
-                self.navigation_failed.emit(path, error_msg)
-                return False
+        if self._validation_enabled and not status.exists:
+            error_msg = f"Invalid path: {path}"
+            logger.error(error_msg)
+            self.navigation_failed.emit(path, error_msg)
+            return False
 
-        # Resolve path to absolute form
-        resolved_path = self._resolve_path(path)
+        resolved_path = status.resolved_path
         if not resolved_path:
             error_msg = f"Could not resolve path: {path}"
             logger.error(error_msg)
@@ -128,7 +215,7 @@ class NavigationService(QObject):
 
         try:
             # Perform the navigation
-            success = self._perform_navigation(resolved_path)
+            success = self._perform_navigation(resolved_path, status)
 
             if success:
                 # Update current path
@@ -317,41 +404,23 @@ class NavigationService(QObject):
         self._validation_enabled = enabled
         logger.info(f"Path validation {'enabled' if enabled else 'disabled'}")
 
-    def _validate_path(self, path: str) -> bool:
-        """
-        Validate if the given path is accessible.
-
-        Args:
-            path: Path to validate
-
-        Returns:
-            bool: True if path is valid and accessible, False otherwise
-        """
-        try:
-            path_obj = Path(path)
-            return path_obj.exists()
-        except Exception as e:
-            logger.error(f"Path validation error for '{path}': {str(e)}")
-            return False
-
-    def _resolve_path(self, path: str) -> Optional[str]:
+    def _absolute_path(self, path: str) -> Optional[str]:
         """
-        Resolve path to absolute form.
+        Make a path absolute without touching the file system.
 
         Args:
-            path: Path to resolve
+            path: Path to convert
 
         Returns:
-            Resolved absolute path or None if resolution fails
+            Absolute path or None if conversion fails
         """
         try:
-            path_obj = Path(path).expanduser().resolve()
-            return str(path_obj)
+            return os.path.abspath(os.path.expanduser(path))
         except Exception as e:
             logger.error(f"Path resolution error for '{path}': {str(e)}")
             return None
 
-    def _perform_navigation(self, path: str) -> bool:
+    def _perform_navigation(self, path: str, status: Optional[PathStatus] = None) -> bool:
         """
         Perform the actual navigation operation.
 
@@ -360,27 +429,22 @@ class NavigationService(QObject):
 
         Args:
             path: Resolved path to navigate to
+            status: Probe result for the path, if already known
 
         Returns:
             bool: True if navigation succeeded, False otherwise
         """
         try:
-            # Basic implementation - verify path exists and is accessible
-            path_obj = Path(path)
-            if not path_obj.exists():
-                return False
-
-            # For directories, check if readable
-            if path_obj.is_dir():
-                try:
-                    list(path_obj.iterdir())
-                    return True
-                except PermissionError:
-                    logger.error(f"Permission denied accessing directory: {path}")
+            if status is None:
+                status = self._probe.check(path, self.NAVIGATION_WAIT_MS / 1000)
+                if status is None:
+                    logger.error(f"Timed out checking path: {path}")
                     return False
 
-            # For files, just check existence
-            return path_obj.is_file()
+            # Directories must be readable, files must exist
+            if status.exists and status.is_dir and not status.readable:
+                logger.error(f"Permission denied accessing directory: {path}")
+            return status.is_navigable
 
         except Exception as e:
             logger.error(f"Navigation performance error: {str(e)}")
@@ -3,12 +3,15 @@ Panel State Management Service for POEditor application.
 
 Provides persistent state management for all sidebar panels using QSettings.
 Supports directory history, search patterns, and panel-specific settings.
+State is written through the shared write-behind settings store, so bursts
+of updates are flushed to disk together.
 """
 
 from typing import Dict, List, Any, Optional
-from PySide6.QtCore import QSettings
 from lg import logger
 
+from services.settings_store import get_settings_store
+
 
 class PanelStateManager:
     """Base class for managing panel state persistence using QSettings."""
@@ -21,8 +24,8 @@ class PanelStateManager:
             panel_id: Unique identifier for the panel (e.g., 'explorer', 'search')
         """
         self.panel_id = panel_id
-        self.settings = QSettings("POEditor", "PanelStates")
-        self._cache = {}  # In-memory cache for frequently accessed settings
+        self._store = get_settings_store("POEditor", "PanelStates")  # shared by all panels
+        self.settings = self._store.settings
         logger.info(f"PanelStateManager initialized for panel: {panel_id}")
 
     def save_state(self, state_data: Dict[str, Any]) -> None:
@@ -33,14 +36,8 @@ class PanelStateManager:
             state_data: Dictionary containing all panel state data
         """
         try:
-            self.settings.beginGroup(self.panel_id)
-
             for key, value in state_data.items():
-                self.settings.setValue(key, value)
-                self._cache[key] = value
-
-            self.settings.endGroup()
-            self.settings.sync()
+                self._store.set_value(f"{self.panel_id}/{key}", value)
 
             logger.debug(f"Saved state for panel {self.panel_id}: {len(state_data)} settings")
 
@@ -56,14 +53,8 @@ class PanelStateManager:
         """
         try:
             state_data = {}
-            self.settings.beginGroup(self.panel_id)
-
-            for key in self.settings.childKeys():
-                value = self.settings.value(key)
-                state_data[key] = value
-                self._cache[key] = value
-
-            self.settings.endGroup()
+            for key in self._store.child_keys(self.panel_id):
+                state_data[key] = self._store.value(f"{self.panel_id}/{key}")
 
             logger.debug(f"Loaded state for panel {self.panel_id}: {len(state_data)} settings")
             return state_data
@@ -74,7 +65,7 @@ class PanelStateManager:
 
     def get_setting(self, key: str, default: Any = None) -> Any:
         """
-        Get a specific setting value with caching.
+        Get a specific setting value through the shared settings store.
 
         Args:
             key: Setting key name
@@ -83,15 +74,8 @@ class PanelStateManager:
         Returns:
             Setting value or default
         """
-        # Check cache first
-        if key in self._cache:
-            return self._cache[key]
-
         try:
-            full_key = f"{self.panel_id}/{key}"
-            value = self.settings.value(full_key, default)
-            self._cache[key] = value
-            return value
+            return self._store.value(f"{self.panel_id}/{key}", default)
 
         except Exception as e:
             logger.error(f"Failed to get setting {key} for panel {self.panel_id}: {e}")
@@ -99,17 +83,14 @@ class PanelStateManager:
 
     def set_setting(self, key: str, value: Any) -> None:
         """
-        Set a specific setting value with immediate persistence.
+        Set a specific setting value; it is persisted with the next flush.
 
         Args:
             key: Setting key name
             value: Setting value
         """
         try:
-            full_key = f"{self.panel_id}/{key}"
-            self.settings.setValue(full_key, value)
-            self.settings.sync()
-            self._cache[key] = value
+            self._store.set_value(f"{self.panel_id}/{key}", value)
 
             logger.debug(f"Set setting {key} = {value} for panel {self.panel_id}")
 
@@ -119,11 +100,7 @@ class PanelStateManager:
     def clear_state(self) -> None:
         """Clear all state data for this panel."""
         try:
-            self.settings.beginGroup(self.panel_id)
-            self.settings.remove("")  # Remove all keys in this group
-            self.settings.endGroup()
-            self.settings.sync()
-            self._cache.clear()
+            self._store.remove_group(self.panel_id)
 
             logger.info(f"Cleared all state for panel {self.panel_id}")
 
@@ -140,8 +117,16 @@ class PanelStateManager:
         Returns:
             True if setting exists, False otherwise
         """
-        full_key = f"{self.panel_id}/{key}"
-        return self.settings.contains(full_key)
+        return self._store.contains(f"{self.panel_id}/{key}")
+
+    def flush(self) -> bool:
+        """
+        Write pending state to disk now.
+
+        Returns:
+            True if anything was written
+        """
+        return self._store.flush()
 
 
 class ExplorerStateManager(PanelStateManager):
@@ -339,10 +324,9 @@ class PanelStateService:
     def save_all_states(self) -> None:
         """Save states for all panels."""
         try:
-            for panel_id, manager in self.state_managers.items():
-                # Each manager handles its own state saving
-                logger.debug(f"State manager for {panel_id} ready for save operations")
-            logger.info("All panel states ready for saving")
+            # The managers share one write-behind store, so one flush writes everything
+            flushed = any([manager.flush() for manager in self.state_managers.values()])
+            logger.info(f"All panel states saved{'' if flushed else ' (nothing pending)'}")
 
         except Exception as e:
             logger.error(f"Failed to save all panel states: {e}")
@@ -5,92 +5,194 @@ This service provides path auto-completion functionality with threading
 support for performance and intelligent suggestions based on context.
 """
 
+import heapq
 import os
 import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Callable, Dict, Any
-from PySide6.QtCore import QObject, Signal, QThread, QMutex, QTimer
+from typing import List, Optional, Callable, Dict, Any, Iterable
+from PySide6.QtCore import QCoreApplication, QObject, Signal, QThread, QMutex, QTimer
 from lg import logger
 
+from services.collation import get_name_collator
+from services.path_index import PathIndex, PathIndexBuilder
+
+
+def is_anything_query(query: str) -> bool:
+    """
+    Check whether a query is a fuzzy "go to anything" query rather than a path.
+
+    Args:
+        query: Completion query
+
+    Returns:
+        True for bare names without separators, home or relative prefixes
+    """
+    query = query.strip()
+    return bool(query) and not query.startswith(('~', '.')) and '/' not in query and os.sep not in query
+
+
+def _index_results(index: PathIndex, query: str, limit: int) -> List[Dict[str, Any]]:
+    """Turn path index matches into completion result dictionaries."""
+    results = []
+    for match in index.match(query, limit):
+        path = os.path.join(index.root, match.path)
+        results.append({
+            'path': path,
+            'name': os.path.basename(match.path),
+            'is_dir': False,
+            'is_file': True,
+            'display_path': match.path,
+            'completion': path,
+            'type': 'project_file',
+            'score': match.score,
+            'match_positions': match.positions
+        })
+    return results
+
+
+@dataclass
+class _DirectoryListing:
+    """Names in one directory, split into directories and files and sorted case-insensitively."""
+    mtime_ns: int
+    dir_keys: List[str]  # lower-case names, sorted
+    dir_names: List[str]
+    dir_ranks: List[int]  # position of each name in collation order
+    file_keys: List[str]
+    file_names: List[str]
+    file_ranks: List[int]
+
+
+def _listing_columns(entries: List[tuple]) -> tuple:
+    """Sort (lower-case name, name) pairs for prefix search and rank the names for display."""
+    entries.sort()
+    names = [name for _key, name in entries]
+    collation_key = get_name_collator().key
+    order = sorted(range(len(names)), key=lambda position: collation_key(names[position]))
+    ranks = [0] * len(names)
+    for rank, position in enumerate(order):
+        ranks[position] = rank
+    return [key for key, _name in entries], names, ranks
+
 
 class PathCompletionWorker(QThread):
     """
     Worker thread for performing path completion operations.
 
     This runs completion searches in a background thread to avoid
-    blocking the UI during file system operations.
+    blocking the UI during file system operations. Directory listings are
+    cached as sorted name arrays and revalidated by mtime, so narrowing a
+    prefix in the same directory is a binary search without re-listing.
+    Every query gets a cancellation token; results are only emitted while
+    their token is still current.
     """
 
     # Worker signals
     completion_ready = Signal(str, list)  # query, results
     completion_error = Signal(str, str)   # query, error_message
 
+    MAX_RESULTS = 50
+    MAX_CACHED_DIRECTORIES = 64
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._mutex = QMutex()
         self._current_query = ""
-        self._should_stop = False
+        self._token = 0  # token of the latest query; bumping it cancels older ones
+        self._handled_token = 0
+        self._running = False
+        self._path_index: Optional[PathIndex] = None
+        # Directory listing cache, least recently used first (worker thread only)
+        self._listings: OrderedDict[str, _DirectoryListing] = OrderedDict()
+
+    def set_path_index(self, index: Optional[PathIndex]):
+        """
+        Set the project path index used for "go to anything" queries.
+
+        Args:
+            index: Built PathIndex, or None to disable index results
+        """
+        self._path_index = index
 
     def search_completions(self, query: str):
         """
         Request completion search for the given query.
 
+        Any search still running for an older query is cancelled.
+
         Args:
             query: Path query to complete
         """
         self._mutex.lock()
         try:
             self._current_query = query
-            self._should_stop = False
+            self._token += 1
+            start = not self._running
+            self._running = True
         finally:
             self._mutex.unlock()
 
-        if not self.isRunning():
+        if start:
+            # run() may have just returned; let the thread finish before restarting it
+            self.wait()
             self.start()
 
     def stop_search(self):
-        """Stop the current search operation."""
+        """Cancel the current search operation."""
+        self._mutex.lock()
+        try:
+            self._token += 1
+            self._handled_token = self._token
+        finally:
+            self._mutex.unlock()
+
+    def _is_cancelled(self, token: int) -> bool:
         self._mutex.lock()
         try:
-            self._should_stop = True
+            return token != self._token
         finally:
             self._mutex.unlock()
 
     def run(self):
         """Main worker thread execution."""
-        try:
+        while True:
             self._mutex.lock()
             try:
+                if self._handled_token == self._token:
+                    self._running = False
+                    return
                 query = self._current_query
+                token = self._handled_token = self._token
             finally:
                 self._mutex.unlock()
 
             if not query:
-                return
+                continue
 
-            # Perform completion search
-            results = self._perform_completion_search(query)
+            try:
+                results = self._perform_completion_search(query, token)
+                signal, payload = self.completion_ready, results
+            except Exception as e:
+                logger.error(f"Path completion worker error: {str(e)}")
+                signal, payload = self.completion_error, str(e)
 
-            # Check if we should still emit results
+            # Emit under the lock so a query cancelled meanwhile can never emit
             self._mutex.lock()
             try:
-                should_emit = not self._should_stop and query == self._current_query
+                if token == self._token:
+                    signal.emit(query, payload)
             finally:
                 self._mutex.unlock()
 
-            if should_emit:
-                self.completion_ready.emit(query, results)
-
-        except Exception as e:
-            logger.error(f"Path completion worker error: {str(e)}")
-            self.completion_error.emit(query, str(e))
-
-    def _perform_completion_search(self, query: str) -> List[Dict[str, Any]]:
+    def _perform_completion_search(self, query: str, token: int = 0) -> List[Dict[str, Any]]:
         """
         Perform the actual completion search.
 
         Args:
             query: Path query to complete
+            token: Cancellation token of the query
 
         Returns:
             List of completion results
@@ -107,7 +209,7 @@ class PathCompletionWorker(QThread):
             path_obj = Path(expanded_query)
 
             # Determine search directory and prefix
-            if expanded_query.endswith(os.sep) or path_obj.is_dir():
+            if expanded_query.endswith(os.sep) or self._is_listed_directory(path_obj):
                 # Query ends with separator or is existing directory
                 search_dir = path_obj
                 prefix = ""
@@ -116,53 +218,99 @@ class PathCompletionWorker(QThread):
                 search_dir = path_obj.parent
                 prefix = path_obj.name.lower()
 
-            # Check if search directory exists and is accessible
-            if not search_dir.exists() or not search_dir.is_dir():
-                return []
-
-            # Search for matching entries
-            try:
-                for entry in search_dir.iterdir():
-                    # Check if we should stop
-                    self._mutex.lock()
-                    try:
-                        should_stop = self._should_stop
-                    finally:
-                        self._mutex.unlock()
-
-                    if should_stop:
-                        break
+            listing = self._get_listing(str(search_dir), token)
+            if listing is not None:
+                # Directories first, then files, both in collation order
+                for keys, names, ranks, is_dir in (
+                        (listing.dir_keys, listing.dir_names, listing.dir_ranks, True),
+                        (listing.file_keys, listing.file_names, listing.file_ranks, False)):
+                    start = end = bisect_left(keys, prefix)
+                    while end < len(keys) and keys[end].startswith(prefix):
+                        end += 1
+                    for position in heapq.nsmallest(self.MAX_RESULTS - len(results), range(start, end),
+                                                    key=ranks.__getitem__):
+                        entry = search_dir / names[position]
+                        results.append({
+                            'path': str(entry),
+                            'name': names[position],
+                            'is_dir': is_dir,
+                            'is_file': not is_dir,
+                            'display_path': self._get_display_path(entry, query),
+                            'completion': self._get_completion_text(entry, query, is_dir)
+                        })
 
-                    # Filter by prefix
-                    if prefix and not entry.name.lower().startswith(prefix):
-                        continue
+        except Exception as e:
+            logger.error(f"Completion search error for '{query}': {str(e)}")
 
-                    # Create result entry
-                    result = {
-                        'path': str(entry),
-                        'name': entry.name,
-                        'is_dir': entry.is_dir(),
-                        'is_file': entry.is_file(),
-                        'display_path': self._get_display_path(entry, query),
-                        'completion': self._get_completion_text(entry, query)
-                    }
+        # Bare names also match anywhere in the project, best first
+        index = self._path_index
+        if index is not None and is_anything_query(query) and not self._is_cancelled(token):
+            try:
+                results.extend(_index_results(index, query.strip(), self.MAX_RESULTS))
+            except Exception as e:
+                logger.error(f"Path index search error for '{query}': {str(e)}")
 
-                    results.append(result)
+        return results
 
-                    # Limit results to prevent overwhelming the UI
-                    if len(results) >= 50:
-                        break
+    def _is_listed_directory(self, path: Path) -> bool:
+        """Check whether path is a directory using the cached listing of its parent."""
+        parent = self._listings.get(str(path.parent))
+        if parent is None:
+            return path.is_dir()
+        key = path.name.lower()
+        position = bisect_left(parent.dir_keys, key)
+        while position < len(parent.dir_keys) and parent.dir_keys[position] == key:
+            if parent.dir_names[position] == path.name:
+                return True
+            position += 1
+        return False
+
+    def _get_listing(self, directory: str, token: int) -> Optional[_DirectoryListing]:
+        """
+        Get the sorted listing of a directory, re-reading it only if its mtime changed.
 
-            except PermissionError:
-                logger.warning(f"Permission denied accessing directory: {search_dir}")
+        Args:
+            directory: Directory path
+            token: Cancellation token of the query
 
-        except Exception as e:
-            logger.error(f"Completion search error for '{query}': {str(e)}")
+        Returns:
+            Directory listing, or None if the directory cannot be listed or
+            the query was cancelled while listing it
+        """
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            self._listings.pop(directory, None)
+            return None
 
-        # Sort results: directories first, then files, both alphabetically
-        results.sort(key=lambda x: (not x['is_dir'], x['name'].lower()))
+        listing = self._listings.get(directory)
+        if listing is not None and listing.mtime_ns == mtime_ns:
+            self._listings.move_to_end(directory)
+            return listing
 
-        return results
+        directories, files = [], []
+        try:
+            with os.scandir(directory) as entries:
+                for count, entry in enumerate(entries):
+                    if count % 256 == 0 and self._is_cancelled(token):
+                        return None
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    (directories if is_dir else files).append((entry.name.lower(), entry.name))
+        except PermissionError:
+            logger.warning(f"Permission denied accessing directory: {directory}")
+            return None
+        except OSError:
+            return None
+
+        listing = _DirectoryListing(mtime_ns, *_listing_columns(directories), *_listing_columns(files))
+        self._listings[directory] = listing
+        self._listings.move_to_end(directory)
+        if len(self._listings) > self.MAX_CACHED_DIRECTORIES:
+            self._listings.popitem(last=False)
+        return listing
 
     def _get_display_path(self, path: Path, query: str) -> str:
         """
@@ -183,22 +331,25 @@ class PathCompletionWorker(QThread):
         except Exception:
             return str(path)
 
-    def _get_completion_text(self, path: Path, query: str) -> str:
+    def _get_completion_text(self, path: Path, query: str, is_dir: Optional[bool] = None) -> str:
         """
         Get completion text for the result.
 
         Args:
             path: Path object
             query: Original query
+            is_dir: Whether path is a directory, if already known
 
         Returns:
             Completion text
         """
         try:
             completion = str(path)
+            if is_dir is None:
+                is_dir = path.is_dir()
 
             # Add separator for directories
-            if path.is_dir() and not completion.endswith(os.sep):
+            if is_dir and not completion.endswith(os.sep):
                 completion += os.sep
 
             # Convert to ~ form if applicable
@@ -220,15 +371,18 @@ class PathCompletionService(QObject):
     - Recent path prioritization
     - Bookmark integration
     - Smart filtering and ranking
+    - Fuzzy "go to anything" matching over a project path index
 
     Signals:
         completions_available(str, list): Emitted when completions are ready
         completion_error(str, str): Emitted when completion fails
+        path_index_ready(int): Emitted with the path count when the project index is built
     """
 
     # Service signals
     completions_available = Signal(str, list)
     completion_error = Signal(str, str)
+    path_index_ready = Signal(int)
 
     def __init__(self, parent=None):
         """
@@ -262,6 +416,13 @@ class PathCompletionService(QObject):
         self._location_manager = None
         self._navigation_history = None
 
+        # Project path index for "go to anything" queries, built in the background
+        self._path_index: Optional[PathIndex] = None
+        self._index_builder: Optional[PathIndexBuilder] = None
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._stop_index_builder)
+
         logger.info("PathCompletionService initialized")
 
     def set_dependencies(self, location_manager, navigation_history):
@@ -352,22 +513,22 @@ class PathCompletionService(QObject):
                             'icon': location.icon
                         })
 
-            # Add recent location completions
+            # Add the best ranked visited locations matching the query
             if self._navigation_history:
-                recent_locations = self._navigation_history.get_recent_locations(10)
+                recent_locations = self._navigation_history.match_recent_locations(query_lower, 10)
                 for recent in recent_locations:
                     path = recent.get('path', '')
-                    if query_lower in path.lower():
-                        quick_results.append({
-                            'path': path,
-                            'name': Path(path).name or path,
-                            'is_dir': Path(path).is_dir(),
-                            'is_file': Path(path).is_file(),
-                            'display_path': path,
-                            'completion': path,
-                            'type': 'recent',
-                            'visit_count': recent.get('visit_count', 1)
-                        })
+                    quick_results.append({
+                        'path': path,
+                        'name': Path(path).name or path,
+                        'is_dir': Path(path).is_dir(),
+                        'is_file': Path(path).is_file(),
+                        'display_path': path,
+                        'completion': path,
+                        'type': 'recent',
+                        'visit_count': recent.get('visit_count', 1),
+                        'score': recent.get('score', 0.0)
+                    })
 
         except Exception as e:
             logger.error(f"Error getting quick completions: {str(e)}")
@@ -381,16 +542,131 @@ class PathCompletionService(QObject):
                 seen_paths.add(result['path'])
                 unique_results.append(result)
 
-        # Sort by type priority and relevance
+        # Sort by type priority and relevance; recent locations keep their frecency order
         type_priority = {'bookmark': 0, 'quick_location': 1, 'recent': 2}
+        collation_key = get_name_collator().key
         unique_results.sort(key=lambda x: (
             type_priority.get(x.get('type'), 3),
-            -x.get('visit_count', 0),
-            x['name'].lower()
+            -x.get('score', 0.0),
+            collation_key(x['name']) if x.get('type') != 'recent' else ()
         ))
 
         return unique_results[:10]  # Limit to top 10 quick results
 
+    def rebuild_path_index(self, root: Optional[str] = None):
+        """
+        Scan a project in the background and replace the path index.
+
+        The current index keeps answering queries until the new one is ready.
+
+        Args:
+            root: Directory to index; defaults to the location manager's
+                project root or the working directory
+        """
+        if root is None:
+            if self._location_manager:
+                root = self._location_manager.get_project_root()
+            root = root or os.getcwd()
+
+        self._stop_index_builder()
+        self._index_builder = PathIndexBuilder(root, self)
+        self._index_builder.index_built.connect(self._on_path_index_built)
+        self._index_builder.start()
+        logger.info(f"Building path index for {root}")
+
+    def ensure_path_index(self):
+        """Start building the path index unless it exists or is being built."""
+        if self._path_index is None and self._index_builder is None:
+            self.rebuild_path_index()
+
+    def get_path_index(self) -> Optional[PathIndex]:
+        """
+        Get the project path index.
+
+        Returns:
+            PathIndex, or None until the first build completes
+        """
+        return self._path_index
+
+    def find_anything(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Fuzzy-match a query against every file in the project.
+
+        Args:
+            query: Characters to match in order, e.g. "pcs" for path_completion_service
+            limit: Maximum number of results
+
+        Returns:
+            Completion results ordered by descending match score
+        """
+        index = self._path_index
+        if index is None or not query.strip():
+            return []
+        try:
+            return _index_results(index, query.strip(), limit)
+        except Exception as e:
+            logger.error(f"Path index search error for '{query}': {str(e)}")
+            return []
+
+    def update_path_index(self, added: Iterable[str] = (), removed: Iterable[str] = ()):
+        """
+        Apply file additions and removals to the path index.
+
+        The index is rebuilt in the background once enough changes accumulate.
+
+        Args:
+            added: Absolute paths of created files
+            removed: Absolute paths of deleted files
+        """
+        index = self._path_index
+        if index is None:
+            return
+        for path in removed:
+            index.remove_path(path)
+        for path in added:
+            index.add_path(path)
+        if index.needs_compaction() and self._index_builder is None:
+            self.rebuild_path_index(index.root)
+
+    def apply_file_system_changes(self, changes: List[Any]):
+        """
+        Keep the path index in step with changes reported by the file watcher.
+
+        Args:
+            changes: DirectoryChanges batches of one FileWatcherService flush
+        """
+        index = self._path_index
+        if index is None:
+            return
+        if any(change.overflow for change in changes):
+            # Events were lost
+            self.rebuild_path_index(index.root)
+            return
+
+        added, removed = set(), set()
+        for change in changes:
+            directories = change.directories
+            added.update(path for path in change.created if path not in directories)
+            for path in change.deleted:
+                removed.update(self._indexed_under(index, path) if path in directories else [path])
+            for old_path, new_path in change.moved:
+                if old_path in directories:
+                    for path in self._indexed_under(index, old_path):
+                        removed.add(path)
+                        added.add(new_path + path[len(old_path):])
+                else:
+                    removed.add(old_path)
+                    added.add(new_path)
+
+        prefix = os.path.join(index.root, "")
+        self.update_path_index(added=[path for path in added if path.startswith(prefix)],
+                               removed=[path for path in removed if path.startswith(prefix)])
+
+    @staticmethod
+    def _indexed_under(index: PathIndex, directory: str) -> List[str]:
+        """Absolute paths of the indexed files below a directory."""
+        return [os.path.join(index.root, path) for path in index.paths_under(directory)]
+
     def set_completion_enabled(self, enabled: bool):
         """
         Enable or disable path completion.
@@ -449,6 +725,27 @@ class PathCompletionService(QObject):
             logger.error(f"Completion search error: {str(e)}")
             self.completion_error.emit(query, str(e))
 
+    def _on_path_index_built(self, index: PathIndex):
+        """
+        Install a freshly built path index.
+
+        Args:
+            index: Built PathIndex
+        """
+        self._index_builder = None
+        self._path_index = index
+        self._worker.set_path_index(index)
+        self.path_index_ready.emit(len(index))
+
+    def _stop_index_builder(self):
+        """Abandon a running index build and wait for its thread."""
+        builder = self._index_builder
+        self._index_builder = None
+        if builder is not None:
+            builder.index_built.disconnect(self._on_path_index_built)
+            builder.stop()
+            builder.wait()
+
     def _on_completion_ready(self, query: str, results: List[Dict[str, Any]]):
         """
         Handle completion results from worker thread.
@@ -473,7 +770,7 @@ class PathCompletionService(QObject):
             for result in results:
                 if result['path'] not in seen_paths:
                     seen_paths.add(result['path'])
-                    result['type'] = 'filesystem'
+                    result.setdefault('type', 'filesystem')
                     combined_results.append(result)
 
             # Store results and emit signal
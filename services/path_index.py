@@ -0,0 +1,473 @@
+"""
+Project path index for "go to anything" fuzzy file finding.
+
+All file paths under a project root are kept in one compact UTF-8 blob with
+an offset array instead of a million Python strings, next to a lower-cased
+copy for matching. For every byte value of the lower-cased paths the index
+holds a bitmap (a Python int, bit i = path i contains the byte),
+so the paths containing every character of a query are found with a few
+big-integer ANDs. Only those candidates are scored with an fzf-style
+subsequence scorer.
+
+Paths are ordered shallowest and shortest first. For very unselective
+queries only the first CANDIDATE_LIMIT matches in that order are scored,
+which keeps a keystroke bounded on huge trees. When a query extends the
+previous one, only the previous matches are rescored and the scan resumes
+where the previous one stopped, as fzf does while the user types.
+"""
+
+import heapq
+import os
+import re
+from array import array
+from itertools import accumulate, chain
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from PySide6.QtCore import QThread, Signal
+from lg import logger
+
+# Directories never indexed
+IGNORED_DIRECTORIES = frozenset({
+    '.git', '.hg', '.svn', '__pycache__', 'node_modules', '.venv', 'venv',
+    '.mypy_cache', '.pytest_cache', '.tox', '.idea'
+})
+
+# Scoring, modelled on fzf's v1 algorithm
+SCORE_MATCH = 16
+BONUS_PATH_SEPARATOR = 9
+BONUS_BOUNDARY = 8
+BONUS_CAMEL_CASE = 7
+BONUS_CONSECUTIVE = 4
+BONUS_BASENAME = 2
+PENALTY_GAP_START = 3
+PENALTY_GAP_EXTENSION = 1
+
+_SEPARATORS = '/\\'
+_WORD_BOUNDARIES = '_-. '
+_NONZERO_BYTE = re.compile(b'[^\x00]')
+
+
+@lru_cache(maxsize=None)
+def _keep_table(byte: int) -> Tuple[bytes, bytes]:
+    """Translate table and delete set keeping one byte (as \\x01) and newlines (as '0')."""
+    table = bytearray(range(256))
+    table[byte] = 1
+    table[ord('\n')] = ord('0')
+    delete = bytes(value for value in range(256) if value not in (byte, ord('\n')))
+    return bytes(table), delete
+
+
+@dataclass
+class PathMatch:
+    """A fuzzy match of a query against an indexed path."""
+    path: str  # Path relative to the index root
+    score: int
+    positions: List[int] = field(default_factory=list)  # Matched character positions in path
+
+
+def fuzzy_score(query: str, text: str) -> Optional[Tuple[int, List[int]]]:
+    """
+    Score text against a lower-case query using subsequence matching.
+
+    The leftmost occurrence of the subsequence is found, then tightened by a
+    backward pass (fzf v1). The basename is also tried on its own so matches
+    in the file name win over scattered matches in the directories.
+
+    Args:
+        query: Lower-case query without whitespace
+        text: Candidate path
+
+    Returns:
+        (score, matched positions), or None if text does not contain the query
+    """
+    lower = text.lower()
+    positions = _align(query, lower, 0)
+    if positions is None:
+        return None
+
+    basename_start = max(lower.rfind('/'), lower.rfind('\\')) + 1
+    best = _score_positions(text, positions, basename_start)
+    if basename_start and positions[0] < basename_start:
+        basename_positions = _align(query, lower, basename_start)
+        if basename_positions is not None:
+            basename_score = _score_positions(text, basename_positions, basename_start)
+            if basename_score > best:
+                return basename_score, basename_positions
+    return best, positions
+
+
+def _align(query: str, lower: str, start: int) -> Optional[List[int]]:
+    position = start - 1
+    for char in query:
+        position = lower.find(char, position + 1)
+        if position < 0:
+            return None
+
+    positions = [0] * len(query)
+    positions[-1] = position
+    for index in range(len(query) - 2, -1, -1):
+        position = lower.rfind(query[index], start, position)
+        positions[index] = position
+    return positions
+
+
+def _score_positions(text: str, positions: List[int], basename_start: int) -> int:
+    score = 0
+    previous = -2
+    for position in positions:
+        score += SCORE_MATCH
+        before = text[position - 1] if position else '/'
+        if before in _SEPARATORS:
+            score += BONUS_PATH_SEPARATOR
+        elif before in _WORD_BOUNDARIES:
+            score += BONUS_BOUNDARY
+        elif before.islower() and text[position].isupper():
+            score += BONUS_CAMEL_CASE
+
+        if position == previous + 1:
+            score += BONUS_CONSECUTIVE
+        elif previous >= 0:
+            score -= PENALTY_GAP_START + PENALTY_GAP_EXTENSION * (position - previous - 2)
+
+        if position >= basename_start:
+            score += BONUS_BASENAME
+        previous = position
+    return score
+
+
+def scan_project_files(root: str, should_stop: Optional[Callable[[], bool]] = None) -> List[str]:
+    """
+    List all files under root as paths relative to root.
+
+    Args:
+        root: Directory to scan
+        should_stop: Optional callable polled per directory to abort the scan
+
+    Returns:
+        Relative file paths
+    """
+    files: List[str] = []
+    pending = [(root, '')]
+    while pending:
+        if should_stop is not None and should_stop():
+            break
+        directory, prefix = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    relative = prefix + entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in IGNORED_DIRECTORIES:
+                                pending.append((entry.path, relative + os.sep))
+                        else:
+                            files.append(relative)
+                    except OSError:
+                        continue
+        except OSError:
+            # Unreadable directories are skipped
+            continue
+    return files
+
+
+class PathIndex:
+    """
+    Compact, incrementally maintained index of the files under a root.
+
+    The bulk of the paths live in a sealed blob built once; paths added
+    later go to a small overflow list and removed paths are cleared from a
+    liveness bitmap. needs_compaction() tells when a rebuild is worthwhile.
+    A directory tree maps each directory to the indices of its files, so
+    the paths below a directory are found without decoding the others, and
+    a dictionary maps each live path to its index for O(1) lookups.
+    """
+
+    CANDIDATE_LIMIT = 2000  # matches scored per query at most
+    BITMAP_CHUNK_PATHS = 65536  # paths per bulk operation while building
+
+    def __init__(self, root: str, paths: Iterable[str] = ()):
+        self.root = os.path.abspath(root)
+        # Bucket rather than sort the paths: one long list.sort() would hold
+        # the GIL for seconds on a big tree while this runs in a worker
+        buckets: Dict[Tuple[int, int], List[str]] = {}
+        seen = set()
+        for path in paths:
+            if path not in seen:
+                seen.add(path)
+                buckets.setdefault((path.count(os.sep), len(path)), []).append(path)
+        del seen
+        ordered = [path for key in sorted(buckets) for path in buckets[key]]
+        del buckets
+        encoded = [path.encode('utf-8', errors='surrogateescape') for path in ordered]
+
+        self._blob = b'\n'.join(encoded) + b'\n' if encoded else b''
+        self._offsets = array('q', accumulate((len(path) + 1 for path in encoded), initial=0))
+        self._sealed_count = len(encoded)
+        del encoded
+        self._lower_blob, self._lower_offsets = self._build_lower_blob(ordered)
+        # Relative directory ('' for the root) -> indices of its files, and
+        # -> its subdirectories
+        self._directory_files: Dict[str, array] = {}
+        self._subdirectories: Dict[str, Set[str]] = {}
+        directory_files = self._directory_files
+        for index, path in enumerate(ordered):
+            files = directory_files.get(path.rpartition(os.sep)[0])
+            if files is None:
+                self._add_to_directory(path, index)
+            else:
+                files.append(index)
+        # Built here, on the builder thread, so watcher batches never scan the blob
+        self._index_of: Dict[str, int] = dict(zip(ordered, range(len(ordered))))
+        del ordered
+        self._overflow: List[str] = []
+        self._removed = 0
+        self._alive = (1 << self._sealed_count) - 1
+        self._bitmaps: Dict[int, int] = self._build_bitmaps()
+        # Last query, its matches and the index its scan stopped at (None if complete)
+        self._last_scan: Optional[Tuple[str, List[int], Optional[int]]] = None
+
+    def _build_lower_blob(self, ordered: List[str]) -> Tuple[bytes, array]:
+        """
+        Build the lower-cased copy of the blob that matching runs on.
+
+        Paths are lower-cased as str, like queries: bytes.lower() only folds
+        ASCII, so "Ärger.po" would never match "ärger". Lower-casing can
+        change the encoded length ("ẞ" to "ß"), in which case the copy gets
+        its own offsets.
+        """
+        if self._blob.isascii():
+            return self._blob.lower(), self._offsets
+        encoded = [path.lower().encode('utf-8', errors='surrogateescape') for path in ordered]
+        lower_offsets = array('q', accumulate((len(path) + 1 for path in encoded), initial=0))
+        lower_blob = b'\n'.join(encoded) + b'\n' if encoded else b''
+        return lower_blob, self._offsets if lower_offsets == self._offsets else lower_offsets
+
+    def _build_bitmaps(self) -> Dict[int, int]:
+        """
+        Build the per-byte bitmaps with bulk bytes operations.
+
+        The blob is processed BITMAP_CHUNK_PATHS lines at a time so no single
+        bytes operation holds the GIL long enough to stall the UI thread.
+        """
+        bitmaps: Dict[int, int] = {}
+        offsets = self._lower_offsets
+        for first in range(0, self._sealed_count, self.BITMAP_CHUNK_PATHS):
+            last = min(first + self.BITMAP_CHUNK_PATHS, self._sealed_count)
+            chunk = self._lower_blob[offsets[first]:offsets[last]]
+            for byte in range(256):
+                if byte == ord('\n') or bytes((byte,)) not in chunk:
+                    continue
+                # A line now reads '0' if the byte is absent and '\x01...\x010' if present
+                bits = chunk.translate(*_keep_table(byte))
+                bits = bits.replace(b'\x010', b'1').translate(None, b'\x01')
+                bitmaps[byte] = bitmaps.get(byte, 0) | int(bits[::-1], 2) << first
+        return bitmaps
+
+    def _add_to_directory(self, path: str, index: int) -> None:
+        directory = path.rpartition(os.sep)[0]
+        files = self._directory_files.get(directory)
+        if files is not None:
+            files.append(index)
+            return
+        self._directory_files[directory] = array('q', (index,))
+        # A new directory: link it and its new ancestors into the tree
+        while directory and directory not in self._subdirectories.get(directory.rpartition(os.sep)[0], ()):
+            parent = directory.rpartition(os.sep)[0]
+            self._subdirectories.setdefault(parent, set()).add(directory)
+            directory = parent
+
+    def __len__(self) -> int:
+        return self._sealed_count + len(self._overflow) - self._removed
+
+    def _path_at(self, index: int) -> str:
+        if index < self._sealed_count:
+            raw = self._blob[self._offsets[index]:self._offsets[index + 1] - 1]
+            return raw.decode('utf-8', errors='surrogateescape')
+        return self._overflow[index - self._sealed_count]
+
+    def _relative(self, path: str) -> str:
+        return os.path.relpath(path, self.root) if os.path.isabs(path) else path
+
+    def contains(self, path: str) -> bool:
+        """Check whether a path (absolute or relative to the root) is indexed."""
+        return self._relative(path) in self._index_of
+
+    def add_path(self, path: str) -> bool:
+        """
+        Add a file to the index.
+
+        Args:
+            path: Absolute path or path relative to the root
+
+        Returns:
+            True if the path was added, False if it was already indexed
+        """
+        relative = self._relative(path)
+        if relative in self._index_of:
+            return False
+        index = self._sealed_count + len(self._overflow)
+        self._overflow.append(relative)
+        self._index_of[relative] = index
+        self._add_to_directory(relative, index)
+        bit = 1 << index
+        for byte in set(relative.lower().encode('utf-8', errors='surrogateescape')):
+            self._bitmaps[byte] = self._bitmaps.get(byte, 0) | bit
+        self._alive |= bit
+        self._last_scan = None
+        return True
+
+    def remove_path(self, path: str) -> bool:
+        """
+        Remove a file from the index.
+
+        Args:
+            path: Absolute path or path relative to the root
+
+        Returns:
+            True if the path was indexed
+        """
+        index = self._index_of.pop(self._relative(path), None)
+        if index is None:
+            return False
+        self._alive &= ~(1 << index)
+        self._removed += 1
+        self._last_scan = None
+        return True
+
+    def needs_compaction(self) -> bool:
+        """True once overflow and removed entries exceed a tenth of the index."""
+        return len(self._overflow) + self._removed > max(1000, self._sealed_count // 10)
+
+    def paths(self) -> List[str]:
+        """All live relative paths in index order."""
+        return [self._path_at(index) for index in self._iter_indices(self._alive)]
+
+    def paths_under(self, directory: str) -> List[str]:
+        """
+        Live relative paths of the files below a directory, at any depth.
+
+        Args:
+            directory: Absolute path or path relative to the root
+
+        Returns:
+            Relative paths, in no particular order
+        """
+        relative = self._relative(directory).rstrip(os.sep)
+        pending = ['' if relative == os.curdir else relative]
+        paths = []
+        # Shifting the liveness bitmap costs its whole length; test bytes instead
+        alive = self._alive.to_bytes((self._alive.bit_length() + 7) // 8, 'little')
+        while pending:
+            current = pending.pop()
+            paths.extend(self._path_at(index) for index in self._directory_files.get(current, ())
+                         if index >> 3 < len(alive) and alive[index >> 3] >> (index & 7) & 1)
+            pending.extend(self._subdirectories.get(current, ()))
+        return paths
+
+    def _iter_indices(self, mask: int) -> Iterable[int]:
+        """Yield the set bits of mask in ascending order."""
+        data = mask.to_bytes((mask.bit_length() + 7) // 8, 'little')
+        for match in _NONZERO_BYTE.finditer(data):
+            byte = match.group()[0]
+            base = match.start() * 8
+            while byte:
+                lowest = byte & -byte
+                yield base + lowest.bit_length() - 1
+                byte ^= lowest
+
+    def match(self, query: str, limit: int = 50) -> List[PathMatch]:
+        """
+        Find the best fuzzy matches for a query.
+
+        Args:
+            query: Characters to match in order; whitespace is ignored
+            limit: Maximum number of matches returned
+
+        Returns:
+            Matches ordered by descending score, shorter paths first on ties
+        """
+        query = ''.join(query.lower().split())
+        if not query:
+            return []
+
+        query_bytes = query.encode('utf-8', errors='surrogateescape')
+        mask = self._alive
+        for byte in set(query_bytes):
+            mask &= self._bitmaps.get(byte, 0)
+            if not mask:
+                return []
+
+        previous = self._last_scan
+        if previous is not None and query.startswith(previous[0]):
+            # Typing narrows: below the previous scan's stopping point every
+            # match of the longer query was a match of the shorter one
+            _previous_query, previous_matches, resume = previous
+            candidates: Iterable[int] = previous_matches
+            if resume is not None:
+                candidates = chain(previous_matches, self._iter_indices(mask >> resume << resume))
+        else:
+            candidates = self._iter_indices(mask)
+        lower_blob = self._lower_blob
+        lower_offsets = self._lower_offsets
+        sealed_count = self._sealed_count
+
+        scored = []
+        matched_indices: List[int] = []
+        for index in candidates:
+            if index < sealed_count:
+                # Most candidates hold the query's bytes out of order; reject
+                # them on the raw bytes before decoding
+                line = lower_blob[lower_offsets[index]:lower_offsets[index + 1] - 1]
+                position = -1
+                for byte in query_bytes:
+                    position = line.find(byte, position + 1)
+                    if position < 0:
+                        break
+                if position < 0:
+                    continue
+            path = self._path_at(index)
+            result = fuzzy_score(query, path)
+            if result is None:
+                continue
+            score, positions = result
+            scored.append((score, -len(path), -index, path, positions))
+            matched_indices.append(index)
+            if len(matched_indices) >= self.CANDIDATE_LIMIT:
+                self._last_scan = (query, matched_indices, index + 1)
+                break
+        else:
+            self._last_scan = (query, matched_indices, None)
+
+        best = heapq.nlargest(limit, scored)
+        return [PathMatch(path, score, positions) for score, _length, _index, path, positions in best]
+
+
+class PathIndexBuilder(QThread):
+    """Worker thread that scans a project root and builds its PathIndex."""
+
+    # Worker signals
+    index_built = Signal(object)  # PathIndex
+
+    def __init__(self, root: str, parent=None):
+        super().__init__(parent)
+        self._root = root
+        self._should_stop = False
+
+    def stop(self):
+        """Abandon the build."""
+        self._should_stop = True
+
+    def run(self):
+        """Main worker thread execution."""
+        try:
+            files = scan_project_files(self._root, lambda: self._should_stop)
+            if self._should_stop:
+                return
+            index = PathIndex(self._root, files)
+            if not self._should_stop:
+                logger.info(f"Indexed {len(index)} paths under {self._root}")
+                self.index_built.emit(index)
+        except Exception as e:
+            logger.error(f"Failed to build path index for {self._root}: {e}")
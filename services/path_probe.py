@@ -0,0 +1,474 @@
+"""
+Non-blocking path probing for navigation and path validation.
+
+Checking a path on a slow or hung network mount (NFS, SSHFS, SMB) can block
+a stat() call for seconds or forever. PathProbe runs probes on one daemon
+worker thread per mount point, so a stuck mount only delays probes on that
+mount, never the event loop and never interpreter exit. Results are cached
+briefly: positive results for POSITIVE_TTL seconds, negative ones for
+NEGATIVE_TTL. Asynchronous requests report through probe_finished, or with
+a timed-out status once the mount's timeout expires; while a timed-out probe
+is still stuck, further probes on that mount fail immediately.
+
+Symlinks are resolved one component at a time, and a probe moves to the
+worker of the next mount as soon as its path crosses into it. A link from
+the root file system into a hung share therefore blocks and marks stuck the
+share's worker, not the root's.
+
+PathProbe is used from the main thread.
+"""
+
+import errno
+import os
+import queue
+import re
+import stat
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from lg import logger
+
+
+@dataclass(frozen=True)
+class PathStatus:
+    """Result of probing one path."""
+
+    path: str
+    resolved_path: Optional[str] = None
+    exists: bool = False
+    is_dir: bool = False
+    is_file: bool = False
+    readable: bool = False
+    error: Optional[str] = None
+    timed_out: bool = False
+
+    @property
+    def is_navigable(self) -> bool:
+        """True for readable directories and existing files."""
+        return self.exists and (self.readable if self.is_dir else self.is_file)
+
+
+MAX_SYMLINKS = 40  # links followed per probe, as the kernel allows
+
+
+def probe_path(path: str, resolved_path: Optional[str] = None) -> PathStatus:
+    """
+    Stat a path and check that it can be read. Runs on a worker thread.
+
+    Args:
+        path: Absolute path
+        resolved_path: path with its symlinks already resolved, if known
+
+    Returns:
+        PathStatus for the path
+    """
+    try:
+        if resolved_path is None:
+            resolved_path = os.path.realpath(path)
+        try:
+            st = os.stat(resolved_path)
+        except (FileNotFoundError, NotADirectoryError):
+            return PathStatus(path, resolved_path)
+        is_dir = stat.S_ISDIR(st.st_mode)
+        # Directories need execute permission to be entered
+        readable = os.access(resolved_path, os.R_OK | os.X_OK if is_dir else os.R_OK)
+        return PathStatus(path, resolved_path, True, is_dir, stat.S_ISREG(st.st_mode), readable,
+                          None if readable else "Permission denied")
+    except OSError as e:
+        return PathStatus(path, error=str(e))
+
+
+@dataclass(frozen=True)
+class _Handoff:
+    """A partly resolved path whose next component lies on another mount."""
+
+    mount_point: str
+    prefix: str  # resolved, symlink-free part
+    rest: Tuple[str, ...]  # components still to resolve
+    links: int  # symlinks followed so far
+
+
+def _mount_point_of(path: str, mount_points: Sequence[str]) -> str:
+    """Get the mount point containing an absolute path, given mount points longest first."""
+    for mount_point in mount_points:
+        if path == mount_point or path.startswith(mount_point.rstrip(os.sep) + os.sep):
+            return mount_point
+    return os.sep
+
+
+def _resolve_on_mount(prefix: str, rest: Tuple[str, ...], links: int, mount_point: str,
+                      mount_points: Sequence[str]) -> Union[str, _Handoff]:
+    """
+    Resolve symlinks like os.path.realpath, touching only one mount.
+
+    Args:
+        prefix: Resolved part of the path
+        rest: Components still to resolve
+        links: Symlinks followed so far
+        mount_point: Mount this worker may access
+        mount_points: All mount points, longest first
+
+    Returns:
+        The resolved path, or a _Handoff once resolving needs another mount
+    """
+    pending = list(reversed(rest))
+    while pending:
+        name = pending.pop()
+        if name in ('', '.'):
+            continue
+        if name == '..':
+            # prefix holds no symlinks, so its parent is the lexical one
+            prefix = os.path.dirname(prefix)
+            continue
+        candidate = os.path.join(prefix, name)
+        owner = _mount_point_of(candidate, mount_points)
+        if owner != mount_point:
+            return _Handoff(owner, prefix, (name, *reversed(pending)), links)
+        try:
+            st = os.lstat(candidate)
+        except (FileNotFoundError, NotADirectoryError):
+            # Nothing below a missing component can be a link
+            return os.path.join(candidate, *reversed(pending))
+        if not stat.S_ISLNK(st.st_mode):
+            prefix = candidate
+            continue
+        links += 1
+        if links > MAX_SYMLINKS:
+            raise OSError(errno.ELOOP, os.strerror(errno.ELOOP), candidate)
+        target = os.readlink(candidate)
+        if os.path.isabs(target):
+            prefix = os.sep
+        pending.extend(reversed(target.split(os.sep)))
+
+    owner = _mount_point_of(prefix, mount_points)
+    if owner != mount_point:
+        # ".." climbed out of this mount
+        return _Handoff(owner, prefix, (), links)
+    return prefix
+
+
+def _probe_on_mount(path: str, handoff: _Handoff, mount_points: Sequence[str]) -> Union[PathStatus, _Handoff]:
+    """Resolve and probe a path as far as handoff.mount_point allows. Runs on a worker thread."""
+    if os.name == 'nt':
+        # Mount points are drives there
+        return probe_path(path)
+    try:
+        resolved = _resolve_on_mount(handoff.prefix, handoff.rest, handoff.links,
+                                     handoff.mount_point, mount_points)
+    except OSError as e:
+        return PathStatus(path, error=str(e))
+    if isinstance(resolved, _Handoff):
+        return resolved
+    return probe_path(path, resolved)
+
+
+class _Probe:
+    """A probe in flight, possibly passed between mount workers."""
+
+    def __init__(self, path: str, mount_point: str):
+        self.path = path
+        self.future: Future = Future()  # final PathStatus
+        self.future.set_running_or_notify_cancel()
+        # Mount whose worker runs the current stage, and that stage; replaced
+        # together so the main thread never pairs a mount with another's stage
+        self.current: Tuple[str, Optional[Future]] = (mount_point, None)
+
+
+def _read_mount_points() -> List[str]:
+    """List mount points, longest first."""
+    mount_points = {os.sep}
+    try:
+        with open("/proc/self/mounts", "r", encoding="utf-8") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) > 1:
+                    # Spaces and tabs in mount points are octal-escaped
+                    mount_points.add(re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), fields[1]))
+    except OSError:
+        # macOS mounts external and network volumes below /Volumes
+        try:
+            mount_points.update(os.path.join("/Volumes", name) for name in os.listdir("/Volumes"))
+        except OSError:
+            pass
+    return sorted(mount_points, key=len, reverse=True)
+
+
+class _MountWorker:
+    """Daemon thread running the probes for one mount point in order."""
+
+    def __init__(self, mount_point: str):
+        self._queue: "queue.SimpleQueue[Tuple[Future, Callable, tuple]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name=f"path-probe {mount_point}", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Callable, *args) -> Future:
+        future: Future = Future()
+        self._queue.put((future, fn, args))
+        return future
+
+    def _run(self) -> None:
+        while True:
+            future, fn, args = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+
+class PathProbe(QObject):
+    """
+    Cached, timeout-bounded path probing on per-mount worker threads.
+
+    Signals:
+        probe_finished(int, object): Request id and PathStatus of a request()
+    """
+
+    POSITIVE_TTL = 2.0  # seconds an existing path is trusted
+    NEGATIVE_TTL = 0.5  # seconds a missing path is trusted
+    PROBE_TIMEOUT_MS = 3000  # default time a mount gets to answer a request
+    MAX_CACHED_PATHS = 512
+    MOUNT_POINTS_TTL = 30.0
+
+    probe_finished = Signal(int, object)
+    _probe_done = Signal(str, object)  # worker -> main thread: path, PathStatus
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._cache: "OrderedDict[str, Tuple[float, PathStatus]]" = OrderedDict()
+        self._workers: Dict[str, _MountWorker] = {}
+        self._workers_lock = threading.Lock()  # workers hand probes to each other
+        self._in_flight: Dict[str, _Probe] = {}
+        self._waiting: Dict[str, List[int]] = {}  # path -> request ids
+        self._requests: Dict[int, str] = {}  # request id -> path
+        self._stuck: Dict[str, Future] = {}  # mount point -> probe stage that timed out
+        self._mount_timeouts: Dict[str, int] = {}
+        self._mount_points: List[str] = []
+        self._mount_points_read = 0.0
+        self._next_request_id = 0
+        self._probe_done.connect(self._on_probe_done)
+
+    def cached(self, path: str) -> Optional[PathStatus]:
+        """
+        Get a cached status that has not expired.
+
+        Args:
+            path: Absolute path
+
+        Returns:
+            PathStatus or None
+        """
+        entry = self._cache.get(path)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._cache[path]
+            return None
+        return entry[1]
+
+    def check(self, path: str, timeout: float) -> Optional[PathStatus]:
+        """
+        Probe a path, waiting at most a short time.
+
+        Args:
+            path: Absolute path
+            timeout: Seconds to wait for the probe
+
+        Returns:
+            PathStatus, a timed-out status if the path's mount is stuck, or
+            None if the probe is still running; its result is cached when it
+            completes
+        """
+        status = self.cached(path)
+        if status is not None:
+            return status
+        mount_point = self.mount_point(path)
+        if self._is_stuck(mount_point):
+            return self._timed_out_status(path, mount_point)
+        probe = self._submit(path, mount_point)
+        try:
+            status = probe.future.result(timeout)
+        except FutureTimeoutError:
+            return None
+        if self._in_flight.get(path) is probe:
+            del self._in_flight[path]
+        self._store(status)
+        return status
+
+    def request(self, path: str) -> int:
+        """
+        Probe a path asynchronously.
+
+        probe_finished is emitted with the returned id once the probe
+        completes or the mount's timeout expires, never before this returns.
+
+        Args:
+            path: Absolute path
+
+        Returns:
+            Request id
+        """
+        self._next_request_id += 1
+        request_id = self._next_request_id
+        mount_point = self.mount_point(path)
+
+        status = self.cached(path)
+        if status is None and self._is_stuck(mount_point):
+            status = self._timed_out_status(path, mount_point)
+        self._requests[request_id] = path
+        if status is not None:
+            QTimer.singleShot(0, self, partial(self._deliver, request_id, status))
+            return request_id
+
+        self._waiting.setdefault(path, []).append(request_id)
+        self._submit(path, mount_point)
+        QTimer.singleShot(self.mount_timeout(mount_point), self,
+                          partial(self._on_request_timeout, request_id, mount_point))
+        return request_id
+
+    def cancel(self, request_id: int) -> None:
+        """Drop a pending request; its probe_finished is not emitted."""
+        path = self._requests.pop(request_id, None)
+        if path is not None:
+            self._forget_request(path, request_id)
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Drop the cached status of one path, or of every path."""
+        if path is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(path, None)
+
+    def mount_point(self, path: str) -> str:
+        """Get the mount point containing a path."""
+        now = time.monotonic()
+        if now - self._mount_points_read > self.MOUNT_POINTS_TTL:
+            self._mount_points = _read_mount_points()
+            self._mount_points_read = now
+        drive = os.path.splitdrive(path)[0]
+        if drive:
+            return drive
+        return _mount_point_of(path, self._mount_points)
+
+    def mount_timeout(self, mount_point: str) -> int:
+        """Milliseconds a mount gets to answer an asynchronous probe."""
+        return self._mount_timeouts.get(mount_point, self.PROBE_TIMEOUT_MS)
+
+    def set_mount_timeout(self, mount_point: str, timeout_ms: int) -> None:
+        """
+        Set the probe timeout of one mount, e.g. longer for a slow network share.
+
+        Args:
+            mount_point: Mount point path
+            timeout_ms: Timeout in milliseconds
+        """
+        self._mount_timeouts[mount_point] = timeout_ms
+
+    def _submit(self, path: str, mount_point: str) -> _Probe:
+        probe = self._in_flight.get(path)
+        if probe is None:
+            probe = self._in_flight[path] = _Probe(path, mount_point)
+            probe.future.add_done_callback(partial(self._emit_done, path))
+            self._run_stage(probe, _Handoff(mount_point, os.sep, tuple(os.path.abspath(path).split(os.sep)), 0),
+                            self._mount_points)
+        return probe
+
+    def _run_stage(self, probe: _Probe, handoff: _Handoff, mount_points: Sequence[str]) -> None:
+        # Main or worker thread
+        with self._workers_lock:
+            worker = self._workers.get(handoff.mount_point)
+            if worker is None:
+                worker = self._workers[handoff.mount_point] = _MountWorker(handoff.mount_point)
+        stage = worker.submit(_probe_on_mount, probe.path, handoff, mount_points)
+        probe.current = (handoff.mount_point, stage)
+        stage.add_done_callback(partial(self._on_stage_done, probe, mount_points))
+
+    def _on_stage_done(self, probe: _Probe, mount_points: Sequence[str], stage: Future) -> None:
+        # Worker thread
+        if stage.exception() is not None:
+            probe.future.set_exception(stage.exception())
+        elif isinstance(stage.result(), _Handoff):
+            self._run_stage(probe, stage.result(), mount_points)
+        else:
+            probe.future.set_result(stage.result())
+
+    def _emit_done(self, path: str, future: Future) -> None:
+        # Worker thread: hand the result to the main thread
+        if not future.cancelled() and future.exception() is None:
+            self._probe_done.emit(path, future.result())
+
+    def _on_probe_done(self, path: str, status: PathStatus) -> None:
+        probe = self._in_flight.get(path)
+        if probe is not None and probe.future.done():
+            del self._in_flight[path]
+        self._store(status)
+        for request_id in self._waiting.pop(path, []):
+            if self._requests.pop(request_id, None) is not None:
+                self.probe_finished.emit(request_id, status)
+
+    def _deliver(self, request_id: int, status: PathStatus) -> None:
+        if self._requests.pop(request_id, None) is not None:
+            self.probe_finished.emit(request_id, status)
+
+    def _on_request_timeout(self, request_id: int, mount_point: str) -> None:
+        path = self._requests.pop(request_id, None)
+        if path is None:
+            return
+        self._forget_request(path, request_id)
+        probe = self._in_flight.get(path)
+        if probe is not None and not probe.future.done():
+            # Blame the mount the probe is waiting on, which symlinks may
+            # have moved it to
+            mount_point, stage = probe.current
+            self._stuck[mount_point] = stage
+            logger.warning(f"Mount {mount_point} did not answer within {self.mount_timeout(mount_point)} ms")
+        self.probe_finished.emit(request_id, self._timed_out_status(path, mount_point))
+
+    def _forget_request(self, path: str, request_id: int) -> None:
+        waiting = self._waiting.get(path)
+        if waiting and request_id in waiting:
+            waiting.remove(request_id)
+            if not waiting:
+                del self._waiting[path]
+
+    def _is_stuck(self, mount_point: str) -> bool:
+        future = self._stuck.get(mount_point)
+        if future is None:
+            return False
+        if future.done():
+            del self._stuck[mount_point]
+            return False
+        return True
+
+    def _timed_out_status(self, path: str, mount_point: str) -> PathStatus:
+        return PathStatus(path, error=f"Timed out accessing {mount_point}", timed_out=True)
+
+    def _store(self, status: PathStatus) -> None:
+        ttl = self.POSITIVE_TTL if status.exists else self.NEGATIVE_TTL
+        self._cache[status.path] = (time.monotonic() + ttl, status)
+        self._cache.move_to_end(status.path)
+        while len(self._cache) > self.MAX_CACHED_PATHS:
+            self._cache.popitem(last=False)
+
+
+_path_probe: Optional[PathProbe] = None
+
+
+def get_path_probe() -> PathProbe:
+    """
+    Get the application-wide path probe.
+
+    Returns:
+        Shared PathProbe instance
+    """
+    global _path_probe
+    if _path_probe is None:
+        _path_probe = PathProbe()
+    return _path_probe
@@ -0,0 +1,223 @@
+"""
+Write-behind QSettings layer for the POEditor application.
+
+Services used to call QSettings.sync() after every write, rewriting the
+settings file each time. WriteBehindSettings records writes as pending
+changes, serves them to reads until they are written, and applies them to
+QSettings in one batch with a single sync(): once writes go quiet, at the
+latest MAX_DELAY_MS after the first pending write, and when the main
+window closes. QSettings writes its file through QSaveFile, so every
+flush replaces the file atomically.
+
+Every other read goes to QSettings, whose in-memory cache is shared by all
+QSettings objects for the same file. Writes made directly through QSettings
+elsewhere, e.g. by MainAppWindow or the preferences panel, stay visible.
+"""
+
+import atexit
+from typing import Any, Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QCoreApplication, QObject, QSettings, QTimer
+from lg import logger
+
+_MISSING = object()  # pending marker for removed keys
+
+
+def _convert(value: Any, value_type: type, default: Any) -> Any:
+    """Convert a stored value the way QSettings.value(type=...) would."""
+    if isinstance(value, value_type):
+        return value
+    try:
+        if value_type is bool:
+            if isinstance(value, str):
+                return value.strip().lower() in ('true', '1', 'yes', 'on')
+            return bool(value)
+        if value_type is list:
+            return list(value) if isinstance(value, (list, tuple)) else [value]
+        return value_type(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class WriteBehindSettings(QObject):
+    """
+    Batched, write-behind view of one QSettings store.
+
+    Keys are full QSettings keys ("group/key"). Use get_settings_store() to
+    share one instance per organization/application pair.
+    """
+
+    IDLE_DELAY_MS = 500  # flush once writes have been quiet this long
+    MAX_DELAY_MS = 5000  # flush at the latest this long after the first pending write
+
+    def __init__(self, organization: str, application: str, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._settings = QSettings(organization, application)
+        self._pending: Dict[str, Any] = {}  # key -> value, or _MISSING for removal
+        self.flush_count = 0  # physical flushes (QSettings.sync calls) so far
+
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.timeout.connect(self.flush)
+        self._max_delay_timer = QTimer(self)
+        self._max_delay_timer.setSingleShot(True)
+        self._max_delay_timer.timeout.connect(self.flush)
+
+    @property
+    def settings(self) -> QSettings:
+        """Underlying QSettings; reading it directly may miss pending writes."""
+        return self._settings
+
+    def value(self, key: str, default: Any = None, value_type: Optional[type] = None) -> Any:
+        """
+        Get a value, including writes that are not flushed yet.
+
+        Args:
+            key: Full settings key
+            default: Value returned when the key does not exist
+            value_type: Optional type to convert the stored value to
+
+        Returns:
+            Stored value or default
+        """
+        value = self._lookup(key)
+        if value is _MISSING:
+            return default
+        if value_type is not None and value is not None:
+            return _convert(value, value_type, default)
+        return value
+
+    def contains(self, key: str) -> bool:
+        """Check whether a key exists."""
+        return self._lookup(key) is not _MISSING
+
+    def set_value(self, key: str, value: Any) -> None:
+        """
+        Set a value; it is written to disk with the next flush.
+
+        Args:
+            key: Full settings key
+            value: Value to store
+        """
+        self._pending[key] = value
+        self._schedule_flush()
+
+    def remove(self, key: str) -> None:
+        """Remove a key; the removal is written with the next flush."""
+        self._pending[key] = _MISSING
+        self._schedule_flush()
+
+    def keys(self, group: str = "") -> List[str]:
+        """
+        List keys below a group.
+
+        Args:
+            group: Group name, or "" for the whole store
+
+        Returns:
+            Keys relative to the group, including keys in subgroups
+        """
+        prefix = f"{group}/" if group else ""
+        stored = [key for key in self._settings.allKeys() if key not in self._pending]
+        written = [key for key, value in self._pending.items() if value is not _MISSING]
+        return [key[len(prefix):] for key in stored + written if key.startswith(prefix)]
+
+    def child_keys(self, group: str = "") -> List[str]:
+        """List keys directly in a group, excluding subgroups."""
+        return [key for key in self.keys(group) if '/' not in key]
+
+    def remove_group(self, group: str) -> None:
+        """
+        Remove every key below a group.
+
+        Args:
+            group: Group name; "" removes only the top-level keys
+        """
+        keys = self.keys(group) if group else self.child_keys()
+        prefix = f"{group}/" if group else ""
+        for key in keys:
+            self._pending[prefix + key] = _MISSING
+        if keys:
+            self._schedule_flush()
+
+    def has_pending_writes(self) -> bool:
+        """True while there are writes not yet flushed to disk."""
+        return bool(self._pending)
+
+    def flush(self) -> bool:
+        """
+        Apply all pending writes to QSettings and sync them to disk.
+
+        Returns:
+            True if a physical flush happened
+        """
+        self._idle_timer.stop()
+        self._max_delay_timer.stop()
+        if not self._pending:
+            return False
+
+        pending, self._pending = self._pending, {}
+        try:
+            for key, value in pending.items():
+                if value is _MISSING:
+                    self._settings.remove(key)
+                else:
+                    self._settings.setValue(key, value)
+            self._settings.sync()
+            self.flush_count += 1
+            logger.debug(f"Flushed {len(pending)} settings to {self._settings.fileName()}")
+        except Exception as e:
+            logger.error(f"Failed to flush settings to {self._settings.fileName()}: {e}")
+            # Keep the writes for the next attempt unless they were superseded
+            pending.update(self._pending)
+            self._pending = pending
+            return False
+        return True
+
+    def _lookup(self, key: str) -> Any:
+        """Get a pending value, else the stored one, or _MISSING."""
+        if key in self._pending:
+            return self._pending[key]
+        return self._settings.value(key) if self._settings.contains(key) else _MISSING
+
+    def _schedule_flush(self) -> None:
+        self._idle_timer.start(self.IDLE_DELAY_MS)
+        if not self._max_delay_timer.isActive():
+            self._max_delay_timer.start(self.MAX_DELAY_MS)
+
+
+_stores: Dict[Tuple[str, str], WriteBehindSettings] = {}
+
+
+def get_settings_store(organization: str, application: str) -> WriteBehindSettings:
+    """
+    Get the shared write-behind store for an organization/application pair.
+
+    Args:
+        organization: QSettings organization name
+        application: QSettings application name
+
+    Returns:
+        WriteBehindSettings instance
+    """
+    store = _stores.get((organization, application))
+    if store is None:
+        if not _stores:
+            # Scripts without an event loop never fire the flush timers
+            atexit.register(flush_all_settings)
+        store = WriteBehindSettings(organization, application)
+        _stores[(organization, application)] = store
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(store.flush)
+    return store
+
+
+def flush_all_settings() -> int:
+    """
+    Flush every shared settings store.
+
+    Returns:
+        Number of stores that had pending writes
+    """
+    return sum(1 for store in list(_stores.values()) if store.flush())
@@ -0,0 +1,284 @@
+"""
+Transactional state store for the POEditor application.
+
+Bookmarks, quick locations, navigation history, recent locations and the
+JSON-backed settings classes used to rewrite a pretty-printed JSON file on
+every change. They now share one SQLite database in WAL mode where each
+change is a small row-level upsert or delete. Every namespace is an ordered
+collection of key/value rows; values are stored as JSON text.
+
+The old JSON files are imported once per service and renamed with a
+".migrated" suffix.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from PySide6.QtCore import QStandardPaths
+from lg import logger
+
+STATE_DATABASE_NAME = "state.db"
+MIGRATIONS_NAMESPACE = "_migrations"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+)
+"""
+
+
+class StateStore:
+    """
+    SQLite-backed store of namespaced key/value rows.
+
+    Rows of a namespace are returned in insertion order; updating a row
+    keeps its position. Writes outside transaction() commit on their own.
+    """
+
+    def __init__(self, database_path: Union[str, Path]):
+        """
+        Open or create a state database.
+
+        Args:
+            database_path: SQLite database file, or ":memory:"
+        """
+        self.database_path = str(database_path)
+        self._lock = threading.RLock()
+        self._depth = 0
+        self.write_count = 0  # committed write transactions, for verification
+
+        self._connection = sqlite3.connect(self.database_path, check_same_thread=False,
+                                           isolation_level=None)
+        if self.database_path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        # WAL with synchronous=NORMAL stays consistent after a crash and
+        # avoids an fsync per commit
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(_SCHEMA)
+        logger.info(f"StateStore opened at {self.database_path}")
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group writes into one atomic transaction; nested use joins the outer one."""
+        with self._lock:
+            if self._depth == 0:
+                self._connection.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._connection.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self._connection.execute("COMMIT")
+                self.write_count += 1
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        """
+        Get one value.
+
+        Args:
+            namespace: Collection name
+            key: Row key
+            default: Value returned if the row does not exist
+
+        Returns:
+            Stored value or default
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM records WHERE namespace = ? AND key = ?", (namespace, key)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def items(self, namespace: str) -> List[Tuple[str, Any]]:
+        """
+        Get all rows of a namespace in insertion order.
+
+        Args:
+            namespace: Collection name
+
+        Returns:
+            (key, value) pairs
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key, value FROM records WHERE namespace = ? ORDER BY rowid", (namespace,)).fetchall()
+        return [(key, json.loads(value)) for key, value in rows]
+
+    def count(self, namespace: str) -> int:
+        """Number of rows in a namespace."""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM records WHERE namespace = ?", (namespace,)).fetchone()[0]
+
+    def put(self, namespace: str, key: str, value: Any) -> None:
+        """
+        Insert or update one row.
+
+        Args:
+            namespace: Collection name
+            key: Row key
+            value: JSON-serialisable value
+        """
+        self.put_many(namespace, [(key, value)])
+
+    def put_many(self, namespace: str, items: Iterable[Tuple[str, Any]]) -> None:
+        """
+        Insert or update several rows in one transaction.
+
+        Args:
+            namespace: Collection name
+            items: (key, value) pairs
+        """
+        now = time.time()
+        rows = [(namespace, key, json.dumps(value, ensure_ascii=False), now) for key, value in items]
+        if not rows:
+            return
+        with self.transaction():
+            self._connection.executemany(
+                "INSERT INTO records (namespace, key, value, updated) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, updated = excluded.updated",
+                rows)
+
+    def delete(self, namespace: str, *keys: str) -> None:
+        """
+        Delete rows.
+
+        Args:
+            namespace: Collection name
+            keys: Keys of the rows to delete
+        """
+        if not keys:
+            return
+        with self.transaction():
+            self._connection.executemany(
+                "DELETE FROM records WHERE namespace = ? AND key = ?", [(namespace, key) for key in keys])
+
+    def clear(self, namespace: str) -> None:
+        """Delete every row of a namespace."""
+        with self.transaction():
+            self._connection.execute("DELETE FROM records WHERE namespace = ?", (namespace,))
+
+    def replace(self, namespace: str, items: Iterable[Tuple[str, Any]]) -> None:
+        """
+        Replace a namespace's rows, writing only rows that changed.
+
+        Unchanged rows keep their position; new rows are appended.
+
+        Args:
+            namespace: Collection name
+            items: Complete new (key, value) contents
+        """
+        new_items = dict(items)
+        existing = dict(self.items(namespace))
+        changed = [(key, value) for key, value in new_items.items()
+                   if key not in existing or existing[key] != value]
+        removed = [key for key in existing if key not in new_items]
+        if not changed and not removed:
+            return
+        with self.transaction():
+            self.delete(namespace, *removed)
+            self.put_many(namespace, changed)
+
+    def migrate_json(self, name: str, file_path: Union[str, Path],
+                     importer: Callable[[Any], None]) -> bool:
+        """
+        Import a legacy JSON file once.
+
+        The importer runs inside one transaction with the migration marker,
+        so an interrupted import is retried on the next start. The file is
+        then renamed with a ".migrated" suffix.
+
+        Args:
+            name: Unique migration name
+            file_path: Legacy JSON file
+            importer: Callable that writes the loaded JSON data into the store
+
+        Returns:
+            True if a file was imported
+        """
+        if self.get(MIGRATIONS_NAMESPACE, name) is not None:
+            return False
+
+        file_path = Path(file_path)
+        data = None
+        if file_path.exists():
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.error(f"Failed to read {file_path} for migration: {e}")
+                return False
+
+        with self.transaction():
+            if data is not None:
+                importer(data)
+            self.put(MIGRATIONS_NAMESPACE, name, {'source': str(file_path), 'migrated_at': time.time()})
+
+        if data is None:
+            return False
+        try:
+            os.replace(file_path, file_path.with_name(file_path.name + ".migrated"))
+        except OSError as e:
+            logger.warning(f"Could not rename migrated file {file_path}: {e}")
+        logger.info(f"Migrated {file_path} into the state store")
+        return True
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+_state_store: Optional[StateStore] = None
+
+
+def get_state_store() -> StateStore:
+    """
+    Get the application-wide state store in the app data directory.
+
+    Returns:
+        Shared StateStore instance
+    """
+    global _state_store
+    if _state_store is None:
+        app_data_dir = Path(QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation))
+        app_data_dir.mkdir(parents=True, exist_ok=True)
+        _state_store = StateStore(app_data_dir / STATE_DATABASE_NAME)
+    return _state_store
+
+
+def diff_rows(saved: Dict[str, str], items: Dict[str, Any]) -> Tuple[List[Tuple[str, Any]], List[str]]:
+    """
+    Compare values against their last saved JSON text.
+
+    Args:
+        saved: Key to JSON text of the last saved values; updated in place
+        items: Current values
+
+    Returns:
+        (changed (key, value) pairs, removed keys)
+    """
+    changed = []
+    for key, value in items.items():
+        encoded = json.dumps(value, ensure_ascii=False, sort_keys=True)
+        if saved.get(key) != encoded:
+            saved[key] = encoded
+            changed.append((key, value))
+    removed = [key for key in saved if key not in items]
+    for key in removed:
+        del saved[key]
+    return changed, removed
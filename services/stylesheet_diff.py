@@ -0,0 +1,270 @@
+"""
+Stylesheet diffing for incremental theme switching.
+
+Compares two processed stylesheets rule by rule so theme switches can skip
+work that would not change anything: identical application sheets are not
+re-applied, widget-scoped sheets are only set when their text changes, and
+explicit repolishing is limited to widgets matched by changed selectors and
+done in one batch with updates disabled.
+
+When every changed rule targets named widgets (an #objectName subject), the
+changes are applied as overlays on those widgets' own stylesheets instead of
+replacing the application stylesheet, which would re-polish every widget.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from PySide6.QtWidgets import QApplication, QWidget
+
+from lg import logger
+
+
+_COMMENT_PATTERN = re.compile(r'/\*.*?\*/', re.DOTALL)
+_RULE_PATTERN = re.compile(r'([^{}]+)\{([^{}]*)\}')
+_TYPE_PATTERN = re.compile(r'(?:^|[\s>+~.])([A-Za-z_][\w]*)')
+_OBJECT_NAME_PATTERN = re.compile(r'#([\w-]+)')
+_PSEUDO_PATTERN = re.compile(r'::?[\w-]+(?:\([^)]*\))?|\[[^\]]*\]')
+
+# Separates a widget's own stylesheet from the theme overlay appended to it
+OVERLAY_MARKER = "\n/* theme overlay */\n"
+
+
+def _selector_subject(selector: str) -> str:
+    """The last compound selector with pseudo states and sub-controls stripped."""
+    return _PSEUDO_PATTERN.sub('', re.split(r'[\s>+~]+', selector.strip())[-1])
+
+
+def parse_stylesheet_rules(css: str) -> Dict[str, Dict[str, str]]:
+    """
+    Parse a stylesheet into selector -> property -> value.
+
+    Selector groups are split so every selector is keyed on its own, and
+    later declarations override earlier ones like they do in QSS.
+
+    Args:
+        css: Processed stylesheet text
+
+    Returns:
+        Dictionary of selectors and their declared properties
+    """
+    rules: Dict[str, Dict[str, str]] = {}
+    for match in _RULE_PATTERN.finditer(_COMMENT_PATTERN.sub('', css)):
+        declarations = {}
+        for declaration in match.group(2).split(';'):
+            name, separator, value = declaration.partition(':')
+            if separator:
+                declarations[name.strip()] = value.strip()
+        for selector in match.group(1).split(','):
+            selector = ' '.join(selector.split())
+            if selector:
+                rules.setdefault(selector, {}).update(declarations)
+    return rules
+
+
+@dataclass
+class StylesheetDiff:
+    """Selectors that differ between two stylesheets."""
+    changed: Set[str] = field(default_factory=set)
+    added: Set[str] = field(default_factory=set)
+    removed: Set[str] = field(default_factory=set)
+
+    @property
+    def is_empty(self) -> bool:
+        """True when both stylesheets style every selector identically."""
+        return not (self.changed or self.added or self.removed)
+
+    @property
+    def selectors(self) -> Set[str]:
+        """All selectors whose effective styling differs."""
+        return self.changed | self.added | self.removed
+
+    @classmethod
+    def between(cls, old_css: str, new_css: str) -> 'StylesheetDiff':
+        """Compute the diff between two stylesheets."""
+        if old_css == new_css:
+            return cls()
+        old_rules = parse_stylesheet_rules(old_css)
+        new_rules = parse_stylesheet_rules(new_css)
+        diff = cls(
+            changed={selector for selector, properties in new_rules.items()
+                     if selector in old_rules and old_rules[selector] != properties},
+            added=new_rules.keys() - old_rules.keys(),
+            removed=old_rules.keys() - new_rules.keys()
+        )
+        logger.debug(f"Stylesheet diff: {len(diff.changed)} changed, "
+                     f"{len(diff.added)} added, {len(diff.removed)} removed selectors")
+        return diff
+
+    def selector_targets(self) -> Tuple[Set[str], Set[str]]:
+        """
+        Extract the widget class names and object names the changed selectors target.
+
+        Only the subject (last compound selector) is considered, with pseudo
+        states and sub-controls stripped. A universal selector yields '*'.
+
+        Returns:
+            Tuple of (class_names, object_names)
+        """
+        class_names: Set[str] = set()
+        object_names: Set[str] = set()
+        for selector in self.selectors:
+            subject = _selector_subject(selector)
+            names = _OBJECT_NAME_PATTERN.findall(subject)
+            object_names.update(names)
+            subject = _OBJECT_NAME_PATTERN.sub('', subject)
+            if not subject and names:
+                continue
+            if subject.startswith('*') or not subject:
+                class_names.add('*')
+            else:
+                class_names.update(_TYPE_PATTERN.findall(subject))
+        return class_names, object_names
+
+    def affected_widgets(self, widgets: Iterable[QWidget]) -> List[QWidget]:
+        """Filter widgets down to those matched by a changed selector."""
+        class_names, object_names = self.selector_targets()
+        if '*' in class_names:
+            return list(widgets)
+        affected = []
+        for widget in widgets:
+            if widget.objectName() in object_names:
+                affected.append(widget)
+                continue
+            meta = widget.metaObject()
+            while meta is not None:
+                if meta.className() in class_names:
+                    affected.append(widget)
+                    break
+                meta = meta.superClass()
+        return affected
+
+
+def object_name_overlays(base_css: str, new_css: str) -> Optional[Dict[str, str]]:
+    """
+    Express the change from base_css to new_css as per-widget overlays.
+
+    Possible only when every changed or added rule has a single #objectName
+    in its subject and no rule or property is removed, since an overlay can
+    override the application stylesheet but not unset anything in it. Each
+    overlay holds all new rules whose subject names that widget, in sheet
+    order, because a widget's own stylesheet outranks the application's
+    regardless of specificity.
+
+    Args:
+        base_css: Stylesheet currently set on the application
+        new_css: Stylesheet to apply
+
+    Returns:
+        Overlay CSS per object name, or None if the change is not scoped
+    """
+    base_rules = parse_stylesheet_rules(base_css)
+    new_rules = parse_stylesheet_rules(new_css)
+    if base_rules.keys() - new_rules.keys():
+        return None
+
+    changed_names: Set[str] = set()
+    for selector, properties in new_rules.items():
+        old_properties = base_rules.get(selector)
+        if old_properties == properties:
+            continue
+        names = _OBJECT_NAME_PATTERN.findall(_selector_subject(selector))
+        if len(names) != 1 or (old_properties is not None and old_properties.keys() - properties.keys()):
+            return None
+        changed_names.add(names[0])
+
+    overlays: Dict[str, List[str]] = {name: [] for name in changed_names}
+    for selector, properties in new_rules.items():
+        for name in _OBJECT_NAME_PATTERN.findall(_selector_subject(selector)):
+            if name in overlays:
+                declarations = "; ".join(f"{key}: {value}" for key, value in properties.items())
+                overlays[name].append(f"{selector} {{ {declarations}; }}")
+    return {name: "\n".join(rules) for name, rules in overlays.items()}
+
+
+def set_scoped_stylesheet(widget: QWidget, css: str) -> bool:
+    """
+    Set a widget-scoped stylesheet only when it actually changes.
+
+    Qt re-polishes the widget subtree on every setStyleSheet call, even when
+    the text is identical. A theme overlay on the widget is kept.
+
+    Returns:
+        True if the stylesheet was updated
+    """
+    _, marker, overlay = widget.styleSheet().partition(OVERLAY_MARKER)
+    return _set_widget_stylesheet(widget, css + marker + overlay)
+
+
+def set_stylesheet_overlay(widget: QWidget, overlay: str) -> bool:
+    """
+    Set or, with an empty overlay, remove the theme overlay of a widget.
+
+    Returns:
+        True if the stylesheet was updated
+    """
+    base = widget.styleSheet().partition(OVERLAY_MARKER)[0]
+    return _set_widget_stylesheet(widget, base + OVERLAY_MARKER + overlay if overlay else base)
+
+
+def _set_widget_stylesheet(widget: QWidget, css: str) -> bool:
+    if widget.styleSheet() == css:
+        return False
+    widget.setStyleSheet(css)
+    return True
+
+
+def apply_stylesheet_overlays(overlays: Dict[str, str]) -> Optional[int]:
+    """
+    Set theme overlays on the widgets they name and clear all others.
+
+    Updates are disabled on visible top-level windows meanwhile, so each
+    window repaints once.
+
+    Args:
+        overlays: Overlay CSS per object name; empty to clear all overlays
+
+    Returns:
+        Number of widgets updated, or None (nothing changed) if a named
+        widget does not exist, since the overlay could not take effect
+    """
+    widgets = QApplication.allWidgets()
+    if overlays.keys() - {widget.objectName() for widget in widgets}:
+        return None
+
+    frozen = [window for window in QApplication.topLevelWidgets()
+              if window.isVisible() and window.updatesEnabled()]
+    for window in frozen:
+        window.setUpdatesEnabled(False)
+    updated = 0
+    for widget in widgets:
+        overlay = overlays.get(widget.objectName(), "")
+        if (overlay or OVERLAY_MARKER in widget.styleSheet()) and set_stylesheet_overlay(widget, overlay):
+            updated += 1
+    for window in frozen:
+        window.setUpdatesEnabled(True)
+    return updated
+
+
+def batched_repolish(widgets: Iterable[QWidget]) -> int:
+    """
+    Re-polish widgets in one pass with updates disabled on their windows.
+
+    Returns:
+        Number of widgets repolished
+    """
+    widgets = list(widgets)
+    if not widgets:
+        return 0
+    windows = {widget.window() for widget in widgets}
+    frozen = [window for window in windows if window.updatesEnabled()]
+    for window in frozen:
+        window.setUpdatesEnabled(False)
+    style = QApplication.style()
+    for widget in widgets:
+        style.unpolish(widget)
+        style.polish(widget)
+    for window in frozen:
+        window.setUpdatesEnabled(True)
+    return len(widgets)
@@ -0,0 +1,147 @@
+"""
+Test suite for the plugin API event bus.
+"""
+
+import gc
+import threading
+import time
+import unittest
+
+from PySide6.QtCore import QCoreApplication
+from PySide6.QtWidgets import QApplication
+
+from core.event_bus import EventBus, EventDelivery
+
+
+class Receiver:
+    """Collects events delivered to a bound method."""
+
+    def __init__(self):
+        self.received = []
+
+    def on_event(self, **event_data):
+        self.received.append(event_data)
+
+
+class TestEventBus(unittest.TestCase):
+    """Test subscription indexing, weak callbacks, coalescing and delivery modes."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment."""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.bus = EventBus()
+
+    def tearDown(self):
+        self.bus.shutdown()
+
+    def _process_events_for(self, milliseconds: int) -> None:
+        deadline = time.perf_counter() + milliseconds / 1000
+        while time.perf_counter() < deadline:
+            QCoreApplication.processEvents()
+            time.sleep(0.005)
+
+    def test_subscribe_emit_unsubscribe(self):
+        """Subscribers receive event data until they unsubscribe."""
+        received = []
+
+        def on_saved(path):
+            received.append(path)
+
+        self.bus.subscribe("file.saved", on_saved)
+        self.bus.subscribe("file.saved", on_saved)
+        self.bus.emit("file.saved", {'path': "a.po"})
+        self.assertEqual(received, ["a.po"])
+
+        self.assertTrue(self.bus.unsubscribe("file.saved", on_saved))
+        self.assertFalse(self.bus.unsubscribe("file.saved", on_saved))
+        self.bus.emit("file.saved", {'path': "b.po"})
+        self.assertEqual(received, ["a.po"])
+        self.assertEqual(self.bus.get_subscriber_counts(), {})
+
+    def test_bound_method_is_weak(self):
+        """A bound-method subscriber is dropped when its object is deleted."""
+        receiver = Receiver()
+        self.bus.subscribe("selection.changed", receiver.on_event)
+        self.bus.emit("selection.changed", {'row': 1})
+        self.assertEqual(receiver.received, [{'row': 1}])
+        self.assertTrue(self.bus.unsubscribe("selection.changed", receiver.on_event))
+
+        self.bus.subscribe("selection.changed", receiver.on_event)
+        del receiver
+        gc.collect()
+        self.assertEqual(self.bus.subscriber_count("selection.changed"), 0)
+        self.bus.emit("selection.changed", {'row': 2})
+
+    def test_failing_subscriber_does_not_stop_dispatch(self):
+        """Errors in one subscriber are logged and the rest still run."""
+        received = []
+
+        def failing(**event_data):
+            raise RuntimeError("boom")
+
+        self.bus.subscribe("cursor.moved", failing)
+        self.bus.subscribe("cursor.moved", lambda line: received.append(line))
+        self.bus.emit("cursor.moved", {'line': 7})
+        self.assertEqual(received, [7])
+
+    def test_coalescing_delivers_latest_data(self):
+        """Bursts of a coalesced event become one dispatch with the latest data."""
+        received = []
+        self.bus.subscribe("cursor.moved", lambda line: received.append(line))
+        self.bus.set_coalescing("cursor.moved", 20)
+
+        for line in range(100):
+            self.bus.emit("cursor.moved", {'line': line})
+        self.assertEqual(received, [])
+
+        self._process_events_for(100)
+        self.assertEqual(received, [99])
+        metrics = self.bus.get_metrics()["cursor.moved"]
+        self.assertEqual(metrics['emitted'], 100)
+        self.assertEqual(metrics['dispatched'], 1)
+        self.assertEqual(metrics['coalesced'], 99)
+
+    def test_flush_delivers_pending_events(self):
+        """flush() dispatches coalesced events without waiting for the timer."""
+        received = []
+        self.bus.subscribe("selection.changed", lambda row: received.append(row))
+        self.bus.set_coalescing("selection.changed", 10000, debounce=True)
+        self.bus.emit("selection.changed", {'row': 3})
+        self.bus.emit("selection.changed", {'row': 4})
+        self.bus.flush()
+        self.assertEqual(received, [4])
+
+    def test_queued_and_worker_delivery(self):
+        """Queued subscribers run on the UI thread later, worker subscribers off it."""
+        queued_threads = []
+        worker_threads = []
+        worker_done = threading.Event()
+
+        def on_worker(**event_data):
+            worker_threads.append(threading.current_thread())
+            worker_done.set()
+
+        self.bus.subscribe("index.updated", lambda **data: queued_threads.append(threading.current_thread()),
+                           EventDelivery.QUEUED)
+        self.bus.subscribe("index.updated", on_worker, EventDelivery.WORKER)
+        self.bus.emit("index.updated", {'count': 1})
+
+        self.assertEqual(queued_threads, [])
+        self.assertTrue(worker_done.wait(5))
+        self._process_events_for(50)
+        self.assertEqual(queued_threads, [threading.main_thread()])
+        self.assertNotEqual(worker_threads, [threading.main_thread()])
+
+    def test_qt_signal_mirrors_dispatch(self):
+        """The event_emitted signal carries dispatched events when connected."""
+        emitted = []
+        self.bus.event_emitted.connect(lambda name, data: emitted.append((name, data)))
+        self.bus.emit("file.opened", {'path': "a.po"})
+        self.assertEqual(emitted, [("file.opened", {'path': "a.po"})])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+Test suite for PluginManager discovery caching and lazy activation.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from PySide6.QtWidgets import QApplication, QWidget
+
+from core.api import PluginAPI
+from core.plugin_manager import PluginManager
+from lg import logger
+
+
+PLUGIN_SOURCE = """
+def register(api):
+    api.register_command('{name}.run', lambda: '{name}')
+"""
+
+
+class TestPluginManager(unittest.TestCase):
+    """Test plugin manifest caching and activation events."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment."""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """Create a temporary plugin directory with eager and lazy plugins."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.plugin_dir = self.temp_dir / "plugins"
+        self.manifest_path = self.temp_dir / "plugin_manifest.json"
+        self._create_plugin("pm_core")
+        self._create_plugin("pm_base", {"activation_events": ["onCommand:pm_base.run"]})
+        self._create_plugin("pm_search", {
+            "dependencies": ["pm_base"],
+            "activation_events": ["onPanel:pm_search", "onCommand:pm_search.run"]
+        })
+        self.window = QWidget()
+        self.api = PluginAPI(self.window)
+
+    def _create_plugin(self, name: str, metadata: dict = None):
+        plugin_path = self.plugin_dir / name
+        plugin_path.mkdir(parents=True)
+        (plugin_path / "__init__.py").write_text("", encoding='utf-8')
+        (plugin_path / "plugin.py").write_text(PLUGIN_SOURCE.format(name=name), encoding='utf-8')
+        if metadata is not None:
+            (plugin_path / "plugin.json").write_text(json.dumps(metadata), encoding='utf-8')
+
+    def _create_manager(self) -> PluginManager:
+        manager = PluginManager(str(self.plugin_dir), self.api, manifest_path=self.manifest_path)
+        self.api.set_activation_handler(manager.activate)
+        return manager
+
+    def test_discovery_uses_manifest_cache(self):
+        """A second discovery reads the manifest instead of scanning plugins."""
+        self.assertEqual(sorted(self._create_manager().discover_plugins()), ["pm_base", "pm_core", "pm_search"])
+        self.assertTrue(self.manifest_path.exists())
+
+        with patch.object(PluginManager, '_analyze_plugin') as analyze:
+            cached = self._create_manager().discover_plugins()
+        analyze.assert_not_called()
+        self.assertEqual(sorted(cached), ["pm_base", "pm_core", "pm_search"])
+
+    def test_manifest_invalidated_by_changed_metadata(self):
+        """Editing plugin.json invalidates the cached manifest."""
+        self._create_manager().discover_plugins()
+        metadata_file = self.plugin_dir / "pm_base" / "plugin.json"
+        metadata_file.write_text(json.dumps({"version": "2.0.0"}), encoding='utf-8')
+        stat = metadata_file.stat()
+        os.utime(metadata_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        manager = self._create_manager()
+        manager.discover_plugins()
+        self.assertEqual(manager.get_plugin_info("pm_base").version, "2.0.0")
+        self.assertFalse(manager.get_plugin_info("pm_base").is_lazy)
+
+    def test_lazy_plugins_load_on_activation(self):
+        """Lazy plugins are deferred and loaded with their dependencies on demand."""
+        manager = self._create_manager()
+        manager.discover_plugins()
+        results = manager.load_all_plugins()
+        self.assertTrue(all(results.values()))
+        self.assertEqual(manager.get_loaded_plugins(), ["pm_core"])
+        self.assertTrue(manager.get_plugin_status()["pm_search"]["deferred"])
+
+        self.assertEqual(manager.activate("onPanel:pm_search"), ["pm_search"])
+        self.assertEqual(sorted(manager.get_loaded_plugins()), ["pm_base", "pm_core", "pm_search"])
+        logger.info(f"Plugin status after activation: {manager.get_plugin_status()}")
+
+    def test_unknown_command_activates_plugin(self):
+        """Executing a command of a deferred plugin activates it first."""
+        manager = self._create_manager()
+        manager.discover_plugins()
+        manager.load_all_plugins()
+        self.assertEqual(self.api.execute_command("pm_base.run"), "pm_base")
+        self.assertIn("pm_base", manager.get_loaded_plugins())
+
+    def test_eager_plugins_register_in_dependency_order(self):
+        """Dependencies register first and load times are reported."""
+        self._create_plugin("pm_ui", {"dependencies": ["pm_model"]})
+        self._create_plugin("pm_model", {"dependencies": ["pm_core"]})
+        manager = self._create_manager()
+        manager.discover_plugins()
+        results = manager.load_all_plugins()
+
+        self.assertTrue(results["pm_ui"])
+        order = list(manager._loaded_plugins)
+        self.assertLess(order.index("pm_core"), order.index("pm_model"))
+        self.assertLess(order.index("pm_model"), order.index("pm_ui"))
+        status = manager.get_plugin_status()["pm_ui"]
+        self.assertIsNotNone(status["import_time_ms"])
+        self.assertIsNotNone(status["register_time_ms"])
+
+    def test_circular_and_missing_dependencies_fail(self):
+        """Plugins in a dependency cycle or with missing dependencies are not loaded."""
+        self._create_plugin("pm_left", {"dependencies": ["pm_right"]})
+        self._create_plugin("pm_right", {"dependencies": ["pm_left"]})
+        self._create_plugin("pm_orphan", {"dependencies": ["pm_missing"]})
+        manager = self._create_manager()
+        manager.discover_plugins()
+        results = manager.load_all_plugins()
+
+        self.assertFalse(results["pm_left"])
+        self.assertFalse(results["pm_right"])
+        self.assertFalse(results["pm_orphan"])
+        self.assertTrue(results["pm_core"])
+
+    def test_module_bodies_run_on_ui_thread(self):
+        """Plugin modules execute on the calling thread; only compiling is concurrent."""
+        plugin_file = self.plugin_dir / "pm_core" / "plugin.py"
+        plugin_file.write_text("import threading\nIMPORT_THREAD = threading.current_thread()\n"
+                               + PLUGIN_SOURCE.format(name="pm_core"), encoding='utf-8')
+        manager = self._create_manager()
+        manager.discover_plugins()
+        self.assertTrue(manager.load_all_plugins()["pm_core"])
+        self.assertIs(manager.get_plugin_info("pm_core").module.IMPORT_THREAD, threading.current_thread())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+"""
+Unit tests for TranslationMemoryService.
+
+Tests n-gram indexing, fuzzy msgid lookup, index persistence and
+confidence score recording in the translation history tables.
+"""
+
+import unittest
+import tempfile
+from pathlib import Path
+
+from preferences.common.database import DatabaseManager
+from preferences.translation_history import (
+    TranslationMemoryService, bounded_levenshtein, extract_ngrams
+)
+from lg import logger
+
+
+class TestBoundedLevenshtein(unittest.TestCase):
+    """Test suite for the bounded edit distance helper."""
+
+    def test_exact_distance_within_bound(self):
+        """Distances inside the bound are exact."""
+        self.assertEqual(bounded_levenshtein("kitten", "sitting", 5), 3)
+        self.assertEqual(bounded_levenshtein("", "abc", 5), 3)
+        self.assertEqual(bounded_levenshtein("same", "same", 0), 0)
+
+    def test_distance_over_bound(self):
+        """Distances beyond the bound are reported as bound + 1."""
+        self.assertEqual(bounded_levenshtein("kitten", "sitting", 2), 3)
+        self.assertEqual(bounded_levenshtein("a", "abcdef", 2), 3)
+
+    def test_extract_ngrams_distinct(self):
+        """N-grams are padded and deduplicated."""
+        self.assertEqual(extract_ngrams("aaaa"), [" aa", "aaa", "aa "])
+        self.assertEqual(extract_ngrams("a"), [" a "])
+
+
+class TestTranslationMemoryService(unittest.TestCase):
+    """Test suite for TranslationMemoryService functionality."""
+
+    ENTRIES = [
+        ("Open file", "Mở tệp"),
+        ("Open folder", "Mở thư mục"),
+        ("Save file", "Lưu tệp"),
+        ("Save file as...", "Lưu tệp thành..."),
+        ("Close all editors", "Đóng tất cả trình soạn thảo"),
+    ]
+
+    def setUp(self):
+        """Set up a temporary preferences database with entries."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = str(Path(self.temp_dir) / "preferences.db")
+        self.db_manager = DatabaseManager(self.db_path)
+        self.db_manager.initialize_database()
+        with self.db_manager.get_connection() as conn:
+            conn.executemany(
+                "INSERT INTO translation_entries (msgid, current_msgstr) VALUES (?, ?)",
+                self.ENTRIES
+            )
+            conn.commit()
+        self.service = TranslationMemoryService(self.db_manager)
+        self.service.build_index()
+
+    def test_index_path_alongside_database(self):
+        """The sidecar index lives next to preferences.db."""
+        self.assertEqual(self.service.index_path, str(Path(self.temp_dir) / "preferences.tmindex"))
+
+    def test_find_similar_ranks_best_first(self):
+        """Closest msgids come first with their confidence."""
+        matches = self.service.find_similar("Save files", limit=3)
+        logger.info(f"TM matches: {matches}")
+        self.assertGreater(len(matches), 0)
+        self.assertEqual(matches[0].msgid, "Save file")
+        self.assertEqual(matches[0].msgstr, "Lưu tệp")
+        self.assertAlmostEqual(matches[0].confidence, 0.9)
+        confidences = [match.confidence for match in matches]
+        self.assertEqual(confidences, sorted(confidences, reverse=True))
+
+    def test_exact_match_is_case_insensitive(self):
+        """Case and whitespace differences still give full confidence."""
+        matches = self.service.find_similar("  open   FILE ")
+        self.assertEqual(matches[0].msgid, "Open file")
+        self.assertEqual(matches[0].confidence, 1.0)
+
+    def test_min_confidence_filters(self):
+        """Unrelated text yields no suggestions."""
+        self.assertEqual(self.service.find_similar("Preferences dialog"), [])
+
+    def test_removed_entry_not_suggested(self):
+        """Removed entries are skipped during lookup."""
+        self.service.remove_entry(1)
+        msgids = [match.msgid for match in self.service.find_similar("Open file")]
+        self.assertNotIn("Open file", msgids)
+
+    def test_replaced_entry_matches_new_text_only(self):
+        """Re-adding an id indexes the new text without duplicate or stale postings."""
+        self.service.add_entry(1, "Open recent projects")
+        self.service.add_entry(1, "Open recent projects")
+        self.assertEqual(list(self.service._postings["pro"]).count(1), 1)
+        self.assertEqual(self.service._collect_candidates("open recent project", 0.6)[0], 1)
+        # Stale postings of "Open file" no longer count towards entry 1
+        self.assertNotIn(1, self.service._collect_candidates("open file", 0.8))
+
+        self.service.purge_replaced()
+        self.assertNotIn(1, self.service._postings["fil"])
+        self.assertIn(1, self.service._postings["pro"])
+
+    def test_sync_reindexes_modified_entries(self):
+        """Entries whose modified_date was bumped are indexed again."""
+        with self.db_manager.get_connection() as conn:
+            conn.execute(
+                "UPDATE translation_entries SET msgid = ?, modified_date = datetime('now', '+1 day') WHERE id = 1",
+                ("Open workspace",)
+            )
+            conn.commit()
+        self.service.sync_index()
+        self.assertEqual(self.service.find_similar("Open workspaces")[0].entry_id, 1)
+        self.assertNotIn(1, [match.entry_id for match in self.service.find_similar("Open file")])
+
+    def test_resyncing_unchanged_entries_replaces_nothing(self):
+        """Rows of the last seen second are synced again without being marked replaced."""
+        self.assertGreater(self.service.sync_index(), 0)
+        self.assertEqual(self.service._replaced, {})
+        self.service.add_entry(1, "Open files")
+        self.assertEqual(self.service._replaced, {1: "open files"})
+        self.assertTrue(self.service.save_index())
+        self.assertEqual(self.service._replaced, {})
+
+    def test_save_load_and_sync(self):
+        """A saved index reloads and picks up new entries incrementally."""
+        self.assertTrue(self.service.save_index())
+        with self.db_manager.get_connection() as conn:
+            conn.execute(
+                "INSERT INTO translation_entries (msgid, current_msgstr) VALUES (?, ?)",
+                ("Open recent file", "Mở tệp gần đây")
+            )
+            conn.commit()
+
+        reloaded = TranslationMemoryService(self.db_manager)
+        self.assertTrue(reloaded.load_index())
+        self.assertEqual(reloaded.entry_count, len(self.ENTRIES))
+        self.assertEqual(reloaded.sync_index(), len(self.ENTRIES) + 1)
+        self.assertEqual(reloaded.find_similar("Open recent files")[0].msgid, "Open recent file")
+
+    def test_record_suggestion_fills_confidence(self):
+        """Recording a suggestion stores its confidence in translation_versions."""
+        match = self.service.find_similar("Save files")[0]
+        version_id = self.service.record_suggestion(match.entry_id, match)
+        with self.db_manager.get_connection() as conn:
+            row = conn.execute(
+                "SELECT source, confidence_score, version_number FROM translation_versions WHERE id = ?",
+                (version_id,)
+            ).fetchone()
+        self.assertEqual(row["source"], TranslationMemoryService.TM_SOURCE)
+        self.assertAlmostEqual(row["confidence_score"], match.confidence)
+        self.assertEqual(row["version_number"], 1)
+
+    def test_score_unscored_versions(self):
+        """TM versions without a score get one from the best matching entry."""
+        with self.db_manager.get_connection() as conn:
+            conn.execute(
+                "INSERT INTO translation_versions (entry_id, msgstr, source) VALUES (?, ?, ?)",
+                (4, "Lưu tệp", TranslationMemoryService.TM_SOURCE)
+            )
+            conn.commit()
+        self.assertEqual(self.service.score_unscored_versions(), 1)
+        with self.db_manager.get_connection() as conn:
+            row = conn.execute("SELECT confidence_score FROM translation_versions").fetchone()
+        self.assertIsNotNone(row["confidence_score"])
+        self.assertGreater(row["confidence_score"], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
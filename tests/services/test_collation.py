@@ -0,0 +1,52 @@
+"""
+Unit tests for the name collator.
+
+Tests natural numeric ordering, case and accent handling and the bounded
+key cache.
+"""
+
+import unittest
+
+from services.collation import NameCollator
+
+
+class TestNameCollator(unittest.TestCase):
+    """Test suite for NameCollator."""
+
+    def setUp(self):
+        self.collator = NameCollator()
+
+    def _sorted(self, names):
+        return sorted(names, key=self.collator.key)
+
+    def test_numbers_sort_by_value(self):
+        """Digit runs compare as numbers, wherever they are in the name."""
+        self.assertEqual(self._sorted(["file10.po", "file2.po", "file1.po", "10", "9"]),
+                         ["9", "10", "file1.po", "file2.po", "file10.po"])
+        self.assertEqual(self._sorted(["v1.10", "v1.9", "v1.9a"]), ["v1.9", "v1.9a", "v1.10"])
+        self.assertEqual(self._sorted(["zetab.po", "zeta2.po", "zeta.po"]), ["zeta.po", "zeta2.po", "zetab.po"])
+
+    def test_case_and_accents(self):
+        """Case is ignored and accented letters sort with their base letters."""
+        self.assertEqual(self._sorted(["beta", "Alpha", "alpine"]), ["Alpha", "alpine", "beta"])
+        self.assertEqual(self._sorted(["abd", "ábc", "abb"]), ["abb", "ábc", "abd"])
+        self.assertEqual(self._sorted(["strat", "Straße", "strap"]), ["strap", "Straße", "strat"])
+        self.assertEqual(self._sorted(["zh_Hant", "zh_Hans", "zh"]), ["zh", "zh_Hans", "zh_Hant"])
+
+    def test_equal_keys_are_ordered_by_name(self):
+        """Names that collate equally still sort deterministically."""
+        self.assertEqual(self._sorted(["readme", "README"]), self._sorted(["README", "readme"]))
+
+    def test_keys_are_memoised(self):
+        """Keys are computed once per name and the cache is bounded."""
+        self.collator.key("messages.po")
+        self.collator.key("messages.po")
+        info = self.collator.key.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+        self.assertEqual(info.maxsize, NameCollator.MAX_CACHED_KEYS)
+        self.collator.clear()
+        self.assertEqual(self.collator.key.cache_info().currsize, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
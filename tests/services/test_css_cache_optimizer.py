@@ -0,0 +1,86 @@
+"""
+Unit tests for AdvancedCSSCache.
+
+Tests LRU ordering, byte-based size accounting, safe serialization and
+SQLite-backed persistence with TTL sweeps.
+"""
+
+import unittest
+import tempfile
+import time
+
+from services.css_cache_optimizer import AdvancedCSSCache
+from lg import logger
+
+
+class TestAdvancedCSSCache(unittest.TestCase):
+    """Test suite for AdvancedCSSCache functionality."""
+
+    def setUp(self):
+        """Create a cache in a temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = AdvancedCSSCache(max_memory_mb=1, max_entries=3, cache_dir=self.temp_dir)
+
+    def tearDown(self):
+        """Close the cache database."""
+        self.cache.close()
+
+    def test_lru_eviction_order(self):
+        """The least recently used entry is evicted first."""
+        self.cache.put(("css", "a"), "A", persist=False)
+        self.cache.put(("css", "b"), "B", persist=False)
+        self.cache.put(("css", "c"), "C", persist=False)
+        self.assertEqual(self.cache.get(("css", "a"), load_from_disk=False), "A")
+
+        self.cache.put(("css", "d"), "D", persist=False)
+        self.assertIsNone(self.cache.get(("css", "b"), load_from_disk=False))
+        self.assertEqual(self.cache.get(("css", "a"), load_from_disk=False), "A")
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_size_from_serialized_bytes(self):
+        """Memory usage counts the encoded bytes, and replacing a key does not leak."""
+        self.cache.put(("css", "utf8"), "ơn", persist=False)
+        self.assertEqual(self.cache.current_memory_usage, len("ơn".encode('utf-8')))
+        self.cache.put(("css", "utf8"), "x", persist=False)
+        self.assertEqual(self.cache.current_memory_usage, 1)
+
+    def test_memory_limit_evicts(self):
+        """Entries are evicted once the byte budget is exceeded."""
+        big = "x" * (600 * 1024)
+        self.cache.put(("css", "one"), big, persist=False)
+        self.cache.put(("css", "two"), big, persist=False)
+        self.assertEqual(len(self.cache.entries), 1)
+        self.assertLessEqual(self.cache.current_memory_usage, self.cache.max_memory_bytes)
+
+    def test_rejects_unserializable_values(self):
+        """Values that cannot be stored safely raise TypeError."""
+        with self.assertRaises(TypeError):
+            self.cache.put(("css", "object"), object())
+
+    def test_persistence_round_trip(self):
+        """Persisted entries are reloaded by a new cache instance."""
+        self.cache.put(("vars", "dark"), {"fg": "#fff", "bg": "#000"})
+        self.cache.put(("css", "dark"), "QWidget { color: #fff; }")
+        self.cache.close()
+
+        reopened = AdvancedCSSCache(cache_dir=self.temp_dir)
+        self.assertEqual(reopened.get(("vars", "dark")), {"fg": "#fff", "bg": "#000"})
+        self.assertEqual(reopened.get(("css", "dark")), "QWidget { color: #fff; }")
+        self.assertEqual(reopened.hits, 2)
+        self.cache = reopened
+
+    def test_cleanup_expired_sweeps_memory_and_disk(self):
+        """Expired entries are removed from memory and, on the sweep thread, from disk."""
+        self.cache.put(("css", "old"), "old")
+        self.cache.entries[("css", "old")].last_accessed = time.time() - 7200
+        self.cache._connection.execute("UPDATE cache_entries SET created_at = ?", (time.time() - 7200,))
+        self.cache._connection.commit()
+
+        self.cache.cleanup_expired(max_age_hours=1, wait=True)
+        logger.info(f"Cache statistics after sweep: {self.cache.get_statistics()}")
+        self.assertEqual(len(self.cache.entries), 0)
+        self.assertIsNone(self.cache.get(("css", "old")))
+
+
+if __name__ == '__main__':
+    unittest.main()
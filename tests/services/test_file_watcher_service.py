@@ -0,0 +1,203 @@
+"""
+Unit tests for the workspace file watcher.
+
+Tests recursive watches, per-directory coalescing, rename pairing, the
+watch limit, publishing on the plugin event bus and the path index
+following the reported changes.
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from PySide6.QtCore import QCoreApplication
+
+from services import file_watcher_service
+from services.file_watcher_service import (
+    FILE_SYSTEM_CHANGED_EVENT, DirectoryChanges, FileWatcherService, _PendingChanges
+)
+from services.path_completion_service import PathCompletionService
+from services.path_index import PathIndex
+
+
+class TestPendingChanges(unittest.TestCase):
+    """Test suite for the per-directory coalescing rules."""
+
+    def test_coalescing(self):
+        """Short-lived files vanish and replaced files are reported modified."""
+        pending = _PendingChanges()
+        pending.add_created("/d/tmp", False)
+        pending.add_modified("/d/tmp")
+        pending.add_deleted("/d/tmp", False)
+        pending.add_deleted("/d/saved.po", False)
+        pending.add_created("/d/saved.po", False)
+        pending.add_created("/d/new", True)
+
+        changes = pending.to_changes("/d")
+        self.assertEqual(changes.created, ["/d/new"])
+        self.assertEqual(changes.deleted, [])
+        self.assertEqual(changes.modified, ["/d/saved.po"])
+        self.assertEqual(changes.directories, {"/d/new"})
+
+
+class TestFileWatcherService(unittest.TestCase):
+    """Test suite for FileWatcherService."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment."""
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        """Watch a small temporary tree."""
+        self.root = Path(tempfile.mkdtemp()).resolve()
+        (self.root / "locale" / "de").mkdir(parents=True)
+        (self.root / ".git").mkdir()
+        (self.root / "locale" / "de" / "messages.po").write_text("msgid \"\"\n")
+        self.api = Mock()
+        self.watcher = FileWatcherService(api=self.api)
+        self.batches = []
+        self.watcher.changes_ready.connect(self.batches.append)
+        ready = []
+        self.watcher.watch_ready.connect(ready.append)
+        self.watcher.watch(str(self.root))
+        self._process_events_until(lambda: ready)
+
+    def tearDown(self):
+        self.watcher.close()
+
+    def _process_events_until(self, condition, timeout: float = 5.0) -> None:
+        deadline = time.perf_counter() + timeout
+        while not condition() and time.perf_counter() < deadline:
+            QCoreApplication.processEvents()
+            time.sleep(0.005)
+
+    def _next_batch(self):
+        self._process_events_until(lambda: self.batches)
+        self.assertTrue(self.batches, "no changes reported")
+        return {change.directory: change for change in self.batches.pop(0)}
+
+    def test_watches_tree_except_ignored_directories(self):
+        """Every directory is watched apart from ignored ones such as .git."""
+        self.assertTrue(self.watcher.is_watched(str(self.root / "locale" / "de")))
+        self.assertFalse(self.watcher.is_watched(str(self.root / ".git")))
+        self.assertEqual(self.watcher.watch_count, 3)
+
+    def test_changes_are_batched_per_directory(self):
+        """A burst of changes arrives as one flush with one batch per directory."""
+        de = self.root / "locale" / "de"
+        (de / "messages.po").write_text("changed")
+        (de / "extra.po").write_text("")
+        (self.root / "README").write_text("")
+        (self.root / "scratch").write_text("")
+        (self.root / "scratch").unlink()
+
+        changes = self._next_batch()
+        self.assertEqual(set(changes), {str(self.root), str(de)})
+        self.assertEqual(changes[str(de)].created, [str(de / "extra.po")])
+        self.assertEqual(changes[str(de)].modified, [str(de / "messages.po")])
+        self.assertEqual(changes[str(self.root)].created, [str(self.root / "README")])
+        self.assertEqual(self.batches, [])
+        self.api.emit_event.assert_called_once_with(FILE_SYSTEM_CHANGED_EVENT,
+                                                    changes=list(changes.values()))
+
+    def test_renames_are_paired(self):
+        """Renames become moves and renamed directories keep their watches."""
+        locale = self.root / "locale"
+        (locale / "de").rename(locale / "de_DE")
+        changes = self._next_batch()
+        move = (str(locale / "de"), str(locale / "de_DE"))
+        self.assertEqual(changes[str(locale)].moved, [move])
+        self.assertEqual(changes[str(locale)].directories, set(move))
+
+        (locale / "de_DE" / "new.po").write_text("")
+        changes = self._next_batch()
+        self.assertEqual(changes[str(locale / "de_DE")].created, [str(locale / "de_DE" / "new.po")])
+
+        (locale / "de_DE" / "new.po").rename(self.root / "new.po")
+        changes = self._next_batch()
+        move = (str(locale / "de_DE" / "new.po"), str(self.root / "new.po"))
+        self.assertEqual(changes[str(self.root)].moved, [move])
+        self.assertEqual(changes[str(locale / "de_DE")].moved, [move])
+
+    def test_new_directories_are_watched(self):
+        """A created tree is watched in the background and its existing entries reported."""
+        listed_on = []
+        real_scandir = os.scandir
+
+        def scandir(path):
+            listed_on.append(threading.current_thread() is threading.main_thread())
+            return real_scandir(path)
+
+        with patch.object(file_watcher_service.os, 'scandir', scandir):
+            os.makedirs(self.root / "new" / "sub")
+            (self.root / "new" / "sub" / "file.po").write_text("")
+            self._process_events_until(lambda: self.watcher.is_watched(str(self.root / "new" / "sub")))
+        self.assertTrue(listed_on)
+        self.assertNotIn(True, listed_on)
+        self.watcher.flush()
+        all_created = [path for batch in self.batches for change in batch for path in change.created]
+        self.assertIn(str(self.root / "new"), all_created)
+        self.assertIn(str(self.root / "new" / "sub" / "file.po"), all_created)
+
+        (self.root / "new" / "sub" / "later.po").write_text("")
+        self.batches.clear()
+        changes = self._next_batch()
+        self.assertEqual(changes[str(self.root / "new" / "sub")].created, [str(self.root / "new" / "sub" / "later.po")])
+
+    def test_atomic_save_is_reported_modified(self):
+        """Renaming a temporary file over an existing one reports the file modified."""
+        de = self.root / "locale" / "de"
+        (de / "messages.po.tmp").write_text("saved")
+        os.replace(de / "messages.po.tmp", de / "messages.po")
+        (de / "fresh.po.tmp").write_text("new")
+        os.replace(de / "fresh.po.tmp", de / "fresh.po")
+        changes = self._next_batch()
+        self.assertEqual(changes[str(de)].modified, [str(de / "messages.po")])
+        self.assertEqual(changes[str(de)].created, [str(de / "fresh.po")])
+        self.assertEqual(changes[str(de)].deleted, [])
+
+    def test_watch_limit(self):
+        """Directories beyond MAX_WATCHES are not watched and the limit is reported."""
+        limits = []
+        watcher = FileWatcherService()
+        watcher.watch_limit_reached.connect(limits.append)
+        with patch.object(FileWatcherService, 'MAX_WATCHES', 2):
+            ready = []
+            watcher.watch_ready.connect(ready.append)
+            watcher.watch(str(self.root))
+            self._process_events_until(lambda: ready)
+        self.assertEqual(watcher.watch_count, 2)
+        self.assertEqual(limits, [2])
+        watcher.close()
+
+
+class TestPathIndexUpdates(unittest.TestCase):
+    """Test suite for PathCompletionService following file system changes."""
+
+    def test_apply_file_system_changes(self):
+        """Created, deleted and moved files and directories update the path index."""
+        root = "/project"
+        service = PathCompletionService()
+        service._path_index = PathIndex(root, ["a.po", "locale/de/x.po", "locale/de/y.po", "old.po"])
+        service.apply_file_system_changes([
+            DirectoryChanges(root, created=["/project/b.po"], deleted=["/project/a.po"],
+                             moved=[("/project/old.po", "/project/new.po")]),
+            DirectoryChanges("/project/locale", moved=[("/project/locale/de", "/project/locale/de_DE")],
+                             directories={"/project/locale/de", "/project/locale/de_DE"}),
+            DirectoryChanges("/elsewhere", created=["/elsewhere/c.po"]),
+        ])
+        self.assertEqual(sorted(service.get_path_index().paths()),
+                         ["b.po", "locale/de_DE/x.po", "locale/de_DE/y.po", "new.po"])
+
+        with patch.object(service, 'rebuild_path_index') as rebuild:
+            service.apply_file_system_changes([DirectoryChanges(root, overflow=True)])
+        rebuild.assert_called_once_with(root)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+"""
+Unit tests for the folder size service.
+
+Tests recursive totals, reuse of the stored directory records, incremental
+updates after changes and the size column of the directory-first proxy.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from PySide6.QtCore import QCoreApplication
+from PySide6.QtWidgets import QApplication, QFileSystemModel
+
+from services import folder_size_service
+from services.folder_size_service import NAMESPACE, FolderSize, FolderSizeService
+from services.state_store import StateStore
+from widgets.simple_explorer_widget import DirectoryFirstProxyModel
+
+
+class TestFolderSizeService(unittest.TestCase):
+    """Test suite for FolderSizeService."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment."""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """Create a small tree and a service on a temporary store."""
+        self.root = Path(tempfile.mkdtemp()).resolve()
+        (self.root / "a" / "b").mkdir(parents=True)
+        (self.root / "c").mkdir()
+        (self.root / "top.txt").write_bytes(b"x" * 10)
+        (self.root / "a" / "one.txt").write_bytes(b"x" * 100)
+        (self.root / "a" / "b" / "two.txt").write_bytes(b"x" * 1000)
+        self.store = StateStore(self.root.parent / f"{self.root.name}.db")
+        self.service = FolderSizeService(state_store=self.store)
+
+    def tearDown(self):
+        self.store.close()
+
+    def _wait_for_size(self, service: FolderSizeService, path: Path) -> FolderSize:
+        deadline = time.perf_counter() + 10
+        folder_size = service.get_size(str(path))
+        while folder_size is None and time.perf_counter() < deadline:
+            QCoreApplication.processEvents()
+            time.sleep(0.005)
+            folder_size = service._sizes.get(str(path))
+        return folder_size
+
+    def _wait_for_update(self, path: Path, expected_size: int) -> FolderSize:
+        deadline = time.perf_counter() + 10
+        while time.perf_counter() < deadline:
+            QCoreApplication.processEvents()
+            folder_size = self.service._sizes.get(str(path))
+            if folder_size is not None and folder_size.size == expected_size:
+                break
+            time.sleep(0.005)
+        return self.service._sizes.get(str(path))
+
+    def test_recursive_totals(self):
+        """Totals include nested files and count files and folders."""
+        self.assertEqual(self._wait_for_size(self.service, self.root), FolderSize(1110, 3, 3))
+        # Subdirectories were summed during the same walk
+        self.assertEqual(self._wait_for_size(self.service, self.root / "a"), FolderSize(1100, 2, 1))
+        self.assertEqual(self.store.count(NAMESPACE), 4)
+
+    def test_stored_records_are_reused(self):
+        """A new service lists only directories whose mtime changed."""
+        self._wait_for_size(self.service, self.root)
+        (self.root / "c" / "new.txt").write_bytes(b"x" * 5)
+
+        listed = []
+        real_scandir = os.scandir
+
+        def scandir(path):
+            listed.append(path)
+            return real_scandir(path)
+
+        with patch.object(folder_size_service.os, 'scandir', scandir):
+            service = FolderSizeService(state_store=self.store)
+            self.assertEqual(self._wait_for_size(service, self.root).size, 1115)
+        self.assertEqual(listed, [str(self.root / "c")])
+
+    def test_records_are_saved_in_small_transactions(self):
+        """A walk commits its records SAVE_BATCH at a time."""
+        for index in range(5):
+            (self.root / "c" / f"sub{index}").mkdir()
+        with patch.object(folder_size_service, 'SAVE_BATCH', 3):
+            self._wait_for_size(self.service, self.root)
+        self.assertEqual(self.store.count(NAMESPACE), 9)
+        self.assertEqual(self.store.write_count, 3)
+
+    def test_invalidate_updates_incrementally(self):
+        """Changed files, new and removed folders update the cached totals."""
+        updates = []
+        self.service.sizes_updated.connect(updates.append)
+        self._wait_for_size(self.service, self.root)
+
+        # Rewriting a file in place does not change its directory's mtime
+        changed_file = self.root / "a" / "b" / "two.txt"
+        changed_file.write_bytes(b"x" * 2000)
+        self.service.invalidate([str(changed_file)])
+        self.assertEqual(self._wait_for_update(self.root, 2110).size, 2110)
+        self.assertIn(str(self.root), updates[-1])
+
+        (self.root / "c" / "d").mkdir()
+        (self.root / "c" / "d" / "three.txt").write_bytes(b"x" * 5)
+        self.service.invalidate([str(self.root / "c" / "d")])
+        self.assertEqual(self._wait_for_update(self.root, 2115), FolderSize(2115, 4, 4))
+
+        (self.root / "c" / "d" / "three.txt").unlink()
+        (self.root / "c" / "d").rmdir()
+        self.service.invalidate([str(self.root / "c" / "d")])
+        self.assertEqual(self._wait_for_update(self.root, 2110), FolderSize(2110, 3, 3))
+        self.assertIsNone(self.store.get(NAMESPACE, str(self.root / "c" / "d")))
+
+    def test_size_column_shows_and_sorts_folder_sizes(self):
+        """The proxy shows folder sizes and sorts folders by size."""
+        model = QFileSystemModel()
+        model.setRootPath(str(self.root))
+        proxy = DirectoryFirstProxyModel()
+        proxy.setSourceModel(model)
+        proxy.set_folder_size_service(self.service)
+        for path in ("a", "c"):
+            self._wait_for_size(self.service, self.root / path)
+        deadline = time.perf_counter() + 10
+        while model.rowCount(model.index(str(self.root))) < 3 and time.perf_counter() < deadline:
+            QCoreApplication.processEvents()
+
+        proxy.sort(DirectoryFirstProxyModel.SIZE_COLUMN)
+        root_index = proxy.mapFromSource(model.index(str(self.root)))
+        names = [proxy.index(row, 0, root_index).data() for row in range(proxy.rowCount(root_index))]
+        self.assertEqual(names, ["c", "a", "top.txt"])
+        size_text = proxy.index(1, DirectoryFirstProxyModel.SIZE_COLUMN, root_index).data()
+        self.assertEqual(size_text, folder_size_service.format_size(1100))
+
+
+if __name__ == '__main__':
+    unittest.main()
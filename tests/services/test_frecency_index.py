@@ -0,0 +1,142 @@
+"""
+Unit tests for the frecency index.
+
+Tests decayed ranking, ordered top-k retrieval, pruning and the
+NavigationHistoryService and completion results built on it.
+"""
+
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from PySide6.QtWidgets import QApplication
+
+from services.frecency_index import HALF_LIFE_SECONDS, FrecencyIndex, add_visit
+from services.navigation_history_service import NavigationHistoryService
+from services.path_completion_service import PathCompletionService
+from services.state_store import StateStore
+
+NOW = 1_800_000_000.0
+DAY = 24 * 3600
+
+
+class TestFrecencyIndex(unittest.TestCase):
+    """Test suite for FrecencyIndex."""
+
+    def setUp(self):
+        self.index = FrecencyIndex()
+
+    def test_rank_matches_decayed_sum(self):
+        """The rank reproduces the sum of decayed visit scores."""
+        visits = [NOW - 10 * DAY, NOW - 3 * DAY, NOW]
+        for visit_time in visits:
+            entry = self.index.visit("/a", "a", visit_time)
+        expected = sum(2 ** (-(NOW - visit_time) / HALF_LIFE_SECONDS) for visit_time in visits)
+        self.assertAlmostEqual(entry.score(NOW), expected)
+        self.assertEqual(entry.visit_count, 3)
+        self.assertEqual(add_visit(None, NOW), NOW / HALF_LIFE_SECONDS)
+
+    def test_frequency_and_recency_both_count(self):
+        """Many older visits beat one recent visit, but old visits fade."""
+        for day in range(5):
+            self.index.visit("/frequent", "frequent", NOW - (10 + day) * DAY)
+        self.index.visit("/recent", "recent", NOW)
+        self.assertEqual([entry.path for entry in self.index.top(2)], ["/frequent", "/recent"])
+
+        self.index.visit("/old", "old", NOW - 60 * DAY)
+        self.index.visit("/old", "old", NOW - 60 * DAY)
+        self.assertEqual([entry.path for entry in self.index], ["/frequent", "/recent", "/old"])
+
+    def test_order_updates_on_visit(self):
+        """A visit moves the entry to its new position."""
+        for number in range(100):
+            self.index.visit(f"/dir{number}", str(number), NOW + number)
+        self.assertEqual(self.index.top(1)[0].path, "/dir99")
+        self.index.visit("/dir0", "0", NOW + 100)
+        self.assertEqual([entry.path for entry in self.index.top(2)], ["/dir0", "/dir99"])
+        self.assertEqual(len(self.index), 100)
+
+    def test_match_remove_trim_and_prune(self):
+        """Matching follows rank order and removals keep the order consistent."""
+        for number in range(10):
+            self.index.visit(f"/Projects/p{number}", str(number), NOW - number * DAY)
+        self.index.visit("/tmp", "tmp", NOW - 100 * DAY)
+
+        self.assertEqual([entry.path for entry in self.index.match("projects", 3)],
+                         ["/Projects/p0", "/Projects/p1", "/Projects/p2"])
+        self.assertTrue(self.index.remove("/Projects/p0"))
+        self.assertFalse(self.index.remove("/Projects/p0"))
+        self.assertEqual(self.index.match("p0", 5), [])
+
+        self.assertEqual(self.index.prune(0.05, NOW), ["/tmp"])
+        self.assertEqual(self.index.trim(2), [f"/Projects/p{number}" for number in range(3, 10)])
+        self.assertEqual([entry.path for entry in self.index], ["/Projects/p1", "/Projects/p2"])
+
+
+class TestFrecencyNavigation(unittest.TestCase):
+    """Test suite for frecency ranking in NavigationHistoryService and completions."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment."""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """Create a history service on a temporary store."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.store = StateStore(self.temp_dir / "state.db")
+        self.storage_patch = patch.object(NavigationHistoryService, '_get_storage_directory',
+                                          lambda service: self.temp_dir)
+        self.storage_patch.start()
+        self.service = NavigationHistoryService(state_store=self.store)
+
+    def tearDown(self):
+        self.storage_patch.stop()
+        self.store.close()
+
+    def test_recent_locations_ranked_and_persisted(self):
+        """Frequently visited paths rank first and the ranking survives a reload."""
+        for path in ["/a", "/b", "/b", "/c", "/b"]:
+            self.service.add_to_history(path)
+        recent = self.service.get_recent_locations()
+        self.assertEqual(recent[0]["path"], "/b")
+        self.assertEqual(recent[0]["visit_count"], 3)
+        self.assertGreater(recent[0]["score"], recent[1]["score"])
+
+        reloaded = NavigationHistoryService(state_store=self.store)
+        self.assertEqual([loc["path"] for loc in reloaded.get_recent_locations()],
+                         [loc["path"] for loc in recent])
+        self.assertEqual(reloaded.get_history_statistics()["total_visits"], 5)
+
+    def test_legacy_rows_are_converted(self):
+        """Rows with ISO timestamps from older versions are ranked and rewritten."""
+        yesterday = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(time.time() - DAY))
+        self.store.put(NavigationHistoryService.RECENT_LOCATIONS_NAMESPACE, "/legacy",
+                       {"path": "/legacy", "last_visited": yesterday, "visit_count": 2, "display_name": "legacy"})
+        self.store.put(NavigationHistoryService.RECENT_LOCATIONS_NAMESPACE, "/expired",
+                       {"path": "/expired", "last_visited": "2000-01-01T00:00:00", "visit_count": 1})
+
+        service = NavigationHistoryService(state_store=self.store)
+        self.assertEqual([loc["path"] for loc in service.get_recent_locations()], ["/legacy"])
+        self.assertIn("rank", self.store.get(NavigationHistoryService.RECENT_LOCATIONS_NAMESPACE, "/legacy"))
+        self.assertIsNone(self.store.get(NavigationHistoryService.RECENT_LOCATIONS_NAMESPACE, "/expired"))
+
+    def test_quick_completions_search_all_visited_paths(self):
+        """Quick completions find visited paths beyond the top entries, best ranked first."""
+        for number in range(30):
+            self.service.add_to_history(f"/work/dir{number}")
+        self.service.add_to_history("/work/special")
+        self.service.add_to_history("/home/special")
+        self.service.add_to_history("/home/special")
+
+        completion_service = PathCompletionService()
+        completion_service.set_dependencies(None, self.service)
+        results = completion_service.get_quick_completions("special")
+        self.assertEqual([result["path"] for result in results], ["/home/special", "/work/special"])
+        self.assertEqual(completion_service.get_quick_completions("dir3")[0]["path"], "/work/dir3")
+
+
+if __name__ == '__main__':
+    unittest.main()
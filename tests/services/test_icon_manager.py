@@ -0,0 +1,76 @@
+"""
+Unit tests for IconManager.
+
+Tests the prebuilt SVG icon atlas (build, reload and invalidation) and the
+bounded LRU cache for runtime-generated icons.
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from PySide6.QtWidgets import QApplication
+
+import resources_rc  # noqa: F401 - registers the :icons/ resources
+from services.icon_manager import IconManager
+from lg import logger
+
+
+class TestIconManager(unittest.TestCase):
+    """Test suite for IconManager caching."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment."""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """Use a temporary atlas directory."""
+        self.atlas_dir = Path(tempfile.mkdtemp())
+
+    def test_atlas_built_then_loaded_from_disk(self):
+        """The first manager builds the atlas and the next one reloads it."""
+        first = IconManager(atlas_dir=self.atlas_dir)
+        icon = first.create_svg_icon('explorer', size=24, active=True)
+        self.assertFalse(icon.isNull())
+        info = first.get_atlas_info()
+        logger.info(f"Icon atlas info: {info}")
+        self.assertTrue(info['loaded'])
+        self.assertFalse(info['from_disk'])
+        expected = len(IconManager.ATLAS_ICON_NAMES) * len(IconManager.ATLAS_STATES) * len(IconManager.ATLAS_SIZES)
+        self.assertEqual(info['icons'], expected)
+        self.assertTrue((self.atlas_dir / "icon_atlas.png").exists())
+
+        second = IconManager(atlas_dir=self.atlas_dir)
+        self.assertFalse(second.create_svg_icon('search', size=16).isNull())
+        self.assertTrue(second.get_atlas_info()['from_disk'])
+
+    def test_stale_atlas_is_rebuilt(self):
+        """An index with a different source hash is not trusted."""
+        IconManager(atlas_dir=self.atlas_dir).load_icon_atlas()
+        index_path = self.atlas_dir / "icon_atlas.json"
+        index = json.loads(index_path.read_text(encoding='utf-8'))
+        index['source_hash'] = 'outdated'
+        index_path.write_text(json.dumps(index), encoding='utf-8')
+
+        manager = IconManager(atlas_dir=self.atlas_dir)
+        self.assertTrue(manager.load_icon_atlas())
+        self.assertFalse(manager.get_atlas_info()['from_disk'])
+
+    def test_runtime_cache_is_bounded(self):
+        """Runtime-generated icons are evicted least recently used first."""
+        manager = IconManager(atlas_dir=self.atlas_dir)
+        manager.RUNTIME_CACHE_LIMIT = 3
+        first = manager.create_text_icon("A", 16)
+        manager.create_text_icon("B", 16)
+        manager.create_text_icon("C", 16)
+        self.assertIs(manager.create_text_icon("A", 16), first)
+        manager.create_text_icon("D", 16)
+        self.assertEqual(manager.get_cache_size(), 3)
+        self.assertIs(manager.create_text_icon("A", 16), first)
+        self.assertNotIn(('text', 'B', 16, '#ffffff', 'transparent'), manager._icon_cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Unit tests for PathCompletionWorker.
+
+Tests the mtime-validated directory listing cache, prefix narrowing by
+binary search and cancellation of stale queries.
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from PySide6.QtCore import QCoreApplication
+from PySide6.QtWidgets import QApplication
+
+from services import path_completion_service
+from services.path_completion_service import PathCompletionWorker
+
+
+class TestPathCompletionWorker(unittest.TestCase):
+    """Test suite for directory caching and cancellation in PathCompletionWorker."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment."""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """Create a directory with mixed files and subdirectories."""
+        self.root = Path(tempfile.mkdtemp())
+        for name in ["beta.po", "Alpha.po", "alpine.txt", "zeta.po"]:
+            (self.root / name).write_text("")
+        for name in ["alpha_dir", "zulu"]:
+            (self.root / name).mkdir()
+        self.worker = PathCompletionWorker()
+
+    def tearDown(self):
+        """Stop the worker thread."""
+        self.worker.stop_search()
+        self.worker.wait()
+
+    def _names(self, query: str):
+        return [result['name'] for result in self.worker._perform_completion_search(query)]
+
+    def test_directories_first_then_files_alphabetically(self):
+        """Listing results put directories first, each group sorted case-insensitively."""
+        self.assertEqual(self._names(str(self.root) + os.sep),
+                         ["alpha_dir", "zulu", "Alpha.po", "alpine.txt", "beta.po", "zeta.po"])
+
+    def test_numbers_in_names_sort_by_value(self):
+        """Matches within a group are listed in natural order."""
+        for name in ["zeta10.po", "zeta2.po"]:
+            (self.root / name).write_text("")
+        self.assertEqual(self._names(str(self.root / "zeta")), ["zeta.po", "zeta2.po", "zeta10.po"])
+
+    def test_narrowing_uses_cached_listing(self):
+        """Narrowing a prefix in the same directory does not list it again."""
+        with patch.object(path_completion_service.os, 'scandir', wraps=os.scandir) as scandir:
+            self.assertEqual(self._names(str(self.root / "a")), ["alpha_dir", "Alpha.po", "alpine.txt"])
+            self.assertEqual(self._names(str(self.root / "alp")), ["alpha_dir", "Alpha.po", "alpine.txt"])
+            self.assertEqual(self._names(str(self.root / "alph")), ["alpha_dir", "Alpha.po"])
+            self.assertEqual(self._names(str(self.root / "x")), [])
+        self.assertEqual(scandir.call_count, 1)
+
+    def test_changed_directory_is_listed_again(self):
+        """A new directory mtime invalidates the cached listing."""
+        self.assertEqual(self._names(str(self.root / "g")), [])
+        (self.root / "gamma.po").write_text("")
+        future = time.time_ns() + 10 ** 9
+        os.utime(self.root, ns=(future, future))
+        self.assertEqual(self._names(str(self.root / "g")), ["gamma.po"])
+
+    def test_existing_directory_query_lists_its_contents(self):
+        """A query naming an existing directory completes inside it."""
+        (self.root / "zulu" / "inner.po").write_text("")
+        self._names(str(self.root) + os.sep)
+        self.assertEqual(self._names(str(self.root / "zulu")), ["inner.po"])
+
+    def test_missing_directory(self):
+        """Queries in directories that do not exist return nothing."""
+        self.assertEqual(self._names(str(self.root / "missing" / "a")), [])
+
+    def test_stale_query_never_emits(self):
+        """Only the latest query's results are emitted."""
+        emitted = []
+        self.worker.completion_ready.connect(lambda query, results: emitted.append(query))
+        release = threading.Event()
+        original = self.worker._perform_completion_search
+
+        def blocking_search(query, token=0):
+            if query.endswith("a"):
+                release.wait(5)
+            return original(query, token)
+
+        first = str(self.root / "a")
+        second = str(self.root / "b")
+        with patch.object(self.worker, '_perform_completion_search', side_effect=blocking_search):
+            self.worker.search_completions(first)
+            self.worker.search_completions(second)
+            release.set()
+            deadline = time.perf_counter() + 5
+            while not emitted and time.perf_counter() < deadline:
+                QCoreApplication.processEvents()
+                time.sleep(0.005)
+            self.worker.wait()
+            QCoreApplication.processEvents()
+
+        self.assertEqual(emitted, [second])
+
+    def test_cancelled_query_is_not_emitted(self):
+        """stop_search() cancels a running query."""
+        emitted = []
+        self.worker.completion_ready.connect(lambda query, results: emitted.append(query))
+        started = threading.Event()
+        release = threading.Event()
+        original = self.worker._perform_completion_search
+
+        def blocking_search(query, token=0):
+            started.set()
+            release.wait(5)
+            return original(query, token)
+
+        with patch.object(self.worker, '_perform_completion_search', side_effect=blocking_search):
+            self.worker.search_completions(str(self.root / "a"))
+            self.assertTrue(started.wait(5))
+            self.worker.stop_search()
+            release.set()
+            self.worker.wait()
+            QCoreApplication.processEvents()
+
+        self.assertEqual(emitted, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,220 @@
+"""
+Unit tests for the project path index.
+
+Tests fuzzy scoring, bitmap candidate filtering, incremental add/remove,
+narrowing while typing and the "go to anything" completion results.
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from PySide6.QtWidgets import QApplication
+
+from services.path_completion_service import PathCompletionService, is_anything_query
+from services.path_index import PathIndex, fuzzy_score, scan_project_files
+
+
+def _path(*parts: str) -> str:
+    return os.sep.join(parts)
+
+
+class TestFuzzyScore(unittest.TestCase):
+    """Test suite for the subsequence scorer."""
+
+    def test_non_subsequence_is_rejected(self):
+        """Characters must appear in query order."""
+        self.assertIsNone(fuzzy_score("ba", "abc"))
+        self.assertIsNone(fuzzy_score("abcd", "abc"))
+
+    def test_positions_are_tightened(self):
+        """The backward pass picks the shortest span ending at the first full match."""
+        score, positions = fuzzy_score("ab", "a_xab")
+        self.assertEqual(positions, [3, 4])
+
+    def test_boundaries_and_basename_rank_higher(self):
+        """Word starts and matches in the file name beat scattered matches."""
+        boundary = fuzzy_score("pcs", _path("services", "path_completion_service.py"))[0]
+        scattered = fuzzy_score("pcs", _path("lib", "epics.py"))[0]
+        self.assertGreater(boundary, scattered)
+
+        score, positions = fuzzy_score("main", _path("main", "widgets", "main.py"))
+        self.assertEqual(positions[0], len(_path("main", "widgets", "")))
+
+    def test_camel_case_bonus(self):
+        """Upper-case letters after lower-case ones count as word starts."""
+        camel = fuzzy_score("fv", "FileView.py")[0]
+        plain = fuzzy_score("fv", "filevoid.py")[0]
+        self.assertGreater(camel, plain)
+
+
+class TestPathIndex(unittest.TestCase):
+    """Test suite for PathIndex matching and maintenance."""
+
+    def setUp(self):
+        """Create an index over a small synthetic project."""
+        self.paths = [
+            _path("services", "path_index.py"),
+            _path("services", "path_completion_service.py"),
+            _path("widgets", "explorer", "goto_path_dialog.py"),
+            _path("core", "main_app_window.py"),
+            "main.py",
+            "README.md",
+        ]
+        self.index = PathIndex("/project", self.paths)
+
+    def test_match_ranks_best_first(self):
+        """The closest match comes first and non-matches are excluded."""
+        results = self.index.match("pathindex")
+        self.assertEqual(results[0].path, _path("services", "path_index.py"))
+        self.assertNotIn("README.md", [result.path for result in results])
+
+        self.assertEqual(self.index.match("main")[0].path, "main.py")
+        self.assertEqual(self.index.match("zzz"), [])
+        self.assertEqual(self.index.match("  "), [])
+
+    def test_match_is_case_insensitive_and_ignores_spaces(self):
+        """Queries match regardless of case and whitespace."""
+        self.assertEqual(self.index.match("READ me")[0].path, "README.md")
+
+    def test_non_ascii_names_are_case_insensitive(self):
+        """Sealed and added paths fold non-ASCII case the same way as queries."""
+        names = [_path("locale", "Ärger.po"), "ÉCOLE.txt", "STRAẞE.po"]
+        sealed = PathIndex("/project", names)
+        added = PathIndex("/project")
+        for name in names:
+            added.add_path(name)
+        for index in (sealed, added):
+            self.assertEqual([match.path for match in index.match("ärger")], [names[0]])
+            self.assertEqual([match.path for match in index.match("école")], [names[1]])
+            self.assertEqual([match.path for match in index.match("straße")], [names[2]])
+            self.assertTrue(index.contains(names[2]))
+
+    def test_add_and_remove(self):
+        """Added paths are found, removed paths are not."""
+        added = _path("widgets", "large_file_viewer.py")
+        self.assertTrue(self.index.add_path(os.path.join("/project", added)))
+        self.assertFalse(self.index.add_path(added))
+        self.assertTrue(self.index.contains(added))
+        self.assertEqual(self.index.match("largefile")[0].path, added)
+
+        self.assertTrue(self.index.remove_path("main.py"))
+        self.assertFalse(self.index.remove_path("main.py"))
+        self.assertFalse(self.index.contains("main.py"))
+        self.assertNotIn("main.py", [result.path for result in self.index.match("main")])
+
+        self.assertTrue(self.index.add_path("main.py"))
+        self.assertTrue(self.index.contains("main.py"))
+        self.assertEqual(len(self.index), len(self.paths) + 1)
+
+    def test_lookup_does_not_confuse_suffixes(self):
+        """A path that is a suffix of another indexed path is looked up exactly."""
+        self.assertFalse(self.index.contains("index.py"))
+        self.assertFalse(self.index.remove_path("index.py"))
+        self.assertTrue(self.index.contains(_path("services", "path_index.py")))
+
+    def test_lookups_do_not_scan_the_blob(self):
+        """Watcher updates look paths up by key instead of searching the sealed blob."""
+        self.index._blob = None
+        self.assertTrue(self.index.contains("main.py"))
+        self.assertTrue(self.index.remove_path("main.py"))
+        self.assertTrue(self.index.add_path("main.py"))
+        self.assertFalse(self.index.add_path("main.py"))
+
+    def test_paths_are_ordered_shallowest_first(self):
+        """Index order puts shallow and short paths first."""
+        self.assertEqual(self.index.paths()[:2], ["main.py", "README.md"])
+
+    def test_paths_under_directory(self):
+        """Files below a directory are listed from the directory tree, added and removed ones included."""
+        index = PathIndex("/project", [_path("a", "one.po"), _path("a", "b", "two.po"), _path("ab", "three.po"),
+                                       "top.po"])
+        index.add_path(_path("a", "c", "four.po"))
+        index.remove_path(_path("a", "one.po"))
+        self.assertEqual(sorted(index.paths_under("a")), [_path("a", "b", "two.po"), _path("a", "c", "four.po")])
+        self.assertEqual(index.paths_under(os.path.join("/project", "a", "b")), [_path("a", "b", "two.po")])
+        self.assertEqual(sorted(index.paths_under("/project")), sorted(index.paths()))
+        self.assertEqual(index.paths_under("missing"), [])
+
+    def test_needs_compaction(self):
+        """Compaction is requested once changes outgrow the sealed paths."""
+        self.assertFalse(self.index.needs_compaction())
+        for number in range(1001):
+            self.index.add_path(f"new_{number}.py")
+        self.assertTrue(self.index.needs_compaction())
+
+    def test_bitmaps_across_build_chunks(self):
+        """Bitmaps built in several chunks select the same paths."""
+        paths = [f"dir_{number % 7}{os.sep}file_{number}.py" for number in range(300)]
+        with patch.object(PathIndex, 'BITMAP_CHUNK_PATHS', 16):
+            index = PathIndex("/project", paths)
+        expected = sorted(path for path in paths if fuzzy_score("file_29", path))
+        self.assertEqual(sorted(result.path for result in index.match("file_29", limit=300)), expected)
+
+    def test_narrowing_matches_a_fresh_search(self):
+        """Typing a longer query gives the same results as searching from scratch."""
+        paths = [f"pkg_{number % 11}{os.sep}mod_{number}_{number * 7 % 13}.py" for number in range(5000)]
+        with patch.object(PathIndex, 'CANDIDATE_LIMIT', 50):
+            typed = PathIndex("/project", paths)
+            fresh = PathIndex("/project", paths)
+            for query in ["m", "mo", "mod", "mod1", "mod12", "mod123"]:
+                typed_results = typed.match(query, limit=20)
+                fresh._last_scan = None
+                fresh_results = fresh.match(query, limit=20)
+                self.assertEqual([(result.path, result.score) for result in typed_results],
+                                 [(result.path, result.score) for result in fresh_results], query)
+
+
+class TestProjectScan(unittest.TestCase):
+    """Test suite for scanning and "go to anything" completions."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment."""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """Create a small project tree."""
+        self.root = Path(tempfile.mkdtemp())
+        (self.root / "services").mkdir()
+        (self.root / "services" / "path_index.py").write_text("")
+        (self.root / ".git").mkdir()
+        (self.root / ".git" / "config").write_text("")
+        (self.root / "main.py").write_text("")
+
+    def test_scan_skips_ignored_directories(self):
+        """Version control directories are not indexed."""
+        files = sorted(scan_project_files(str(self.root)))
+        self.assertEqual(files, ["main.py", _path("services", "path_index.py")])
+
+    def test_find_anything(self):
+        """The completion service builds the index and returns project files."""
+        service = PathCompletionService()
+        ready = []
+        service.path_index_ready.connect(ready.append)
+        service.rebuild_path_index(str(self.root))
+        service._index_builder.wait()
+        self.app.processEvents()
+
+        self.assertEqual(ready, [2])
+        results = service.find_anything("pidx")
+        self.assertEqual(results[0]['path'], str(self.root / "services" / "path_index.py"))
+        self.assertEqual(results[0]['display_path'], _path("services", "path_index.py"))
+        self.assertEqual(results[0]['type'], 'project_file')
+
+        service.update_path_index(added=[str(self.root / "services" / "pidx.py")])
+        self.assertEqual(service.find_anything("pidx")[0]['name'], "pidx.py")
+
+    def test_is_anything_query(self):
+        """Only bare names are fuzzy queries."""
+        self.assertTrue(is_anything_query("pathidx"))
+        self.assertFalse(is_anything_query("~/Documents"))
+        self.assertFalse(is_anything_query(_path("services", "")))
+        self.assertFalse(is_anything_query("./main"))
+        self.assertFalse(is_anything_query("  "))
+
+
+if __name__ == '__main__':
+    unittest.main()
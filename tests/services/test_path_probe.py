@@ -0,0 +1,230 @@
+"""
+Unit tests for the path probe and non-blocking navigation.
+
+Tests probe results, the short-lived stat cache, per-mount timeouts with
+fail-fast on stuck mounts, and NavigationService finishing or superseding
+navigations in the background.
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from PySide6.QtCore import QCoreApplication
+
+from services import path_probe
+from services.navigation_service import NavigationService
+from services.path_probe import PathProbe, probe_path
+
+
+class _SlowMount:
+    """Makes probes of chosen paths block until released."""
+
+    def __init__(self, *slow_paths: str):
+        self.slow_paths = set(slow_paths)
+        self.release = threading.Event()
+        self.calls = []
+
+    def __call__(self, path, *args):
+        self.calls.append(path)
+        if path in self.slow_paths:
+            self.release.wait(5)
+        return probe_path(path, *args)
+
+
+class _ProbeTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment."""
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp()).resolve()
+        (self.root / "subdir").mkdir()
+        (self.root / "file.txt").write_text("content")
+        self.probe = PathProbe()
+
+    def _process_events_until(self, condition, timeout: float = 5.0) -> None:
+        deadline = time.perf_counter() + timeout
+        while not condition() and time.perf_counter() < deadline:
+            QCoreApplication.processEvents()
+            time.sleep(0.005)
+
+
+class TestPathProbe(_ProbeTestCase):
+    """Test suite for PathProbe."""
+
+    def test_probe_results(self):
+        """Directories, files and missing paths are told apart."""
+        directory = self.probe.check(str(self.root / "subdir"), 5)
+        self.assertTrue(directory.is_dir and directory.readable and directory.is_navigable)
+        self.assertEqual(directory.resolved_path, str(self.root / "subdir"))
+
+        file_status = self.probe.check(str(self.root / "file.txt"), 5)
+        self.assertTrue(file_status.is_file and file_status.is_navigable)
+
+        missing = self.probe.check(str(self.root / "missing"), 5)
+        self.assertFalse(missing.exists or missing.is_navigable)
+
+    def test_cache_ttl(self):
+        """Cached results are reused until their TTL expires."""
+        slow_mount = _SlowMount()
+        with patch.object(path_probe, 'probe_path', slow_mount):
+            path = str(self.root / "subdir")
+            self.probe.check(path, 5)
+            self.probe.check(path, 5)
+            self.assertEqual(len(slow_mount.calls), 1)
+
+            with patch.object(PathProbe, 'NEGATIVE_TTL', 0.0):
+                missing = str(self.root / "missing")
+                self.probe.check(missing, 5)
+                self.probe.check(missing, 5)
+            self.assertEqual(slow_mount.calls.count(missing), 2)
+
+            self.probe.invalidate(path)
+            self.probe.check(path, 5)
+            self.assertEqual(slow_mount.calls.count(path), 2)
+
+    def test_stuck_mount_times_out_and_fails_fast(self):
+        """A mount that does not answer times out and fails fast until it recovers."""
+        stuck = str(self.root / "subdir")
+        slow_mount = _SlowMount(stuck)
+        mount_point = self.probe.mount_point(stuck)
+        self.probe.set_mount_timeout(mount_point, 50)
+        results = []
+        self.probe.probe_finished.connect(lambda request_id, status: results.append((request_id, status)))
+
+        with patch.object(path_probe, 'probe_path', slow_mount):
+            self.assertIsNone(self.probe.check(stuck, 0.01))
+            request_id = self.probe.request(stuck)
+            self._process_events_until(lambda: results)
+            self.assertEqual(results[0][0], request_id)
+            self.assertTrue(results[0][1].timed_out)
+
+            started = time.perf_counter()
+            other = self.probe.check(str(self.root / "file.txt"), 5)
+            self.assertTrue(other.timed_out)
+            self.assertLess(time.perf_counter() - started, 0.05)
+
+            slow_mount.release.set()
+            self._process_events_until(lambda: self.probe.cached(stuck) is not None)
+            self.assertTrue(self.probe.check(str(self.root / "file.txt"), 5).is_file)
+
+    def test_symlink_into_stuck_mount_blames_that_mount(self):
+        """A link into a hung mount marks that mount stuck, not the link's own."""
+        share = self.root / "share"
+        (share / "subdir").mkdir(parents=True)
+        link = self.root / "link"
+        link.symlink_to(share / "subdir")
+        slow_mount = _SlowMount(str(link))
+        results = []
+        self.probe.probe_finished.connect(lambda request_id, status: results.append(status))
+
+        with patch.object(path_probe, '_read_mount_points', return_value=[str(share), "/"]), \
+                patch.object(path_probe, 'probe_path', slow_mount):
+            self.probe.set_mount_timeout("/", 50)
+            self.probe.request(str(link))
+            self._process_events_until(lambda: results)
+            self.assertTrue(results[0].timed_out)
+            self.assertIn(str(share), results[0].error)
+
+            self.assertTrue(self.probe.check(str(self.root / "file.txt"), 5).is_file)
+            self.assertTrue(self.probe.check(str(share / "subdir"), 5).timed_out)
+
+            slow_mount.release.set()
+            self._process_events_until(lambda: self.probe.cached(str(link)) is not None)
+        status = self.probe.cached(str(link))
+        self.assertTrue(status.is_dir)
+        self.assertEqual(status.resolved_path, str(share / "subdir"))
+
+    def test_symlinks_resolve_like_realpath(self):
+        """Relative, absolute, chained and dangling links resolve as realpath does."""
+        (self.root / "subdir" / "inner").mkdir()
+        (self.root / "relative").symlink_to("subdir/inner")
+        (self.root / "absolute").symlink_to(self.root / "relative")
+        (self.root / "up").symlink_to("subdir/inner/..")
+        (self.root / "dangling").symlink_to("missing/file")
+        for name in ("relative", "absolute", "up", "dangling"):
+            path = str(self.root / name)
+            self.assertEqual(self.probe.check(path, 5).resolved_path, os.path.realpath(path), name)
+        self.assertFalse(self.probe.check(str(self.root / "dangling"), 5).exists)
+
+    def test_cancelled_request_is_not_reported(self):
+        """A cancelled request never emits probe_finished."""
+        results = []
+        self.probe.probe_finished.connect(lambda request_id, status: results.append(request_id))
+        path = str(self.root / "subdir")
+        self.probe.check(path, 5)
+
+        cancelled = self.probe.request(path)
+        kept = self.probe.request(path)
+        self.probe.cancel(cancelled)
+        self._process_events_until(lambda: results)
+        self.assertEqual(results, [kept])
+
+
+class TestAsyncNavigation(_ProbeTestCase):
+    """Test suite for NavigationService navigation on slow mounts."""
+
+    def setUp(self):
+        super().setUp()
+        self.service = NavigationService(path_probe=self.probe)
+        self.completed = []
+        self.failed = []
+        self.service.navigation_completed.connect(self.completed.append)
+        self.service.navigation_failed.connect(lambda path, error: self.failed.append((path, error)))
+
+    def test_slow_navigation_completes_in_background(self):
+        """navigate_to returns quickly and completes once the probe answers."""
+        slow = str(self.root / "subdir")
+        slow_mount = _SlowMount(slow)
+        with patch.object(path_probe, 'probe_path', slow_mount):
+            started = time.perf_counter()
+            self.assertTrue(self.service.navigate_to(slow))
+            self.assertLess(time.perf_counter() - started, 1.0)
+            self.assertTrue(self.service.is_navigating)
+            self.assertEqual(self.completed, [])
+
+            slow_mount.release.set()
+            self._process_events_until(lambda: self.completed)
+
+        self.assertEqual(self.completed, [slow])
+        self.assertEqual(self.service.current_path, slow)
+        self.assertFalse(self.service.is_navigating)
+
+    def test_superseded_navigation_is_dropped(self):
+        """A newer navigation cancels one still waiting for its probe."""
+        slow = str(self.root / "subdir")
+        slow_mount = _SlowMount(slow)
+        with patch.object(path_probe, 'probe_path', slow_mount):
+            self.service.navigate_to(slow)
+            self.assertTrue(self.service.navigate_to(str(self.root)))
+            slow_mount.release.set()
+            self._process_events_until(lambda: self.probe.cached(slow) is not None)
+            QCoreApplication.processEvents()
+
+        self.assertEqual(self.completed, [str(self.root)])
+        self.assertEqual(self.service.current_path, str(self.root))
+
+    def test_stuck_mount_fails_navigation(self):
+        """Navigation to a mount that never answers fails with a timeout."""
+        stuck = str(self.root / "subdir")
+        slow_mount = _SlowMount(stuck)
+        self.probe.set_mount_timeout(self.probe.mount_point(stuck), 50)
+        with patch.object(path_probe, 'probe_path', slow_mount):
+            self.assertTrue(self.service.navigate_to(stuck))
+            self._process_events_until(lambda: self.failed)
+            slow_mount.release.set()
+
+        self.assertEqual(self.completed, [])
+        self.assertIn("Timed out", self.failed[0][1])
+        self.assertFalse(self.service.is_navigating)
+
+
+if __name__ == '__main__':
+    unittest.main()
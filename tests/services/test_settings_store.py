@@ -0,0 +1,178 @@
+"""
+Unit tests for the write-behind settings store.
+
+Tests coalescing of writes, reads of pending and stored values, timer-driven
+flushes and the services that persist through the store.
+"""
+
+import itertools
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from PySide6.QtCore import QCoreApplication, QSettings
+from PySide6.QtWidgets import QApplication
+
+from services.config_service import ConfigurationService
+from services.panel_state_service import PanelStateManager
+from services.settings_store import WriteBehindSettings, flush_all_settings, get_settings_store
+
+ORGANIZATION = "POEditorTests"
+_application_numbers = itertools.count()
+
+
+class TestWriteBehindSettings(unittest.TestCase):
+    """Test suite for WriteBehindSettings."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Keep settings files in a temporary directory."""
+        cls.app = QApplication.instance() or QApplication([])
+        cls.temp_dir = tempfile.mkdtemp()
+        QSettings.setPath(QSettings.Format.NativeFormat, QSettings.Scope.UserScope, cls.temp_dir)
+
+    def setUp(self):
+        self.application = f"SettingsStore{next(_application_numbers)}"
+        self.store = WriteBehindSettings(ORGANIZATION, self.application)
+
+    def _disk(self) -> QSettings:
+        return QSettings(ORGANIZATION, self.application)
+
+    def _process_events_for(self, milliseconds: int) -> None:
+        deadline = time.perf_counter() + milliseconds / 1000
+        while time.perf_counter() < deadline:
+            QCoreApplication.processEvents()
+            time.sleep(0.005)
+
+    def test_writes_are_coalesced_into_one_flush(self):
+        """Many writes are served from memory and reach disk in a single flush."""
+        for number in range(100):
+            self.store.set_value("panel/width", number)
+        self.store.set_value("panel/visible", True)
+
+        self.assertEqual(self.store.value("panel/width"), 99)
+        self.assertEqual(self.store.flush_count, 0)
+        self.assertFalse(self._disk().contains("panel/width"))
+
+        self.assertTrue(self.store.flush())
+        self.assertFalse(self.store.flush())
+        self.assertEqual(self.store.flush_count, 1)
+        self.assertEqual(self._disk().value("panel/width", type=int), 99)
+
+    def test_removals_and_groups(self):
+        """Removed keys and groups disappear from reads and from disk."""
+        self.store.set_value("explorer/path", "/tmp")
+        self.store.set_value("explorer/view/columns", 3)
+        self.store.set_value("search/pattern", "msgid")
+        self.store.set_value("top", 1)
+        self.store.flush()
+
+        self.assertEqual(sorted(self.store.keys("explorer")), ["path", "view/columns"])
+        self.assertEqual(self.store.child_keys("explorer"), ["path"])
+
+        self.store.remove_group("explorer")
+        self.store.remove("search/pattern")
+        self.assertFalse(self.store.contains("explorer/path"))
+        self.assertEqual(self.store.value("search/pattern", "none"), "none")
+        self.assertEqual(self.store.keys(), ["top"])
+
+        self.store.flush()
+        self.assertEqual(self._disk().allKeys(), ["top"])
+
+    def test_reads_existing_values_and_converts_types(self):
+        """Values already on disk are read into the mirror and converted on request."""
+        disk = self._disk()
+        disk.setValue("window/maximized", "true")
+        disk.setValue("window/width", "640")
+        disk.sync()
+
+        store = WriteBehindSettings(ORGANIZATION, self.application)
+        self.assertIs(store.value("window/maximized", False, bool), True)
+        self.assertEqual(store.value("window/width", 0, int), 640)
+        self.assertEqual(store.value("window/missing", 5, int), 5)
+        self.assertEqual(sorted(store.keys("window")), ["maximized", "width"])
+
+    def test_direct_qsettings_writes_stay_visible(self):
+        """Keys written through another QSettings object are never served stale."""
+        disk = self._disk()
+        disk.setValue("window/geometry", "first")
+        self.assertEqual(self.store.value("window/geometry"), "first")
+        disk.setValue("window/geometry", "second")
+        self.assertEqual(self.store.value("window/geometry"), "second")
+
+        self.store.set_value("theme/current", "Dark")
+        self.store.flush()
+        disk.setValue("theme/current", "Light")
+        disk.remove("window/geometry")
+        self.assertEqual(self.store.value("theme/current"), "Light")
+        self.assertFalse(self.store.contains("window/geometry"))
+        self.assertEqual(self.store.keys(), ["theme/current"])
+
+    def test_idle_timer_flushes_after_writes_go_quiet(self):
+        """Pending writes are flushed once no writes arrive for the idle delay."""
+        with patch.object(WriteBehindSettings, 'IDLE_DELAY_MS', 20):
+            self.store.set_value("a", 1)
+            self.store.set_value("b", 2)
+            self._process_events_for(100)
+        self.assertEqual(self.store.flush_count, 1)
+        self.assertFalse(self.store.has_pending_writes())
+
+    def test_max_delay_flushes_during_continuous_writes(self):
+        """A steady stream of writes is still flushed within the maximum delay."""
+        with patch.object(WriteBehindSettings, 'IDLE_DELAY_MS', 10000), \
+                patch.object(WriteBehindSettings, 'MAX_DELAY_MS', 30):
+            self.store.set_value("splitter", 1)
+            self._process_events_for(100)
+        self.assertEqual(self.store.flush_count, 1)
+
+    def test_shared_stores_and_flush_all(self):
+        """Services share one store per settings file and flush_all_settings writes it."""
+        store = get_settings_store(ORGANIZATION, self.application)
+        self.assertIs(get_settings_store(ORGANIZATION, self.application), store)
+        store.set_value("shared", 1)
+        self.assertGreaterEqual(flush_all_settings(), 1)
+        self.assertEqual(store.flush_count, 1)
+
+    def test_configuration_service_batches_writes(self):
+        """ConfigurationService writes, removals and clears cost no flush until sync()."""
+        service = ConfigurationService(ORGANIZATION, self.application)
+        changes = []
+        service.watch_setting("editor", "font_size", lambda *args: changes.append(args))
+
+        for size in range(10, 20):
+            service.set_value("editor", "font_size", size)
+        service.set_value("editor", "wrap", True)
+        service.remove_value("editor", "wrap")
+        self.assertEqual(service.get_value("editor", "font_size"), 19)
+        self.assertEqual(service.get_namespace_keys("editor"), ["font_size"])
+        self.assertEqual(len(changes), 10)
+
+        service.clear_namespace("editor")
+        self.assertFalse(service.has_value("editor", "font_size"))
+        self.assertEqual(service.get_storage_info()["flush_count"], 0)
+
+        service.set_value("editor", "theme", "dark")
+        service.sync()
+        self.assertEqual(service.get_storage_info()["flush_count"], 1)
+        self.assertEqual(self._disk().value("editor/theme"), "dark")
+
+    def test_panel_state_round_trip(self):
+        """Panel state saved through the store loads back before and after a flush."""
+        with patch('services.panel_state_service.get_settings_store',
+                   lambda organization, application: get_settings_store(ORGANIZATION, self.application)):
+            manager = PanelStateManager("explorer")
+
+        manager.save_state({'current_location': "/tmp", 'history_index': 3})
+        manager.set_setting("history_index", 4)
+        self.assertEqual(manager.load_state(), {'current_location': "/tmp", 'history_index': 4})
+
+        self.assertTrue(manager.flush())
+        manager.clear_state()
+        self.assertFalse(manager.has_setting("current_location"))
+        manager.flush()
+        self.assertEqual(self._disk().allKeys(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+"""
+Unit tests for the SQLite state store.
+
+Tests row-level persistence, transactions, one-time migration of the legacy
+JSON files and the services that store their state in it.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from PySide6.QtWidgets import QApplication
+
+from core.explorer_settings import ExplorerSettings
+from core.settings_manager import SettingsManager
+from services.location_manager import LocationManager
+from services.navigation_history_service import NavigationHistoryService
+from services.state_store import StateStore
+
+
+class TestStateStore(unittest.TestCase):
+    """Test suite for StateStore."""
+
+    def setUp(self):
+        """Open a store in a temporary directory."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.database_path = self.temp_dir / "state.db"
+        self.store = StateStore(self.database_path)
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_wal_mode_and_persistence(self):
+        """Rows survive reopening the database, which runs in WAL mode."""
+        self.store.put("settings", "theme", {"name": "dark"})
+        self.store.close()
+
+        self.store = StateStore(self.database_path)
+        mode = self.store._connection.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+        self.assertEqual(self.store.get("settings", "theme"), {"name": "dark"})
+        self.assertIsNone(self.store.get("settings", "missing"))
+
+    def test_rows_keep_insertion_order(self):
+        """Updating a row keeps its position, deleting removes only that row."""
+        self.store.put_many("bookmarks", [("a", 1), ("b", 2), ("c", 3)])
+        self.store.put("bookmarks", "a", 10)
+        self.store.delete("bookmarks", "b")
+        self.assertEqual(self.store.items("bookmarks"), [("a", 10), ("c", 3)])
+        self.assertEqual(self.store.count("bookmarks"), 2)
+        self.assertEqual(self.store.items("other"), [])
+
+    def test_replace_writes_only_changes(self):
+        """replace() leaves unchanged rows alone and drops missing ones."""
+        self.store.put_many("locations", [("a", 1), ("b", 2)])
+        writes = self.store.write_count
+        self.store.replace("locations", [("a", 1), ("b", 2)])
+        self.assertEqual(self.store.write_count, writes)
+
+        self.store.replace("locations", [("b", 3), ("c", 4)])
+        self.assertEqual(self.store.items("locations"), [("b", 3), ("c", 4)])
+
+    def test_transaction_rolls_back(self):
+        """A failing transaction leaves no partial writes; nested writes commit once."""
+        with self.assertRaises(RuntimeError):
+            with self.store.transaction():
+                self.store.put("history", "a", 1)
+                raise RuntimeError("boom")
+        self.assertEqual(self.store.items("history"), [])
+
+        writes = self.store.write_count
+        with self.store.transaction():
+            self.store.put("history", "a", 1)
+            self.store.put("history", "b", 2)
+        self.assertEqual(self.store.write_count, writes + 1)
+
+    def test_migrate_json_runs_once(self):
+        """A legacy file is imported once and renamed."""
+        legacy = self.temp_dir / "legacy.json"
+        legacy.write_text(json.dumps({"x": 1}))
+        importer = lambda data: self.store.put_many("legacy", data.items())
+
+        self.assertTrue(self.store.migrate_json("legacy", legacy, importer))
+        self.assertFalse(legacy.exists())
+        self.assertTrue((self.temp_dir / "legacy.json.migrated").exists())
+
+        legacy.write_text(json.dumps({"x": 2}))
+        self.assertFalse(self.store.migrate_json("legacy", legacy, importer))
+        self.assertEqual(self.store.get("legacy", "x"), 1)
+
+
+class TestStateStoreServices(unittest.TestCase):
+    """Test suite for the services persisting into the state store."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment."""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """Redirect legacy storage directories and open a temporary store."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.store = StateStore(self.temp_dir / "state.db")
+        self.storage_patches = [
+            patch.object(NavigationHistoryService, '_get_storage_directory', lambda service: self.temp_dir),
+            patch.object(LocationManager, '_get_storage_directory', lambda manager: self.temp_dir),
+        ]
+        for storage_patch in self.storage_patches:
+            storage_patch.start()
+
+    def tearDown(self):
+        for storage_patch in self.storage_patches:
+            storage_patch.stop()
+        self.store.close()
+
+    def test_navigation_history_migrates_and_persists(self):
+        """Legacy history files are imported; navigation writes rows, not files."""
+        last_visited = (datetime.now() - timedelta(days=1)).isoformat()
+        recent = {"path": "/old", "last_visited": last_visited, "visit_count": 3, "display_name": "old"}
+        (self.temp_dir / "navigation_history.json").write_text(
+            json.dumps({"back_history": ["/a"], "forward_history": [], "current_path": "/b"}))
+        (self.temp_dir / "recent_locations.json").write_text(json.dumps({"recent_locations": [recent]}))
+
+        service = NavigationHistoryService(state_store=self.store)
+        self.assertEqual(service.get_back_history(), ["/a"])
+        self.assertEqual(service.get_recent_locations()[0]["visit_count"], 3)
+
+        writes = self.store.write_count
+        service.add_to_history("/c")
+        self.assertEqual(self.store.write_count, writes + 1)
+        self.assertEqual(os.listdir(self.temp_dir).count("navigation_history.json"), 0)
+
+        reloaded = NavigationHistoryService(state_store=self.store)
+        self.assertEqual(reloaded.get_back_history(), ["/b", "/a"])
+        # Three visits yesterday outrank one visit now
+        self.assertEqual([loc["path"] for loc in reloaded.get_recent_locations()], ["/old", "/c"])
+
+        reloaded.remove_from_recent_locations("/old")
+        self.assertEqual(self.store.count(NavigationHistoryService.RECENT_LOCATIONS_NAMESPACE), 1)
+
+    def test_recent_locations_are_trimmed(self):
+        """Recent locations beyond the maximum are deleted from the store."""
+        service = NavigationHistoryService(state_store=self.store)
+        with patch.object(NavigationHistoryService, 'MAX_TRACKED_LOCATIONS', 3):
+            for number in range(5):
+                service.add_to_history(f"/dir{number}")
+        self.assertEqual(self.store.count(NavigationHistoryService.RECENT_LOCATIONS_NAMESPACE), 3)
+
+    def test_bookmarks_round_trip(self):
+        """Bookmarks and custom quick locations are stored row by row."""
+        manager = LocationManager(state_store=self.store)
+        bookmark = manager.add_bookmark("Temp", str(self.temp_dir), category="work")
+        manager.add_quick_location("Scratch", "📁", str(self.temp_dir))
+        manager.update_bookmark(bookmark.id, name="Renamed")
+
+        reloaded = LocationManager(state_store=self.store)
+        self.assertEqual([bm.name for bm in reloaded.get_bookmarks()], ["Renamed"])
+        self.assertIn("work", reloaded.get_bookmark_categories())
+        self.assertIn("Scratch", [loc.name for loc in reloaded.get_quick_locations()])
+
+        reloaded.remove_bookmark(bookmark.id)
+        self.assertEqual(LocationManager(state_store=self.store).get_bookmarks(), [])
+
+    def test_explorer_settings_save_changed_keys(self):
+        """ExplorerSettings migrates its JSON file and rewrites only changed keys."""
+        settings_file = self.temp_dir / "explorer_settings.json"
+        settings_file.write_text(json.dumps({"font_size": 14}))
+
+        settings = ExplorerSettings(str(settings_file), state_store=self.store)
+        self.assertEqual(settings.get("font_size"), 14)
+        settings.save()
+
+        with patch.object(self.store, 'put_many', wraps=self.store.put_many) as put_many:
+            settings.set("show_hidden_files", True)
+            settings.save()
+        put_many.assert_called_once_with(settings._namespace, [("show_hidden_files", True)])
+
+        reloaded = ExplorerSettings(str(settings_file), state_store=self.store)
+        self.assertTrue(reloaded.get("show_hidden_files"))
+        self.assertEqual(reloaded.get("font_size"), 14)
+
+    def test_settings_manager(self):
+        """SettingsManager keeps one row per setting."""
+        with patch.object(Path, 'home', lambda: self.temp_dir):
+            manager = SettingsManager(state_store=self.store)
+            manager.set_theme("dark")
+            self.assertEqual(SettingsManager(state_store=self.store).get_theme(), "dark")
+        self.assertEqual(self.store.get(SettingsManager.NAMESPACE, "theme"), "dark")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+"""
+Cold-start import regression tests.
+
+Runs `python -X importtime` in a fresh interpreter and checks that `import
+main` stays within an import budget, does not pull in modules that are only
+needed after startup, and that the lazily exported packages do not import
+their submodules up front.
+
+The cumulative wall-clock budget depends on the machine's load and only
+runs when POEDITOR_IMPORT_TIMING_TESTS=1 is set.
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Top-level packages and modules owned by this project
+PROJECT_PACKAGES = {
+    'core', 'services', 'widgets', 'managers', 'models', 'plugins', 'panels',
+    'preferences', 'themes', 'lg', 'main'
+}
+
+# Budget for the self time of project modules imported by `import main`.
+# Measured around 120-150 ms; the margin absorbs slow CI machines.
+MAIN_IMPORT_BUDGET_MS = 400
+
+# The Qt modules main cannot start without; their import time is the
+# baseline the cumulative budget of `import main` scales with, so the budget
+# follows the speed of the machine running the test.
+BASELINE_IMPORT = 'import PySide6.QtWidgets'
+
+# Budget for the cumulative time of `import main` as a multiple of the
+# baseline, covering every stdlib and third-party module pulled in on the
+# way. Usually 1.9-2.2x, but a loaded machine can reach the limit, hence
+# the opt-in below.
+MAIN_CUMULATIVE_BUDGET_RATIO = 2.5
+TIMING_TESTS_ENABLED = os.environ.get('POEDITOR_IMPORT_TIMING_TESTS') == '1'
+
+# Modules that are only needed once the window is up or a panel is opened;
+# `import main` must not import them.
+DEFERRED_MODULES = (
+    'sqlite3',
+    'plugins',
+    'preferences',
+    'services.path_index',
+    'services.file_watcher_service',
+    'services.folder_size_service',
+    'services.state_store',
+    'widgets.simple_explorer_widget',
+)
+
+
+def _run_python(code: str, *args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    return subprocess.run(
+        [sys.executable, *args, '-c', code],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, timeout=120
+    )
+
+
+def _import_times(code: str) -> Dict[str, Tuple[int, int]]:
+    """Run code under -X importtime and return (self, cumulative) microseconds per module."""
+    result = _run_python(code, '-X', 'importtime')
+    if result.returncode != 0:
+        raise AssertionError(result.stderr)
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        times[module.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def _import_self_times(code: str) -> Dict[str, int]:
+    """Run code under -X importtime and return self time in microseconds per module."""
+    return {module: self_us for module, (self_us, _cumulative_us) in _import_times(code).items()}
+
+
+def _best_cumulative_ms(code: str, top_level: Iterable[str], runs: int = 3) -> float:
+    """Best-of-runs cumulative import time of the given top-level modules, in milliseconds."""
+    best_us = None
+    for _ in range(runs):
+        times = _import_times(code)
+        total_us = sum(times[module][1] for module in top_level)
+        best_us = total_us if best_us is None else min(best_us, total_us)
+    return best_us / 1000
+
+
+class TestImportTime(unittest.TestCase):
+    """Import time budget and lazy export checks."""
+
+    @classmethod
+    def setUpClass(cls):
+        # Warm run so bytecode is cached and the measurement is a cold
+        # interpreter start rather than a compile.
+        _run_python('import main')
+
+    def test_main_import_within_budget(self):
+        """Project modules imported by main stay within the import budget."""
+        self_times = _import_self_times('import main')
+        project_us = sum(us for module, us in self_times.items()
+                         if module.split('.')[0] in PROJECT_PACKAGES)
+        self.assertLess(project_us / 1000, MAIN_IMPORT_BUDGET_MS)
+
+    def test_main_does_not_import_deferred_modules(self):
+        """Modules needed only after startup are not imported by main."""
+        # main logs to stdout, so the module list goes on one tagged line
+        result = _run_python('import sys, main\nprint("modules:", " ".join(sys.modules))')
+        self.assertEqual(result.returncode, 0, result.stderr)
+        modules = result.stdout.rsplit('modules:', 1)[1].split()
+        imported = [module for module in modules
+                    if module.split('.')[0] in DEFERRED_MODULES or module in DEFERRED_MODULES]
+        self.assertEqual(imported, [])
+
+    @unittest.skipUnless(TIMING_TESTS_ENABLED, "set POEDITOR_IMPORT_TIMING_TESTS=1 to check wall-clock budgets")
+    def test_main_cumulative_import_within_budget(self):
+        """Everything imported by main, project or not, stays within a baseline-derived budget."""
+        _run_python(BASELINE_IMPORT)
+        baseline_ms = _best_cumulative_ms(BASELINE_IMPORT, ('PySide6.QtWidgets',))
+        main_ms = _best_cumulative_ms('import main', ('main',))
+        self.assertLess(main_ms, baseline_ms * MAIN_CUMULATIVE_BUDGET_RATIO,
+                        f"import main took {main_ms:.0f} ms, baseline {baseline_ms:.0f} ms")
+
+    def test_services_package_imports_lazily(self):
+        """Importing the services package does not import its services."""
+        self_times = _import_self_times('import services')
+        self.assertIn('services', self_times)
+        self.assertNotIn('services.location_manager', self_times)
+        self.assertNotIn('services.navigation_service', self_times)
+
+    def test_preferences_package_imports_lazily(self):
+        """Importing the preferences package does not build the dialog modules."""
+        self_times = _import_self_times('import preferences')
+        self.assertNotIn('preferences.main_dialog', self_times)
+        self.assertNotIn('preferences.common.base_components', self_times)
+        self_times = _import_self_times('import preferences.translation_history')
+        self.assertNotIn('preferences.translation_history.translation_memory_service', self_times)
+
+    def test_lazy_exports_resolve_on_access(self):
+        """Lazily exported names resolve to the defining module's objects."""
+        result = _run_python(
+            'import services, preferences\n'
+            'from services.location_manager import LocationBookmark\n'
+            'assert services.LocationBookmark is LocationBookmark\n'
+            'assert "PathCompletionService" in dir(services)\n'
+            'from preferences import create_preferences_dialog\n'
+            'assert callable(create_preferences_dialog)\n'
+            'try:\n'
+            '    services.DoesNotExist\n'
+            'except AttributeError:\n'
+            '    pass\n'
+            'else:\n'
+            '    raise SystemExit("missing attribute did not raise")\n'
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
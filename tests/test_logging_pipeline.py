@@ -0,0 +1,110 @@
+"""
+Unit tests for the asynchronous logging pipeline in lg.py.
+"""
+
+import configparser
+import gzip
+import logging
+import queue
+import tempfile
+import threading
+import unittest
+from logging.handlers import QueueListener
+from pathlib import Path
+from unittest.mock import patch
+
+from lg import CompressedRotatingFileHandler, DeferredQueueHandler, ModuleLevelFilter, _read_module_levels, logger
+
+
+class ListHandler(logging.Handler):
+    """Collects formatted messages."""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+
+
+class TestLoggingPipeline(unittest.TestCase):
+    """Test suite for the logging pipeline building blocks."""
+
+    def test_previous_run_is_rotated_and_compressed(self):
+        """A non-empty log from a previous run becomes a .gz backup."""
+        log_path = Path(tempfile.mkdtemp()) / "application.log"
+        log_path.write_text("previous run\n", encoding='utf-8')
+
+        handler = CompressedRotatingFileHandler(str(log_path), maxBytes=1024, backupCount=2, encoding='utf-8')
+        handler.close()
+
+        self.assertEqual(log_path.read_text(encoding='utf-8'), "")
+        with gzip.open(str(log_path) + ".1.gz", 'rt', encoding='utf-8') as backup:
+            self.assertEqual(backup.read(), "previous run\n")
+
+    def test_compression_runs_off_the_opening_thread(self):
+        """Opening the handler renames the old log; gzip runs on another thread."""
+        log_path = Path(tempfile.mkdtemp()) / "application.log"
+        log_path.write_text("previous run\n", encoding='utf-8')
+        threads = []
+        compress = CompressedRotatingFileHandler._compress
+
+        def record_thread(source, dest):
+            threads.append(threading.current_thread())
+            compress(source, dest)
+
+        with patch.object(CompressedRotatingFileHandler, '_compress', staticmethod(record_thread)):
+            handler = CompressedRotatingFileHandler(str(log_path), maxBytes=1024, backupCount=2,
+                                                    encoding='utf-8')
+            handler.stream.write("second run\n")
+            handler.doRollover()
+            handler.close()
+
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(threading.current_thread(), threads)
+        for backup, content in ((".1.gz", "second run\n"), (".2.gz", "previous run\n")):
+            with gzip.open(str(log_path) + backup, 'rt', encoding='utf-8') as backup_file:
+                self.assertEqual(backup_file.read(), content)
+
+    def test_module_level_override(self):
+        """Records below a module's override level are dropped."""
+        module_filter = ModuleLevelFilter({'css_manager': logging.INFO})
+        debug_record = logging.LogRecord('lg', logging.DEBUG, '/x/css_manager.py', 1, 'dump', None, None)
+        info_record = logging.LogRecord('lg', logging.INFO, '/x/css_manager.py', 1, 'loaded', None, None)
+        other_record = logging.LogRecord('lg', logging.DEBUG, '/x/tab_manager.py', 1, 'tab', None, None)
+        self.assertFalse(module_filter.filter(debug_record))
+        self.assertTrue(module_filter.filter(info_record))
+        self.assertTrue(module_filter.filter(other_record))
+
+    def test_unknown_module_level_is_skipped(self):
+        """A misspelt level is ignored with a warning instead of breaking the filter."""
+        config = configparser.ConfigParser()
+        config.read_string("[module_levels]\ncss_manager = info\ntab_manager = VERBOSE\n")
+        with self.assertLogs('lg', logging.WARNING) as captured:
+            module_levels = _read_module_levels(config)
+        self.assertEqual(module_levels, {'css_manager': logging.INFO})
+        self.assertIn('VERBOSE', captured.output[0])
+
+        record = logging.LogRecord('lg', logging.DEBUG, '/x/tab_manager.py', 1, 'tab', None, None)
+        self.assertTrue(ModuleLevelFilter(module_levels).filter(record))
+
+    def test_records_are_formatted_by_listener(self):
+        """Lazy arguments reach the handler unformatted and are formatted there."""
+        log_queue = queue.SimpleQueue()
+        collector = ListHandler()
+        listener = QueueListener(log_queue, collector)
+        test_logger = logging.getLogger('lg.test_pipeline')
+        test_logger.propagate = False
+        test_logger.setLevel(logging.DEBUG)
+        test_logger.addHandler(DeferredQueueHandler(log_queue))
+
+        listener.start()
+        test_logger.debug("loaded %s (%d chars)", "dark.css", 42)
+        listener.stop()
+
+        logger.info(f"Collected log messages: {collector.messages}")
+        self.assertEqual(collector.messages, ["loaded dark.css (42 chars)"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Unit tests for CSSPreprocessor variable resolution and compiled templates.
+"""
+
+import unittest
+
+from services.css_preprocessor import CSSPreprocessor
+from lg import logger
+
+
+class TestCSSPreprocessor(unittest.TestCase):
+    """Test suite for CSSPreprocessor processing."""
+
+    def setUp(self):
+        """Create a fresh preprocessor for each test."""
+        self.preprocessor = CSSPreprocessor()
+
+    def test_nested_variables_flattened(self):
+        """Nested references resolve in dependency order."""
+        resolved = self.preprocessor.resolve_variables({
+            'border': '1px solid var(--accent)',
+            'accent': 'var(--blue)',
+            'blue': '#007acc',
+        })
+        self.assertEqual(resolved['border'], '1px solid #007acc')
+        self.assertEqual(resolved['accent'], '#007acc')
+
+    def test_cycles_resolve_to_initial(self):
+        """Variables in a reference cycle resolve to 'initial'."""
+        resolved = self.preprocessor.resolve_variables({
+            'a': 'var(--b)',
+            'b': 'var(--a)',
+            'c': 'red',
+        })
+        self.assertEqual(resolved['a'], 'initial')
+        self.assertEqual(resolved['b'], 'initial')
+        self.assertEqual(resolved['c'], 'red')
+
+    def test_process_css_fallbacks_and_declarations(self):
+        """Fallbacks apply, missing values become 'initial' and :root is removed."""
+        css = (":root {\n    --fg: #111;\n}\n"
+               "QWidget { color: var(--fg); background: var(--bg, white); border: var(--none); }")
+        processed = self.preprocessor.process_css(css, {'fg': '#111'})
+        logger.info(f"Processed CSS: {processed}")
+        self.assertEqual(processed, "QWidget { color: #111; background: white; border: initial; }")
+
+    def test_reprocessing_reuses_compiled_template(self):
+        """Rendering under new variables reuses the compiled template."""
+        css = "QLabel { color: var(--fg); }"
+        self.assertEqual(self.preprocessor.process_css(css, {'fg': 'black'}), "QLabel { color: black; }")
+        template = self.preprocessor.compile_css(css, strip_declarations=True)
+        self.assertEqual(self.preprocessor.process_css(css, {'fg': 'white'}), "QLabel { color: white; }")
+        self.assertIs(self.preprocessor.compile_css(css, strip_declarations=True), template)
+
+    def test_tables_are_cached_by_source(self):
+        """Resolved tables are reused per source CSS and both caches stay bounded."""
+        source = ":root { --fg: black; }"
+        resolved = self.preprocessor.resolve_variables({'fg': 'black'}, source)
+        self.assertIs(self.preprocessor.resolve_variables({'fg': 'black'}, source), resolved)
+        self.assertIsNot(self.preprocessor.resolve_variables({'fg': 'black'}), resolved)
+
+        for number in range(CSSPreprocessor.TEMPLATE_CACHE_SIZE + 5):
+            css = f"QLabel {{ margin: {number}px; color: var(--fg); }}"
+            self.preprocessor.process_css(css, {'fg': 'black'}, f":root {{ --fg: black; /* {number} */ }}")
+        self.assertEqual(len(self.preprocessor._compiled_templates), CSSPreprocessor.TEMPLATE_CACHE_SIZE)
+        self.assertEqual(len(self.preprocessor._resolved_tables), CSSPreprocessor.RESOLVED_TABLE_CACHE_SIZE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+Unit tests for IconPreprocessor template-based variant generation.
+"""
+
+import base64
+import tempfile
+import unittest
+from pathlib import Path
+
+from services.icon_preprocessor import IconPreprocessor
+from lg import logger
+
+
+SVG_CONTENT = """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 16 16">
+    <path fill="#ffffff" d="M0 0h16v16H0z"/>
+    <circle fill="#858585" cx="8" cy="8" r="4"/>
+</svg>"""
+
+
+class TestIconPreprocessor(unittest.TestCase):
+    """Test suite for IconPreprocessor."""
+
+    def setUp(self):
+        """Create a temporary icon directory."""
+        self.icons_dir = Path(tempfile.mkdtemp())
+        (self.icons_dir / "files.svg").write_text(SVG_CONTENT, encoding='utf-8')
+        (self.icons_dir / "files_active.svg").write_text(SVG_CONTENT, encoding='utf-8')
+        self.preprocessor = IconPreprocessor(str(self.icons_dir))
+
+    def test_variants_replace_every_fill(self):
+        """Each variant fills all shapes with its mapped colour."""
+        self.preprocessor.process_all_icons()
+        primary = base64.b64decode(self.preprocessor.processed_icons["files"]["primary"]).decode('utf-8')
+        logger.info(f"Primary variant: {primary}")
+        self.assertEqual(primary.count('fill="var(--fg-main)"'), 2)
+        self.assertNotIn('#ffffff', primary)
+        self.assertIn("active", self.preprocessor.processed_icons["files"])
+
+    def test_identical_svgs_share_one_template(self):
+        """SVGs with the same content are parsed only once."""
+        self.preprocessor.process_all_icons()
+        self.assertEqual(len(self.preprocessor._templates), 1)
+
+    def test_generated_css_is_memoised_until_icons_change(self):
+        """Repeated CSS generation reuses the previous result."""
+        first = self.preprocessor.generate_icon_css(generate_variables=True)
+        self.assertIs(self.preprocessor.generate_icon_css(generate_variables=True), first)
+
+        (self.icons_dir / "other.svg").write_text(SVG_CONTENT.replace("16 16", "24 24"), encoding='utf-8')
+        self.preprocessor.process_svg_file(self.icons_dir / "other.svg")
+        self.assertIn("--icon-other-primary-url", self.preprocessor.generate_icon_css(generate_variables=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
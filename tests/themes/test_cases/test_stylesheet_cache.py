@@ -0,0 +1,110 @@
+"""
+Unit tests for the content-addressed processed stylesheet cache of
+CSSFileBasedThemeManager.
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from PySide6.QtWidgets import QApplication
+
+from services.css_file_based_theme_manager import CSSFileBasedThemeManager
+
+
+class TestStylesheetCache(unittest.TestCase):
+    """Test memory and disk hits, cache keys, pruning and the debug dump."""
+
+    THEME_CSS = "QLabel { color: var(--text); }"
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment."""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.manager = CSSFileBasedThemeManager()
+        self.cache_dir = Path(tempfile.mkdtemp()) / "stylesheet_cache"
+        self.css_manager = Mock(css_cache={"variables": ":root { --text: #000; }"})
+        self.preprocessor = Mock()
+        self.preprocessor.extract_variables.return_value = {"--text": "#000"}
+        self.preprocessor.process_css.side_effect = lambda css, variables, variables_source=None: f"processed {len(css)}"
+        self.icons = Mock()
+        self.icons.generate_icon_css.return_value = ""
+        self.icons.get_source_fingerprint.return_value = "icons-1"
+        self.settings = Mock()
+        self.settings.value.return_value = False
+        for name, value in (("_stylesheet_cache_dir", self.cache_dir), ("_processed_css_cache", {}),
+                            ("css_manager", self.css_manager), ("css_preprocessor", self.preprocessor),
+                            ("icon_preprocessor", self.icons), ("settings", self.settings)):
+            patcher = patch.object(self.manager, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _key(self, css: str = THEME_CSS) -> str:
+        return self.manager._stylesheet_cache_key(self.css_manager.css_cache["variables"], css)
+
+    def test_memory_hit(self):
+        """A second request is served from memory without preprocessing."""
+        first = self.manager._get_processed_css(self.THEME_CSS)
+        self.assertEqual(self.manager._get_processed_css(self.THEME_CSS), first)
+        self.assertEqual(self.preprocessor.process_css.call_count, 1)
+
+    def test_disk_hit(self):
+        """A new session reads the stored stylesheet instead of preprocessing."""
+        first = self.manager._get_processed_css(self.THEME_CSS)
+        self.assertTrue((self.cache_dir / f"{self._key()}.qss").exists())
+        self.manager._processed_css_cache.clear()
+        self.assertEqual(self.manager._get_processed_css(self.THEME_CSS), first)
+        self.assertEqual(self.preprocessor.process_css.call_count, 1)
+
+    def test_unreadable_cache_file_is_a_miss(self):
+        """A cache file that cannot be read is rebuilt rather than failing."""
+        self.cache_dir.mkdir(parents=True)
+        (self.cache_dir / f"{self._key()}.qss").mkdir()
+        self.assertTrue(self.manager._get_processed_css(self.THEME_CSS).startswith("processed"))
+        self.assertEqual(self.preprocessor.process_css.call_count, 1)
+
+    def test_key_follows_inputs(self):
+        """Variables, theme CSS and icon sources all change the key."""
+        key = self._key()
+        self.assertNotEqual(self._key("QLabel { color: red; }"), key)
+        self.icons.get_source_fingerprint.return_value = "icons-2"
+        self.assertNotEqual(self._key(), key)
+        self.icons.get_source_fingerprint.return_value = "icons-1"
+        self.css_manager.css_cache["variables"] = ":root { --text: #fff; }"
+        self.assertNotEqual(self._key(), key)
+
+    def test_pruned_to_limit(self):
+        """Only the newest STYLESHEET_CACHE_LIMIT stylesheets are kept on disk."""
+        with patch.object(CSSFileBasedThemeManager, 'STYLESHEET_CACHE_LIMIT', 2):
+            for color in ("red", "green", "blue"):
+                self.manager._get_processed_css(f"QLabel {{ color: {color}; }}")
+        self.assertEqual(len(list(self.cache_dir.glob("*.qss"))), 2)
+
+    def test_debug_dump_is_opt_in(self):
+        """Processed CSS is dumped for inspection only when enabled in settings."""
+        with patch.object(self.manager, '_write_debug_css') as write_debug_css:
+            self.manager._get_processed_css(self.THEME_CSS)
+            write_debug_css.assert_not_called()
+
+            self.settings.value.return_value = True
+            self.manager._get_processed_css("QLabel { color: red; }")
+            write_debug_css.assert_called_once()
+
+    def test_debug_dump_on_cache_hits(self):
+        """Enabling the dump on a warm cache writes it from memory and disk hits too."""
+        processed_css = self.manager._get_processed_css(self.THEME_CSS)
+        self.settings.value.return_value = True
+        with patch.object(self.manager, '_write_debug_css') as write_debug_css:
+            self.manager._get_processed_css(self.THEME_CSS)
+            self.manager._processed_css_cache.clear()
+            self.manager._get_processed_css(self.THEME_CSS)
+        self.assertEqual(write_debug_css.call_count, 2)
+        write_debug_css.assert_called_with(processed_css)
+        self.assertEqual(self.preprocessor.process_css.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
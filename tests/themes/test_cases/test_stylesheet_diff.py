@@ -0,0 +1,140 @@
+"""
+Unit tests for stylesheet diffing used by incremental theme switching.
+"""
+
+import unittest
+from unittest.mock import patch
+
+from PySide6.QtWidgets import QApplication, QPushButton, QLabel, QWidget
+
+from services.css_file_based_theme_manager import CSSFileBasedThemeManager
+from services.stylesheet_diff import (
+    StylesheetDiff, parse_stylesheet_rules, set_scoped_stylesheet, batched_repolish,
+    object_name_overlays, set_stylesheet_overlay
+)
+from lg import logger
+
+
+class TestStylesheetDiff(unittest.TestCase):
+    """Test suite for StylesheetDiff and helpers."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment."""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_parse_splits_selector_groups(self):
+        """Grouped selectors are keyed separately and comments are ignored."""
+        rules = parse_stylesheet_rules("/* c */ QLabel, QPushButton:hover { color: red; padding: 2px }")
+        self.assertEqual(rules["QLabel"], {"color": "red", "padding": "2px"})
+        self.assertEqual(rules["QPushButton:hover"], {"color": "red", "padding": "2px"})
+
+    def test_identical_sheets_have_empty_diff(self):
+        """Formatting-only differences do not count as changes."""
+        diff = StylesheetDiff.between("QLabel { color: red; }", "QLabel{color:red}")
+        self.assertTrue(diff.is_empty)
+
+    def test_changed_added_removed(self):
+        """Selectors are classified by how their styling changed."""
+        diff = StylesheetDiff.between(
+            "QLabel { color: red; } QLineEdit { border: none; } #sidebar { margin: 0; }",
+            "QLabel { color: blue; } QLineEdit { border: none; } QPushButton::menu-indicator { width: 0; }"
+        )
+        logger.info(f"Stylesheet diff: {diff}")
+        self.assertEqual(diff.changed, {"QLabel"})
+        self.assertEqual(diff.added, {"QPushButton::menu-indicator"})
+        self.assertEqual(diff.removed, {"#sidebar"})
+        self.assertEqual(diff.selector_targets(), ({"QLabel", "QPushButton"}, {"sidebar"}))
+
+    def test_affected_widgets_match_class_hierarchy_and_name(self):
+        """Widgets match by class (including base classes) or objectName."""
+        button = QPushButton()
+        label = QLabel()
+        plain = QWidget()
+        plain.setObjectName("sidebar")
+        diff = StylesheetDiff.between("", "QAbstractButton { color: red; } #sidebar { margin: 0; }")
+        self.assertEqual(diff.affected_widgets([button, label, plain]), [button, plain])
+
+    def test_set_scoped_stylesheet_skips_identical(self):
+        """Setting the same scoped stylesheet twice only applies it once."""
+        widget = QWidget()
+        self.assertTrue(set_scoped_stylesheet(widget, "QWidget { color: red; }"))
+        self.assertFalse(set_scoped_stylesheet(widget, "QWidget { color: red; }"))
+
+    def test_batched_repolish_restores_updates(self):
+        """Batched repolish leaves windows with updates enabled."""
+        window = QWidget()
+        child = QLabel(window)
+        self.assertEqual(batched_repolish([window, child]), 2)
+        self.assertTrue(window.updatesEnabled())
+
+    def test_object_name_overlays(self):
+        """Changes to rules for named widgets become overlays with all their rules."""
+        base = "QLabel { color: red; } #sidebar { margin: 0; } #sidebar:hover { margin: 1px; }"
+        overlays = object_name_overlays(base, base.replace("margin: 0", "margin: 2px"))
+        self.assertEqual(overlays, {"sidebar": "#sidebar { margin: 2px; }\n#sidebar:hover { margin: 1px; }"})
+        self.assertEqual(object_name_overlays(base, base), {})
+
+    def test_unscoped_changes_have_no_overlays(self):
+        """Class selectors, removed rules and removed properties need the application sheet."""
+        base = "QLabel { color: red; } #sidebar { margin: 0; padding: 0; }"
+        self.assertIsNone(object_name_overlays(base, base.replace("red", "blue")))
+        self.assertIsNone(object_name_overlays(base, "QLabel { color: red; }"))
+        self.assertIsNone(object_name_overlays(base, base.replace(" padding: 0;", "")))
+
+    def test_scoped_stylesheet_keeps_overlay(self):
+        """The widget's own stylesheet and its theme overlay are set independently."""
+        widget = QWidget()
+        set_scoped_stylesheet(widget, "QWidget { color: red; }")
+        self.assertTrue(set_stylesheet_overlay(widget, "#w { margin: 0; }"))
+        set_scoped_stylesheet(widget, "QWidget { color: blue; }")
+        self.assertIn("color: blue", widget.styleSheet())
+        self.assertIn("#w { margin: 0; }", widget.styleSheet())
+        self.assertTrue(set_stylesheet_overlay(widget, ""))
+        self.assertEqual(widget.styleSheet(), "QWidget { color: blue; }")
+
+
+class TestIncrementalThemeSwitch(unittest.TestCase):
+    """Test that incremental switching only replaces the application sheet when needed."""
+
+    BASE_CSS = "QLabel { color: red; } #themed_panel { margin: 0; }"
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment."""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.manager = CSSFileBasedThemeManager()
+        self.panel = QWidget()
+        self.panel.setObjectName("themed_panel")
+        for name, value in (("theme_switch_mode", "incremental"), ("_application_css", None),
+                            ("_effective_css", None)):
+            patcher = patch.object(self.manager, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(self.app.setStyleSheet, "")
+
+    def _apply(self, processed_css: str):
+        with patch.object(self.manager, '_get_processed_css', return_value=processed_css):
+            self.manager._apply_theme("")
+
+    def test_named_widget_changes_skip_application_sheet(self):
+        """Changes scoped to a named widget go to its overlay, then back to the application sheet."""
+        self._apply(self.BASE_CSS)
+        self.assertEqual(self.app.styleSheet(), self.BASE_CSS)
+
+        with patch.object(self.app, 'setStyleSheet') as set_application_sheet:
+            self._apply(self.BASE_CSS.replace("margin: 0", "margin: 4px"))
+        set_application_sheet.assert_not_called()
+        self.assertIn("#themed_panel { margin: 4px; }", self.panel.styleSheet())
+        self.assertEqual(self.manager.last_stylesheet_diff.changed, {"#themed_panel"})
+
+        new_css = self.BASE_CSS.replace("red", "blue")
+        self._apply(new_css)
+        self.assertEqual(self.app.styleSheet(), new_css)
+        self.assertEqual(self.panel.styleSheet(), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Test suite for the directory-first sorting of the explorer proxy model.
+"""
+
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from PySide6.QtCore import QCoreApplication
+from PySide6.QtWidgets import QApplication, QFileSystemModel
+
+from widgets.simple_explorer_widget import DirectoryFirstProxyModel
+
+
+class TestDirectoryFirstProxyModel(unittest.TestCase):
+    """Test ordering and sort key invalidation of DirectoryFirstProxyModel."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment."""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp()).resolve()
+        for name in ("dir10", "Dir2"):
+            (self.root / name).mkdir()
+        for name in ("file10.po", "file2.po", "File1.po"):
+            (self.root / name).write_text("")
+        self.model = QFileSystemModel()
+        self.model.setRootPath(str(self.root))
+        self.proxy = DirectoryFirstProxyModel()
+        self.proxy.setSourceModel(self.model)
+        self._wait_for_rows(5)
+        self.proxy.sort(0)
+
+    def _wait_for_rows(self, count: int) -> None:
+        deadline = time.perf_counter() + 10
+        while self.model.rowCount(self.model.index(str(self.root))) != count and time.perf_counter() < deadline:
+            QCoreApplication.processEvents()
+            time.sleep(0.005)
+        # Let the model finish fetching file info
+        for _ in range(20):
+            QCoreApplication.processEvents()
+
+    def _names(self):
+        root_index = self.proxy.mapFromSource(self.model.index(str(self.root)))
+        return [self.proxy.index(row, 0, root_index).data() for row in range(self.proxy.rowCount(root_index))]
+
+    def test_natural_directory_first_order(self):
+        """Directories come first and embedded numbers sort by value."""
+        self.assertEqual(self._names(), ["Dir2", "dir10", "File1.po", "file2.po", "file10.po"])
+
+    def test_inserted_and_removed_entries_are_resorted(self):
+        """New rows get sort keys and removed rows lose theirs."""
+        (self.root / "file3.po").write_text("")
+        (self.root / "dir1").mkdir()
+        self._wait_for_rows(7)
+        self.assertEqual(self._names(),
+                         ["dir1", "Dir2", "dir10", "File1.po", "file2.po", "file3.po", "file10.po"])
+
+        (self.root / "file10.po").unlink()
+        self._wait_for_rows(6)
+        (self.root / "file0.po").write_text("")
+        self._wait_for_rows(7)
+        self.assertEqual(self._names(),
+                         ["dir1", "Dir2", "dir10", "file0.po", "File1.po", "file2.po", "file3.po"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+Test suite for the large file viewer and its background line index.
+"""
+
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from PySide6.QtCore import QCoreApplication
+from PySide6.QtWidgets import QApplication
+
+from widgets.large_file_viewer import LargeFileViewer, LineIndexWorker
+
+
+class TestLargeFileViewer(unittest.TestCase):
+    """Test line indexing and line access of LargeFileViewer."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment."""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.viewers = []
+
+    def tearDown(self):
+        for viewer in self.viewers:
+            viewer.cleanup()
+            viewer.deleteLater()
+
+    def _open_indexed(self, content: bytes) -> LargeFileViewer:
+        file_path = self.temp_dir / "sample.log"
+        file_path.write_bytes(content)
+        viewer = LargeFileViewer(str(file_path))
+        self.viewers.append(viewer)
+        deadline = time.perf_counter() + 10
+        while viewer.is_indexing() and time.perf_counter() < deadline:
+            QCoreApplication.processEvents()
+            time.sleep(0.005)
+        self.assertFalse(viewer.is_indexing())
+        return viewer
+
+    def test_lines_across_chunk_boundaries(self):
+        """Offsets are correct when lines span the worker's read chunks."""
+        lines = [f"line {number} " + "x" * (number % 13) for number in range(200)]
+        with patch.object(LineIndexWorker, 'CHUNK_SIZE', 7):
+            viewer = self._open_indexed("\n".join(lines).encode('utf-8') + b"\n")
+
+        self.assertEqual(viewer.line_count(), 200)
+        self.assertEqual([viewer.line_text(number) for number in range(200)], lines)
+
+    def test_last_line_without_newline_and_crlf(self):
+        """A final unterminated line is indexed and CRLF endings are stripped."""
+        viewer = self._open_indexed(b"first\r\nsecond\r\nlast")
+        self.assertEqual(viewer.line_count(), 3)
+        self.assertEqual([viewer.line_text(number) for number in range(3)], ["first", "second", "last"])
+
+    def test_empty_file(self):
+        """An empty file opens with no lines."""
+        viewer = self._open_indexed(b"")
+        self.assertEqual(viewer.line_count(), 0)
+        viewer.resize(400, 300)
+        viewer.repaint()
+
+    def test_invalid_utf8_is_replaced(self):
+        """Undecodable bytes are shown as replacement characters."""
+        viewer = self._open_indexed(b"ok\n\xff\xfe broken\n")
+        self.assertEqual(viewer.line_text(1), "�� broken")
+
+    def test_scroll_range_follows_line_count(self):
+        """The vertical scroll bar counts lines beyond the visible page."""
+        viewer = self._open_indexed(b"row\n" * 1000)
+        viewer.resize(400, 300)
+        viewer.show()
+        QCoreApplication.processEvents()
+        page = viewer.verticalScrollBar().pageStep()
+        self.assertEqual(viewer.verticalScrollBar().maximum(), 1000 - page)
+        viewer.goto_line(990)
+        self.assertEqual(viewer.first_visible_line(), min(990, 1000 - page))
+
+
+if __name__ == '__main__':
+    unittest.main()
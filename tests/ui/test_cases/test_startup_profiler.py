@@ -0,0 +1,86 @@
+"""
+Unit tests for the startup profiler and deferred initialisation queue.
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from PySide6.QtWidgets import QApplication, QWidget
+
+from core.deferred_init_queue import DeferredInitQueue
+from core.startup_profiler import StartupProfiler
+from lg import logger
+
+
+class TestStartupProfiler(unittest.TestCase):
+    """Test suite for StartupProfiler and DeferredInitQueue."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment."""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_phases_are_recorded_and_reported(self):
+        """Phases are written to the report; later phases are ignored."""
+        profiler = StartupProfiler()
+        with profiler.phase("imports"):
+            pass
+        profiler.record("theme", 12.5)
+
+        report_path = Path(tempfile.mkdtemp()) / "startup_report.json"
+        self.assertEqual(profiler.write_report(report_path), report_path)
+        report = json.loads(report_path.read_text(encoding='utf-8'))
+        logger.info(f"Startup report: {report}")
+        self.assertEqual([phase['name'] for phase in report['phases']], ["imports", "theme"])
+
+        profiler.record("after_report", 1.0)
+        self.assertEqual(len(profiler.get_report()['phases']), 2)
+
+    def test_origin_can_be_moved_earlier(self):
+        """Time before the profiler was created is reported as the bootstrap phase."""
+        profiler = StartupProfiler(origin=100.0)
+        profiler.record("imports", 5.0)
+        finished_at = profiler.get_report()['phases'][0]['finished_at_ms']
+
+        profiler.set_origin(99.5)
+        phases = profiler.get_report()['phases']
+        self.assertEqual([phase['name'] for phase in phases], ["bootstrap", "imports"])
+        self.assertEqual(phases[0]['duration_ms'], 500.0)
+        self.assertAlmostEqual(phases[1]['finished_at_ms'], finished_at + 500.0, places=1)
+
+    def test_first_paint_starts_callback(self):
+        """The first paint of the window is recorded once."""
+        profiler = StartupProfiler()
+        painted = []
+        window = QWidget()
+        profiler.watch_first_paint(window, lambda: painted.append(True))
+        window.show()
+        window.repaint()
+        window.repaint()
+        self.app.processEvents()
+        self.assertEqual(painted, [True])
+        self.assertIsNotNone(profiler.first_paint_ms)
+
+    def test_deferred_queue_runs_in_order_after_start(self):
+        """Tasks wait for start() and then run one per event loop iteration."""
+        profiler = StartupProfiler()
+        queue = DeferredInitQueue(profiler)
+        ran = []
+        queue.add("first", lambda: ran.append("first"))
+        queue.add("second", lambda: ran.append("second"))
+        queue.add("third", lambda: ran.append("third"))
+        self.app.processEvents()
+        self.assertEqual(ran, [])
+
+        self.assertTrue(queue.run_now("third"))
+        queue.start()
+        while queue.pending():
+            self.app.processEvents()
+        self.assertEqual(ran, ["third", "first", "second"])
+        self.assertIn("deferred:first", [phase['name'] for phase in profiler.get_report()['phases']])
+
+
+if __name__ == '__main__':
+    unittest.main()
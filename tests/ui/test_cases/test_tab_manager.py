@@ -0,0 +1,150 @@
+"""
+Test suite for TabManager path lookup and tab virtualisation.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+
+from PySide6.QtCore import QCoreApplication
+from PySide6.QtWidgets import QApplication, QTextEdit
+
+from core.main_app_window import FileAwareTextEdit
+from core.tab_manager import TabManager, VirtualTabPlaceholder
+from services.file_watcher_service import FileWatcherService
+
+
+class TestTabManager(unittest.TestCase):
+    """Test the path index and virtualisation of background tabs."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment."""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.tab_manager = TabManager()
+
+    def tearDown(self):
+        self.tab_manager.deleteLater()
+
+    def _process_events_until(self, condition, timeout: float = 5.0) -> None:
+        deadline = time.perf_counter() + timeout
+        while not condition() and time.perf_counter() < deadline:
+            QCoreApplication.processEvents()
+            time.sleep(0.005)
+
+    def _add_editor(self, name: str, content: str = "msgid \"\"\n") -> FileAwareTextEdit:
+        editor = FileAwareTextEdit()
+        editor.setPlainText(content)
+        editor.file_path = os.path.join(self.temp_dir, name)
+        self.tab_manager.add_tab(editor, name)
+        return editor
+
+    def test_find_tab_by_path_follows_add_close_and_rename(self):
+        """The path index is kept in step with added, closed and renamed tabs."""
+        first = self._add_editor("first.po")
+        second = self._add_editor("second.po")
+        plain = QTextEdit()
+        self.tab_manager.add_tab(plain, "untitled")
+
+        first_path = os.path.join(self.temp_dir, "first.po")
+        self.assertEqual(self.tab_manager.find_tab_by_path(first_path), 0)
+        self.assertEqual(self.tab_manager.find_tab_by_path(
+            os.path.join(self.temp_dir, "sub", "..", "second.po")), 1)
+
+        self.tab_manager.close_tab(0)
+        self.assertEqual(self.tab_manager.find_tab_by_path(first_path), -1)
+        self.assertEqual(self.tab_manager.find_tab_by_path(second.file_path), 0)
+
+        renamed_path = os.path.join(self.temp_dir, "renamed.po")
+        self.tab_manager.rename_path(second.file_path, renamed_path)
+        self.assertEqual(self.tab_manager.find_tab_by_path(renamed_path), 0)
+        self.assertEqual(self.tab_manager.find_tab_by_path(os.path.join(self.temp_dir, "second.po")), -1)
+        self.assertEqual(self.tab_manager.tabText(0), "renamed.po")
+        self.assertEqual(second.file_path, renamed_path)
+        del first
+
+    def test_tabs_follow_watched_renames(self):
+        """Files and directories renamed on disk are followed through the file watcher."""
+        os.makedirs(os.path.join(self.temp_dir, "locale", "de"))
+        for name in ("messages.po", os.path.join("locale", "de", "app.po")):
+            with open(os.path.join(self.temp_dir, name), 'w', encoding='utf-8') as f:
+                f.write("msgid \"\"\n")
+        messages = self._add_editor("messages.po")
+        app_po = self._add_editor(os.path.join("locale", "de", "app.po"))
+
+        watcher = FileWatcherService()
+        watcher.changes_ready.connect(self.tab_manager.apply_file_system_changes)
+        ready = []
+        watcher.watch_ready.connect(ready.append)
+        watcher.watch(self.temp_dir)
+        self._process_events_until(lambda: ready)
+
+        renamed = os.path.join(self.temp_dir, "renamed.po")
+        os.rename(messages.file_path, renamed)
+        os.rename(os.path.join(self.temp_dir, "locale", "de"), os.path.join(self.temp_dir, "locale", "de_DE"))
+        moved = os.path.join(self.temp_dir, "locale", "de_DE", "app.po")
+        self._process_events_until(lambda: self.tab_manager.find_tab_by_path(moved) >= 0)
+        watcher.close()
+
+        self.assertEqual(self.tab_manager.find_tab_by_path(renamed), 0)
+        self.assertEqual(self.tab_manager.tabText(0), "renamed.po")
+        self.assertEqual(self.tab_manager.find_tab_by_path(moved), 1)
+        self.assertEqual(app_po.file_path, moved)
+        self.assertEqual(self.tab_manager.find_tab_by_path(os.path.join(self.temp_dir, "messages.po")), -1)
+
+    def test_background_tabs_are_virtualised_within_budget(self):
+        """Least recently used tabs are serialised once the budget is exceeded."""
+        content = "msgid \"entry\"\nmsgstr \"\"\n" * 500
+        per_tab = len(content) * 4
+        self.tab_manager.set_virtualization(True, per_tab * 3)
+
+        for number in range(10):
+            self._add_editor(f"catalogue_{number}.po", content)
+
+        self.assertLessEqual(self.tab_manager.get_resident_memory(), per_tab * 3)
+        self.assertFalse(self.tab_manager.is_tab_virtual(self.tab_manager.currentIndex()))
+        self.assertTrue(self.tab_manager.is_tab_virtual(0))
+        self.assertEqual(self.tab_manager.tabText(0), "catalogue_0.po")
+        self.assertEqual(self.tab_manager.find_tab_by_path(
+            os.path.join(self.temp_dir, "catalogue_0.po")), 0)
+
+    def test_virtualised_tab_restores_content_and_cursor(self):
+        """Activating a virtualised tab rebuilds the editor with its state."""
+        content = "line\n" * 2000
+        self.tab_manager.set_virtualization(True, len(content) * 4)
+
+        editor = self._add_editor("restored.po", content)
+        cursor = editor.textCursor()
+        cursor.setPosition(10)
+        cursor.setPosition(25, cursor.MoveMode.KeepAnchor)
+        editor.setTextCursor(cursor)
+        self._add_editor("other.po", content)
+        self.assertTrue(self.tab_manager.is_tab_virtual(0))
+        self.assertIsInstance(self.tab_manager.widget(0), VirtualTabPlaceholder)
+
+        self.tab_manager.setCurrentIndex(0)
+        restored = self.tab_manager.widget(0)
+        self.assertIsInstance(restored, FileAwareTextEdit)
+        self.assertEqual(restored.toPlainText(), content)
+        self.assertEqual(restored.file_path, os.path.join(self.temp_dir, "restored.po"))
+        self.assertEqual((restored.textCursor().anchor(), restored.textCursor().position()), (10, 25))
+        self.assertTrue(self.tab_manager.is_tab_virtual(1))
+
+    def test_modified_documents_stay_resident(self):
+        """Editors with unsaved edits are not virtualised."""
+        content = "line\n" * 2000
+        self.tab_manager.set_virtualization(True, len(content) * 4)
+
+        editor = self._add_editor("dirty.po", content)
+        editor.insertPlainText("edit")
+        self._add_editor("other.po", content)
+        self.assertFalse(self.tab_manager.is_tab_virtual(0))
+        self.assertIs(self.tab_manager.widget(0), editor)
+
+
+if __name__ == '__main__':
+    unittest.main()
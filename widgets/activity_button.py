@@ -9,7 +9,7 @@ from lg import logger
 from PySide6.QtWidgets import QPushButton, QToolTip
 from PySide6.QtCore import Signal, Qt, QSize, QRect
 from PySide6.QtGui import QPainter, QColor, QFontMetrics, QIcon, QEnterEvent
-from services.icon_manager import IconManager
+from services.icon_manager import icon_manager
 # Import typography and theme system
 from themes.typography import get_typography_manager, FontRole, get_font
 from services.theme_manager import theme_manager
@@ -44,8 +44,8 @@ class ActivityButton(QPushButton):
         self.is_hovered = False  # Track hover state for icon changes
         self.badge_count = 0
 
-        # Initialize icon manager
-        self.icon_manager = IconManager()
+        # Share the global icon manager so its atlas and cache are reused
+        self.icon_manager = icon_manager
 
         # Initialize typography and theme managers
         self.typography_manager = get_typography_manager()
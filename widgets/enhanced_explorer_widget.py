@@ -20,6 +20,7 @@ from services.navigation_service import NavigationService
 from services.navigation_history_service import NavigationHistoryService
 from services.location_manager import LocationManager
 from services.path_completion_service import PathCompletionService
+from services.file_watcher_service import get_file_watcher_service
 
 
 class EnhancedExplorerWidget(QWidget):
@@ -72,6 +73,9 @@ class EnhancedExplorerWidget(QWidget):
         self.location_manager = LocationManager()
         self.completion_service = PathCompletionService()
 
+        # Shared watcher of the project tree
+        self.file_watcher = get_file_watcher_service()
+
         # Set up navigation service dependencies
         self.navigation_service.set_dependencies(
             history_service=self.history_service,
@@ -123,6 +127,10 @@ class EnhancedExplorerWidget(QWidget):
         # Connect file operations service signals
         self._connect_service_signals()
 
+        # Follow file system changes in the indexed project
+        self.completion_service.path_index_ready.connect(self._on_path_index_ready)
+        self.file_watcher.changes_ready.connect(self._on_file_system_changes)
+
     def _connect_service_signals(self):
         """Connect signals from file operations service."""
         # Operation status signals
@@ -176,6 +184,20 @@ class EnhancedExplorerWidget(QWidget):
         except Exception as e:
             logger.error(f"Failed to open file {path}: {e}")
 
+    def _on_path_index_ready(self, path_count: int):
+        """Watch the indexed project so the index follows its changes."""
+        index = self.completion_service.get_path_index()
+        if index is not None:
+            self.file_watcher.watch(index.root)
+
+    def _on_file_system_changes(self, changes: list):
+        """Update the path index and folder sizes from watched changes."""
+        self.completion_service.apply_file_system_changes(changes)
+        paths = []
+        for change in changes:
+            paths.extend([change.directory] if change.overflow else change.changed_paths())
+        self.file_view.folder_sizes.invalidate(paths)
+
     def _on_operation_started(self, operation_type, targets):
         """Handle operation started event."""
         logger.debug(f"Operation started: {operation_type} on {targets}")
@@ -14,7 +14,8 @@ from lg import logger
 from widgets.simple_explorer_widget import SimpleFileView
 from widgets.explorer_context_menu import ExplorerContextMenu
 from widgets.explorer.explorer_header_bar import HeaderNavigationWidget
-from services.file_operations_service import FileOperationsService
+from widgets.explorer.properties_dialog import PropertiesDialog
+from services.file_operations_service import FileOperationsService, OperationType
 from services.undo_redo_service import UndoRedoManager
 from services.drag_drop_service import DragDropService
 from services.column_manager_service import ColumnManagerService
@@ -22,6 +23,7 @@ from services.navigation_service import NavigationService
 from services.navigation_history_service import NavigationHistoryService
 from services.location_manager import LocationManager
 from services.path_completion_service import PathCompletionService
+from services.folder_size_service import get_folder_size_service
 
 
 class EnhancedFileView(SimpleFileView):
@@ -54,6 +56,10 @@ class EnhancedFileView(SimpleFileView):
         # Track drag start position
         self.drag_start_position = None
 
+        # Show recursive folder sizes in the size column
+        self.folder_sizes = get_folder_size_service()
+        self.proxy_model.set_folder_size_service(self.folder_sizes)
+
         # Create and set header navigation widget
         self._setup_header_navigation()
 
@@ -96,6 +102,9 @@ class EnhancedFileView(SimpleFileView):
         # Connect context menu signal
         self.customContextMenuRequested.connect(self._show_context_menu)
 
+        # Recompute folder sizes affected by file operations
+        file_operations_service.operationCompleted.connect(self._on_operation_completed)
+
         # Connect context menu signals
         self.context_menu_manager.show_properties.connect(self._show_properties)
         self.context_menu_manager.show_open_with.connect(self._show_open_with)
@@ -190,8 +199,27 @@ class EnhancedFileView(SimpleFileView):
         Args:
             paths: List of paths to show properties for
         """
-        # This would be implemented with a properties dialog
-        logger.debug(f"Show properties for: {paths}")
+        if not paths:
+            return
+        dialog = PropertiesDialog(paths, self.folder_sizes, self)
+        dialog.exec()
+
+    def _on_operation_completed(self, operation_type: str, source_paths: list, target_path: str):
+        """
+        Recompute folder sizes after a file operation.
+
+        Args:
+            operation_type: Type of the completed operation
+            source_paths: Paths the operation read or removed
+            target_path: Path the operation created, if any
+        """
+        if operation_type in (OperationType.COPY.value, OperationType.CUT.value):
+            # Only the clipboard changed
+            return
+        changed = list(source_paths)
+        if target_path:
+            changed.append(target_path)
+        self.folder_sizes.invalidate(changed)
 
     def _show_open_with(self, paths):
         """
@@ -400,6 +428,17 @@ class EnhancedFileView(SimpleFileView):
 
         return paths
 
+    def set_current_path(self, path: str) -> None:
+        """
+        Set the current directory path, dropping folder size requests for
+        the directory being left.
+
+        Args:
+            path: The absolute path to the directory.
+        """
+        self.folder_sizes.cancel_requests()
+        super().set_current_path(path)
+
     def rootPath(self) -> str:
         """Get the current root path of the view."""
         return self.file_system_model.rootPath()
@@ -2,7 +2,7 @@
 Goto Dropdown Widget
 
 Provides a dropdown for quick location selection including:
-- Recent locations from navigation history
+- Most frecent locations from navigation history
 - Bookmarked locations from location manager
 - Quick access locations (Home, Documents, etc.)
 """
@@ -52,6 +52,8 @@ class GotoDropdown(QComboBox):
     # Signals
     location_selected = Signal(str)
 
+    RECENT_LOCATION_ITEMS = 8
+
     def __init__(self, parent: Optional[QWidget] = None):
         """
         Initialize the goto dropdown.
@@ -146,16 +148,26 @@ class GotoDropdown(QComboBox):
         self.setItemData(0, "", Qt.ItemDataRole.UserRole)  # No path for placeholder
 
         # Add quick locations
+        listed_paths = set()
+        quick_locations = []
+        bookmarks = []
         if self._location_manager:
             quick_locations = self._location_manager.get_quick_locations()
+            bookmarks = self._location_manager.get_bookmarks()
+            listed_paths.update(location.path for location in quick_locations)
+            listed_paths.update(bookmark.path for bookmark in bookmarks)
             if quick_locations:
                 self._add_section_separator("Quick Locations")
                 for location in quick_locations:
                     self._add_location_item(location.name, location.path, location.icon)
 
-        # Add recent locations
+        # Add the most frecent locations not listed in the other sections
         if self._history_service:
-            recent_locations = self._history_service.get_recent_locations(limit=8)
+            recent_locations = [
+                location_data for location_data in
+                self._history_service.get_recent_locations(limit=self.RECENT_LOCATION_ITEMS + len(listed_paths))
+                if location_data.get('path') not in listed_paths
+            ][:self.RECENT_LOCATION_ITEMS]
             if recent_locations:
                 self._add_section_separator("Recent Locations")
                 for location_data in recent_locations:
@@ -165,7 +177,6 @@ class GotoDropdown(QComboBox):
 
         # Add bookmarks
         if self._location_manager:
-            bookmarks = self._location_manager.get_bookmarks()
             if bookmarks:
                 self._add_section_separator("Bookmarks")
                 for bookmark in bookmarks:
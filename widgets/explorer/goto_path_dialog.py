@@ -17,7 +17,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Signal, QTimer, QDir, QThread
 from PySide6.QtGui import QFont, QIcon
 
-from services.path_completion_service import PathCompletionService
+from services.path_completion_service import PathCompletionService, is_anything_query
 from services.navigation_history_service import NavigationHistoryService
 
 logger = logging.getLogger(__name__)
@@ -37,6 +37,9 @@ class PathCompletionThread(QThread):
         """Run path completion in background."""
         try:
             completions = self.completion_service.get_quick_completions(self.path)
+            if is_anything_query(self.path):
+                # Bare names also match any file in the project
+                completions += self.completion_service.find_anything(self.path)
             # Extract just the path strings from the completion dictionaries
             paths = [comp.get('path', comp.get('text', '')) for comp in completions if comp]
             self.completion_ready.emit(paths)
@@ -72,6 +75,9 @@ class GotoPathDialog(QDialog):
         self._setup_connections()
         self._load_recent_paths()
 
+        if self.completion_service:
+            self.completion_service.ensure_path_index()
+
         # Auto-resize
         self.resize(500, 300)
 
@@ -99,7 +105,7 @@ class GotoPathDialog(QDialog):
 
         # Path input field
         self.path_input = QLineEdit()
-        self.path_input.setPlaceholderText("Enter path (e.g., /Users/username/Documents)")
+        self.path_input.setPlaceholderText("Enter a path or part of a file name (e.g., /Users/username/Documents)")
         path_layout.addWidget(self.path_input)
 
         # Completion list
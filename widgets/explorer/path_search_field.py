@@ -6,8 +6,12 @@ Provides an intelligent path search field with:
 - Navigation history integration
 - Path validation feedback
 - Keyboard navigation support
+
+Paths are validated through the shared PathProbe, so typing a path on a
+slow or hung mount never blocks the UI.
 """
 
+import os
 from typing import Optional, List
 from PySide6.QtWidgets import (
     QLineEdit, QWidget, QCompleter, QAbstractItemView
@@ -17,6 +21,7 @@ from PySide6.QtGui import QKeyEvent, QPalette
 
 from services.path_completion_service import PathCompletionService
 from services.navigation_history_service import NavigationHistoryService
+from services.path_probe import PathStatus, get_path_probe
 
 
 class PathSearchField(QLineEdit):
@@ -38,6 +43,9 @@ class PathSearchField(QLineEdit):
     path_entered = Signal(str)
     path_validated = Signal(str, bool)
 
+    # Milliseconds Enter waits for a path check before handing the path to navigation
+    RETURN_VALIDATION_WAIT_MS = 100
+
     def __init__(self, parent: Optional[QWidget] = None):
         """
         Initialize the path search field.
@@ -59,6 +67,9 @@ class PathSearchField(QLineEdit):
         self._validation_timer = QTimer()
         self._last_valid_path = ""
         self._is_path_valid = True
+        self._probe = get_path_probe()
+        self._validation_request = 0
+        self._validation_text = ""
 
         # Setup UI
         self._setup_ui()
@@ -100,6 +111,7 @@ class PathSearchField(QLineEdit):
         # Validation timer (debounced validation)
         self._validation_timer.setSingleShot(True)
         self._validation_timer.timeout.connect(self._validate_current_path)
+        self._probe.probe_finished.connect(self._on_probe_finished)
 
         # Completer signals
         if self._completer:
@@ -188,10 +200,46 @@ class PathSearchField(QLineEdit):
                 self._completer.complete()
 
     def _validate_current_path(self) -> None:
-        """Validate the current path and update UI accordingly."""
+        """Validate the current path in the background and update UI when done."""
         current_text = self.text().strip()
-        is_valid = self._validate_path(current_text)
+        self._probe.cancel(self._validation_request)
+        self._validation_request = 0
+        if not current_text:
+            self._apply_validation(current_text, True)  # Empty path is not an error
+            return
+
+        path = self._absolute_path(current_text)
+        status = self._probe.cached(path)
+        if status is not None:
+            self._apply_validation(current_text, status.exists and status.is_dir)
+            return
 
+        self._validation_text = current_text
+        self._validation_request = self._probe.request(path)
+
+    def _on_probe_finished(self, request_id: int, status: PathStatus) -> None:
+        """
+        Apply a finished background validation.
+
+        Args:
+            request_id: Probe request id
+            status: Probe result
+        """
+        if request_id != self._validation_request:
+            return
+        self._validation_request = 0
+        if self.text().strip() == self._validation_text:
+            # A mount that did not answer is not reported as an invalid path
+            self._apply_validation(self._validation_text, status.timed_out or (status.exists and status.is_dir))
+
+    def _apply_validation(self, current_text: str, is_valid: bool) -> None:
+        """
+        Update validation state and UI.
+
+        Args:
+            current_text: Validated text
+            is_valid: Whether the path is valid
+        """
         # Update validation state
         if self._is_path_valid != is_valid:
             self._is_path_valid = is_valid
@@ -214,14 +262,19 @@ class PathSearchField(QLineEdit):
             return True  # Empty path is considered valid (no error state)
 
         try:
-            from pathlib import Path
-            path_obj = Path(path)
+            status = self._probe.check(self._absolute_path(path), self.RETURN_VALIDATION_WAIT_MS / 1000)
+            if status is None or status.timed_out:
+                return True  # Navigation reports the outcome once the mount answers
 
             # Check if path exists and is accessible
-            return path_obj.exists() and path_obj.is_dir()
+            return status.exists and status.is_dir
         except Exception:
             return False
 
+    def _absolute_path(self, path: str) -> str:
+        """Make a path absolute without touching the file system."""
+        return os.path.abspath(os.path.expanduser(path.strip()))
+
     def _update_validation_style(self, is_valid: bool) -> None:
         """
         Update the visual style based on validation state.
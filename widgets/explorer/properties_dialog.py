@@ -0,0 +1,112 @@
+"""
+Properties Dialog
+
+Shows the location, type, size, contents and modification time of the
+files and folders selected in the explorer. Folder sizes come from the
+FolderSizeService and are filled in when their computation finishes.
+"""
+
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from PySide6.QtWidgets import QDialog, QDialogButtonBox, QFormLayout, QLabel, QVBoxLayout, QWidget
+
+from services.folder_size_service import FolderSize, FolderSizeService, format_size
+from lg import logger
+
+
+class PropertiesDialog(QDialog):
+    """Dialog showing properties of one or more paths."""
+
+    def __init__(self, paths: List[str], folder_sizes: FolderSizeService,
+                 parent: Optional[QWidget] = None):
+        """
+        Initialize the properties dialog.
+
+        Args:
+            paths: Selected file and folder paths
+            folder_sizes: Service computing recursive folder sizes
+            parent: Parent widget
+        """
+        super().__init__(parent)
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.folder_sizes = folder_sizes
+        self._file_size = 0
+        self._file_count = 0
+        self._folders: Dict[str, Optional[FolderSize]] = {}
+
+        self._setup_ui()
+        self.folder_sizes.sizes_updated.connect(self._on_sizes_updated)
+        for path in self._folders:
+            self._folders[path] = self.folder_sizes.get_size(path)
+        self._update_size()
+
+    def _setup_ui(self) -> None:
+        """Setup the user interface."""
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+        layout.addLayout(form)
+
+        if len(self.paths) == 1:
+            path = self.paths[0]
+            self.setWindowTitle(f"{os.path.basename(path) or path} Properties")
+            form.addRow("Name:", QLabel(os.path.basename(path) or path))
+            form.addRow("Location:", QLabel(os.path.dirname(path)))
+            form.addRow("Type:", QLabel("Folder" if os.path.isdir(path) else "File"))
+        else:
+            self.setWindowTitle("Properties")
+            form.addRow("Items:", QLabel(f"{len(self.paths)} selected"))
+
+        for path in self.paths:
+            try:
+                if os.path.isdir(path):
+                    self._folders[path] = None
+                else:
+                    self._file_size += os.path.getsize(path)
+                    self._file_count += 1
+            except OSError as e:
+                logger.warning(f"Cannot read properties of {path}: {e}")
+
+        self.size_label = QLabel()
+        form.addRow("Size:", self.size_label)
+        self.contents_label = QLabel()
+        if self._folders:
+            form.addRow("Contains:", self.contents_label)
+
+        if len(self.paths) == 1:
+            try:
+                modified = datetime.fromtimestamp(os.path.getmtime(self.paths[0]))
+                form.addRow("Modified:", QLabel(modified.strftime("%Y-%m-%d %H:%M:%S")))
+            except OSError:
+                pass
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def _on_sizes_updated(self, sizes) -> None:
+        """Fill in folder sizes as they are computed."""
+        changed = False
+        for path in self._folders:
+            if path in sizes:
+                self._folders[path] = sizes[path]
+                changed = True
+        if changed:
+            self._update_size()
+
+    def _update_size(self) -> None:
+        """Show the total size and contents of the selection."""
+        size, file_count, folder_count = self._file_size, self._file_count, 0
+        for folder_size in self._folders.values():
+            if folder_size is None:
+                continue
+            size += folder_size.size
+            file_count += folder_size.file_count
+            folder_count += folder_size.folder_count
+
+        text = f"{format_size(size)} ({size:,} bytes)"
+        if any(folder_size is None for folder_size in self._folders.values()):
+            text += " - calculating..."
+        self.size_label.setText(text)
+        self.contents_label.setText(f"{file_count:,} files, {folder_count:,} folders")
@@ -0,0 +1,271 @@
+"""
+Large file viewer for the POEditor application.
+
+Read-only viewer for files too large to load into a QTextEdit. The file is
+memory-mapped and a line-offset index is built by a background thread, so
+the first screen is shown straight away and the scroll range grows while
+indexing runs. Only the visible lines are read, decoded and painted.
+"""
+
+import mmap
+import os
+import time
+from array import array
+from itertools import accumulate
+from typing import Optional
+
+from PySide6.QtCore import QCoreApplication, Qt, QThread, Signal
+from PySide6.QtGui import QFontMetrics, QKeyEvent, QPainter, QPaintEvent, QResizeEvent
+from PySide6.QtWidgets import QAbstractScrollArea, QWidget
+from lg import logger
+
+from themes.typography import get_font, FontRole
+
+# Files at least this large open in the viewer instead of a text editor
+LARGE_FILE_THRESHOLD = 8 * 1024 * 1024
+
+# Longest part of a line that is decoded and painted
+MAX_PAINTED_LINE_CHARS = 4096
+
+
+class LineIndexWorker(QThread):
+    """
+    Worker thread that records the byte offset of every line start.
+
+    Offsets are appended to a shared array as each chunk is scanned; the
+    viewer only reads offsets that are already published through
+    indexed_lines, so it never sees a partially written chunk.
+    """
+
+    # Worker signals
+    progress = Signal(int)  # lines indexed so far
+    indexing_finished = Signal(int)  # total line count
+
+    CHUNK_SIZE = 2 * 1024 * 1024  # small chunks keep GIL hand-offs to the UI short
+    PROGRESS_INTERVAL = 0.1  # seconds between progress signals
+
+    def __init__(self, file_path: str, offsets: array, parent=None):
+        super().__init__(parent)
+        self._file_path = file_path
+        self._offsets = offsets
+        self._should_stop = False
+        self.indexed_lines = 0
+        self.max_line_length = 0
+
+    def stop(self):
+        """Stop indexing at the next chunk boundary."""
+        self._should_stop = True
+
+    def run(self):
+        """Main worker thread execution."""
+        try:
+            with open(self._file_path, 'rb') as file:
+                position = 0
+                pending_line_length = 0
+                last_progress = 0.0
+                while not self._should_stop:
+                    chunk = file.read(self.CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    lines = chunk.split(b'\n')
+                    # Starts of the lines after each newline in the chunk
+                    starts = accumulate((len(line) + 1 for line in lines[:-1]), initial=position)
+                    next(starts)
+                    self._offsets.extend(starts)
+
+                    if len(lines) > 1:
+                        self.max_line_length = max(self.max_line_length, pending_line_length + len(lines[0]),
+                                                   max(map(len, lines[1:-1]), default=0))
+                        pending_line_length = len(lines[-1])
+                    else:
+                        pending_line_length += len(chunk)
+                    position += len(chunk)
+
+                    # The line after the last newline is incomplete until the next chunk
+                    self.indexed_lines = len(self._offsets) - 1
+                    now = time.perf_counter()
+                    if now - last_progress >= self.PROGRESS_INTERVAL:
+                        last_progress = now
+                        self.progress.emit(self.indexed_lines)
+
+                self.max_line_length = max(self.max_line_length, pending_line_length)
+                if not self._should_stop:
+                    # The final line has no trailing newline unless the file ends with one
+                    self.indexed_lines = len(self._offsets) if pending_line_length else len(self._offsets) - 1
+                    self.indexing_finished.emit(self.indexed_lines)
+        except OSError as e:
+            logger.error(f"Failed to index {self._file_path}: {e}")
+            self.indexing_finished.emit(self.indexed_lines)
+
+
+class LargeFileViewer(QAbstractScrollArea):
+    """
+    Read-only, virtualised view of a large text file.
+
+    The vertical scroll bar counts lines and the horizontal one counts
+    characters; paintEvent reads just the lines in the viewport from the
+    memory map.
+    """
+
+    # Emitted when the line index is complete
+    indexing_finished = Signal(int)  # total line count
+
+    def __init__(self, file_path: str, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self._file_path = file_path
+        self._file = open(file_path, 'rb')
+        self._size = os.fstat(self._file.fileno()).st_size
+        self._map: Optional[mmap.mmap] = None
+        if self._size:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._offsets = array('q', [0])
+        self._line_count = 0
+        self._indexing = True
+
+        self._worker = LineIndexWorker(file_path, self._offsets, self)
+        self._worker.progress.connect(self._on_index_progress)
+        self._worker.indexing_finished.connect(self._on_indexing_finished)
+
+        self.setFont(get_font(FontRole.CODE))
+        self.viewport().setCursor(Qt.CursorShape.IBeamCursor)
+        self._update_metrics()
+
+        self._worker.start()
+        # Tabs are not closed on exit, so stop the worker before the thread object goes away
+        QCoreApplication.instance().aboutToQuit.connect(self.cleanup)
+
+        logger.info(f"Opened large file viewer for {file_path} ({self._size / (1024 * 1024):.1f} MB)")
+
+    @property
+    def file_path(self) -> str:
+        """Path of the viewed file."""
+        return self._file_path
+
+    def line_count(self) -> int:
+        """Number of lines indexed so far."""
+        return self._line_count
+
+    def is_indexing(self) -> bool:
+        """True while the line index is still being built."""
+        return self._indexing
+
+    def line_text(self, line: int) -> str:
+        """
+        Read one line from the file.
+
+        Args:
+            line: Zero-based line number, must be below line_count()
+
+        Returns:
+            Line text without its line terminator
+        """
+        start = self._offsets[line]
+        end = self._offsets[line + 1] - 1 if line + 1 < len(self._offsets) else self._size
+        end = min(end, start + MAX_PAINTED_LINE_CHARS * 4)
+        text = self._map[start:end].decode('utf-8', errors='replace') if self._map else ""
+        return text.rstrip('\r')
+
+    def first_visible_line(self) -> int:
+        """Line shown at the top of the viewport."""
+        return self.verticalScrollBar().value()
+
+    def goto_line(self, line: int) -> None:
+        """
+        Scroll so a line is at the top of the viewport.
+
+        Args:
+            line: Zero-based line number
+        """
+        self.verticalScrollBar().setValue(line)
+
+    def can_close(self) -> bool:
+        """The viewer is read-only and can always close."""
+        return True
+
+    def cleanup(self) -> None:
+        """Stop indexing and release the file mapping."""
+        if self._file.closed:
+            return
+        self._worker.stop()
+        self._worker.wait()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def _visible_line_capacity(self) -> int:
+        return max(1, self.viewport().height() // self._line_height)
+
+    def _update_metrics(self) -> None:
+        metrics = QFontMetrics(self.font())
+        self._line_height = metrics.lineSpacing()
+        self._ascent = metrics.ascent()
+        self._char_width = max(1, metrics.horizontalAdvance('M'))
+
+    def _update_scroll_ranges(self) -> None:
+        capacity = self._visible_line_capacity()
+        vertical = self.verticalScrollBar()
+        vertical.setPageStep(capacity)
+        vertical.setRange(0, max(0, self._line_count - capacity))
+
+        columns = max(1, self.viewport().width() // self._char_width)
+        longest = min(self._worker.max_line_length, MAX_PAINTED_LINE_CHARS)
+        horizontal = self.horizontalScrollBar()
+        horizontal.setPageStep(columns)
+        horizontal.setRange(0, max(0, longest - columns))
+
+    def _on_index_progress(self, indexed_lines: int) -> None:
+        visible_before = self._line_count < self.first_visible_line() + self._visible_line_capacity()
+        self._line_count = indexed_lines
+        self._update_scroll_ranges()
+        if visible_before:
+            self.viewport().update()
+
+    def _on_indexing_finished(self, line_count: int) -> None:
+        self._indexing = False
+        self._on_index_progress(line_count)
+        self.viewport().update()
+        logger.info(f"Indexed {line_count} lines of {self._file_path}")
+        self.indexing_finished.emit(line_count)
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        painter = QPainter(self.viewport())
+        painter.setFont(self.font())
+        painter.setPen(self.palette().text().color())
+
+        first = self.first_visible_line()
+        last = min(self._line_count, first + self._visible_line_capacity() + 1)
+        column = self.horizontalScrollBar().value()
+        y = self._ascent
+        for line in range(first, last):
+            text = self.line_text(line).expandtabs(4)
+            painter.drawText(4, y, text[column:column + MAX_PAINTED_LINE_CHARS])
+            y += self._line_height
+        painter.end()
+
+    def resizeEvent(self, event: QResizeEvent) -> None:
+        super().resizeEvent(event)
+        self._update_scroll_ranges()
+
+    def changeEvent(self, event) -> None:
+        super().changeEvent(event)
+        if event.type() == event.Type.FontChange:
+            self._update_metrics()
+            self._update_scroll_ranges()
+
+    def keyPressEvent(self, event: QKeyEvent) -> None:
+        vertical = self.verticalScrollBar()
+        actions = {
+            Qt.Key.Key_Up: vertical.SliderAction.SliderSingleStepSub,
+            Qt.Key.Key_Down: vertical.SliderAction.SliderSingleStepAdd,
+            Qt.Key.Key_PageUp: vertical.SliderAction.SliderPageStepSub,
+            Qt.Key.Key_PageDown: vertical.SliderAction.SliderPageStepAdd,
+            Qt.Key.Key_Home: vertical.SliderAction.SliderToMinimum,
+            Qt.Key.Key_End: vertical.SliderAction.SliderToMaximum,
+        }
+        action = actions.get(event.key())
+        if action is None:
+            super().keyPressEvent(event)
+            return
+        vertical.triggerAction(action)
@@ -33,6 +33,7 @@ from PySide6.QtGui import QFont, QKeySequence, QShortcut
 from core.file_filter import FileFilter
 from core.directory_model import DirectoryModel, FileInfo
 from core.explorer_settings import ExplorerSettings
+from services.collation import get_name_collator
 from lg import logger
 
 
@@ -216,7 +217,7 @@ class SimpleExplorer(QWidget):
         This method implements a consistent sorting behavior:
         - Directories are always displayed first
         - Files are displayed after directories
-        - Both groups are sorted alphabetically
+        - Both groups are sorted by name in natural, locale-aware order
         - This sorting applies to both normal and filtered views
 
         The explorer also maintains a clean visual appearance by:
@@ -235,8 +236,9 @@ class SimpleExplorer(QWidget):
             # Update UI
             self.file_list.clear()
 
-            # Sort: directories first, then files, alphabetically
-            sorted_files = sorted(files, key=lambda f: (not f.is_directory, f.name.lower()))
+            # Sort: directories first, then files, by name
+            collator = get_name_collator()
+            sorted_files = sorted(files, key=lambda f: (not f.is_directory, collator.key(f.name)))
 
             for file_info in sorted_files:
                 self._add_file_item(file_info)
@@ -15,7 +15,7 @@ Features:
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTreeView, QLineEdit,
@@ -26,7 +26,9 @@ from PySide6.QtCore import Qt, Signal, QDir, QModelIndex, QItemSelectionModel, Q
 from PySide6.QtGui import QAction
 
 from core.explorer_settings import ExplorerSettings
+from services.collation import get_name_collator
 from services.file_operations_service import FileOperationsService
+from services.folder_size_service import FolderSizeService, format_size
 from services.undo_redo_service import UndoRedoManager
 from widgets.explorer_context_menu import ExplorerContextMenu
 from lg import logger
@@ -38,60 +40,201 @@ class DirectoryFirstProxyModel(QSortFilterProxyModel):
 
     This proxy model implements the directory-first sorting behavior:
     - Directories are always displayed before files
-    - Within each group, items are sorted alphabetically
+    - Within each group, items are sorted by name in natural, locale-aware
+      order ("file2" before "file10"), ignoring case
     - This sorting applies to both normal and filtered views
+
+    With a folder size service the size column shows recursive directory
+    sizes and sorts directories and files by size.
     """
 
+    SIZE_COLUMN = 1
+    TYPE_COLUMN = 2
+    MODIFIED_COLUMN = 3
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self._folder_sizes: Optional[FolderSizeService] = None
+        self._collator = get_name_collator()
+        self._sorts_file_system = False
+        self._clear_sort_keys()
         # Enable dynamic sorting
         self.setSortRole(Qt.ItemDataRole.DisplayRole)
         self.setDynamicSortFilter(True)
 
+    def set_folder_size_service(self, folder_sizes: FolderSizeService) -> None:
+        """
+        Show recursive directory sizes in the size column.
+
+        Args:
+            folder_sizes: Service computing the sizes
+        """
+        self._folder_sizes = folder_sizes
+        folder_sizes.sizes_updated.connect(self._on_folder_sizes_updated)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        """Return recursive sizes for directories in the size column."""
+        if (role != Qt.ItemDataRole.DisplayRole or index.column() != self.SIZE_COLUMN
+                or self._folder_sizes is None):
+            return super().data(index, role)
+        source_model = self.sourceModel()
+        source_index = self.mapToSource(index)
+        if not isinstance(source_model, QFileSystemModel) or not source_model.isDir(source_index):
+            return super().data(index, role)
+        folder_size = self._folder_sizes.get_size(source_model.filePath(source_index))
+        return format_size(folder_size.size) if folder_size is not None else ""
+
+    def _item_size(self, source_model: QFileSystemModel, index: QModelIndex, is_dir: bool) -> int:
+        """Size used for sorting; directories of unknown size sort first."""
+        if not is_dir:
+            return source_model.size(index)
+        if self._folder_sizes is None:
+            return -1
+        folder_size = self._folder_sizes.get_size(source_model.filePath(index))
+        return folder_size.size if folder_size is not None else -1
+
+    def _on_folder_sizes_updated(self, sizes) -> None:
+        """Repaint updated sizes and re-sort when sorted by size."""
+        source_model = self.sourceModel()
+        if not isinstance(source_model, QFileSystemModel):
+            return
+        updated = False
+        for path in sizes:
+            source_index = source_model.index(path, self.SIZE_COLUMN)
+            proxy_index = self.mapFromSource(source_index)
+            if proxy_index.isValid():
+                self.dataChanged.emit(proxy_index, proxy_index, [Qt.ItemDataRole.DisplayRole])
+                if self._sort_keys.pop(source_index.internalId(), None) is not None:
+                    self._drop_ranks(source_index.parent().internalId())
+                updated = True
+        if updated and self.sortColumn() == self.SIZE_COLUMN:
+            self.sort(self.sortColumn(), self.sortOrder())
+
+    # ============== SORT KEYS ==============
+    #
+    # lessThan runs O(n log n) times per sort. Rather than fetching and
+    # comparing file info in every call, each source row gets a sort key
+    # once, (is file, collation key of the name) plus the sorted column's value, and
+    # the rows of a directory are sorted in Python; lessThan then compares
+    # the resulting integer ranks. Keys and ranks are keyed by the source
+    # index's internalId(), which QFileSystemModel keeps stable per file,
+    # and are dropped when the source rows change.
+
+    def setSourceModel(self, source_model):
+        """Set the source model and track changes that invalidate sort keys."""
+        old_model = self.sourceModel()
+        if isinstance(old_model, QFileSystemModel):
+            old_model.rowsInserted.disconnect(self._on_source_rows_inserted)
+            old_model.rowsAboutToBeRemoved.disconnect(self._on_source_rows_removed)
+            old_model.dataChanged.disconnect(self._on_source_data_changed)
+            old_model.modelReset.disconnect(self._clear_sort_keys)
+            old_model.layoutChanged.disconnect(self._clear_sort_keys)
+        self._clear_sort_keys()
+        self._sorts_file_system = isinstance(source_model, QFileSystemModel)
+        # Connected before the base class so keys are current when it re-sorts
+        if self._sorts_file_system:
+            source_model.rowsInserted.connect(self._on_source_rows_inserted)
+            source_model.rowsAboutToBeRemoved.connect(self._on_source_rows_removed)
+            source_model.dataChanged.connect(self._on_source_data_changed)
+            source_model.modelReset.connect(self._clear_sort_keys)
+            source_model.layoutChanged.connect(self._clear_sort_keys)
+        super().setSourceModel(source_model)
+
+    def _clear_sort_keys(self, *args) -> None:
+        self._sort_keys: Dict[int, tuple] = {}
+        self._sort_keys_column = self.sortColumn()
+        self._ranks: Dict[int, int] = {}
+        self._rank_groups: Dict[int, List[int]] = {}  # parent id -> child ids
+
+    def _drop_ranks(self, parent_id: int) -> None:
+        for node_id in self._rank_groups.pop(parent_id, ()):
+            self._ranks.pop(node_id, None)
+
+    def _on_source_rows_inserted(self, parent: QModelIndex, first: int, last: int) -> None:
+        self._drop_ranks(parent.internalId())
+
+    def _on_source_rows_removed(self, parent: QModelIndex, first: int, last: int) -> None:
+        # Ids of deleted files may be reused by new ones
+        source_model = self.sourceModel()
+        for row in range(first, last + 1):
+            self._sort_keys.pop(source_model.index(row, 0, parent).internalId(), None)
+        self._drop_ranks(parent.internalId())
+
+    def _on_source_data_changed(self, top_left: QModelIndex, bottom_right: QModelIndex, roles=()) -> None:
+        if not self._rank_groups:
+            return
+        source_model = self.sourceModel()
+        parent = top_left.parent()
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            index = source_model.index(row, 0, parent)
+            node_id = index.internalId()
+            old_key = self._sort_keys.get(node_id)
+            if old_key is None:
+                continue
+            key = self._sort_key(source_model, index, self._sort_keys_column)
+            if key != old_key:
+                self._sort_keys[node_id] = key
+                self._drop_ranks(parent.internalId())
+
+    def _sort_key(self, source_model: QFileSystemModel, index: QModelIndex, column: int) -> tuple:
+        """Sort key of one row for a column: files after directories, then the column's value, then the name."""
+        is_dir = source_model.isDir(index)
+        name_key = self._collator.key(source_model.fileName(index))
+        if column == self.SIZE_COLUMN:
+            return (not is_dir, self._item_size(source_model, index, is_dir), name_key)
+        if column == self.TYPE_COLUMN:
+            return (not is_dir, self._collator.key(source_model.type(index)), name_key)
+        if column == self.MODIFIED_COLUMN:
+            return (not is_dir, source_model.lastModified(index).toMSecsSinceEpoch(), name_key)
+        return (not is_dir, name_key)
+
+    def _build_ranks(self, source_parent: QModelIndex) -> None:
+        """Sort the rows of one directory by their keys and record their ranks."""
+        source_model = self.sourceModel()
+        column = self.sortColumn()
+        if column != self._sort_keys_column:
+            self._clear_sort_keys()
+        sort_keys = self._sort_keys
+        rows = []
+        for row in range(source_model.rowCount(source_parent)):
+            index = source_model.index(row, 0, source_parent)
+            node_id = index.internalId()
+            key = sort_keys.get(node_id)
+            if key is None:
+                key = sort_keys[node_id] = self._sort_key(source_model, index, column)
+            rows.append((key, node_id))
+        rows.sort()
+
+        node_ids = [node_id for _, node_id in rows]
+        self._drop_ranks(source_parent.internalId())
+        self._rank_groups[source_parent.internalId()] = node_ids
+        self._ranks.update(zip(node_ids, range(len(node_ids))))
+
     def lessThan(self, left_index, right_index):
         """
         Custom sorting implementation that prioritizes directories over files.
 
         Args:
-            left_index: Left index from the proxy model
-            right_index: Right index from the proxy model
+            left_index: Left index from the source model
+            right_index: Right index from the source model
 
         Returns:
             bool: True if left should be sorted before right
         """
-        # Get source model
-        source_model = self.sourceModel()
-
-        # Ensure we have a file system model
-        if not source_model or not isinstance(source_model, QFileSystemModel):
+        # Without a file system model use the default sorting
+        if not self._sorts_file_system:
             return super().lessThan(left_index, right_index)
 
+        ranks = self._ranks
         try:
-            # Map proxy indexes to source model indexes - don't use mapToSource
-            # since these are already source indexes in the lessThan method
-
-            # Access file info directly from the source model using column 0
-            # which contains the filename
-            left_is_dir = source_model.isDir(source_model.index(left_index.row(), 0, left_index.parent()))
-            right_is_dir = source_model.isDir(source_model.index(right_index.row(), 0, right_index.parent()))
-
-            # Directory first sorting
-            if left_is_dir and not right_is_dir:
-                return True
-            elif not left_is_dir and right_is_dir:
-                return False
-
-            # Both are dirs or both are files, compare by name
-            left_name = source_model.data(left_index, Qt.ItemDataRole.DisplayRole)
-            right_name = source_model.data(right_index, Qt.ItemDataRole.DisplayRole)
-
-            # Case insensitive sorting
-            if isinstance(left_name, str) and isinstance(right_name, str):
-                return left_name.lower() < right_name.lower()
-
-            # Fallback to default sorting
-            return super().lessThan(left_index, right_index)
+            return ranks[left_index.internalId()] < ranks[right_index.internalId()]
+        except KeyError:
+            pass
 
+        try:
+            self._build_ranks(left_index.parent())
+            ranks = self._ranks
+            return ranks.get(left_index.internalId(), -1) < ranks.get(right_index.internalId(), -1)
         except Exception as e:
             logger.error(f"Sorting error: {e}")
             return super().lessThan(left_index, right_index)